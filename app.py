@@ -3,6 +3,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import plotly.graph_objects as go
 import plotly.express as px
+import html
 import json
 import os
 import time
@@ -11,6 +12,9 @@ import random
 import sys
 from pathlib import Path
 
+# Minimum seconds between data updates, so widget interactions rerun on cached data
+DATA_REFRESH_SECONDS = 5
+
 # Set up paths
 dashboard_dir = os.path.dirname(os.path.abspath(__file__))
 data_dir = os.path.join(dashboard_dir, 'data')
@@ -20,6 +24,30 @@ logs_dir = os.path.join(dashboard_dir, 'logs')
 os.makedirs(data_dir, exist_ok=True)
 os.makedirs(logs_dir, exist_ok=True)
 
+try:
+    from src.utils.log_tail import LogTailReader
+except ImportError:
+    # Fall back to reading whole log files
+    LogTailReader = None
+
+@st.cache_resource
+def get_log_reader():
+    """Get the log tail reader, kept across reruns so each refresh reads only new log lines."""
+    return LogTailReader() if LogTailReader is not None else None
+
+def file_version(path):
+    """Get the modification time and size of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+@st.cache_data(max_entries=16)
+def read_csv_cached(path, version):
+    """Read a CSV file once per version, so an unchanged file is never parsed again"""
+    return pd.read_csv(path)
+
 # Data bridge class for handling data
 class TradingDataBridge:
     """
@@ -47,6 +75,9 @@ class TradingDataBridge:
         
         # Initialize trading app log files if they don't exist
         self._initialize_log_files()
+        
+        # Tail reader keeping an offset per log file between refreshes
+        self.log_reader = get_log_reader()
     
     def _initialize_data_files(self):
         """Initialize data files if they don't exist."""
@@ -119,7 +150,7 @@ class TradingDataBridge:
     def get_positions(self):
         """Get current positions."""
         try:
-            return pd.read_csv(self.positions_path)
+            return read_csv_cached(self.positions_path, file_version(self.positions_path))
         except Exception as e:
             st.error(f"Error reading positions: {str(e)}")
             return pd.DataFrame()
@@ -127,7 +158,7 @@ class TradingDataBridge:
     def get_orders(self):
         """Get order history."""
         try:
-            return pd.read_csv(self.orders_path)
+            return read_csv_cached(self.orders_path, file_version(self.orders_path))
         except Exception as e:
             st.error(f"Error reading orders: {str(e)}")
             return pd.DataFrame()
@@ -135,7 +166,7 @@ class TradingDataBridge:
     def get_pnl_history(self):
         """Get P&L history."""
         try:
-            return pd.read_csv(self.pnl_history_path)
+            return read_csv_cached(self.pnl_history_path, file_version(self.pnl_history_path))
         except Exception as e:
             st.error(f"Error reading P&L history: {str(e)}")
             return pd.DataFrame()
@@ -173,6 +204,8 @@ class TradingDataBridge:
     def get_logs(self, max_lines=100):
         """Get trading app logs."""
         try:
+            if self.log_reader is not None:
+                return self.log_reader.tail(self.trading_app_log_path, max_lines)
             if os.path.exists(self.trading_app_log_path):
                 with open(self.trading_app_log_path, 'r') as f:
                     logs = f.readlines()
@@ -185,6 +218,8 @@ class TradingDataBridge:
     def get_error_logs(self, max_lines=100):
         """Get trading app error logs."""
         try:
+            if self.log_reader is not None:
+                return self.log_reader.tail(self.trading_app_error_log_path, max_lines)
             if os.path.exists(self.trading_app_error_log_path):
                 with open(self.trading_app_error_log_path, 'r') as f:
                     logs = f.readlines()
@@ -293,7 +328,70 @@ class TradingDataBridge:
 # Initialize data bridge
 data_bridge = TradingDataBridge()
 
+@st.cache_data(ttl=DATA_REFRESH_SECONDS)
+def refresh_data():
+    """Update the trading data at most once per DATA_REFRESH_SECONDS, across reruns and sessions"""
+    return data_bridge.update_data()
+
 # Helper functions
+@st.cache_data(max_entries=4)
+def load_pnl_performance(version, investment):
+    """
+    Load the P&L history and derive its charts and metrics,
+    once per version of the P&L file rather than on every rerun
+    """
+    pnl_history = data_bridge.get_pnl_history()
+    if pnl_history.empty:
+        return pnl_history, None
+    
+    # Convert date column to datetime
+    pnl_history['date'] = pd.to_datetime(pnl_history['date'])
+    
+    # Daily P&L chart
+    daily_fig = px.bar(
+        pnl_history, 
+        x='date', 
+        y='daily_pnl',
+        title='Daily P&L',
+        labels={'date': 'Date', 'daily_pnl': 'Daily P&L'},
+        color='daily_pnl',
+        color_continuous_scale=['red', 'green'],
+        color_continuous_midpoint=0
+    )
+    daily_fig.update_layout(height=400)
+    
+    # Cumulative P&L chart
+    cumulative_fig = px.line(
+        pnl_history, 
+        x='date', 
+        y='cumulative_pnl',
+        title='Cumulative P&L',
+        labels={'date': 'Date', 'cumulative_pnl': 'Cumulative P&L'}
+    )
+    cumulative_fig.update_layout(height=400)
+    
+    performance = {
+        'daily_fig': daily_fig,
+        'cumulative_fig': cumulative_fig,
+        'daily_pnl': pnl_history['daily_pnl'].iloc[-1],
+        'total_pnl': pnl_history['cumulative_pnl'].iloc[-1],
+        'monthly_return': pnl_history['cumulative_pnl'].iloc[-1] / investment * 100,
+    }
+    return pnl_history, performance
+
+def format_logs(lines):
+    """Render log lines as HTML, colored by level"""
+    rendered = []
+    for line in lines:
+        if ' - ERROR - ' in line or ' - CRITICAL - ' in line:
+            level = 'error-log'
+        elif ' - WARNING - ' in line:
+            level = 'warning-log'
+        else:
+            level = 'info-log'
+        rendered.append(f"<span class='{level}'>{html.escape(line.rstrip())}</span>")
+    return "<div class='log-container'>" + "<br>".join(rendered) + "</div>"
+
 def load_config():
     """Load configuration or return default config"""
     # Default config
@@ -405,7 +503,7 @@ if 'strategy_running' not in st.session_state:
     st.session_state.strategy_running = status['running']
 
 # Update data
-data_bridge.update_data()
+refresh_data()
 
 # Main dashboard layout
 st.markdown("<h1 class='main-header'>Nifty 50 Trading Dashboard</h1>", unsafe_allow_html=True)
@@ -425,5 +523,220 @@ with col1:
             st.write(f"Running since: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
             st.write(f"Uptime: {uptime}")
     else:
-        st.markdown("<p cla
-(Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
+        st.markdown("<p class='status-inactive'>● INACTIVE</p>", unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+with col2:
+    st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
+    st.subheader("Controls")
+    if st.session_state.strategy_running:
+        if st.button("Stop Strategy", key="stop_button"):
+            if data_bridge.stop_strategy():
+                st.session_state.strategy_running = False
+                st.success("Strategy stopped successfully!")
+                st.rerun()
+    else:
+        if st.button("Start Strategy", key="start_button"):
+            if data_bridge.start_strategy():
+                st.session_state.strategy_running = True
+                st.success("Strategy started successfully!")
+                st.rerun()
+    st.markdown("</div>", unsafe_allow_html=True)
+
+with col3:
+    st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
+    st.subheader("Emergency Actions")
+    if st.button("Close All Positions", key="close_positions_button"):
+        if data_bridge.close_all_positions():
+            st.success("All positions closed successfully!")
+            st.rerun()
+    st.markdown("</div>", unsafe_allow_html=True)
+
+# Tabs for different sections
+tab1, tab2, tab3, tab4 = st.tabs(["Positions & P&L", "Strategy Configuration", "Logs & Monitoring", "About"])
+
+# Tab 1: Positions & P&L
+with tab1:
+    st.markdown("<h2 class='sub-header'>Current Positions</h2>", unsafe_allow_html=True)
+    
+    # Load positions
+    positions = data_bridge.get_positions()
+    
+    # Display positions
+    if not positions.empty:
+        st.dataframe(positions, use_container_width=True)
+    else:
+        st.info("No positions found.")
+    
+    st.markdown("<h2 class='sub-header'>P&L Performance</h2>", unsafe_allow_html=True)
+    
+    # Load P&L history and its derived charts and metrics
+    config = load_config()
+    investment = config["INVESTMENT_CONFIG"]["base_investment"]
+    pnl_history, performance = load_pnl_performance(file_version(data_bridge.pnl_history_path), investment)
+    
+    # Display P&L charts
+    if not pnl_history.empty:
+        # Create two columns for charts
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(performance['daily_fig'], use_container_width=True)
+        
+        with col2:
+            st.plotly_chart(performance['cumulative_fig'], use_container_width=True)
+        
+        # P&L metrics
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
+            st.metric("Today's P&L", f"₹{performance['daily_pnl']:,.2f}")
+            st.markdown("</div>", unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
+            st.metric("Total P&L", f"₹{performance['total_pnl']:,.2f}")
+            st.markdown("</div>", unsafe_allow_html=True)
+        
+        with col3:
+            st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
+            monthly_return = performance['monthly_return']
+            st.metric("Monthly Return", f"{monthly_return:.2f}%")
+            st.markdown("</div>", unsafe_allow_html=True)
+        
+        with col4:
+            st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
+            target_return = config["STRATEGY_CONFIG"]["target_monthly_return"] * 100
+            st.metric("Target Return", f"{target_return:.2f}%", f"{monthly_return - target_return:+.2f}%")
+            st.markdown("</div>", unsafe_allow_html=True)
+    else:
+        st.info("No P&L history found.")
+
+# Tab 2: Strategy Configuration
+with tab2:
+    st.markdown("<h2 class='sub-header'>Strategy Configuration</h2>", unsafe_allow_html=True)
+    
+    config = load_config()
+    investment_config = config["INVESTMENT_CONFIG"]
+    strategy_config = config["STRATEGY_CONFIG"]
+    trading_hours = config["TRADING_HOURS"]
+    
+    with st.form("config_form"):
+        st.subheader("Investment")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            base_investment = st.number_input("Base Investment (₹)", min_value=0,
+                                              value=int(investment_config["base_investment"]), step=10000)
+            lot_size = st.number_input("Lot Size", min_value=1, value=int(investment_config["lot_size"]))
+        
+        with col2:
+            lots_per_investment = st.number_input("Lots per Investment", min_value=1,
+                                                  value=int(investment_config["lots_per_investment"]))
+            investment_per_lot = st.number_input("Investment per Lot (₹)", min_value=0,
+                                                 value=int(investment_config["investment_per_lot"]), step=10000)
+        
+        st.subheader("Strategy")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            target_monthly_return = st.number_input("Target Monthly Return (%)", min_value=0.0,
+                                                    value=strategy_config["target_monthly_return"] * 100, step=0.5)
+            leg_premium_target = st.number_input("Leg Premium Target (% of investment)", min_value=0.0,
+                                                 value=strategy_config["leg_premium_target"] * 100, step=0.5)
+            strangle_distance = st.number_input("Strangle Distance (points)", min_value=0,
+                                                value=int(strategy_config["strangle_distance"]), step=50)
+            sell_expiry_weeks = st.number_input("Sell Expiry (weeks)", min_value=1,
+                                                value=int(strategy_config["sell_expiry_weeks"]))
+            hedge_expiry_weeks = st.number_input("Hedge Expiry (weeks)", min_value=1,
+                                                 value=int(strategy_config["hedge_expiry_weeks"]))
+        
+        with col2:
+            stop_loss_trigger = st.number_input("Stop Loss Trigger (% drop)", min_value=0.0,
+                                                value=strategy_config["stop_loss_trigger"] * 100, step=5.0)
+            stop_loss_percentage = st.number_input("Stop Loss (%)", min_value=0.0,
+                                                   value=strategy_config["stop_loss_percentage"] * 100, step=5.0)
+            martingale_trigger = st.number_input("Martingale Trigger (price multiple)", min_value=1.0,
+                                                 value=float(strategy_config["martingale_trigger"]), step=0.25)
+            martingale_quantity_multiplier = st.number_input(
+                "Martingale Quantity Multiplier", min_value=1.0,
+                value=float(strategy_config["martingale_quantity_multiplier"]), step=0.5)
+            martingale_premium_divisor = st.number_input(
+                "Martingale Premium Divisor", min_value=1.0,
+                value=float(strategy_config["martingale_premium_divisor"]), step=0.5)
+        
+        st.subheader("Trading Hours")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            start_time = st.text_input("Start Time", value=trading_hours["start_time"])
+        
+        with col2:
+            end_time = st.text_input("End Time", value=trading_hours["end_time"])
+        
+        with col3:
+            check_interval = st.number_input("Check Interval (seconds)", min_value=10,
+                                             value=int(trading_hours["check_interval"]), step=10)
+        
+        holidays = st.text_area("Holidays (one YYYY-MM-DD date per line)", value="\n".join(config["HOLIDAYS"]))
+        
+        if st.form_submit_button("Save Configuration"):
+            investment_config.update(base_investment=base_investment, lot_size=lot_size,
+                                     lots_per_investment=lots_per_investment,
+                                     investment_per_lot=investment_per_lot)
+            strategy_config.update(target_monthly_return=target_monthly_return / 100,
+                                   leg_premium_target=leg_premium_target / 100,
+                                   strangle_distance=strangle_distance,
+                                   sell_expiry_weeks=sell_expiry_weeks,
+                                   hedge_expiry_weeks=hedge_expiry_weeks,
+                                   stop_loss_trigger=stop_loss_trigger / 100,
+                                   stop_loss_percentage=stop_loss_percentage / 100,
+                                   martingale_trigger=martingale_trigger,
+                                   martingale_quantity_multiplier=martingale_quantity_multiplier,
+                                   martingale_premium_divisor=martingale_premium_divisor)
+            trading_hours.update(start_time=start_time, end_time=end_time, check_interval=check_interval)
+            config["HOLIDAYS"] = [line.strip() for line in holidays.splitlines() if line.strip()]
+            
+            save_config(config)
+            st.success("Configuration saved. Restart the strategy to apply it.")
+
+# Tab 3: Logs & Monitoring
+with tab3:
+    st.markdown("<h2 class='sub-header'>Logs & Monitoring</h2>", unsafe_allow_html=True)
+    
+    max_lines = st.slider("Log lines", min_value=10, max_value=500, value=100, step=10)
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Trading Log")
+        st.markdown(format_logs(data_bridge.get_logs(max_lines)), unsafe_allow_html=True)
+    
+    with col2:
+        st.subheader("Error Log")
+        st.markdown(format_logs(data_bridge.get_error_logs(max_lines)), unsafe_allow_html=True)
+    
+    st.markdown("<h2 class='sub-header'>Recent Orders</h2>", unsafe_allow_html=True)
+    orders = data_bridge.get_orders()
+    if not orders.empty:
+        st.dataframe(orders, use_container_width=True)
+    else:
+        st.info("No orders found.")
+
+# Tab 4: About
+with tab4:
+    st.markdown("<h2 class='sub-header'>About</h2>", unsafe_allow_html=True)
+    st.markdown("""
+This dashboard monitors the short strangle options strategy for Nifty 50.
+
+**Strategy logic**
+
+1. The total investment is the invested amount plus the available funds
+2. Short strangle legs are placed at least the strangle distance away from the spot price
+3. Each leg premium targets around 2% of the investment
+4. Hedge buy orders are placed for the current week's expiry and rolled over weekly on expiry day
+5. When a sell leg drops by the stop loss trigger, a stop loss is placed and a new sell order is added
+6. When a sell leg doubles in price, the martingale rule sells a larger quantity further out
+
+Configuration changes take effect when the strategy is restarted.
+""")
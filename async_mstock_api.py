@@ -0,0 +1,423 @@
+"""
+Asyncio mStock API client for interacting with the mStock Trading API.
+Mirrors MStockAPI so independent requests can run concurrently.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Any, Optional, List, Tuple
+
+import aiohttp
+
+from src.api.rate_limiter import RateLimiter, RateLimitTimeout, endpoint_class, get_rate_limiter
+from src.api.session_manager import OTPProvider, SessionManager, create_otp_provider, get_session_manager
+from src.utils.resilience import BreakerRegistry, TransientError, async_call_with_retry, endpoint_name
+from config.config import API_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMStockAPI:
+    """
+    Asyncio client for the mStock Trading API.
+    Exposes the same methods as MStockAPI as coroutines.
+    """
+    
+    def __init__(self, api_key: str, username: str, password: str,
+                 session: Optional[aiohttp.ClientSession] = None, rate_limiter: Optional[RateLimiter] = None,
+                 breakers: Optional[BreakerRegistry] = None, otp_provider: Optional[OTPProvider] = None,
+                 session_manager: Optional[SessionManager] = None):
+        """
+        Initialize the AsyncMStockAPI client.
+        
+        Args:
+            api_key: API key for authentication
+            username: mStock account username
+            password: mStock account password
+            session: aiohttp session to use, created on first request if not provided
+            rate_limiter: Rate limiter to queue requests on, defaults to the process-wide limiter
+                shared with MStockAPI
+            breakers: Circuit breakers per endpoint, defaults to a new registry for this client
+            otp_provider: Source of the login OTP, defaults to SESSION_CONFIG["otp_provider"]
+            session_manager: Store for the access token across restarts, defaults to
+                SESSION_CONFIG, None there disables persistence
+        """
+        self.api_key = api_key
+        self.username = username
+        self.password = password
+        self.access_token = None
+        self.headers = {
+            "X-Mirae-Version": API_CONFIG["version"],
+            "Content-Type": "application/x-www-form-urlencoded"
+        }
+        self.base_url = API_CONFIG["api_url"]
+        self.ws_url = API_CONFIG["ws_url"]
+        self.session = session
+        self._owns_session = session is None
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter()
+        self.breakers = breakers if breakers is not None else BreakerRegistry()
+        self.otp_provider = otp_provider if otp_provider is not None else create_otp_provider()
+        self.session_manager = session_manager if session_manager is not None else get_session_manager()
+    
+    async def __aenter__(self) -> 'AsyncMStockAPI':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the HTTP session, creating a pooled keep-alive session if needed.
+        
+        Returns:
+            aiohttp client session
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=API_CONFIG["pool_connections"] * API_CONFIG["pool_maxsize"],
+                limit_per_host=API_CONFIG["pool_maxsize"]
+            )
+            timeout = aiohttp.ClientTimeout(
+                sock_connect=API_CONFIG["connect_timeout"],
+                sock_read=API_CONFIG["read_timeout"]
+            )
+            self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._owns_session = True
+        return self.session
+    
+    async def close(self) -> None:
+        """
+        Close the HTTP session if it was created by this client.
+        """
+        if self._owns_session and self.session is not None and not self.session.closed:
+            await self.session.close()
+    
+    async def _request(self, method: str, path: str, action: str,
+                       data: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+        """
+        Send a request and validate the response envelope.
+        
+        Every attempt waits for the shared rate limiter, GET requests are
+        retried with jittered backoff on connection errors, timeouts and 429 or
+        5xx responses within the call budget, and every request goes through
+        the endpoint's circuit breaker.
+        
+        Args:
+            method: HTTP method
+            path: URL path relative to the base URL
+            action: Description used in log messages (e.g. "get positions")
+            data: Form data for POST requests
+        
+        Returns:
+            Parsed response dictionary or None if request fails
+        """
+        url = f"{self.base_url}{path}"
+        
+        async def attempt(remaining: float) -> Tuple[int, str]:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(endpoint_class(url))
+            async with self._get_session().request(method, url, headers=self.headers, data=data) as response:
+                text = await response.text()
+                if response.status == 429:
+                    self._on_throttle(url, response.headers.get("Retry-After", ""))
+                if response.status == 429 or response.status >= 500:
+                    raise TransientError(f"HTTP {response.status} from {endpoint_name(path)}", (response.status, text))
+                return response.status, text
+        
+        status, text = await async_call_with_retry(attempt, self.breakers.get(endpoint_name(path)),
+                                                   retry=method == "GET", passthrough=(RateLimitTimeout,))
+        if status != 200:
+            logger.error(f"Failed to {action}: {text}")
+            return None
+        
+        result = json.loads(text)
+        if result["status"] != "success":
+            logger.error(f"Failed to {action}: {result['message']}")
+            return None
+        
+        return result
+    
+    def _on_throttle(self, url: str, retry_after: str) -> None:
+        # Broker throttling pauses the whole endpoint class, not just this request
+        if self.rate_limiter is None:
+            return
+        try:
+            pause = float(retry_after)
+        except ValueError:
+            pause = None
+        self.rate_limiter.throttle(endpoint_class(url), pause)
+    
+    def _set_access_token(self, access_token: Optional[str]) -> None:
+        """
+        Use an access token for subsequent requests.
+        
+        Args:
+            access_token: Access token, None to drop the current one
+        """
+        self.access_token = access_token
+        if access_token is None:
+            self.headers.pop("Authorization", None)
+        else:
+            self.headers["Authorization"] = f"token {self.api_key}:{access_token}"
+    
+    async def restore_session(self) -> bool:
+        """
+        Reuse the access token saved by an earlier login, if it is still valid.
+        
+        Returns:
+            bool: True if a saved token was restored, False otherwise
+        """
+        if self.session_manager is None:
+            return False
+        access_token = self.session_manager.load(self.base_url, self.api_key, self.username)
+        if access_token is None:
+            return False
+        
+        self._set_access_token(access_token)
+        try:
+            if await self._request("GET", "/openapi/typea/fund/summary", "validate saved session") is not None:
+                logger.info("Restored saved session")
+                return True
+        except Exception as e:
+            logger.warning(f"Could not validate saved session: {str(e)}")
+        self._set_access_token(None)
+        return False
+    
+    async def login(self, force: bool = False) -> bool:
+        """
+        Login to mStock API and generate access token.
+        
+        A saved, still valid access token is reused without a new OTP unless
+        force is set.
+        
+        Args:
+            force: Log in again even if a saved token is valid
+        
+        Returns:
+            bool: True if login successful, False otherwise
+        """
+        if not force and await self.restore_session():
+            return True
+        
+        try:
+            # Step 1: Login with username and password to get OTP
+            login_data = {
+                "username": self.username,
+                "password": self.password
+            }
+            
+            login_response = await self._request("POST", "/openapi/typea/connect/login", "login", login_data)
+            if login_response is None:
+                return False
+            
+            # Step 2: Get OTP from the provider without blocking the event loop
+            loop = asyncio.get_running_loop()
+            otp = await loop.run_in_executor(None, self.otp_provider.get_otp, self.username)
+            if not otp:
+                logger.error("Login failed: no OTP available")
+                return False
+            
+            # Step 3: Generate session token
+            session_data = {
+                "api_key": self.api_key,
+                "request_token": otp,
+                "checksum": "L"  # This might need to be calculated based on API documentation
+            }
+            
+            session_response = await self._request(
+                "POST", "/openapi/typea/session/token", "generate session token", session_data
+            )
+            if session_response is None:
+                return False
+            
+            # Use the access token and keep it for the next start
+            self._set_access_token(session_response["data"]["access_token"])
+            if self.session_manager is not None:
+                self.session_manager.save(self.base_url, self.api_key, self.username, self.access_token)
+            
+            logger.info("Login successful")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Login error: {str(e)}")
+            return False
+    
+    async def get_positions(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get current positions.
+        
+        Returns:
+            List of position objects or None if request fails
+        """
+        try:
+            response = await self._request("GET", "/openapi/typea/portfolio/positions", "get positions")
+            return response["data"]["net"] if response is not None else None
+        except Exception as e:
+            logger.error(f"Get positions error: {str(e)}")
+            return None
+    
+    async def get_option_chain_master(self) -> Optional[Dict[str, Any]]:
+        """
+        Get option chain master data.
+        
+        Returns:
+            Option chain master data or None if request fails
+        """
+        try:
+            response = await self._request(
+                "GET", "/openapi/typea/getoptionchainmaster/2", "get option chain master"  # 2 is for NSE
+            )
+            return response["data"] if response is not None else None
+        except Exception as e:
+            logger.error(f"Get option chain master error: {str(e)}")
+            return None
+    
+    async def get_option_chain(self, expiry_timestamp: str, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Get option chain data for a specific expiry and token.
+        
+        Args:
+            expiry_timestamp: Expiry timestamp
+            token: Instrument token
+        
+        Returns:
+            Option chain data or None if request fails
+        """
+        try:
+            response = await self._request(
+                "GET", f"/openapi/typea/GetOptionChain/2/{expiry_timestamp}/{token}", "get option chain"
+            )
+            return response["data"] if response is not None else None
+        except Exception as e:
+            logger.error(f"Get option chain error: {str(e)}")
+            return None
+    
+    async def place_order(self, order_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Place an order.
+        
+        Args:
+            order_params: Order parameters
+        
+        Returns:
+            Order response or None if request fails
+        """
+        try:
+            response = await self._request("POST", "/openapi/typea/order/place", "place order", order_params)
+            return response["data"] if response is not None else None
+        except Exception as e:
+            logger.error(f"Place order error: {str(e)}")
+            return None
+    
+    async def modify_order(self, order_id: str, order_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Modify an existing order.
+        
+        Args:
+            order_id: Order ID to modify
+            order_params: New order parameters
+        
+        Returns:
+            Order response or None if request fails
+        """
+        try:
+            order_params["order_id"] = order_id
+            response = await self._request("POST", "/openapi/typea/order/modify", "modify order", order_params)
+            return response["data"] if response is not None else None
+        except Exception as e:
+            logger.error(f"Modify order error: {str(e)}")
+            return None
+    
+    async def cancel_order(self, order_id: str) -> bool:
+        """
+        Cancel an existing order.
+        
+        Args:
+            order_id: Order ID to cancel
+        
+        Returns:
+            True if cancellation successful, False otherwise
+        """
+        try:
+            data = {"order_id": order_id}
+            response = await self._request("POST", "/openapi/typea/order/cancel", "cancel order", data)
+            return response is not None
+        except Exception as e:
+            logger.error(f"Cancel order error: {str(e)}")
+            return False
+    
+    async def get_order_history(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get order history.
+        
+        Returns:
+            List of orders or None if request fails
+        """
+        try:
+            response = await self._request("GET", "/openapi/typea/order/history", "get order history")
+            return response["data"] if response is not None else None
+        except Exception as e:
+            logger.error(f"Get order history error: {str(e)}")
+            return None
+    
+    async def get_fund_summary(self) -> Optional[Dict[str, Any]]:
+        """
+        Get fund summary.
+        
+        Returns:
+            Fund summary or None if request fails
+        """
+        try:
+            response = await self._request("GET", "/openapi/typea/fund/summary", "get fund summary")
+            return response["data"] if response is not None else None
+        except Exception as e:
+            logger.error(f"Get fund summary error: {str(e)}")
+            return None
+    
+    def endpoint_available(self, endpoint: str) -> bool:
+        """
+        Check whether an endpoint's circuit breaker lets calls through.
+        
+        Args:
+            endpoint: Endpoint name, e.g. GetOptionChain or portfolio/positions
+        
+        Returns:
+            False while the endpoint is failing and calls fail fast, True otherwise
+        """
+        return self.breakers.is_available(endpoint)
+    
+    def get_breaker_states(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get circuit breaker states.
+        
+        Returns:
+            Endpoint name -> state and failure counters
+        """
+        return self.breakers.states()
+    
+    async def get_option_chains(self, requests: List[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Fetch several option chains concurrently.
+        
+        Args:
+            requests: List of (expiry_timestamp, token) pairs
+        
+        Returns:
+            Option chain data for each request in order, None for failed requests
+        """
+        return list(await asyncio.gather(
+            *(self.get_option_chain(expiry_timestamp, token) for expiry_timestamp, token in requests)
+        ))
+    
+    async def place_orders(self, orders_params: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Place several independent orders concurrently.
+        
+        Args:
+            orders_params: List of order parameters
+        
+        Returns:
+            Order response for each order in order, None for failed orders
+        """
+        return list(await asyncio.gather(*(self.place_order(params) for params in orders_params)))
@@ -0,0 +1,227 @@
+"""
+Offline backtesting engine for the Short Strangle strategy.
+Replays historical option chain snapshots in event time through the real
+ShortStrangleStrategy against a SimulatedBroker.
+"""
+
+import contextlib
+import datetime
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, List
+
+import numpy as np
+
+from src.api.simulated_broker import SimulatedBroker
+from src.models.chain_series import ChainSeries
+from src.models.snapshot_store import SnapshotStore
+from src.models.position import Position
+from src.strategies.short_strangle import ShortStrangleStrategy
+from config.config import STRATEGY_CONFIG, BACKTEST_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+@contextlib.contextmanager
+def config_overrides(overrides: Dict[str, Any] = None):
+    """
+    Temporarily override STRATEGY_CONFIG values.
+    
+    Args:
+        overrides: Strategy parameters to replace while the context is active
+    """
+    overrides = overrides or {}
+    unknown = set(overrides) - set(STRATEGY_CONFIG)
+    if unknown:
+        raise KeyError(f"Unknown strategy parameters: {', '.join(sorted(unknown))}")
+    
+    saved = {key: STRATEGY_CONFIG[key] for key in overrides}
+    STRATEGY_CONFIG.update(overrides)
+    try:
+        yield
+    finally:
+        STRATEGY_CONFIG.update(saved)
+
+
+@dataclass
+class BacktestResult:
+    """
+    Equity curve and trades of one backtest run.
+    """
+    timestamps: np.ndarray  # Event times as Unix seconds
+    equity: np.ndarray  # Account equity after each event
+    initial_capital: float
+    trades: List[Dict[str, Any]] = field(default_factory=list)
+    entries: int = 0
+    stop_losses: int = 0
+    martingales: int = 0
+    rejected_orders: int = 0
+    
+    @property
+    def max_drawdown(self) -> float:
+        """Largest peak-to-trough fall of equity."""
+        if len(self.equity) == 0:
+            return 0.0
+        return float(np.max(np.maximum.accumulate(self.equity) - self.equity))
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Get summary statistics of the run.
+        
+        Returns:
+            Dictionary with P&L, drawdown and activity counts
+        """
+        final_equity = float(self.equity[-1]) if len(self.equity) else self.initial_capital
+        return {
+            "events": len(self.timestamps),
+            "initial_capital": self.initial_capital,
+            "final_equity": final_equity,
+            "total_pnl": final_equity - self.initial_capital,
+            "return": (final_equity - self.initial_capital) / self.initial_capital if self.initial_capital else 0.0,
+            "max_drawdown": self.max_drawdown,
+            "fills": sum(1 for trade in self.trades if trade["kind"] == "fill"),
+            "settlements": sum(1 for trade in self.trades if trade["kind"] == "settlement"),
+            "entries": self.entries,
+            "stop_losses": self.stop_losses,
+            "martingales": self.martingales,
+            "rejected_orders": self.rejected_orders,
+        }
+
+
+class BacktestEngine:
+    """
+    Drives ShortStrangleStrategy over historical chain snapshots.
+    
+    Every distinct snapshot time is one event. At each event the broker is
+    advanced, the strategy's positions are synchronized and, as in live
+    trading, a new strangle is opened when flat or the open positions are
+    managed with the strategy's check_positions. No wall-clock sleeps are
+    involved, so a run takes as long as the strategy's decisions do.
+    """
+    
+    def __init__(self, series: List[ChainSeries], capital: float = None,
+                 strategy_overrides: Dict[str, Any] = None, entry_time: str = None, **broker_options):
+        """
+        Initialize the engine.
+        
+        Args:
+            series: Chain series, one per expiry
+            capital: Starting cash, defaults to BACKTEST_CONFIG
+            strategy_overrides: STRATEGY_CONFIG values to use for the run
+            entry_time: Earliest time of day to open a strangle (HH:MM:SS), defaults to BACKTEST_CONFIG
+            **broker_options: Further SimulatedBroker arguments (fill_model, margin_model, brokerage)
+        """
+        self.series = series
+        self.capital = BACKTEST_CONFIG["initial_capital"] if capital is None else capital
+        self.strategy_overrides = strategy_overrides or {}
+        self.entry_time = datetime.datetime.strptime(entry_time or BACKTEST_CONFIG["entry_time"], "%H:%M:%S").time()
+        self.broker_options = broker_options
+    
+    @classmethod
+    def from_store(cls, root: str, underlying: str = None, start: datetime.date = None,
+                   end: datetime.date = None, **options) -> 'BacktestEngine':
+        """
+        Create an engine over the snapshots in a SnapshotStore.
+        
+        Args:
+            root: Root directory of the store
+            underlying: Underlying symbol, defaults to every stored underlying
+            start: First day of snapshots to load
+            end: Last day of snapshots to load
+            **options: Further BacktestEngine arguments
+        
+        Returns:
+            BacktestEngine replaying the stored snapshots
+        """
+        return cls(SnapshotStore(root).load_all(underlying, start, end), **options)
+    
+    def event_times(self, start: int = None, end: int = None) -> np.ndarray:
+        """
+        Get the merged snapshot times of all series.
+        
+        Args:
+            start: First Unix time to include
+            end: Last Unix time to include
+        
+        Returns:
+            Sorted unique Unix times
+        """
+        if not self.series:
+            return np.empty(0, dtype=np.int64)
+        times = np.unique(np.concatenate([item.timestamps for item in self.series]))
+        if start is not None:
+            times = times[times >= start]
+        if end is not None:
+            times = times[times <= end]
+        return times
+    
+    def run(self, start: int = None, end: int = None) -> BacktestResult:
+        """
+        Run the backtest.
+        
+        Args:
+            start: First Unix time to replay
+            end: Last Unix time to replay
+        
+        Returns:
+            BacktestResult of the run
+        """
+        times = self.event_times(start, end)
+        broker = SimulatedBroker(self.series, capital=self.capital, **self.broker_options)
+        # Snapshot index of every series at every event, resolved up front
+        rows = np.stack([item.rows_at(times) for item in broker.series], axis=1) if len(times) else None
+        result = BacktestResult(times, np.empty(len(times)), self.capital)
+        
+        with config_overrides(self.strategy_overrides):
+            strategy = ShortStrangleStrategy(broker, clock=lambda: broker.now)
+            strategy.snapshot_writer = None  # Replayed chains are not stored again
+            strategy.handle_stop_loss = self._counted(strategy.handle_stop_loss, broker, result, "stop_losses")
+            strategy.handle_martingale = self._counted(strategy.handle_martingale, broker, result, "martingales")
+            if not strategy.initialize():
+                logger.error("Failed to initialize strategy for backtest")
+                return result
+            
+            last_entry_date = None
+            synced_version = -1
+            for index, timestamp in enumerate(times.tolist()):
+                broker.advance(timestamp, rows[index])
+                now = broker.now
+                
+                if broker.position_version != synced_version:
+                    self._sync_positions(strategy, broker)
+                    synced_version = broker.position_version
+                else:
+                    for position in strategy.active_positions.values():
+                        position.last_price = broker.last_price(position.symbol)
+                
+                if not strategy.active_positions:
+                    if now.date() != last_entry_date and now.time() >= self.entry_time:
+                        last_entry_date = now.date()
+                        # Orders of closed strangles no longer block re-entry at the same strikes
+                        strategy.placed_orders_cache.clear()
+                        if strategy.place_short_strangle(strategy.calculate_investment_amount()):
+                            result.entries += 1
+                else:
+                    strategy.check_positions()
+                
+                result.equity[index] = broker.equity()
+        
+        result.trades = broker.trades
+        result.rejected_orders = broker.rejected_orders
+        return result
+    
+    def _sync_positions(self, strategy: ShortStrangleStrategy, broker: SimulatedBroker) -> None:
+        strategy.active_positions = {}
+        for position_data in broker.get_positions():
+            position = Position.from_api_response(position_data)
+            strategy.active_positions[position.symbol] = position
+    
+    def _counted(self, handler: Callable[[Position], bool], broker: SimulatedBroker,
+                 result: BacktestResult, counter: str) -> Callable[[Position], bool]:
+        # Count the handler calls that changed the broker's positions
+        def counted(position: Position) -> bool:
+            version = broker.position_version
+            success = handler(position)
+            setattr(result, counter, getattr(result, counter) + (broker.position_version != version))
+            return success
+        return counted
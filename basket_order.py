@@ -0,0 +1,246 @@
+"""
+Basket order execution for multi-leg option strategies.
+Submits legs concurrently in ordered stages and compensates filled legs on failure.
+"""
+
+import dataclasses
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from itertools import groupby
+from typing import Dict, Any, List, Optional, Callable
+
+from src.api.mstock_api import MStockAPI
+from src.api.rate_limiter import Priority, request_priority
+from src.models.order import Order, OrderSide, OrderStatus, OrderType
+from config.config import STRATEGY_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class LegStatus(Enum):
+    """Possible outcomes of a basket leg."""
+    PENDING = "PENDING"
+    PLACED = "PLACED"
+    FAILED = "FAILED"
+    SKIPPED = "SKIPPED"
+    COMPENSATED = "COMPENSATED"
+    COMPENSATION_FAILED = "COMPENSATION_FAILED"
+
+
+@dataclass
+class LegResult:
+    """
+    Outcome of a single leg in a basket order.
+    """
+    order: Order
+    status: LegStatus = LegStatus.PENDING
+    response: Optional[Dict[str, Any]] = None
+    latency: Optional[float] = None  # Submit-to-ack time in seconds
+    compensation_order_id: Optional[str] = None
+
+
+@dataclass
+class BasketResult:
+    """
+    Outcome of a basket order with per-leg results.
+    """
+    legs: List[LegResult] = field(default_factory=list)
+    
+    @property
+    def success(self) -> bool:
+        """True if every leg was placed and none were rolled back."""
+        return all(leg.status == LegStatus.PLACED for leg in self.legs)
+    
+    @property
+    def placed_legs(self) -> List[LegResult]:
+        """Legs that are currently live with the broker."""
+        return [leg for leg in self.legs if leg.status == LegStatus.PLACED]
+    
+    @property
+    def latencies(self) -> Dict[str, float]:
+        """Submit-to-ack latency in seconds keyed by order symbol."""
+        return {leg.order.symbol: leg.latency for leg in self.legs if leg.latency is not None}
+
+
+def hedges_first(order: Order) -> int:
+    """
+    Ordering policy that submits hedge legs before sell legs.
+    
+    Args:
+        order: Order to rank
+    
+    Returns:
+        Stage number (lower stages are submitted first)
+    """
+    return 0 if order.is_hedge else 1
+
+
+def simultaneous(order: Order) -> int:
+    """
+    Ordering policy that submits every leg in a single stage.
+    
+    Args:
+        order: Order to rank
+    
+    Returns:
+        Stage number (always 0)
+    """
+    return 0
+
+
+ORDERING_POLICIES = {
+    "hedges_first": hedges_first,
+    "simultaneous": simultaneous,
+}
+
+
+class BasketOrderExecutor:
+    """
+    Executes a basket of orders as a unit.
+    
+    Legs are grouped into stages by an ordering policy. Legs within a stage are
+    submitted concurrently; the next stage starts only when every leg of the
+    current stage has been acknowledged. If any leg fails, the remaining stages
+    are skipped and already placed legs are cancelled or offset, in reverse
+    order of submission.
+    """
+    
+    def __init__(self, api: MStockAPI, ordering: Callable[[Order], int] = None,
+                 rollback: bool = None, max_workers: int = None):
+        """
+        Initialize the executor.
+        
+        Args:
+            api: MStockAPI client
+            ordering: Function mapping an order to its stage number
+            rollback: Whether to compensate placed legs when a sibling fails
+            max_workers: Maximum number of concurrent submissions
+        """
+        self.api = api
+        self.ordering = ordering or ORDERING_POLICIES[STRATEGY_CONFIG["basket_order_policy"]]
+        self.rollback = STRATEGY_CONFIG["basket_rollback_on_failure"] if rollback is None else rollback
+        self.max_workers = max_workers
+    
+    def execute(self, orders: List[Order]) -> BasketResult:
+        """
+        Execute a basket of orders.
+        
+        Args:
+            orders: Orders to place
+        
+        Returns:
+            BasketResult with per-leg outcomes
+        """
+        result = BasketResult(legs=[LegResult(order=order) for order in orders])
+        if not result.legs:
+            return result
+        
+        stages = [list(legs) for _, legs in groupby(
+            sorted(result.legs, key=lambda leg: self.ordering(leg.order)),
+            key=lambda leg: self.ordering(leg.order)
+        )]
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers or len(result.legs)) as executor:
+            for stage_index, stage in enumerate(stages):
+                list(executor.map(self._submit_leg, stage))
+                
+                if all(leg.status == LegStatus.PLACED for leg in stage):
+                    continue
+                
+                for later_stage in stages[stage_index + 1:]:
+                    for leg in later_stage:
+                        leg.status = LegStatus.SKIPPED
+                
+                if self.rollback:
+                    self._rollback(executor, stages[:stage_index + 1])
+                break
+        
+        return result
+    
+    def _rollback(self, executor: ThreadPoolExecutor, stages: List[List[LegResult]]) -> None:
+        """
+        Compensate placed legs stage by stage in reverse order of submission,
+        sell legs before hedges within a stage. A hedge is kept if a leg
+        unwound before it could not be, so no sell leg is left unhedged.
+        
+        Args:
+            executor: Executor to compensate the legs of a group concurrently
+            stages: Submitted stages in submission order
+        """
+        for stage in reversed(stages):
+            placed = sorted((leg for leg in stage if leg.status == LegStatus.PLACED),
+                            key=lambda leg: leg.order.is_hedge)
+            for is_hedge, legs in groupby(placed, key=lambda leg: leg.order.is_hedge):
+                legs = list(legs)
+                list(executor.map(self._compensate_leg, legs))
+                
+                if any(leg.status == LegStatus.COMPENSATION_FAILED for leg in legs) and not is_hedge:
+                    logger.critical("Keeping hedge legs of the basket, as a sell leg could not be unwound")
+                    return
+    
+    def _submit_leg(self, leg: LegResult) -> None:
+        """
+        Submit a single leg and record its outcome and latency.
+        
+        Args:
+            leg: Leg to submit
+        """
+        start = time.perf_counter()
+        try:
+            response = self.api.place_order(leg.order.to_api_params())
+        except Exception as e:
+            logger.error(f"Place order error for {leg.order.symbol}: {str(e)}")
+            response = None
+        leg.latency = time.perf_counter() - start
+        leg.response = response
+        
+        if response is None:
+            leg.status = LegStatus.FAILED
+            leg.order.status = OrderStatus.REJECTED
+            logger.error(f"Failed to place basket leg: {leg.order.symbol}")
+            return
+        
+        leg.order.order_id = response.get("order_id")
+        leg.order.status = OrderStatus.OPEN
+        leg.status = LegStatus.PLACED
+        logger.info(f"Placed basket leg: {leg.order.side.value} {leg.order.symbol} "
+                    f"in {leg.latency * 1000:.1f} ms")
+    
+    def _compensate_leg(self, leg: LegResult) -> None:
+        """
+        Undo a placed leg by cancelling it, or by placing an offsetting order if already filled.
+        
+        Args:
+            leg: Leg to compensate
+        """
+        with request_priority(Priority.CRITICAL):
+            self._undo_leg(leg)
+    
+    def _undo_leg(self, leg: LegResult) -> None:
+        if leg.order.order_id and self.api.cancel_order(leg.order.order_id):
+            leg.order.status = OrderStatus.CANCELLED
+            leg.status = LegStatus.COMPENSATED
+            logger.warning(f"Cancelled basket leg {leg.order.symbol} after sibling failure")
+            return
+        
+        offset_order = dataclasses.replace(
+            leg.order,
+            order_type=OrderType.MARKET,
+            side=OrderSide.BUY if leg.order.side == OrderSide.SELL else OrderSide.SELL,
+            order_id=None,
+            parent_order_id=leg.order.order_id,
+            status=OrderStatus.PENDING
+        )
+        response = self.api.place_order(offset_order.to_api_params())
+        
+        if response is None:
+            leg.status = LegStatus.COMPENSATION_FAILED
+            logger.critical(f"Failed to offset basket leg {leg.order.symbol}, position left open")
+            return
+        
+        leg.compensation_order_id = response.get("order_id")
+        leg.status = LegStatus.COMPENSATED
+        logger.warning(f"Offset basket leg {leg.order.symbol} after sibling failure")
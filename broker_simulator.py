@@ -0,0 +1,327 @@
+"""
+Local stand-in for the mStock HTTP API.
+Serves the /openapi/typea endpoints MStockAPI calls from a SimulatedBroker, with
+a simulation clock, an in-memory order book and injectable latency and errors,
+so the full client and strategy stack can be load tested offline.
+"""
+
+import datetime
+import json
+import logging
+import random
+import re
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from src.api.simulated_broker import SimulatedBroker
+from src.models.chain_series import ChainSeries
+from src.utils.price_path import generate_chain_series
+from config.config import SIMULATOR_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# HTTP method, path pattern and endpoint name of every served route
+ROUTES = (
+    ("POST", re.compile(r"^/openapi/typea/connect/login$"), "login"),
+    ("POST", re.compile(r"^/openapi/typea/session/token$"), "session_token"),
+    ("GET", re.compile(r"^/openapi/typea/portfolio/positions$"), "positions"),
+    ("GET", re.compile(r"^/openapi/typea/getoptionchainmaster/\d+$"), "option_chain_master"),
+    ("GET", re.compile(r"^/openapi/typea/GetOptionChain/\d+/(?P<expiry>\d+)/(?P<token>\w+)$"), "option_chain"),
+    ("POST", re.compile(r"^/openapi/typea/order/place$"), "place_order"),
+    ("POST", re.compile(r"^/openapi/typea/order/modify$"), "modify_order"),
+    ("POST", re.compile(r"^/openapi/typea/order/cancel$"), "cancel_order"),
+    ("GET", re.compile(r"^/openapi/typea/order/history$"), "order_history"),
+    ("GET", re.compile(r"^/openapi/typea/fund/summary$"), "fund_summary"),
+)
+
+
+@dataclass
+class FaultProfile:
+    """
+    Latency and failures injected into responses of one endpoint.
+    """
+    latency: float = 0.0  # Seconds added to every response
+    jitter: float = 0.0  # Up to this many seconds added at random on top of the latency
+    error_rate: float = 0.0  # Fraction of requests answered with error_status
+    error_status: int = 503  # HTTP status of injected errors
+    drop_rate: float = 0.0  # Fraction of requests whose connection is closed without a response
+    
+    @classmethod
+    def from_config(cls) -> 'FaultProfile':
+        """
+        Create the default profile from SIMULATOR_CONFIG.
+        
+        Returns:
+            FaultProfile instance
+        """
+        return cls(SIMULATOR_CONFIG["latency"], SIMULATOR_CONFIG["latency_jitter"], SIMULATOR_CONFIG["error_rate"],
+                   SIMULATOR_CONFIG["error_status"], SIMULATOR_CONFIG["drop_rate"])
+
+
+class SimulatorRequestHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 keep-alive handler dispatching mStock API routes to the simulator."""
+    
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body are written separately
+    
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+        params = dict(parse_qsl(body, keep_blank_values=True))
+        path = urlsplit(self.path).path
+        
+        result = self.server.simulator.dispatch(method, path, params, self.headers.get("Authorization", ""))
+        if result is None:
+            self.close_connection = True  # Dropped: the client sees the connection reset
+            return
+        
+        status, payload = result
+        data = json.dumps(payload, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def do_GET(self):
+        """Handle GET requests."""
+        self._handle("GET")
+    
+    def do_POST(self):
+        """Handle POST requests."""
+        self._handle("POST")
+    
+    def log_message(self, format, *args):
+        """Route request logging to the module logger."""
+        logger.debug(format % args)
+
+
+class BrokerSimulatorServer:
+    """
+    Threaded HTTP server answering MStockAPI calls from a SimulatedBroker.
+    
+    Simulated time starts at the first snapshot and runs at speed simulated
+    seconds per wall-clock second; with speed 0 it only moves on advance().
+    Before each call the broker is advanced to the current simulated time,
+    which also fills resting limit orders that have become marketable. Broker
+    state is guarded by one lock, while injected latency is slept outside it
+    so slow responses do not serialize the server.
+    """
+    
+    def __init__(self, series: List[ChainSeries], host: str = None, port: int = None, speed: float = None,
+                 start_timestamp: int = None, faults: Dict[str, FaultProfile] = None,
+                 default_fault: FaultProfile = None, require_auth: bool = False, seed: int = 0,
+                 **broker_options):
+        """
+        Initialize the server.
+        
+        Args:
+            series: Chain series, one per expiry
+            host: Interface to bind, defaults to SIMULATOR_CONFIG
+            port: Port to bind, 0 for a free port, defaults to SIMULATOR_CONFIG
+            speed: Simulated seconds per wall-clock second, defaults to SIMULATOR_CONFIG
+            start_timestamp: Simulated Unix time to start at, defaults to the first snapshot
+            faults: Endpoint name -> fault profile, see ROUTES for the names
+            default_fault: Fault profile of endpoints not in faults, defaults to SIMULATOR_CONFIG
+            require_auth: Whether calls other than login need the issued access token
+            seed: Random seed of fault injection
+            **broker_options: SimulatedBroker arguments (capital, fill_model, margin_model, brokerage)
+        """
+        self.broker = SimulatedBroker(series, **broker_options)
+        self.speed = SIMULATOR_CONFIG["speed"] if speed is None else speed
+        self.faults = faults or {}
+        self.default_fault = default_fault or FaultProfile.from_config()
+        self.require_auth = require_auth
+        
+        if start_timestamp is None:
+            start_timestamp = min(int(item.timestamps[0]) for item in series if len(item.timestamps))
+        self._start_timestamp = start_timestamp
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._tokens = set()
+        self._counts = {"requests": 0, "errors_injected": 0, "drops_injected": 0, "unauthorized": 0}
+        self._endpoint_counts = {}
+        self.broker.advance(start_timestamp)
+        
+        self.server = ThreadingHTTPServer((host or SIMULATOR_CONFIG["host"],
+                                           SIMULATOR_CONFIG["port"] if port is None else port),
+                                          SimulatorRequestHandler)
+        self.server.daemon_threads = True
+        self.server.simulator = self
+        self.thread = None
+    
+    @classmethod
+    def from_price_path(cls, start: datetime.date, days: int, interval_minutes: int = 1,
+                        generator_options: Dict[str, Any] = None, **kwargs) -> 'BrokerSimulatorServer':
+        """
+        Create a server over a generated random-walk market.
+        
+        Args:
+            start: First calendar date of the market
+            days: Number of calendar days
+            interval_minutes: Minutes between chain snapshots
+            generator_options: Further generate_chain_series arguments (spot, volatility, seed)
+            **kwargs: BrokerSimulatorServer arguments
+        
+        Returns:
+            BrokerSimulatorServer instance
+        """
+        series = generate_chain_series(start, days, interval_minutes, **(generator_options or {}))
+        return cls(series, **kwargs)
+    
+    @property
+    def base_url(self) -> str:
+        """URL to use as MStockAPI.base_url."""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> None:
+        """Start serving requests in a background thread."""
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"Broker simulator listening on {self.base_url}")
+    
+    def stop(self) -> None:
+        """Stop the server and close its socket."""
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def simulated_time(self) -> int:
+        """
+        Get the current simulated time.
+        
+        Returns:
+            Unix seconds
+        """
+        return int(self._start_timestamp + (time.monotonic() - self._started) * self.speed)
+    
+    def advance(self, timestamp: int) -> None:
+        """
+        Move simulated time to a given Unix time and restart the clock from there.
+        
+        Args:
+            timestamp: Unix seconds
+        """
+        with self._lock:
+            self._start_timestamp = int(timestamp)
+            self._started = time.monotonic()
+            self.broker.advance(self._start_timestamp)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get request and fault injection counters.
+        
+        Returns:
+            Dictionary with totals and per-endpoint request counts
+        """
+        with self._lock:
+            return {**self._counts, "endpoints": dict(self._endpoint_counts),
+                    "orders": self.broker.order_count, "trades": len(self.broker.trades)}
+    
+    def _fault(self, endpoint: str) -> Tuple[float, Optional[str]]:
+        profile = self.faults.get(endpoint, self.default_fault)
+        latency = profile.latency + (self._random.uniform(0.0, profile.jitter) if profile.jitter else 0.0)
+        draw = self._random.random()
+        if draw < profile.drop_rate:
+            return latency, "drop"
+        if draw < profile.drop_rate + profile.error_rate:
+            return latency, "error"
+        return latency, None
+    
+    def dispatch(self, method: str, path: str, params: Dict[str, str],
+                 authorization: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Answer one API request.
+        
+        Args:
+            method: HTTP method
+            path: Request path
+            params: Form fields of the request body
+            authorization: Authorization header
+        
+        Returns:
+            Tuple of (HTTP status, JSON payload), or None to drop the connection
+        """
+        endpoint, match = None, None
+        for route_method, pattern, name in ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                endpoint = name
+                break
+        if endpoint is None:
+            return 404, {"status": "error", "message": f"Unknown endpoint {method} {path}"}
+        
+        with self._lock:
+            self._counts["requests"] += 1
+            self._endpoint_counts[endpoint] = self._endpoint_counts.get(endpoint, 0) + 1
+            latency, fault = self._fault(endpoint)
+            if fault == "drop":
+                self._counts["drops_injected"] += 1
+            elif fault == "error":
+                self._counts["errors_injected"] += 1
+        
+        if latency > 0:
+            time.sleep(latency)
+        if fault == "drop":
+            return None
+        if fault == "error":
+            profile = self.faults.get(endpoint, self.default_fault)
+            return profile.error_status, {"status": "error", "message": "Injected error"}
+        
+        with self._lock:
+            if (self.require_auth and endpoint not in ("login", "session_token")
+                    and authorization.rpartition(":")[2] not in self._tokens):
+                self._counts["unauthorized"] += 1
+                return 401, {"status": "error", "message": "Invalid session"}
+            
+            now = self.simulated_time()
+            if now != self.broker.timestamp:
+                self.broker.advance(now)
+            data = getattr(self, f"_{endpoint}")(params, **match.groupdict())
+        
+        if data is None:
+            return 200, {"status": "error", "message": f"{endpoint} failed"}
+        return 200, {"status": "success", "data": data}
+    
+    def _login(self, params: Dict[str, str]) -> Dict[str, Any]:
+        return {"ugid": secrets.token_hex(8), "cid": params.get("username", ""), "nm": params.get("username", ""),
+                "is_error": "false", "flag": 0}
+    
+    def _session_token(self, params: Dict[str, str]) -> Dict[str, Any]:
+        access_token = secrets.token_hex(16)
+        self._tokens.add(access_token)
+        return {"user_name": "simulator", "broker": "SIMULATOR", "api_key": params.get("api_key", ""),
+                "access_token": access_token, "exchanges": ["NFO"], "products": ["NRML", "MIS"],
+                "order_types": ["MARKET", "LIMIT"]}
+    
+    def _positions(self, params: Dict[str, str]) -> Dict[str, Any]:
+        return {"net": self.broker.get_positions(), "day": None}
+    
+    def _option_chain_master(self, params: Dict[str, str]) -> Dict[str, Any]:
+        return self.broker.get_option_chain_master()
+    
+    def _option_chain(self, params: Dict[str, str], expiry: str, token: str) -> Optional[Dict[str, Any]]:
+        return self.broker.get_option_chain(expiry, token)
+    
+    def _place_order(self, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        return self.broker.place_order(params)
+    
+    def _modify_order(self, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        params = dict(params)
+        return self.broker.modify_order(params.pop("order_id", ""), params)
+    
+    def _cancel_order(self, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        order_id = params.get("order_id", "")
+        return {"order_id": order_id, "status": "CANCELLED"} if self.broker.cancel_order(order_id) else None
+    
+    def _order_history(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        return self.broker.get_order_history()
+    
+    def _fund_summary(self, params: Dict[str, str]) -> Dict[str, Any]:
+        return self.broker.get_fund_summary()
@@ -0,0 +1,249 @@
+"""
+Columnar time series of option chain snapshots.
+Holds every snapshot of one expiry as (time x strike) arrays so historical
+quotes can be looked up and replayed without re-parsing API payloads.
+Series are stored on disk with SnapshotStore.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import datetime
+
+import numpy as np
+
+
+class SeriesSide:
+    """
+    One side (calls or puts) of a chain series.
+    Contracts are columns sorted by strike; snapshots are rows. Contracts not
+    listed in a snapshot hold NaN.
+    """
+    
+    # API field name, column name
+    FIELDS = (
+        ("lastPrice", "last_price"),
+        ("bidPrice", "bid_price"),
+        ("askPrice", "ask_price"),
+        ("openInterest", "open_interest"),
+    )
+    
+    def __init__(self, option_type: str, strike: np.ndarray, symbols: np.ndarray, tokens: np.ndarray,
+                 **columns: np.ndarray):
+        """
+        Initialize the side.
+        
+        Args:
+            option_type: Option type (CE or PE)
+            strike: Strike prices, shape (contracts,)
+            symbols: Trading symbols, shape (contracts,)
+            tokens: Instrument tokens, shape (contracts,)
+            **columns: Arrays named as in FIELDS, shape (snapshots, contracts)
+        """
+        self.option_type = option_type
+        self.strike = np.asarray(strike, dtype=np.float64)
+        self.symbols = np.asarray(symbols, dtype=object)
+        self.tokens = np.asarray(tokens, dtype=object)
+        for _, name in self.FIELDS:
+            setattr(self, name, np.asarray(columns[name], dtype=np.float64))
+    
+    @classmethod
+    def from_records(cls, snapshots: List[List[Dict[str, Any]]], option_type: str) -> 'SeriesSide':
+        """
+        Build a side from the contract records of successive snapshots.
+        
+        Args:
+            snapshots: Contract records of each snapshot
+            option_type: Option type (CE or PE)
+        
+        Returns:
+            SeriesSide object
+        """
+        contracts = {}  # Strike -> (symbol, token)
+        for records in snapshots:
+            for record in records:
+                contracts.setdefault(float(record.get("strikePrice", 0)), (record.get("sym", ""), record.get("token", "")))
+        
+        strike = np.array(sorted(contracts), dtype=np.float64)
+        column_of = {value: index for index, value in enumerate(strike.tolist())}
+        columns = {name: np.full((len(snapshots), len(strike)), np.nan) for _, name in cls.FIELDS}
+        
+        for row, records in enumerate(snapshots):
+            for record in records:
+                column = column_of[float(record.get("strikePrice", 0))]
+                for key, name in cls.FIELDS:
+                    columns[name][row, column] = float(record.get(key, 0) or 0)
+        
+        return cls(
+            option_type, strike,
+            symbols=[contracts[value][0] for value in strike.tolist()],
+            tokens=[contracts[value][1] for value in strike.tolist()],
+            **columns
+        )
+    
+    def __len__(self) -> int:
+        return len(self.strike)
+    
+    def records(self, row: int) -> List[Dict[str, Any]]:
+        """
+        Get the contracts listed in one snapshot as API records.
+        
+        Args:
+            row: Snapshot index
+        
+        Returns:
+            List of contract dictionaries in option chain response format
+        """
+        listed = np.flatnonzero(~np.isnan(self.last_price[row]))
+        last_price = self.last_price[row, listed].tolist()
+        bid_price = np.nan_to_num(self.bid_price[row, listed]).tolist()
+        ask_price = np.nan_to_num(self.ask_price[row, listed]).tolist()
+        open_interest = np.nan_to_num(self.open_interest[row, listed]).astype(np.int64).tolist()
+        
+        records = []
+        for i, column in enumerate(listed.tolist()):
+            records.append({
+                "sym": self.symbols[column],
+                "strikePrice": self.strike[column].item(),
+                "token": self.tokens[column],
+                "lastPrice": last_price[i],
+                "change": 0.0,
+                "openInterest": open_interest[i],
+                "volume": 0,
+                "bidPrice": bid_price[i],
+                "bidQty": 0,
+                "askPrice": ask_price[i],
+                "askQty": 0,
+            })
+        return records
+
+
+class ChainSeries:
+    """
+    Snapshots of one underlying and expiry over time.
+    """
+    
+    def __init__(self, underlying: str, expiry_date: datetime.datetime, timestamps: np.ndarray,
+                 spot_price: np.ndarray, calls: SeriesSide, puts: SeriesSide):
+        """
+        Initialize the series.
+        
+        Args:
+            underlying: Underlying symbol
+            expiry_date: Expiry date and time of the contracts
+            timestamps: Snapshot times as Unix seconds, ascending, shape (snapshots,)
+            spot_price: Spot price at each snapshot, shape (snapshots,)
+            calls: Call side
+            puts: Put side
+        """
+        self.underlying = underlying
+        self.expiry_date = expiry_date
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.spot_price = np.asarray(spot_price, dtype=np.float64)
+        self.calls = calls
+        self.puts = puts
+        self._locations = None
+    
+    @classmethod
+    def from_snapshots(cls, snapshots: List[Tuple[int, Dict[str, Any]]],
+                       expiry_date: datetime.datetime) -> 'ChainSeries':
+        """
+        Build a series from option chain responses.
+        
+        Args:
+            snapshots: (Unix timestamp, option chain response) pairs
+            expiry_date: Expiry date and time of the contracts
+        
+        Returns:
+            ChainSeries object
+        """
+        snapshots = sorted(snapshots, key=lambda snapshot: snapshot[0])
+        models = [response.get("contractModel", {}) for _, response in snapshots]
+        underlying = next((model.get("sym") for model in models if model.get("sym")), "")
+        
+        return cls(
+            underlying=underlying,
+            expiry_date=expiry_date,
+            timestamps=np.array([timestamp for timestamp, _ in snapshots], dtype=np.int64),
+            spot_price=np.array([float(model.get("spotPrice", 0)) for model in models], dtype=np.float64),
+            calls=SeriesSide.from_records([model.get("ce", []) for model in models], "CE"),
+            puts=SeriesSide.from_records([model.get("pe", []) for model in models], "PE")
+        )
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    @property
+    def expiry_timestamp(self) -> int:
+        """Expiry as Unix seconds."""
+        return int(self.expiry_date.timestamp())
+    
+    def side(self, option_type: str) -> SeriesSide:
+        """
+        Get one side of the series.
+        
+        Args:
+            option_type: Option type (CE or PE)
+        
+        Returns:
+            SeriesSide for the option type
+        """
+        return self.calls if option_type == "CE" else self.puts
+    
+    def row_at(self, timestamp: int) -> int:
+        """
+        Get the latest snapshot at or before a time.
+        
+        Args:
+            timestamp: Unix seconds
+        
+        Returns:
+            Snapshot index or -1 if the series has not started
+        """
+        return int(np.searchsorted(self.timestamps, timestamp, side="right")) - 1
+    
+    def rows_at(self, timestamps: np.ndarray) -> np.ndarray:
+        """
+        Vectorized row_at for many times.
+        
+        Args:
+            timestamps: Unix seconds
+        
+        Returns:
+            Snapshot indexes, -1 where the series has not started
+        """
+        return np.searchsorted(self.timestamps, np.asarray(timestamps, dtype=np.int64), side="right") - 1
+    
+    def locate(self, symbol: str) -> Optional[Tuple[SeriesSide, int]]:
+        """
+        Find a contract by trading symbol.
+        
+        Args:
+            symbol: Trading symbol
+        
+        Returns:
+            (side, column) or None if the series has no such contract
+        """
+        if self._locations is None:
+            self._locations = {}
+            for side in (self.calls, self.puts):
+                for column, contract_symbol in enumerate(side.symbols.tolist()):
+                    self._locations[contract_symbol] = (side, column)
+        return self._locations.get(symbol)
+    
+    def to_api_response(self, row: int) -> Dict[str, Any]:
+        """
+        Rebuild the option chain response of one snapshot.
+        
+        Args:
+            row: Snapshot index
+        
+        Returns:
+            Option chain data in API response format
+        """
+        return {
+            "contractModel": {
+                "sym": self.underlying,
+                "spotPrice": self.spot_price[row].item(),
+                "ce": self.calls.records(row),
+                "pe": self.puts.records(row),
+            }
+        }
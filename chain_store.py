@@ -0,0 +1,236 @@
+"""
+Incremental option chain store.
+Applies each new option chain snapshot as a diff against the previous one so
+only contracts whose data changed are re-parsed and updated.
+"""
+
+import logging
+import datetime
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.models.option_chain import OptionChain, OptionContract
+from config.config import STRATEGY_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+# Tracked contract attribute -> STRATEGY_CONFIG threshold key
+TRACKED_FIELDS = {
+    "last_price": "chain_price_change_threshold",
+    "open_interest": "chain_oi_change_threshold",
+    "bid_price": "chain_quote_change_threshold",
+    "ask_price": "chain_quote_change_threshold",
+}
+
+
+@dataclass
+class ContractChange:
+    """
+    A contract whose tracked fields moved beyond their thresholds.
+    """
+    contract: OptionContract
+    changes: Dict[str, Tuple[float, float]]  # Field -> (last reported value, current value)
+
+
+@dataclass
+class ChainChangeSet:
+    """
+    Result of applying one snapshot to an OptionChainStore.
+    """
+    added: List[OptionContract] = field(default_factory=list)
+    removed: List[OptionContract] = field(default_factory=list)
+    changed: List[ContractChange] = field(default_factory=list)
+    spot_price_changed: bool = False
+    parsed: int = 0  # Number of contract entries parsed from the snapshot
+    
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed or self.spot_price_changed)
+    
+    def strikes(self, option_type: str) -> List[float]:
+        """
+        Get the sorted strikes of one option type that were added or moved.
+        
+        Args:
+            option_type: Option type (CE or PE)
+        
+        Returns:
+            Sorted list of strike prices
+        """
+        strikes = {contract.strike_price for contract in self.added if contract.option_type == option_type}
+        strikes.update(change.contract.strike_price for change in self.changed
+                       if change.contract.option_type == option_type)
+        return sorted(strikes)
+
+
+class OptionChainStore:
+    """
+    Holds the latest OptionChain for one expiry and updates it in place from
+    new snapshots.
+    
+    Raw entries are compared against the previous snapshot before parsing, so
+    unchanged contracts cost a dict comparison and are never re-parsed. Changed
+    contracts are updated in place, keeping references held by callers current.
+    """
+    
+    def __init__(self, expiry_date: datetime.datetime, thresholds: Dict[str, float] = None):
+        """
+        Initialize the store.
+        
+        Args:
+            expiry_date: Expiry date and time of the chain
+            thresholds: Tracked field -> minimum move to report, defaults to STRATEGY_CONFIG
+        """
+        self.expiry_date = expiry_date
+        self.thresholds = {name: STRATEGY_CONFIG[key] for name, key in TRACKED_FIELDS.items()}
+        if thresholds:
+            self.thresholds.update(thresholds)
+        
+        self.chain = None
+        self._raw = {}  # (option type, key) -> raw entry
+        self._contracts = {}  # (option type, key) -> OptionContract
+        self._reported = {}  # (option type, key) -> tracked values when last reported
+    
+    @staticmethod
+    def _entry_key(entry: Dict[str, Any]) -> str:
+        return entry.get("token") or entry.get("sym", "")
+    
+    def _tracked_values(self, contract: OptionContract) -> Dict[str, float]:
+        return {name: getattr(contract, name) for name in self.thresholds}
+    
+    def _moved(self, key: Tuple[str, str], contract: OptionContract) -> Optional[ContractChange]:
+        reported = self._reported[key]
+        changes = {}
+        for name, threshold in self.thresholds.items():
+            current = getattr(contract, name)
+            if abs(current - reported[name]) >= threshold:
+                changes[name] = (reported[name], current)
+        
+        if not changes:
+            return None
+        
+        reported.update({name: current for name, (_, current) in changes.items()})
+        return ContractChange(contract=contract, changes=changes)
+    
+    def get_contract(self, instrument_token: str, option_type: str) -> Optional[OptionContract]:
+        """
+        Get the current contract for an instrument token.
+        
+        Args:
+            instrument_token: Instrument token
+            option_type: Option type (CE or PE)
+        
+        Returns:
+            OptionContract or None if not in the chain
+        """
+        return self._contracts.get((option_type, instrument_token))
+    
+    def apply(self, response: Dict[str, Any]) -> Optional[ChainChangeSet]:
+        """
+        Apply an option chain snapshot.
+        
+        Args:
+            response: Option chain API response data
+        
+        Returns:
+            ChainChangeSet describing the update, or None if the snapshot is malformed
+        """
+        contract_model = response.get("contractModel") if isinstance(response, dict) else None
+        if not isinstance(contract_model, dict):
+            logger.error("Option chain snapshot has no contract model")
+            return None
+        
+        if self.chain is None:
+            return self._load(contract_model)
+        
+        change_set = ChainChangeSet()
+        chain = self.chain
+        
+        spot_price = float(contract_model.get("spotPrice", 0))
+        if spot_price != chain.spot_price:
+            chain.spot_price = spot_price
+            for contract in self._contracts.values():
+                contract.underlying_price = spot_price
+            change_set.spot_price_changed = True
+        
+        for option_type, side in (("CE", "ce"), ("PE", "pe")):
+            seen = set()
+            known = 0  # Entries already in the chain before this snapshot
+            side_changed = False
+            
+            for entry in contract_model.get(side, []):
+                key = (option_type, self._entry_key(entry))
+                seen.add(key)
+                
+                previous = self._raw.get(key)
+                if previous is not None:
+                    known += 1
+                if previous == entry:
+                    continue
+                
+                contract = OptionContract.from_api_response(entry, option_type, self.expiry_date, spot_price)
+                change_set.parsed += 1
+                self._raw[key] = entry
+                existing = self._contracts.get(key)
+                
+                if existing is None or existing.strike_price != contract.strike_price:
+                    if existing is not None:
+                        change_set.removed.append(existing)
+                    self._contracts[key] = contract
+                    self._reported[key] = self._tracked_values(contract)
+                    change_set.added.append(contract)
+                    side_changed = True
+                    continue
+                
+                vars(existing).update(vars(contract))
+                moved = self._moved(key, existing)
+                if moved is not None:
+                    change_set.changed.append(moved)
+            
+            contracts = chain.calls if option_type == "CE" else chain.puts
+            if known != len(contracts):
+                for contract in contracts:
+                    key = (option_type, contract.instrument_token or contract.symbol)
+                    if key not in seen:
+                        del self._raw[key], self._contracts[key], self._reported[key]
+                        change_set.removed.append(contract)
+                        side_changed = True
+            
+            if side_changed:
+                # Replace the list so the chain's strike index is rebuilt
+                rebuilt = [contract for (contract_type, _), contract in self._contracts.items()
+                           if contract_type == option_type]
+                if option_type == "CE":
+                    chain.calls = rebuilt
+                else:
+                    chain.puts = rebuilt
+        
+        chain.underlying = contract_model.get("sym", chain.underlying)
+        return change_set
+    
+    def _load(self, contract_model: Dict[str, Any]) -> ChainChangeSet:
+        spot_price = float(contract_model.get("spotPrice", 0))
+        sides = {}
+        
+        for option_type, side in (("CE", "ce"), ("PE", "pe")):
+            contracts = []
+            for entry in contract_model.get(side, []):
+                key = (option_type, self._entry_key(entry))
+                contract = OptionContract.from_api_response(entry, option_type, self.expiry_date, spot_price)
+                self._raw[key] = entry
+                self._contracts[key] = contract
+                self._reported[key] = self._tracked_values(contract)
+                contracts.append(contract)
+            sides[option_type] = contracts
+        
+        self.chain = OptionChain(
+            underlying=contract_model.get("sym", ""),
+            spot_price=spot_price,
+            expiry_date=self.expiry_date,
+            calls=sides["CE"],
+            puts=sides["PE"]
+        )
+        
+        added = sides["CE"] + sides["PE"]
+        logger.info(f"Loaded option chain for {self.expiry_date.date()} with {len(added)} contracts")
+        return ChainChangeSet(added=added, spot_price_changed=True, parsed=len(added))
@@ -0,0 +1,412 @@
+"""
+Columnar option chain model backed by NumPy arrays.
+Stores each side of the chain as contiguous, strike-sorted arrays so strike
+selection and screening run as vectorized operations.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import datetime
+
+import numpy as np
+
+from src.models.option_chain import OptionContract, OptionChain
+from config.config import STRATEGY_CONFIG
+
+
+class ContractView:
+    """
+    Read-only view of one contract in an OptionColumns block.
+    Attribute reads go straight to the underlying arrays without copying.
+    """
+    
+    __slots__ = ("_columns", "_index")
+    
+    # Contract attribute -> column name
+    COLUMN_ATTRIBUTES = {
+        "symbol": "symbols",
+        "instrument_token": "tokens",
+        "strike_price": "strike",
+        "last_price": "last_price",
+        "change": "change",
+        "open_interest": "open_interest",
+        "volume": "volume",
+        "bid_price": "bid_price",
+        "bid_quantity": "bid_quantity",
+        "ask_price": "ask_price",
+        "ask_quantity": "ask_quantity",
+    }
+    
+    # Contract attributes shared by every row of the block
+    SHARED_ATTRIBUTES = ("option_type", "expiry_date", "underlying_price")
+    
+    def __init__(self, columns: 'OptionColumns', index: int):
+        """
+        Initialize the view.
+        
+        Args:
+            columns: Column block holding the contract
+            index: Row index of the contract
+        """
+        self._columns = columns
+        self._index = index
+    
+    def __getattr__(self, name: str) -> Any:
+        if name in self.SHARED_ATTRIBUTES:
+            return getattr(self._columns, name)
+        column = self.COLUMN_ATTRIBUTES.get(name)
+        if column is None:
+            raise AttributeError(name)
+        value = getattr(self._columns, column)[self._index]
+        return value.item() if isinstance(value, np.generic) else value
+    
+    def to_contract(self) -> OptionContract:
+        """
+        Materialize the view as an OptionContract.
+        
+        Returns:
+            OptionContract object
+        """
+        return OptionContract(
+            symbol=self.symbol,
+            strike_price=self.strike_price,
+            expiry_date=self.expiry_date,
+            option_type=self.option_type,
+            instrument_token=self.instrument_token,
+            last_price=self.last_price,
+            change=self.change,
+            open_interest=self.open_interest,
+            volume=self.volume,
+            bid_price=self.bid_price,
+            bid_quantity=self.bid_quantity,
+            ask_price=self.ask_price,
+            ask_quantity=self.ask_quantity,
+            underlying_price=self.underlying_price
+        )
+    
+    def __repr__(self) -> str:
+        return f"ContractView({self.symbol!r}, strike={self.strike_price}, ltp={self.last_price})"
+
+
+class OptionColumns:
+    """
+    One side (calls or puts) of an option chain stored as strike-sorted arrays.
+    """
+    
+    # API field name, column name, dtype
+    FIELDS = (
+        ("strikePrice", "strike", np.float64),
+        ("lastPrice", "last_price", np.float64),
+        ("change", "change", np.float64),
+        ("openInterest", "open_interest", np.int64),
+        ("volume", "volume", np.int64),
+        ("bidPrice", "bid_price", np.float64),
+        ("bidQty", "bid_quantity", np.int64),
+        ("askPrice", "ask_price", np.float64),
+        ("askQty", "ask_quantity", np.int64),
+    )
+    
+    def __init__(self, option_type: str, expiry_date: datetime.datetime, underlying_price: float,
+                 symbols: np.ndarray, tokens: np.ndarray, **columns: np.ndarray):
+        """
+        Initialize the column block, sorting all columns by strike.
+        
+        Args:
+            option_type: Option type (CE or PE)
+            expiry_date: Expiry date shared by all contracts
+            underlying_price: Spot price when the chain was captured
+            symbols: Trading symbols
+            tokens: Instrument tokens
+            **columns: Numeric columns named as in FIELDS
+        """
+        self.option_type = option_type
+        self.expiry_date = expiry_date
+        self.underlying_price = underlying_price
+        
+        order = np.argsort(columns["strike"], kind="stable")
+        self.symbols = np.asarray(symbols, dtype=object)[order]
+        self.tokens = np.asarray(tokens, dtype=object)[order]
+        for _, name, dtype in self.FIELDS:
+            setattr(self, name, np.ascontiguousarray(np.asarray(columns[name], dtype=dtype)[order]))
+    
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]], option_type: str,
+                     expiry_date: datetime.datetime, underlying_price: float) -> 'OptionColumns':
+        """
+        Build a column block directly from API contract records.
+        
+        Args:
+            records: List of contract dictionaries from the API
+            option_type: Option type (CE or PE)
+            expiry_date: Expiry date for the contracts
+            underlying_price: Spot price
+        
+        Returns:
+            OptionColumns object
+        """
+        columns = {
+            name: np.fromiter((dtype(record.get(key, 0) or 0) for record in records), dtype=dtype, count=len(records))
+            for key, name, dtype in cls.FIELDS
+        }
+        return cls(
+            option_type, expiry_date, underlying_price,
+            symbols=[record.get("sym", "") for record in records],
+            tokens=[record.get("token", "") for record in records],
+            **columns
+        )
+    
+    @classmethod
+    def from_contracts(cls, contracts: List[OptionContract], option_type: str,
+                       expiry_date: datetime.datetime, underlying_price: float) -> 'OptionColumns':
+        """
+        Build a column block from OptionContract objects.
+        
+        Args:
+            contracts: Option contracts
+            option_type: Option type (CE or PE)
+            expiry_date: Expiry date for the contracts
+            underlying_price: Spot price
+        
+        Returns:
+            OptionColumns object
+        """
+        columns = {
+            name: np.fromiter((getattr(contract, name if name != "strike" else "strike_price")
+                               for contract in contracts), dtype=dtype, count=len(contracts))
+            for _, name, dtype in cls.FIELDS
+        }
+        return cls(
+            option_type, expiry_date, underlying_price,
+            symbols=[contract.symbol for contract in contracts],
+            tokens=[contract.instrument_token for contract in contracts],
+            **columns
+        )
+    
+    def __len__(self) -> int:
+        return len(self.strike)
+    
+    def __getitem__(self, index: int) -> ContractView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("contract index out of range")
+        return ContractView(self, index)
+    
+    def __iter__(self):
+        return (ContractView(self, index) for index in range(len(self)))
+    
+    @property
+    def mid_price(self) -> np.ndarray:
+        """Midpoint of bid and ask for every contract."""
+        return (self.bid_price + self.ask_price) / 2
+    
+    @property
+    def spread(self) -> np.ndarray:
+        """Bid-ask spread for every contract."""
+        return self.ask_price - self.bid_price
+    
+    def take(self, indices: np.ndarray) -> 'OptionColumns':
+        """
+        Create a new column block containing the selected rows.
+        
+        Args:
+            indices: Row indices or boolean mask
+        
+        Returns:
+            OptionColumns object
+        """
+        return OptionColumns(
+            self.option_type, self.expiry_date, self.underlying_price,
+            symbols=self.symbols[indices],
+            tokens=self.tokens[indices],
+            **{name: getattr(self, name)[indices] for _, name, _ in self.FIELDS}
+        )
+    
+    def find(self, strike_price: float) -> Optional[ContractView]:
+        """
+        Find the contract at a strike price.
+        
+        Args:
+            strike_price: Strike price to find
+        
+        Returns:
+            ContractView if found, None otherwise
+        """
+        index = int(np.searchsorted(self.strike, strike_price - 0.01))
+        if index < len(self) and abs(self.strike[index] - strike_price) < 0.01:
+            return ContractView(self, index)
+        return None
+    
+    def nearest(self, strike_price: float) -> Optional[ContractView]:
+        """
+        Find the contract with the strike closest to a price (lower strike on ties).
+        
+        Args:
+            strike_price: Target strike price
+        
+        Returns:
+            ContractView or None if there are no contracts
+        """
+        if len(self) == 0:
+            return None
+        
+        index = int(np.searchsorted(self.strike, strike_price))
+        if index == len(self) or (index > 0 and
+                                  strike_price - self.strike[index - 1] <= self.strike[index] - strike_price):
+            index -= 1
+        return ContractView(self, index)
+    
+    def screen(self, min_open_interest: int = 0, min_volume: int = 0, min_price: float = 0.0,
+               max_spread: float = None) -> np.ndarray:
+        """
+        Build a mask of contracts passing liquidity filters.
+        
+        Args:
+            min_open_interest: Minimum open interest
+            min_volume: Minimum traded volume
+            min_price: Minimum last traded price
+            max_spread: Maximum bid-ask spread
+        
+        Returns:
+            Boolean mask over the contracts
+        """
+        mask = (self.open_interest >= min_open_interest) & (self.volume >= min_volume)
+        mask &= self.last_price >= min_price
+        if max_spread is not None:
+            mask &= self.spread <= max_spread
+        return mask
+
+
+class ColumnarOptionChain:
+    """
+    Option chain with calls and puts stored as columnar, strike-sorted arrays.
+    """
+    
+    def __init__(self, underlying: str, spot_price: float, expiry_date: datetime.datetime,
+                 calls: OptionColumns, puts: OptionColumns):
+        """
+        Initialize the columnar option chain.
+        
+        Args:
+            underlying: Underlying symbol
+            spot_price: Spot price
+            expiry_date: Expiry date
+            calls: Call side columns
+            puts: Put side columns
+        """
+        self.underlying = underlying
+        self.spot_price = spot_price
+        self.expiry_date = expiry_date
+        self.calls = calls
+        self.puts = puts
+    
+    @classmethod
+    def from_api_response(cls, response: Dict[str, Any], expiry_date: datetime.datetime) -> 'ColumnarOptionChain':
+        """
+        Create a ColumnarOptionChain from API response without building per-contract objects.
+        
+        Args:
+            response: API response dictionary
+            expiry_date: Expiry date for the option chain
+        
+        Returns:
+            ColumnarOptionChain object
+        """
+        contract_model = response.get("contractModel", {})
+        underlying = contract_model.get("sym", "")
+        spot_price = float(contract_model.get("spotPrice", 0))
+        
+        return cls(
+            underlying=underlying,
+            spot_price=spot_price,
+            expiry_date=expiry_date,
+            calls=OptionColumns.from_records(contract_model.get("ce", []), "CE", expiry_date, spot_price),
+            puts=OptionColumns.from_records(contract_model.get("pe", []), "PE", expiry_date, spot_price)
+        )
+    
+    @classmethod
+    def from_option_chain(cls, option_chain: OptionChain) -> 'ColumnarOptionChain':
+        """
+        Create a ColumnarOptionChain from an OptionChain.
+        
+        Args:
+            option_chain: Option chain
+        
+        Returns:
+            ColumnarOptionChain object
+        """
+        return cls(
+            underlying=option_chain.underlying,
+            spot_price=option_chain.spot_price,
+            expiry_date=option_chain.expiry_date,
+            calls=OptionColumns.from_contracts(option_chain.calls, "CE",
+                                               option_chain.expiry_date, option_chain.spot_price),
+            puts=OptionColumns.from_contracts(option_chain.puts, "PE",
+                                              option_chain.expiry_date, option_chain.spot_price)
+        )
+    
+    def to_option_chain(self) -> OptionChain:
+        """
+        Materialize the chain as an OptionChain of OptionContract objects.
+        
+        Returns:
+            OptionChain object
+        """
+        return OptionChain(
+            underlying=self.underlying,
+            spot_price=self.spot_price,
+            expiry_date=self.expiry_date,
+            calls=[view.to_contract() for view in self.calls],
+            puts=[view.to_contract() for view in self.puts]
+        )
+    
+    def side(self, option_type: str) -> OptionColumns:
+        """
+        Get the columns for an option type.
+        
+        Args:
+            option_type: Option type (CE or PE)
+        
+        Returns:
+            OptionColumns for the requested side
+        """
+        return self.calls if option_type == "CE" else self.puts
+    
+    def find_option_contract(self, strike_price: float, option_type: str,
+                             nearest: bool = False) -> Optional[ContractView]:
+        """
+        Find an option contract with the specified strike price and type.
+        
+        Args:
+            strike_price: Strike price to find
+            option_type: Option type (CE or PE)
+            nearest: Return the contract with the closest listed strike instead of an exact match
+        
+        Returns:
+            ContractView if found, None otherwise
+        """
+        side = self.side(option_type)
+        return side.nearest(strike_price) if nearest else side.find(strike_price)
+    
+    def find_strike_prices_for_strangle(self, distance: int = None) -> Tuple[float, float]:
+        """
+        Find strike prices for a short strangle using binary search over the sorted strikes.
+        
+        Args:
+            distance: Minimum distance from spot price (points)
+        
+        Returns:
+            Tuple of (call_strike, put_strike)
+        """
+        if distance is None:
+            distance = STRATEGY_CONFIG["strangle_distance"]
+        
+        call_strikes = self.calls.strike
+        put_strikes = self.puts.strike
+        
+        # First call strike at or above spot + distance, else the highest strike
+        call_index = min(int(np.searchsorted(call_strikes, self.spot_price + distance, side="left")),
+                         len(call_strikes) - 1)
+        # Last put strike at or below spot - distance, else the lowest strike
+        put_index = max(int(np.searchsorted(put_strikes, self.spot_price - distance, side="right")) - 1, 0)
+        
+        return float(call_strikes[call_index]), float(put_strikes[put_index])
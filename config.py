@@ -8,7 +8,59 @@ API_CONFIG = {
     "api_key": "",  # To be filled by user
     "api_url": "https://api.mstock.trade",
     "ws_url": "https://ws.mstock.trade",
-    "version": "1"
+    "version": "1",
+    "pool_connections": 4,  # Number of per-host connection pools to keep
+    "pool_maxsize": 8,  # Keep-alive connections per host
+    "pool_block": True,  # Wait for a free pooled connection instead of opening extra ones
+    "connect_timeout": 3.05,  # Seconds to establish a connection
+    "read_timeout": 10,  # Seconds to wait for a response
+    "option_chain_master_ttl": 900,  # Seconds to cache the option chain master
+    "stream_mode": "ltp",  # Tick stream mode: ltp, quote or full
+    "stream_heartbeat": 10,  # Seconds between websocket pings
+    "stream_reconnect_delay": 0.5,  # Initial delay before reconnecting the tick stream
+    "stream_max_reconnect_delay": 30,  # Maximum delay between reconnect attempts
+    "transport_mode": "live",  # HTTP transport: live, record (log every exchange) or replay (answer from the log)
+    "transport_log": "data/api_transport.jsonl",  # Exchange log written in record mode and read in replay mode
+    "replay_latency_scale": 0.0,  # Replay at this multiple of recorded request spacing and latency, 0 for as fast as possible
+}
+
+# API Session Configuration
+SESSION_CONFIG = {
+    "persist": True,  # Keep the access token on disk, encrypted, so a restart does not need a new OTP
+    "token_file": "data/.mstock_session",  # Encrypted access token file, readable by the owner only
+    "key_env_var": "MSTOCK_SESSION_KEY",  # Environment variable with the secret the token file is encrypted with
+    "key_file": "~/.mstock/session.key",  # Random key used when the variable is not set, kept outside the data directory
+    "expiry_time": "06:00",  # Access tokens expire at the next occurrence of this time after login
+    "otp_provider": "console",  # OTP source for re-login: console, env, file or totp
+    "otp_env_var": "MSTOCK_OTP",  # Environment variable read by the env provider
+    "otp_file": "data/mstock_otp.txt",  # File the file provider waits for, deleted after reading
+    "otp_timeout": 300,  # Seconds the file provider waits for the OTP
+    "totp_secret_env_var": "MSTOCK_TOTP_SECRET",  # Environment variable with the base32 TOTP secret
+}
+
+# API Rate Limit Configuration
+RATE_LIMIT_CONFIG = {
+    "enabled": True,  # Queue requests client-side instead of exceeding broker limits
+    "buckets": {
+        # Requests per second and burst size per endpoint class, set to the broker's limits
+        "orders": {"rate": 10, "burst": 10},  # Place, modify and cancel order, order history
+        "market_data": {"rate": 5, "burst": 10},  # Option chain and option chain master
+        "portfolio": {"rate": 5, "burst": 10},  # Positions, funds and session endpoints
+    },
+    "global": {"rate": 20, "burst": 20},  # Requests per second and burst across all endpoints
+    "max_wait": 10.0,  # Seconds a request may wait for its turn before failing
+    "throttle_pause": 1.0,  # Seconds to pause an endpoint class after a 429 without Retry-After
+}
+
+# API Retry and Circuit Breaker Configuration
+RESILIENCE_CONFIG = {
+    "max_attempts": 3,  # Attempts per idempotent request, orders are never retried
+    "backoff_base": 0.2,  # Seconds, upper bound of the first jittered retry delay
+    "backoff_cap": 2.0,  # Seconds, upper bound of any retry delay
+    "call_budget": 15.0,  # Seconds one API call may take across all attempts and delays
+    "failure_threshold": 5,  # Consecutive failed calls (after retries) that open an endpoint's circuit breaker
+    "recovery_timeout": 30.0,  # Seconds an open breaker fails fast before allowing a trial call
+    "half_open_max_calls": 1,  # Concurrent trial calls while a breaker is half-open
 }
 
 # Investment Configuration
@@ -31,6 +83,17 @@ STRATEGY_CONFIG = {
     "martingale_trigger": 2.0,  # Trigger martingale when sell leg doubles in price
     "martingale_quantity_multiplier": 2.0,  # Double quantity for martingale sell orders
     "martingale_premium_divisor": 2.0,  # Half premium for martingale sell orders
+    "strike_selection": "distance",  # Pick sell strikes by fixed "distance" or by "delta"
+    "target_delta": 0.15,  # Absolute delta of sell legs when strike_selection is "delta"
+    "risk_free_rate": 0.065,  # Annual risk-free rate for option pricing
+    "dividend_yield": 0.0,  # Continuous dividend yield for option pricing
+    "basket_order_policy": "hedges_first",  # Leg ordering for multi-leg entries: hedges_first or simultaneous
+    "basket_rollback_on_failure": True,  # Cancel or offset placed legs if a sibling leg fails
+    "chain_price_change_threshold": 0.05,  # Report a contract when LTP moves at least this many points
+    "chain_oi_change_threshold": 75,  # Report a contract when open interest moves at least this much
+    "chain_quote_change_threshold": 0.05,  # Report a contract when bid or ask moves at least this many points
+    "trigger_debounce_seconds": 1.0,  # A trigger condition must hold this long before acting
+    "trigger_cooldown_seconds": 60,  # Minimum time between repeated actions of one rule on one position
 }
 
 # Trading Hours Configuration
@@ -46,6 +109,67 @@ HOLIDAYS = [
     # To be filled by user
 ]
 
+# Trading Calendar Configuration
+CALENDAR_CONFIG = {
+    "years_back": 5,  # Years of history covered by the precomputed trading calendar
+    "years_ahead": 2,  # Years ahead covered by the precomputed trading calendar
+    "expiry_weekday_rules": [
+        # Expiry weekday (0 is Monday) for weekly and monthly contracts, from each effective date
+        {"effective_from": "2000-01-01", "weekday": 3},  # Thursday
+    ],
+}
+
+# Backtest Configuration
+BACKTEST_CONFIG = {
+    "initial_capital": 200000,  # Starting cash of the simulated account
+    "tick_size": 0.05,  # Minimum price increment of option contracts
+    "slippage_ticks": 1,  # Ticks of adverse slippage applied to every fill
+    "brokerage_per_order": 20.0,  # Flat charge per executed order
+    "short_margin_rate": 0.12,  # Margin blocked per short option as a fraction of spot notional
+    "hedge_margin_benefit": 0.7,  # Margin reduction on short quantity covered by long options of the same type
+    "entry_time": "09:20:00",  # Earliest time of day to open a new strangle
+}
+
+# Local Broker Simulator Configuration
+SIMULATOR_CONFIG = {
+    "host": "127.0.0.1",  # Interface the simulator server binds to
+    "port": 8765,  # Port of the simulator server, 0 for any free port
+    "speed": 60.0,  # Simulated seconds per wall-clock second, 0 to move time only on demand
+    "latency": 0.0,  # Seconds added to every response
+    "latency_jitter": 0.0,  # Up to this many extra seconds added at random
+    "error_rate": 0.0,  # Fraction of requests answered with an HTTP error
+    "error_status": 503,  # HTTP status of injected errors
+    "drop_rate": 0.0,  # Fraction of requests whose connection is closed without a response
+}
+
+# Option Chain Snapshot Storage
+SNAPSHOT_CONFIG = {
+    "enabled": False,  # Append every fetched option chain to the columnar snapshot store
+    "directory": "data/snapshots",  # Root directory of the snapshot store
+    "fsync": False,  # Flush each snapshot to disk before the next one is written
+    "queue_size": 1024,  # Snapshots waiting for the background writer before new ones are dropped
+}
+
+# Shared-Memory State Bus
+STATE_BUS_CONFIG = {
+    "enabled": False,  # Publish positions, prices, P&L and status to shared memory for the dashboard
+    "name": "nifty_trading_state",  # Shared memory segment name
+    "capacity": 64,  # Maximum number of published positions
+    "read_timeout": 0.1,  # Seconds a reader retries while a write is in progress
+}
+
+# Live Dashboard Feed
+LIVE_FEED_CONFIG = {
+    "enabled": False,  # Embed the pushed live positions and P&L in the dashboard
+    "host": "127.0.0.1",  # Interface the feed server binds to
+    "port": 8766,  # Port of the feed server, 0 for any free port
+    "public_url": None,  # Event stream URL as the browser reaches it, defaults to http://host:port/events
+    "poll_interval": 0.1,  # Seconds between checks of the state bus for changes
+    "heartbeat": 15.0,  # Seconds of silence after which a keep-alive is sent
+    "history": 2000,  # P&L points kept for the live chart
+    "client_queue": 256,  # Events buffered per client before it is resynchronized with a snapshot
+}
+
 # Logging Configuration
 LOGGING_CONFIG = {
     "log_level": "INFO",
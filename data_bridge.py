@@ -3,6 +3,7 @@ import json
 import pandas as pd
 import datetime
 import time
+import random
 import logging
 import sys
 from pathlib import Path
@@ -23,6 +24,31 @@ except ImportError:
     class Order:
         pass
 
+try:
+    from src.utils.log_tail import LogTailReader
+except ImportError:
+    # Fall back to reading whole log files
+    LogTailReader = None
+
+try:
+    from src.models.trading_store import TradingStore
+except ImportError:
+    # Fall back to CSV data files
+    TradingStore = None
+
+try:
+    from src.utils.state_bus import StateReader
+except ImportError:
+    # No live state, the data files are the only source
+    StateReader = None
+
+try:
+    from src.api.live_feed import client_html
+    from config.config import LIVE_FEED_CONFIG
+except ImportError:
+    # No pushed updates, the dashboard refreshes by rerunning
+    client_html = None
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,6 +61,14 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+def file_version(path):
+    """Get the modification time and size of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
 class TradingDataBridge:
     """
     Bridge between the trading application and the dashboard.
@@ -56,6 +90,10 @@ class TradingDataBridge:
         self.pnl_history_path = os.path.join(self.data_dir, 'pnl_history.csv')
         self.strategy_status_path = os.path.join(self.data_dir, 'strategy_status.json')
         
+        # Indexed SQLite store for positions, orders and P&L, replacing the CSV files when available
+        self.store_path = os.path.join(self.data_dir, 'trading.db')
+        self.store = TradingStore(self.store_path) if TradingStore is not None else None
+        
         # Initialize data files if they don't exist
         self._initialize_data_files()
         
@@ -70,46 +108,76 @@ class TradingDataBridge:
         
         # Initialize trading app log files if they don't exist
         self._initialize_log_files()
+        
+        # Tail reader keeping an offset per log file between refreshes
+        self.log_reader = LogTailReader() if LogTailReader is not None else None
+        
+        # Reader of the live state the trading engine publishes to shared memory
+        self.state_reader = StateReader() if StateReader is not None else None
+    
+    def _sample_positions(self):
+        """Sample positions for a new installation."""
+        return pd.DataFrame({
+            'symbol': ['NIFTY25MAY18000CE', 'NIFTY25MAY17000PE'],
+            'quantity': [-75, -75],
+            'average_price': [150.25, 145.75],
+            'last_price': [155.50, 140.25],
+            'pnl': [-393.75, 412.50],
+            'timestamp': [datetime.datetime.now(), datetime.datetime.now()]
+        })
+    
+    def _sample_orders(self):
+        """Sample orders for a new installation."""
+        return pd.DataFrame({
+            'order_id': ['order1', 'order2', 'order3', 'order4'],
+            'symbol': ['NIFTY25MAY18000CE', 'NIFTY25MAY17000PE', 'NIFTY25MAY18500CE', 'NIFTY25MAY16500PE'],
+            'side': ['SELL', 'SELL', 'BUY', 'BUY'],
+            'quantity': [75, 75, 75, 75],
+            'price': [150.25, 145.75, 95.25, 45.50],
+            'status': ['COMPLETE', 'COMPLETE', 'COMPLETE', 'COMPLETE'],
+            'timestamp': [datetime.datetime.now() - datetime.timedelta(days=1),
+                         datetime.datetime.now() - datetime.timedelta(days=1),
+                         datetime.datetime.now() - datetime.timedelta(days=1),
+                         datetime.datetime.now() - datetime.timedelta(days=1)]
+        })
+    
+    def _sample_pnl_history(self):
+        """Sample P&L history for a new installation."""
+        dates = pd.date_range(end=datetime.datetime.now(), periods=30)
+        return pd.DataFrame({
+            'date': dates,
+            'daily_pnl': [100 * (i - 15) for i in range(30)],
+            'cumulative_pnl': [100 * sum(range(i+1)) for i in range(30)]
+        })
+    
+    def _initialize_store(self):
+        """Fill empty store tables from existing CSV data files, or with sample data."""
+        def existing_or_sample(path, sample):
+            return pd.read_csv(path) if os.path.exists(path) else sample()
+        
+        if self.store.count('positions') == 0:
+            self.store.replace_positions(existing_or_sample(self.positions_path, self._sample_positions))
+        if self.store.count('orders') == 0:
+            self.store.append_orders(existing_or_sample(self.orders_path, self._sample_orders))
+        if self.store.count('pnl_history') == 0:
+            self.store.append_pnl_history(existing_or_sample(self.pnl_history_path, self._sample_pnl_history))
     
     def _initialize_data_files(self):
         """Initialize data files if they don't exist."""
-        # Positions
-        if not os.path.exists(self.positions_path):
-            positions = pd.DataFrame({
-                'symbol': ['NIFTY25MAY18000CE', 'NIFTY25MAY17000PE'],
-                'quantity': [-75, -75],
-                'average_price': [150.25, 145.75],
-                'last_price': [155.50, 140.25],
-                'pnl': [-393.75, 412.50],
-                'timestamp': [datetime.datetime.now(), datetime.datetime.now()]
-            })
-            positions.to_csv(self.positions_path, index=False)
-        
-        # Orders
-        if not os.path.exists(self.orders_path):
-            orders = pd.DataFrame({
-                'order_id': ['order1', 'order2', 'order3', 'order4'],
-                'symbol': ['NIFTY25MAY18000CE', 'NIFTY25MAY17000PE', 'NIFTY25MAY18500CE', 'NIFTY25MAY16500PE'],
-                'side': ['SELL', 'SELL', 'BUY', 'BUY'],
-                'quantity': [75, 75, 75, 75],
-                'price': [150.25, 145.75, 95.25, 45.50],
-                'status': ['COMPLETE', 'COMPLETE', 'COMPLETE', 'COMPLETE'],
-                'timestamp': [datetime.datetime.now() - datetime.timedelta(days=1),
-                             datetime.datetime.now() - datetime.timedelta(days=1),
-                             datetime.datetime.now() - datetime.timedelta(days=1),
-                             datetime.datetime.now() - datetime.timedelta(days=1)]
-            })
-            orders.to_csv(self.orders_path, index=False)
-        
-        # P&L History
-        if not os.path.exists(self.pnl_history_path):
-            dates = pd.date_range(end=datetime.datetime.now(), periods=30)
-            pnl_history = pd.DataFrame({
-                'date': dates,
-                'daily_pnl': [100 * (i - 15) for i in range(30)],
-                'cumulative_pnl': [100 * sum(range(i+1)) for i in range(30)]
-            })
-            pnl_history.to_csv(self.pnl_history_path, index=False)
+        if self.store is not None:
+            self._initialize_store()
+        else:
+            # Positions
+            if not os.path.exists(self.positions_path):
+                self._sample_positions().to_csv(self.positions_path, index=False)
+            
+            # Orders
+            if not os.path.exists(self.orders_path):
+                self._sample_orders().to_csv(self.orders_path, index=False)
+            
+            # P&L History
+            if not os.path.exists(self.pnl_history_path):
+                self._sample_pnl_history().to_csv(self.pnl_history_path, index=False)
         
         # Strategy Status
         if not os.path.exists(self.strategy_status_path):
@@ -119,8 +187,20 @@ class TradingDataBridge:
                 'start_time': None,
                 'uptime': 0
             }
-            with open(self.strategy_status_path, 'w') as f:
-                json.dump(status, f)
+            self._write_status(status)
+    
+    def _write_status(self, status):
+        """Replace the strategy status file atomically, so readers never see a partial write."""
+        temp_path = f"{self.strategy_status_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(status, f)
+        os.replace(temp_path, self.strategy_status_path)
+    
+    def _write_csv(self, frame, path):
+        """Replace a CSV data file atomically, so readers never see a partial write."""
+        temp_path = f"{path}.tmp"
+        frame.to_csv(temp_path, index=False)
+        os.replace(temp_path, path)
     
     def _initialize_log_files(self):
         """Initialize log files if they don't exist."""
@@ -142,27 +222,90 @@ class TradingDataBridge:
     def get_positions(self):
         """Get current positions."""
         try:
+            if self.store is not None:
+                return self.store.get_positions()
             return pd.read_csv(self.positions_path)
         except Exception as e:
             logger.error(f"Error reading positions: {str(e)}")
             return pd.DataFrame()
     
-    def get_orders(self):
-        """Get order history."""
+    def get_live_state(self):
+        """Get a consistent snapshot of the trading engine's live state, or None if no engine publishes it."""
+        if self.state_reader is None:
+            return None
+        try:
+            return self.state_reader.snapshot()
+        except Exception as e:
+            logger.error(f"Error reading live state: {str(e)}")
+            return None
+    
+    def get_live_positions(self):
+        """Get the positions the trading engine publishes, with their latest prices, or None."""
+        state = self.get_live_state()
+        if state is None:
+            return None
+        positions = pd.DataFrame(state.positions,
+                                 columns=['symbol', 'quantity', 'average_price', 'last_price', 'pnl'])
+        positions['timestamp'] = state.updated_at
+        return positions
+    
+    def get_live_feed_html(self):
+        """Get the client page of the live feed for the dashboard to embed, or None if the feed is disabled."""
+        if client_html is None or not LIVE_FEED_CONFIG["enabled"]:
+            return None
+        url = (LIVE_FEED_CONFIG["public_url"]
+               or f"http://{LIVE_FEED_CONFIG['host']}:{LIVE_FEED_CONFIG['port']}/events")
+        return client_html(url)
+    
+    def get_orders(self, start=None, end=None):
+        """Get order history, optionally only between start and end timestamps."""
         try:
-            return pd.read_csv(self.orders_path)
+            if self.store is not None:
+                return self.store.get_orders(start, end)
+            return self._filter_range(pd.read_csv(self.orders_path), 'timestamp', start, end)
         except Exception as e:
             logger.error(f"Error reading orders: {str(e)}")
             return pd.DataFrame()
     
-    def get_pnl_history(self):
-        """Get P&L history."""
+    def get_pnl_history(self, start=None, end=None):
+        """Get P&L history, optionally only between start and end dates."""
         try:
-            return pd.read_csv(self.pnl_history_path)
+            if self.store is not None:
+                return self.store.get_pnl_history(start, end)
+            return self._filter_range(pd.read_csv(self.pnl_history_path), 'date', start, end)
         except Exception as e:
             logger.error(f"Error reading P&L history: {str(e)}")
             return pd.DataFrame()
     
+    def data_versions(self):
+        """
+        Get a version of each dataset that changes whenever its data does.
+        The dashboard keys its caches on these, so unchanged data is never read twice.
+        """
+        versions = {'strategy_status': file_version(self.strategy_status_path)}
+        try:
+            if self.store is not None:
+                versions.update(self.store.versions())
+            else:
+                versions['positions'] = file_version(self.positions_path)
+                versions['orders'] = file_version(self.orders_path)
+                versions['pnl_history'] = file_version(self.pnl_history_path)
+        except Exception as e:
+            logger.error(f"Error reading data versions: {str(e)}")
+        return versions
+    
+    def _filter_range(self, frame, column, start, end):
+        """Keep the rows of a CSV frame whose column is between start and end."""
+        if start is None and end is None:
+            return frame
+        times = pd.to_datetime(frame[column])
+        mask = pd.Series(True, index=frame.index)
+        if start is not None:
+            mask &= times >= pd.Timestamp(start)
+        if end is not None:
+            mask &= times <= pd.Timestamp(end)
+        return frame[mask].reset_index(drop=True)
+    
     def get_strategy_status(self):
         """Get strategy status."""
         try:
@@ -185,8 +328,7 @@ class TradingDataBridge:
                 status['start_time'] = None
                 status['uptime'] = 0
             
-            with open(self.strategy_status_path, 'w') as f:
-                json.dump(status, f)
+            self._write_status(status)
             
             return True
         except Exception as e:
@@ -196,6 +338,8 @@ class TradingDataBridge:
     def get_logs(self, max_lines=100):
         """Get trading app logs."""
         try:
+            if self.log_reader is not None:
+                return self.log_reader.tail(self.trading_app_log_path, max_lines)
             if os.path.exists(self.trading_app_log_path):
                 with open(self.trading_app_log_path, 'r') as f:
                     logs = f.readlines()
@@ -208,6 +352,8 @@ class TradingDataBridge:
     def get_error_logs(self, max_lines=100):
         """Get trading app error logs."""
         try:
+            if self.log_reader is not None:
+                return self.log_reader.tail(self.trading_app_error_log_path, max_lines)
             if os.path.exists(self.trading_app_error_log_path):
                 with open(self.trading_app_error_log_path, 'r') as f:
                     logs = f.readlines()
@@ -267,44 +413,65 @@ class TradingDataBridge:
                 f.write(f"{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - INFO - Closing all positions\n")
             
             # Update positions to zero
-            positions = self.get_positions()
-            positions['quantity'] = 0
-            positions['pnl'] = 0
-            positions['timestamp'] = datetime.datetime.now()
-            positions.to_csv(self.positions_path, index=False)
+            if self.store is not None:
+                self.store.close_positions(datetime.datetime.now())
+            else:
+                positions = self.get_positions()
+                positions['quantity'] = 0
+                positions['pnl'] = 0
+                positions['timestamp'] = datetime.datetime.now()
+                self._write_csv(positions, self.positions_path)
             
             return True
         except Exception as e:
             logger.error(f"Error closing positions: {str(e)}")
             return False
     
+    def _update_store(self):
+        """Refresh position timestamps and append today's P&L to the store."""
+        now = datetime.datetime.now()
+        self.store.touch_positions(now)
+        
+        # Add today's P&L if not already present
+        last = self.store.last_pnl()
+        if last is not None and last['date'] != now.date():
+            last_pnl = last['cumulative_pnl']
+            daily_pnl = round(last_pnl * 0.01 * (0.5 - random.random()), 2)  # Random daily P&L
+            self.store.append_pnl(now.date(), daily_pnl, last_pnl + daily_pnl)
+    
+    def _update_csv_files(self):
+        """Refresh position timestamps and append today's P&L to the CSV files."""
+        # Update positions
+        positions = self.get_positions()
+        if not positions.empty:
+            positions['timestamp'] = datetime.datetime.now()
+            self._write_csv(positions, self.positions_path)
+        
+        # Update P&L history
+        pnl_history = self.get_pnl_history()
+        if not pnl_history.empty:
+            # Add today's P&L if not already present
+            today = datetime.datetime.now().date()
+            if not any(pd.to_datetime(pnl_history['date']).dt.date == today):
+                last_pnl = pnl_history['cumulative_pnl'].iloc[-1]
+                daily_pnl = round(last_pnl * 0.01 * (0.5 - random.random()), 2)  # Random daily P&L
+                new_row = pd.DataFrame({
+                    'date': [today],
+                    'daily_pnl': [daily_pnl],
+                    'cumulative_pnl': [last_pnl + daily_pnl]
+                })
+                pnl_history = pd.concat([pnl_history, new_row], ignore_index=True)
+                self._write_csv(pnl_history, self.pnl_history_path)
+    
     def update_data(self):
         """Update data from the trading application."""
         try:
             # In a real implementation, this would fetch data from the trading application
             # For now, we'll just update the timestamps
-            
-            # Update positions
-            positions = self.get_positions()
-            if not positions.empty:
-                positions['timestamp'] = datetime.datetime.now()
-                positions.to_csv(self.positions_path, index=False)
-            
-            # Update P&L history
-            pnl_history = self.get_pnl_history()
-            if not pnl_history.empty:
-                # Add today's P&L if not already present
-                today = datetime.datetime.now().date()
-                if not any(pd.to_datetime(pnl_history['date']).dt.date == today):
-                    last_pnl = pnl_history['cumulative_pnl'].iloc[-1]
-                    daily_pnl = round(last_pnl * 0.01 * (0.5 - random.random()), 2)  # Random daily P&L
-                    new_row = pd.DataFrame({
-                        'date': [today],
-                        'daily_pnl': [daily_pnl],
-                        'cumulative_pnl': [last_pnl + daily_pnl]
-                    })
-                    pnl_history = pd.concat([pnl_history, new_row], ignore_index=True)
-                    pnl_history.to_csv(self.pnl_history_path, index=False)
+            if self.store is not None:
+                self._update_store()
+            else:
+                self._update_csv_files()
             
             # Update strategy status
             status = self.get_strategy_status()
@@ -312,8 +479,7 @@ class TradingDataBridge:
                 start_time = datetime.datetime.fromisoformat(status['start_time'])
                 uptime = (datetime.datetime.now() - start_time).total_seconds()
                 status['uptime'] = uptime
-                with open(self.strategy_status_path, 'w') as f:
-                    json.dump(status, f)
+                self._write_status(status)
             
             return True
         except Exception as e:
@@ -2,11 +2,678 @@
 Date utility functions for the trading application.
 """
 
+import bisect
 import datetime
-from typing import List, Optional, Tuple
-import calendar
+import threading
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
 
-from config.config import HOLIDAYS
+import numpy as np
+
+from config.config import HOLIDAYS, CALENDAR_CONFIG, TRADING_HOURS
+
+
+# Ordinal of 1970-01-01, for converting between date ordinals and datetime64[D]
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def _to_ordinals(dates) -> np.ndarray:
+    """
+    Convert dates to proleptic Gregorian ordinals.
+    
+    Args:
+        dates: Array-like of datetime64 values or date/datetime objects
+    
+    Returns:
+        Integer array of ordinals with the same shape
+    """
+    array = np.asarray(dates)
+    if np.issubdtype(array.dtype, np.datetime64):
+        return array.astype("datetime64[D]").astype(np.int64) + _EPOCH_ORDINAL
+    return np.fromiter((d.toordinal() for d in array.ravel()), dtype=np.int64, count=array.size).reshape(array.shape)
+
+
+def _to_datetime64(ordinals: np.ndarray) -> np.ndarray:
+    """
+    Convert ordinals to datetime64[D] values.
+    
+    Args:
+        ordinals: Integer array of ordinals
+    
+    Returns:
+        Array of datetime64[D]
+    """
+    return (np.asarray(ordinals, dtype=np.int64) - _EPOCH_ORDINAL).astype("datetime64[D]")
+
+
+def _parse_date(holiday: Union[str, datetime.date]) -> datetime.date:
+    if isinstance(holiday, datetime.datetime):
+        return holiday.date()
+    if isinstance(holiday, datetime.date):
+        return holiday
+    return datetime.datetime.strptime(holiday, "%Y-%m-%d").date()
+
+
+class TradingCalendar:
+    """
+    Precomputed trading calendar over a fixed date range.
+    
+    Trading days and weekly/monthly expiries are stored as sorted ordinal
+    arrays, with a per-calendar-day offset table, so every query is an index
+    or bisect lookup. Array variants take many dates at once for backtests.
+    """
+    
+    def __init__(self, start_date: datetime.date, end_date: datetime.date,
+                 holidays: Iterable[Union[str, datetime.date]] = None,
+                 expiry_weekday_rules: List[Dict[str, Any]] = None):
+        """
+        Build the calendar.
+        
+        Args:
+            start_date: First calendar day covered
+            end_date: Last calendar day covered
+            holidays: Market holidays as dates or "YYYY-MM-DD" strings, defaults to HOLIDAYS
+            expiry_weekday_rules: Expiry weekday rules ({"effective_from", "weekday"}), defaults to CALENDAR_CONFIG
+        """
+        self.start_date = start_date
+        self.end_date = end_date
+        self.holidays = frozenset(_parse_date(h) for h in (HOLIDAYS if holidays is None else holidays))
+        rules = CALENDAR_CONFIG["expiry_weekday_rules"] if expiry_weekday_rules is None else expiry_weekday_rules
+        rules = sorted((_parse_date(rule["effective_from"]).toordinal(), rule["weekday"]) for rule in rules)
+        self._rule_starts = [start for start, _ in rules]
+        self._rule_weekdays = [weekday for _, weekday in rules]
+        self._start = start_date.toordinal()
+        self._end = end_date.toordinal()
+        
+        days = np.arange(self._start, self._end + 1, dtype=np.int64)
+        weekdays = (days - 1) % 7  # Ordinal 1 (0001-01-01) is a Monday
+        holiday_ordinals = np.array(sorted(h.toordinal() for h in self.holidays), dtype=np.int64)
+        trading_mask = (weekdays < 5) & ~np.isin(days, holiday_ordinals)
+        
+        self._trading = days[trading_mask]
+        # Index of the first trading day on or after each calendar day (one past the end included)
+        self._next_index = np.searchsorted(self._trading, np.append(days, self._end + 1), side="left")
+        
+        # Weekly expiries: each day falling on the expiry weekday in force that day,
+        # moved back to the previous trading day if needed
+        rule_index = np.searchsorted(np.array(self._rule_starts, dtype=np.int64), days, side="right") - 1
+        expiry_weekdays = np.array([-1] + self._rule_weekdays, dtype=np.int64)[rule_index + 1]
+        nominal = days[weekdays == expiry_weekdays]
+        self._weekly = self._move_to_previous_trading_day(nominal)
+        
+        # Monthly expiries: the last weekly nominal expiry of each month, moved back the same way
+        months = _to_datetime64(nominal).astype("datetime64[M]").astype(np.int64)
+        last_in_month = np.append(months[1:] != months[:-1], True) if len(nominal) else np.zeros(0, dtype=bool)
+        self._monthly = self._move_to_previous_trading_day(nominal[last_in_month])
+        
+        # Plain lists are faster than numpy scalars for single lookups
+        self._trading_list = self._trading.tolist()
+        self._next_index_list = self._next_index.tolist()
+        self._trading_mask_list = trading_mask.tolist()
+        self._weekly_list = self._weekly.tolist()
+        self._monthly_by_month = {}
+        for ordinal in self._monthly.tolist():
+            date = datetime.date.fromordinal(ordinal)
+            self._monthly_by_month[(date.year, date.month)] = date
+    
+    def _move_to_previous_trading_day(self, ordinals: np.ndarray) -> np.ndarray:
+        index = np.searchsorted(self._trading, ordinals, side="right") - 1
+        index = index[index >= 0]
+        return np.unique(self._trading[index])
+    
+    @classmethod
+    def around(cls, date: datetime.date, holidays: Iterable[Union[str, datetime.date]] = None,
+               years_back: int = None, years_ahead: int = None) -> 'TradingCalendar':
+        """
+        Build a calendar covering whole years around a date.
+        
+        Args:
+            date: Reference date
+            holidays: Market holidays, defaults to HOLIDAYS
+            years_back: Years before the reference year, defaults to CALENDAR_CONFIG
+            years_ahead: Years after the reference year, defaults to CALENDAR_CONFIG
+        
+        Returns:
+            TradingCalendar object
+        """
+        years_back = CALENDAR_CONFIG["years_back"] if years_back is None else years_back
+        years_ahead = CALENDAR_CONFIG["years_ahead"] if years_ahead is None else years_ahead
+        return cls(datetime.date(date.year - years_back, 1, 1), datetime.date(date.year + years_ahead, 12, 31), holidays)
+    
+    def covers(self, date: datetime.date, margin_days: int = 0) -> bool:
+        """
+        Check if a date, padded by a margin on both sides, is inside the calendar.
+        
+        Args:
+            date: Date to check
+            margin_days: Days of padding required on each side
+        
+        Returns:
+            True if covered, False otherwise
+        """
+        ordinal = date.toordinal()
+        return self._start + margin_days <= ordinal <= self._end - margin_days
+    
+    def expiry_weekday_on(self, date: datetime.date) -> Optional[int]:
+        """
+        Get the expiry weekday in force on a date.
+        
+        Args:
+            date: Date to check
+        
+        Returns:
+            Weekday (0 is Monday) or None if no rule is in force
+        """
+        index = bisect.bisect_right(self._rule_starts, date.toordinal()) - 1
+        return self._rule_weekdays[index] if index >= 0 else None
+    
+    def weekly_expiries_between(self, start_date: datetime.date, end_date: datetime.date) -> List[datetime.date]:
+        """
+        List weekly expiries in the inclusive range [start_date, end_date].
+        
+        Args:
+            start_date: First day of the range
+            end_date: Last day of the range
+        
+        Returns:
+            List of expiry dates
+        """
+        first = bisect.bisect_left(self._weekly_list, start_date.toordinal())
+        last = bisect.bisect_right(self._weekly_list, end_date.toordinal())
+        return [datetime.date.fromordinal(o) for o in self._weekly_list[first:last]]
+    
+    def monthly_expiries_between(self, start_date: datetime.date, end_date: datetime.date) -> List[datetime.date]:
+        """
+        List monthly expiries in the inclusive range [start_date, end_date].
+        
+        Args:
+            start_date: First day of the range
+            end_date: Last day of the range
+        
+        Returns:
+            List of expiry dates
+        """
+        first = int(np.searchsorted(self._monthly, start_date.toordinal(), side="left"))
+        last = int(np.searchsorted(self._monthly, end_date.toordinal(), side="right"))
+        return [datetime.date.fromordinal(o) for o in self._monthly[first:last].tolist()]
+    
+    def _offset(self, date: datetime.date) -> int:
+        ordinal = date.toordinal()
+        if not self._start <= ordinal <= self._end:
+            raise ValueError(f"{date} is outside the trading calendar ({self.start_date} to {self.end_date})")
+        return ordinal - self._start
+    
+    def _trading_date(self, index: int) -> datetime.date:
+        if not 0 <= index < len(self._trading_list):
+            raise ValueError(f"Result is outside the trading calendar ({self.start_date} to {self.end_date})")
+        return datetime.date.fromordinal(self._trading_list[index])
+    
+    def is_holiday(self, date: datetime.date) -> bool:
+        """
+        Check if a date is a market holiday.
+        
+        Args:
+            date: Date to check
+        
+        Returns:
+            True if holiday, False otherwise
+        """
+        if isinstance(date, datetime.datetime):
+            date = date.date()
+        return date in self.holidays
+    
+    def is_trading_day(self, date: datetime.date) -> bool:
+        """
+        Check if a date is a trading day.
+        
+        Args:
+            date: Date to check
+        
+        Returns:
+            True if trading day, False otherwise
+        """
+        return self._trading_mask_list[self._offset(date)]
+    
+    def next_trading_day(self, date: datetime.date) -> datetime.date:
+        """
+        Get the first trading day strictly after a date.
+        
+        Args:
+            date: Starting date
+        
+        Returns:
+            Next trading day
+        """
+        return self._trading_date(self._next_index_list[self._offset(date) + 1])
+    
+    def previous_trading_day(self, date: datetime.date) -> datetime.date:
+        """
+        Get the last trading day strictly before a date.
+        
+        Args:
+            date: Starting date
+        
+        Returns:
+            Previous trading day
+        """
+        return self._trading_date(self._next_index_list[self._offset(date)] - 1)
+    
+    def add_trading_days(self, date: datetime.date, n: int) -> datetime.date:
+        """
+        Move a number of trading days from a date.
+        
+        Args:
+            date: Starting date
+            n: Trading days to move (negative moves backwards)
+        
+        Returns:
+            Resulting trading day
+        """
+        offset = self._offset(date)
+        if n > 0:
+            return self._trading_date(self._next_index_list[offset + 1] + n - 1)
+        if n < 0:
+            return self._trading_date(self._next_index_list[offset] + n)
+        return date
+    
+    def count_trading_days(self, start_date: datetime.date, end_date: datetime.date) -> int:
+        """
+        Count trading days in the inclusive range [start_date, end_date].
+        
+        Args:
+            start_date: First day of the range
+            end_date: Last day of the range
+        
+        Returns:
+            Number of trading days
+        """
+        return max(self._next_index_list[self._offset(end_date) + 1] - self._next_index_list[self._offset(start_date)], 0)
+    
+    def trading_days(self, start_date: datetime.date, end_date: datetime.date) -> List[datetime.date]:
+        """
+        List trading days in the inclusive range [start_date, end_date].
+        
+        Args:
+            start_date: First day of the range
+            end_date: Last day of the range
+        
+        Returns:
+            List of trading days
+        """
+        first = self._next_index_list[self._offset(start_date)]
+        last = self._next_index_list[self._offset(end_date) + 1]
+        return [datetime.date.fromordinal(o) for o in self._trading_list[first:last]]
+    
+    def weekly_expiries(self, from_date: datetime.date, count: int) -> List[datetime.date]:
+        """
+        Get the next weekly expiries on or after a date.
+        
+        Args:
+            from_date: Starting date
+            count: Number of expiries
+        
+        Returns:
+            List of expiry dates
+        """
+        self._offset(from_date)
+        index = bisect.bisect_left(self._weekly_list, from_date.toordinal())
+        expiries = self._weekly_list[index:index + count]
+        if len(expiries) < count:
+            raise ValueError(f"Not enough weekly expiries after {from_date} in the trading calendar")
+        return [datetime.date.fromordinal(o) for o in expiries]
+    
+    def next_weekly_expiry(self, from_date: datetime.date, n: int = 1) -> datetime.date:
+        """
+        Get the nth weekly expiry on or after a date.
+        
+        Args:
+            from_date: Starting date
+            n: Which expiry (1 is the nearest)
+        
+        Returns:
+            Expiry date
+        """
+        return self.weekly_expiries(from_date, n)[-1]
+    
+    def monthly_expiry(self, year: int, month: int) -> datetime.date:
+        """
+        Get the monthly expiry of a month.
+        
+        Args:
+            year: Year
+            month: Month
+        
+        Returns:
+            Monthly expiry date
+        """
+        expiry = self._monthly_by_month.get((year, month))
+        if expiry is None:
+            raise ValueError(f"{year}-{month:02d} is outside the trading calendar")
+        return expiry
+    
+    def next_monthly_expiry(self, from_date: datetime.date) -> datetime.date:
+        """
+        Get the first monthly expiry on or after a date.
+        
+        Args:
+            from_date: Starting date
+        
+        Returns:
+            Monthly expiry date
+        """
+        self._offset(from_date)
+        index = int(np.searchsorted(self._monthly, from_date.toordinal(), side="left"))
+        if index >= len(self._monthly):
+            raise ValueError(f"No monthly expiry after {from_date} in the trading calendar")
+        return datetime.date.fromordinal(int(self._monthly[index]))
+    
+    def _offsets_array(self, dates) -> np.ndarray:
+        ordinals = _to_ordinals(dates)
+        if ordinals.size and (ordinals.min() < self._start or ordinals.max() > self._end):
+            raise ValueError(f"Dates outside the trading calendar ({self.start_date} to {self.end_date})")
+        return ordinals - self._start
+    
+    def _trading_dates_array(self, index: np.ndarray) -> np.ndarray:
+        if index.size and (index.min() < 0 or index.max() >= len(self._trading)):
+            raise ValueError(f"Results outside the trading calendar ({self.start_date} to {self.end_date})")
+        return _to_datetime64(self._trading[index])
+    
+    def is_trading_day_array(self, dates) -> np.ndarray:
+        """
+        Vectorized is_trading_day.
+        
+        Args:
+            dates: Array-like of datetime64 values or date objects
+        
+        Returns:
+            Boolean array
+        """
+        offsets = self._offsets_array(dates)
+        return (self._next_index[offsets + 1] - self._next_index[offsets]) == 1
+    
+    def next_trading_day_array(self, dates) -> np.ndarray:
+        """
+        Vectorized next_trading_day.
+        
+        Args:
+            dates: Array-like of datetime64 values or date objects
+        
+        Returns:
+            Array of datetime64[D]
+        """
+        return self._trading_dates_array(self._next_index[self._offsets_array(dates) + 1])
+    
+    def previous_trading_day_array(self, dates) -> np.ndarray:
+        """
+        Vectorized previous_trading_day.
+        
+        Args:
+            dates: Array-like of datetime64 values or date objects
+        
+        Returns:
+            Array of datetime64[D]
+        """
+        return self._trading_dates_array(self._next_index[self._offsets_array(dates)] - 1)
+    
+    def count_trading_days_array(self, start_dates, end_dates) -> np.ndarray:
+        """
+        Vectorized count_trading_days.
+        
+        Args:
+            start_dates: Array-like of range start dates
+            end_dates: Array-like of range end dates
+        
+        Returns:
+            Integer array of trading day counts
+        """
+        start = self._next_index[self._offsets_array(start_dates)]
+        end = self._next_index[self._offsets_array(end_dates) + 1]
+        return np.maximum(end - start, 0)
+    
+    def next_weekly_expiry_array(self, dates, n: int = 1) -> np.ndarray:
+        """
+        Vectorized next_weekly_expiry.
+        
+        Args:
+            dates: Array-like of datetime64 values or date objects
+            n: Which expiry (1 is the nearest)
+        
+        Returns:
+            Array of datetime64[D]
+        """
+        ordinals = self._offsets_array(dates) + self._start
+        index = np.searchsorted(self._weekly, ordinals, side="left") + (n - 1)
+        if index.size and index.max() >= len(self._weekly):
+            raise ValueError("Not enough weekly expiries in the trading calendar")
+        return _to_datetime64(self._weekly[index])
+    
+    def next_monthly_expiry_array(self, dates) -> np.ndarray:
+        """
+        Vectorized next_monthly_expiry.
+        
+        Args:
+            dates: Array-like of datetime64 values or date objects
+        
+        Returns:
+            Array of datetime64[D]
+        """
+        ordinals = self._offsets_array(dates) + self._start
+        index = np.searchsorted(self._monthly, ordinals, side="left")
+        if index.size and index.max() >= len(self._monthly):
+            raise ValueError("No monthly expiry in the trading calendar")
+        return _to_datetime64(self._monthly[index])
+
+
+_trading_calendar = None
+
+
+def get_trading_calendar(date: datetime.date = None) -> TradingCalendar:
+    """
+    Get the shared trading calendar, building it on first use.
+    
+    The calendar covers CALENDAR_CONFIG years around today and is rebuilt
+    with a wider range if asked about a date near or beyond its edges.
+    
+    Args:
+        date: Date the caller is about to query
+    
+    Returns:
+        TradingCalendar object
+    """
+    global _trading_calendar
+    
+    current = _trading_calendar
+    if current is None:
+        current = TradingCalendar.around(datetime.date.today())
+    
+    # Keep a margin so next/previous lookups and expiry searches stay inside the range
+    if date is not None and not current.covers(date, margin_days=62):
+        start = min(current.start_date, datetime.date(date.year - 1, 1, 1))
+        end = max(current.end_date, datetime.date(date.year + 1, 12, 31))
+        current = TradingCalendar(start, end)
+    
+    _trading_calendar = current
+    return current
+
+
+def reset_trading_calendar() -> None:
+    """
+    Drop the shared trading calendar so it is rebuilt, e.g. after HOLIDAYS changes.
+    """
+    global _trading_calendar
+    _trading_calendar = None
+    _expiry_service.clear_cache()
+
+
+class ExpiryService:
+    """
+    Expiry lookups against an explicit as-of timestamp.
+    
+    Nothing here reads the clock, so the same as-of always gives the same
+    answer and results are memoized by (effective date, n_weeks). An as-of past
+    the market close counts as the next day, since that day's expiry is over.
+    """
+    
+    def __init__(self, calendar: TradingCalendar = None, cutoff: datetime.time = None):
+        """
+        Initialize the service.
+        
+        Args:
+            calendar: Trading calendar to use, defaults to the shared calendar
+            cutoff: Time of day after which the day's expiry has passed, defaults to TRADING_HOURS end_time
+        """
+        self.calendar = calendar
+        self.cutoff = cutoff or datetime.datetime.strptime(TRADING_HOURS["end_time"], "%H:%M:%S").time()
+        self.hits = 0
+        self.misses = 0
+        self._cache = {}  # (effective date, n_weeks) -> expiry date
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def with_rules(cls, expiry_weekday_rules: List[Dict[str, Any]], start_date: datetime.date,
+                   end_date: datetime.date, holidays: Iterable[Union[str, datetime.date]] = None) -> 'ExpiryService':
+        """
+        Create a service for custom expiry weekday rules.
+        
+        Args:
+            expiry_weekday_rules: Expiry weekday rules ({"effective_from", "weekday"})
+            start_date: First calendar day covered
+            end_date: Last calendar day covered
+            holidays: Market holidays, defaults to HOLIDAYS
+        
+        Returns:
+            ExpiryService object
+        """
+        return cls(TradingCalendar(start_date, end_date, holidays, expiry_weekday_rules))
+    
+    def _calendar_for(self, date: datetime.date) -> TradingCalendar:
+        return self.calendar if self.calendar is not None else get_trading_calendar(date)
+    
+    def effective_date(self, as_of: Union[datetime.datetime, datetime.date]) -> datetime.date:
+        """
+        Get the first date whose expiry has not passed at as_of.
+        
+        Args:
+            as_of: Valuation timestamp, or a date meaning the start of that day
+        
+        Returns:
+            Effective date
+        """
+        if isinstance(as_of, datetime.datetime):
+            date = as_of.date()
+            return date + datetime.timedelta(days=1) if as_of.time() > self.cutoff else date
+        return as_of
+    
+    def next_expiry(self, as_of: Union[datetime.datetime, datetime.date], n_weeks: int = 1) -> datetime.date:
+        """
+        Get the nth weekly expiry that has not passed at as_of.
+        
+        Args:
+            as_of: Valuation timestamp
+            n_weeks: Which expiry (1 is the nearest)
+        
+        Returns:
+            Expiry date
+        """
+        key = (self.effective_date(as_of), n_weeks)
+        with self._lock:
+            expiry = self._cache.get(key)
+            if expiry is not None:
+                self.hits += 1
+                return expiry
+            self.misses += 1
+        
+        expiry = self._calendar_for(key[0]).next_weekly_expiry(key[0], n_weeks)
+        with self._lock:
+            self._cache[key] = expiry
+        return expiry
+    
+    def expiries(self, as_of: Union[datetime.datetime, datetime.date], count: int) -> List[datetime.date]:
+        """
+        Get the next weekly expiries that have not passed at as_of.
+        
+        Args:
+            as_of: Valuation timestamp
+            count: Number of expiries
+        
+        Returns:
+            List of expiry dates
+        """
+        if count <= 0:
+            return []
+        first_expiry = self.next_expiry(as_of)
+        return self._calendar_for(first_expiry).weekly_expiries(first_expiry, count)
+    
+    def next_monthly_expiry(self, as_of: Union[datetime.datetime, datetime.date]) -> datetime.date:
+        """
+        Get the first monthly expiry that has not passed at as_of.
+        
+        Args:
+            as_of: Valuation timestamp
+        
+        Returns:
+            Monthly expiry date
+        """
+        date = self.effective_date(as_of)
+        return self._calendar_for(date).next_monthly_expiry(date)
+    
+    def schedule(self, start_date: datetime.date, end_date: datetime.date, monthly: bool = False) -> List[datetime.date]:
+        """
+        Get the expiry schedule between two dates under the calendar's weekday rules.
+        
+        Args:
+            start_date: First day of the range
+            end_date: Last day of the range
+            monthly: Monthly instead of weekly expiries
+        
+        Returns:
+            List of expiry dates
+        """
+        calendar = self._calendar_for(start_date)
+        if self.calendar is None and not calendar.covers(end_date, margin_days=62):
+            calendar = get_trading_calendar(end_date)
+        if monthly:
+            return calendar.monthly_expiries_between(start_date, end_date)
+        return calendar.weekly_expiries_between(start_date, end_date)
+    
+    def clear_cache(self) -> None:
+        """Drop memoized expiries."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Get memoization statistics.
+        
+        Returns:
+            Dictionary with hits, misses and size
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
+
+
+_expiry_service = ExpiryService()
+
+
+def get_expiry_service() -> ExpiryService:
+    """
+    Get the shared expiry service used by the module-level expiry functions.
+    
+    Returns:
+        ExpiryService object
+    """
+    return _expiry_service
+
+
+def _resolve_as_of(from_date: Optional[datetime.date],
+                   as_of: Optional[datetime.datetime]) -> Union[datetime.datetime, datetime.date]:
+    if as_of is not None:
+        return as_of
+    now = datetime.datetime.now()
+    if from_date is not None and from_date != now.date():
+        return from_date
+    return now  # Today rolls past an expiry that has already closed
 
 
 def is_market_holiday(date: datetime.date) -> bool:
@@ -19,8 +686,7 @@ def is_market_holiday(date: datetime.date) -> bool:
     Returns:
         True if holiday, False otherwise
     """
-    date_str = date.strftime("%Y-%m-%d")
-    return date_str in HOLIDAYS
+    return get_trading_calendar().is_holiday(date)
 
 
 def is_weekend(date: datetime.date) -> bool:
@@ -46,7 +712,7 @@ def is_trading_day(date: datetime.date) -> bool:
     Returns:
         True if trading day, False otherwise
     """
-    return not (is_weekend(date) or is_market_holiday(date))
+    return get_trading_calendar(date).is_trading_day(date)
 
 
 def get_next_trading_day(date: datetime.date) -> datetime.date:
@@ -59,10 +725,7 @@ def get_next_trading_day(date: datetime.date) -> datetime.date:
     Returns:
         Next trading day
     """
-    next_day = date + datetime.timedelta(days=1)
-    while not is_trading_day(next_day):
-        next_day += datetime.timedelta(days=1)
-    return next_day
+    return get_trading_calendar(date).next_trading_day(date)
 
 
 def get_previous_trading_day(date: datetime.date) -> datetime.date:
@@ -75,38 +738,21 @@ def get_previous_trading_day(date: datetime.date) -> datetime.date:
     Returns:
         Previous trading day
     """
-    prev_day = date - datetime.timedelta(days=1)
-    while not is_trading_day(prev_day):
-        prev_day -= datetime.timedelta(days=1)
-    return prev_day
+    return get_trading_calendar(date).previous_trading_day(date)
 
 
-def get_next_expiry_date(from_date: datetime.date = None) -> datetime.date:
+def get_next_expiry_date(from_date: datetime.date = None, as_of: datetime.datetime = None) -> datetime.date:
     """
     Get the next weekly expiry date (usually Thursday).
     
     Args:
-        from_date: Starting date, defaults to today
-        
+        from_date: Starting date; the search starts at the beginning of this day, or now for today
+        as_of: Valuation timestamp, takes precedence over from_date; defaults to now
+    
     Returns:
         Next expiry date
     """
-    if from_date is None:
-        from_date = datetime.date.today()
-    
-    # Find the next Thursday (weekday 3)
-    days_ahead = (3 - from_date.weekday()) % 7
-    next_thursday = from_date + datetime.timedelta(days=days_ahead)
-    
-    # If today is Thursday and we're looking for the next expiry, go to next week
-    if days_ahead == 0 and datetime.datetime.now().time() > datetime.time(15, 30):
-        next_thursday += datetime.timedelta(days=7)
-    
-    # Check if it's a holiday, if so, move to the previous trading day
-    while not is_trading_day(next_thursday):
-        next_thursday = get_previous_trading_day(next_thursday)
-    
-    return next_thursday
+    return _expiry_service.next_expiry(_resolve_as_of(from_date, as_of))
 
 
 def get_monthly_expiry_date(year: int, month: int) -> datetime.date:
@@ -120,59 +766,41 @@ def get_monthly_expiry_date(year: int, month: int) -> datetime.date:
     Returns:
         Monthly expiry date
     """
-    # Get the last day of the month
-    last_day = calendar.monthrange(year, month)[1]
-    last_date = datetime.date(year, month, last_day)
-    
-    # Find the last Thursday of the month
-    offset = (3 - last_date.weekday()) % 7
-    last_thursday = last_date - datetime.timedelta(days=(7 - offset) % 7)
-    
-    # Check if it's a holiday, if so, move to the previous trading day
-    while not is_trading_day(last_thursday):
-        last_thursday = get_previous_trading_day(last_thursday)
-    
-    return last_thursday
+    return get_trading_calendar(datetime.date(year, month, 15)).monthly_expiry(year, month)
 
 
-def get_expiry_dates(weeks_ahead: int, from_date: datetime.date = None) -> List[datetime.date]:
+def get_expiry_dates(weeks_ahead: int, from_date: datetime.date = None,
+                     as_of: datetime.datetime = None) -> List[datetime.date]:
     """
     Get a list of expiry dates for a specified number of weeks ahead.
     
     Args:
         weeks_ahead: Number of weeks ahead to get expiry dates for
-        from_date: Starting date, defaults to today
-        
+        from_date: Starting date; the search starts at the beginning of this day, or now for today
+        as_of: Valuation timestamp, takes precedence over from_date; defaults to now
+    
     Returns:
         List of expiry dates
     """
-    if from_date is None:
-        from_date = datetime.date.today()
-    
-    expiry_dates = []
-    current_date = from_date
-    
-    for _ in range(weeks_ahead):
-        next_expiry = get_next_expiry_date(current_date)
-        expiry_dates.append(next_expiry)
-        current_date = next_expiry + datetime.timedelta(days=1)
-    
-    return expiry_dates
+    return _expiry_service.expiries(_resolve_as_of(from_date, as_of), weeks_ahead)
 
 
-def get_expiry_date_n_weeks_ahead(n: int, from_date: datetime.date = None) -> datetime.date:
+def get_expiry_date_n_weeks_ahead(n: int, from_date: datetime.date = None,
+                                  as_of: datetime.datetime = None) -> datetime.date:
     """
     Get the expiry date n weeks ahead.
     
     Args:
         n: Number of weeks ahead
-        from_date: Starting date, defaults to today
-        
+        from_date: Starting date; the search starts at the beginning of this day, or now for today
+        as_of: Valuation timestamp, takes precedence over from_date; defaults to now
+    
     Returns:
         Expiry date n weeks ahead
     """
-    expiry_dates = get_expiry_dates(n, from_date)
-    return expiry_dates[-1] if expiry_dates else None
+    if n <= 0:
+        return None
+    return _expiry_service.next_expiry(_resolve_as_of(from_date, as_of), n)
 
 
 def timestamp_to_datetime(timestamp: int) -> datetime.datetime:
@@ -0,0 +1,352 @@
+"""
+Vectorized Black-Scholes pricing, implied volatility and greeks for option chains.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Union
+import datetime
+import math
+
+import numpy as np
+
+from src.models.option_chain import OptionChain
+from src.models.columnar_chain import ColumnarOptionChain
+from config.config import STRATEGY_CONFIG
+
+try:
+    from scipy.special import ndtr as _ndtr
+except ImportError:
+    _ndtr = None
+
+
+SECONDS_PER_YEAR = 365.0 * 24 * 60 * 60
+SQRT_2PI = math.sqrt(2 * math.pi)
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """
+    Standard normal cumulative distribution function.
+    
+    Uses scipy when installed, otherwise a Chebyshev erfc approximation
+    with relative error below 1.2e-7.
+    
+    Args:
+        x: Input values
+    
+    Returns:
+        CDF values
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if _ndtr is not None:
+        return _ndtr(x)
+    
+    z = np.abs(x) / math.sqrt(2)
+    t = 1.0 / (1.0 + 0.5 * z)
+    erfc = t * np.exp(-z * z - 1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (
+        -0.18628806 + t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+            -0.82215223 + t * 0.17087277)))))))))
+    return np.where(x >= 0, 1.0 - 0.5 * erfc, 0.5 * erfc)
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    """
+    Standard normal probability density function.
+    
+    Args:
+        x: Input values
+    
+    Returns:
+        PDF values
+    """
+    x = np.asarray(x, dtype=np.float64)
+    return np.exp(-0.5 * x * x) / SQRT_2PI
+
+
+def _d1_d2(spot, strike, time_to_expiry, volatility, rate, dividend_yield):
+    """Compute the Black-Scholes d1 and d2 terms."""
+    vol_sqrt_t = volatility * np.sqrt(time_to_expiry)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(spot / strike) + (rate - dividend_yield + 0.5 * volatility ** 2) * time_to_expiry) / vol_sqrt_t
+    return d1, d1 - vol_sqrt_t
+
+
+def black_scholes_price(spot, strike, time_to_expiry, volatility, is_call,
+                        rate: float = None, dividend_yield: float = None) -> np.ndarray:
+    """
+    Black-Scholes price for European options.
+    
+    Args:
+        spot: Underlying price(s)
+        strike: Strike price(s)
+        time_to_expiry: Time to expiry in years
+        volatility: Annualized volatility
+        is_call: True for calls, False for puts
+        rate: Risk-free rate, defaults to STRATEGY_CONFIG
+        dividend_yield: Continuous dividend yield, defaults to STRATEGY_CONFIG
+    
+    Returns:
+        Option prices
+    """
+    rate = STRATEGY_CONFIG["risk_free_rate"] if rate is None else rate
+    dividend_yield = STRATEGY_CONFIG["dividend_yield"] if dividend_yield is None else dividend_yield
+    
+    spot, strike, time_to_expiry, volatility, is_call = np.broadcast_arrays(
+        np.asarray(spot, dtype=np.float64), np.asarray(strike, dtype=np.float64),
+        np.asarray(time_to_expiry, dtype=np.float64), np.asarray(volatility, dtype=np.float64),
+        np.asarray(is_call, dtype=bool)
+    )
+    d1, d2 = _d1_d2(spot, strike, time_to_expiry, volatility, rate, dividend_yield)
+    discounted_spot = spot * np.exp(-dividend_yield * time_to_expiry)
+    discounted_strike = strike * np.exp(-rate * time_to_expiry)
+    
+    call = discounted_spot * norm_cdf(d1) - discounted_strike * norm_cdf(d2)
+    put = discounted_strike * norm_cdf(-d2) - discounted_spot * norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+
+def black_scholes_greeks(spot, strike, time_to_expiry, volatility, is_call,
+                         rate: float = None, dividend_yield: float = None) -> Dict[str, np.ndarray]:
+    """
+    First-order Black-Scholes greeks and gamma.
+    
+    Theta is per calendar day and vega is per one volatility point (1%).
+    
+    Args:
+        spot: Underlying price(s)
+        strike: Strike price(s)
+        time_to_expiry: Time to expiry in years
+        volatility: Annualized volatility
+        is_call: True for calls, False for puts
+        rate: Risk-free rate, defaults to STRATEGY_CONFIG
+        dividend_yield: Continuous dividend yield, defaults to STRATEGY_CONFIG
+    
+    Returns:
+        Dictionary with delta, gamma, theta and vega arrays
+    """
+    rate = STRATEGY_CONFIG["risk_free_rate"] if rate is None else rate
+    dividend_yield = STRATEGY_CONFIG["dividend_yield"] if dividend_yield is None else dividend_yield
+    
+    spot, strike, time_to_expiry, volatility, is_call = np.broadcast_arrays(
+        np.asarray(spot, dtype=np.float64), np.asarray(strike, dtype=np.float64),
+        np.asarray(time_to_expiry, dtype=np.float64), np.asarray(volatility, dtype=np.float64),
+        np.asarray(is_call, dtype=bool)
+    )
+    d1, d2 = _d1_d2(spot, strike, time_to_expiry, volatility, rate, dividend_yield)
+    sqrt_t = np.sqrt(time_to_expiry)
+    spot_discount = np.exp(-dividend_yield * time_to_expiry)
+    strike_discount = np.exp(-rate * time_to_expiry)
+    pdf_d1 = norm_pdf(d1)
+    
+    delta = np.where(is_call, spot_discount * norm_cdf(d1), -spot_discount * norm_cdf(-d1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = spot_discount * pdf_d1 / (spot * volatility * sqrt_t)
+        decay = -spot * spot_discount * pdf_d1 * volatility / (2 * sqrt_t)
+    call_theta = (decay - rate * strike * strike_discount * norm_cdf(d2)
+                  + dividend_yield * spot * spot_discount * norm_cdf(d1))
+    put_theta = (decay + rate * strike * strike_discount * norm_cdf(-d2)
+                 - dividend_yield * spot * spot_discount * norm_cdf(-d1))
+    theta = np.where(is_call, call_theta, put_theta) / 365.0
+    vega = spot * spot_discount * pdf_d1 * sqrt_t / 100.0
+    
+    return {"delta": delta, "gamma": gamma, "theta": theta, "vega": vega}
+
+
+def implied_volatility(price, spot, strike, time_to_expiry, is_call,
+                       rate: float = None, dividend_yield: float = None,
+                       tolerance: float = 1e-6, max_iterations: int = 100) -> np.ndarray:
+    """
+    Solve for Black-Scholes implied volatility across many options at once.
+    
+    Runs a safeguarded Newton iteration on every option in parallel: each option
+    keeps a bracket [low, high] around its root, and falls back to bisection when
+    the Newton step leaves the bracket or vega is too small. Prices outside the
+    no-arbitrage bounds, or options at or past expiry, yield NaN.
+    
+    Args:
+        price: Observed option price(s)
+        spot: Underlying price(s)
+        strike: Strike price(s)
+        time_to_expiry: Time to expiry in years
+        is_call: True for calls, False for puts
+        rate: Risk-free rate, defaults to STRATEGY_CONFIG
+        dividend_yield: Continuous dividend yield, defaults to STRATEGY_CONFIG
+        tolerance: Volatility tolerance for convergence
+        max_iterations: Maximum number of iterations
+    
+    Returns:
+        Implied volatilities (NaN where no solution exists)
+    """
+    rate = STRATEGY_CONFIG["risk_free_rate"] if rate is None else rate
+    dividend_yield = STRATEGY_CONFIG["dividend_yield"] if dividend_yield is None else dividend_yield
+    
+    price, spot, strike, time_to_expiry, is_call = np.broadcast_arrays(
+        np.asarray(price, dtype=np.float64), np.asarray(spot, dtype=np.float64),
+        np.asarray(strike, dtype=np.float64), np.asarray(time_to_expiry, dtype=np.float64),
+        np.asarray(is_call, dtype=bool)
+    )
+    shape = price.shape
+    price, spot, strike, time_to_expiry, is_call = (
+        np.array(a).ravel() for a in (price, spot, strike, time_to_expiry, is_call)
+    )
+    
+    discounted_spot = spot * np.exp(-dividend_yield * time_to_expiry)
+    discounted_strike = strike * np.exp(-rate * time_to_expiry)
+    lower_bound = np.where(is_call, np.maximum(discounted_spot - discounted_strike, 0.0),
+                           np.maximum(discounted_strike - discounted_spot, 0.0))
+    upper_bound = np.where(is_call, discounted_spot, discounted_strike)
+    valid = ((time_to_expiry > 0) & (spot > 0) & (strike > 0)
+             & (price > lower_bound) & (price < upper_bound))
+    
+    low = np.full(price.shape, 1e-4)
+    high = np.full(price.shape, 5.0)
+    # Brenner-Subrahmanyam starting point, clipped into the bracket
+    with np.errstate(divide="ignore", invalid="ignore"):
+        guess = np.sqrt(2 * math.pi / time_to_expiry) * price / spot
+    volatility = np.clip(np.nan_to_num(guess, nan=0.2), 0.05, 2.0)
+    active = valid.copy()
+    
+    for _ in range(max_iterations):
+        if not active.any():
+            break
+        
+        index = np.nonzero(active)[0]
+        sigma = volatility[index]
+        model = black_scholes_price(spot[index], strike[index], time_to_expiry[index], sigma,
+                                    is_call[index], rate, dividend_yield)
+        diff = model - price[index]
+        vega = black_scholes_greeks(spot[index], strike[index], time_to_expiry[index], sigma,
+                                    is_call[index], rate, dividend_yield)["vega"] * 100.0
+        
+        # Price is increasing in volatility, so the sign of diff tightens the bracket
+        too_high = diff > 0
+        high[index[too_high]] = np.minimum(high[index[too_high]], sigma[too_high])
+        low[index[~too_high]] = np.maximum(low[index[~too_high]], sigma[~too_high])
+        
+        with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+            newton_step = diff / vega
+        newton = sigma - newton_step
+        # Converge on volatility, not price: deep in-the-money options have so little
+        # vega that a small price error can hide a large volatility error
+        converged = (diff == 0) | (np.abs(newton_step) < tolerance) | (high[index] - low[index] < tolerance)
+        active[index[converged]] = False
+        
+        bisection = 0.5 * (low[index] + high[index])
+        use_newton = np.isfinite(newton) & (newton > low[index]) & (newton < high[index])
+        step = np.where(use_newton, newton, bisection)
+        
+        update = ~converged
+        volatility[index[update]] = step[update]
+    
+    return np.where(valid, volatility, np.nan).reshape(shape)
+
+
+def time_to_expiry_years(expiry_date: datetime.datetime, as_of: datetime.datetime = None) -> float:
+    """
+    Time from as_of to expiry in years.
+    
+    Args:
+        expiry_date: Expiry date and time
+        as_of: Valuation time, defaults to now
+    
+    Returns:
+        Time to expiry in years (zero if expired)
+    """
+    if as_of is None:
+        as_of = datetime.datetime.now()
+    return max((expiry_date - as_of).total_seconds(), 0.0) / SECONDS_PER_YEAR
+
+
+@dataclass
+class SideGreeks:
+    """
+    Implied volatility and greeks for one side of an option chain, aligned
+    with the strike-sorted columns of that side.
+    """
+    strike: np.ndarray
+    price: np.ndarray
+    iv: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    theta: np.ndarray
+    vega: np.ndarray
+
+
+@dataclass
+class ChainGreeks:
+    """
+    Implied volatility and greeks for a whole option chain.
+    """
+    chain: ColumnarOptionChain
+    time_to_expiry: float
+    calls: SideGreeks
+    puts: SideGreeks
+    
+    def side(self, option_type: str) -> SideGreeks:
+        """
+        Get the greeks for an option type.
+        
+        Args:
+            option_type: Option type (CE or PE)
+        
+        Returns:
+            SideGreeks for the requested side
+        """
+        return self.calls if option_type == "CE" else self.puts
+
+
+def compute_chain_greeks(option_chain: Union[OptionChain, ColumnarOptionChain],
+                         as_of: datetime.datetime = None, rate: float = None,
+                         dividend_yield: float = None, use_mid_price: bool = False) -> ChainGreeks:
+    """
+    Compute implied volatility and greeks for every contract in a chain in one pass.
+    
+    Args:
+        option_chain: Option chain (list or columnar)
+        as_of: Valuation time, defaults to now
+        rate: Risk-free rate, defaults to STRATEGY_CONFIG
+        dividend_yield: Continuous dividend yield, defaults to STRATEGY_CONFIG
+        use_mid_price: Use bid/ask midpoint where quoted instead of last traded price
+    
+    Returns:
+        ChainGreeks with per-side arrays sorted by strike
+    """
+    if not isinstance(option_chain, ColumnarOptionChain):
+        option_chain = ColumnarOptionChain.from_option_chain(option_chain)
+    
+    calls, puts = option_chain.calls, option_chain.puts
+    time_to_expiry = time_to_expiry_years(option_chain.expiry_date, as_of)
+    
+    def side_prices(columns):
+        if not use_mid_price:
+            return columns.last_price
+        quoted = (columns.bid_price > 0) & (columns.ask_price > 0)
+        return np.where(quoted, columns.mid_price, columns.last_price)
+    
+    strike = np.concatenate([calls.strike, puts.strike])
+    price = np.concatenate([side_prices(calls), side_prices(puts)])
+    is_call = np.concatenate([np.ones(len(calls), dtype=bool), np.zeros(len(puts), dtype=bool)])
+    
+    iv = implied_volatility(price, option_chain.spot_price, strike, time_to_expiry, is_call,
+                            rate, dividend_yield)
+    greeks = black_scholes_greeks(option_chain.spot_price, strike, time_to_expiry, iv, is_call,
+                                  rate, dividend_yield)
+    
+    split = len(calls)
+    
+    def side_greeks(part: slice) -> SideGreeks:
+        return SideGreeks(
+            strike=strike[part],
+            price=price[part],
+            iv=iv[part],
+            delta=greeks["delta"][part],
+            gamma=greeks["gamma"][part],
+            theta=greeks["theta"][part],
+            vega=greeks["vega"][part]
+        )
+    
+    return ChainGreeks(
+        chain=option_chain,
+        time_to_expiry=time_to_expiry,
+        calls=side_greeks(slice(None, split)),
+        puts=side_greeks(slice(split, None))
+    )
@@ -0,0 +1,203 @@
+"""
+Pooled HTTP session for the mStock API client.
+Keeps connections alive between calls and tracks connection pool usage.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+
+from config.config import API_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """
+    Thread-safe counters describing how the connection pool is being used.
+    """
+    
+    def __init__(self):
+        """Initialize empty pool statistics."""
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.pool_waits = 0
+        self.pool_wait_time = 0.0
+    
+    def record_request(self) -> None:
+        """Record a request sent through the pool."""
+        with self._lock:
+            self.requests += 1
+    
+    def record_new_connection(self) -> None:
+        """Record a request that had to open a fresh TCP/TLS connection."""
+        with self._lock:
+            self.new_connections += 1
+    
+    def record_pool_wait(self, wait_time: float) -> None:
+        """
+        Record a request that had to wait for a free pooled connection.
+        
+        Args:
+            wait_time: Time spent waiting in seconds
+        """
+        with self._lock:
+            self.pool_waits += 1
+            self.pool_wait_time += wait_time
+    
+    @property
+    def reused_connections(self) -> int:
+        """Number of requests served on an already open connection."""
+        return max(self.requests - self.new_connections, 0)
+    
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of requests that skipped the connection handshake."""
+        if self.requests == 0:
+            return 0.0
+        return self.reused_connections / self.requests
+    
+    def reset(self) -> None:
+        """Reset all counters to zero."""
+        with self._lock:
+            self.requests = 0
+            self.new_connections = 0
+            self.pool_waits = 0
+            self.pool_wait_time = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get a snapshot of the statistics.
+        
+        Returns:
+            Dictionary with pool statistics
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": self.reused_connections,
+                "reuse_ratio": self.reuse_ratio,
+                "pool_waits": self.pool_waits,
+                "pool_wait_time": self.pool_wait_time,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Connection pool mixin that reports handshakes and pool waits to PoolStats."""
+    
+    pool_stats: PoolStats = None
+    
+    def _get_conn(self, timeout=None):
+        # All slots are checked out, so a blocking pool will wait for a release
+        must_wait = self.block and self.pool is not None and self.pool.qsize() == 0
+        start = time.perf_counter()
+        conn = super()._get_conn(timeout)
+        if must_wait:
+            self.pool_stats.record_pool_wait(time.perf_counter() - start)
+        return conn
+    
+    def _make_request(self, conn, *args, **kwargs):
+        self.pool_stats.record_request()
+        if getattr(conn, "sock", None) is None:
+            self.pool_stats.record_new_connection()
+        return super()._make_request(conn, *args, **kwargs)
+
+
+def _instrumented_pool_class(base: type, stats: PoolStats) -> type:
+    """
+    Build a connection pool class bound to a PoolStats instance.
+    
+    Args:
+        base: urllib3 connection pool class to extend
+        stats: Statistics object to report to
+    
+    Returns:
+        Instrumented connection pool class
+    """
+    return type(f"Instrumented{base.__name__}", (_InstrumentedPoolMixin, base), {"pool_stats": stats})
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter with keep-alive connection pooling and usage statistics.
+    """
+    
+    def __init__(self, pool_connections: int = None, pool_maxsize: int = None,
+                 pool_block: bool = None, **kwargs):
+        """
+        Initialize the adapter.
+        
+        Args:
+            pool_connections: Number of per-host pools to cache
+            pool_maxsize: Maximum number of kept-alive connections per host
+            pool_block: Whether to wait for a free connection instead of opening extra ones
+            **kwargs: Additional HTTPAdapter arguments
+        """
+        # Must exist before HTTPAdapter.__init__ calls init_poolmanager
+        self.stats = PoolStats()
+        super().__init__(
+            pool_connections=pool_connections or API_CONFIG["pool_connections"],
+            pool_maxsize=pool_maxsize or API_CONFIG["pool_maxsize"],
+            pool_block=API_CONFIG["pool_block"] if pool_block is None else pool_block,
+            **kwargs
+        )
+    
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _instrumented_pool_class(HTTPConnectionPool, self.stats),
+            "https": _instrumented_pool_class(HTTPSConnectionPool, self.stats),
+        }
+
+
+def get_default_timeout() -> Tuple[float, float]:
+    """
+    Get the configured (connect, read) timeout pair.
+    
+    Returns:
+        Tuple of (connect_timeout, read_timeout) in seconds
+    """
+    return API_CONFIG["connect_timeout"], API_CONFIG["read_timeout"]
+
+
+def create_session(pool_connections: int = None, pool_maxsize: int = None,
+                   pool_block: bool = None) -> requests.Session:
+    """
+    Create a requests session backed by a pooled, keep-alive adapter.
+    
+    Args:
+        pool_connections: Number of per-host pools to cache
+        pool_maxsize: Maximum number of kept-alive connections per host
+        pool_block: Whether to wait for a free connection instead of opening extra ones
+    
+    Returns:
+        Configured requests session
+    """
+    session = requests.Session()
+    adapter = PooledHTTPAdapter(pool_connections, pool_maxsize, pool_block)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session_stats(session: requests.Session) -> Optional[Dict[str, Any]]:
+    """
+    Get pool statistics for a session created by create_session.
+    
+    Args:
+        session: Requests session
+    
+    Returns:
+        Dictionary with pool statistics or None if the session is not pooled
+    """
+    adapter = session.get_adapter("https://")
+    if not isinstance(adapter, PooledHTTPAdapter):
+        return None
+    return adapter.stats.to_dict()
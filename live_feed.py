@@ -0,0 +1,405 @@
+"""
+Server-sent events feed of the engine's live state for the dashboards.
+Watches the shared-memory state bus and pushes each client a snapshot when it
+connects, then only the position rows, status and P&L points that changed,
+so browsers update in place instead of rerunning the dashboard script.
+"""
+
+import collections
+import json
+import logging
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.utils.state_bus import LiveState, StateReader
+from config.config import LIVE_FEED_CONFIG
+
+logger = logging.getLogger(__name__)
+
+Event = Tuple[str, int, Dict[str, Any]]  # (event name, sequence, data)
+
+
+def _isoformat(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+class LiveFeed:
+    """
+    Turns successive LiveState snapshots into events and fans them out.
+    
+    Each subscriber gets a bounded queue that starts with a snapshot event.
+    Later events are deltas holding only what changed. A subscriber too slow
+    to keep up has its queue replaced by a fresh snapshot instead of growing
+    without bound.
+    """
+    
+    def __init__(self, history: int = None, queue_size: int = None):
+        """
+        Initialize an empty feed.
+        
+        Args:
+            history: P&L points kept for the chart of a new client, defaults to LIVE_FEED_CONFIG
+            queue_size: Events buffered per client, defaults to LIVE_FEED_CONFIG
+        """
+        self.queue_size = queue_size or LIVE_FEED_CONFIG["client_queue"]
+        self._rows = {}  # Symbol -> published position row
+        self._status = {"running": False, "start_time": None}
+        self._updated_at = None
+        self._sequence = 0
+        self._pnl = collections.deque(maxlen=history or LIVE_FEED_CONFIG["history"])  # (Unix time, P&L)
+        self._subscribers = []
+        self._lock = threading.Lock()
+    
+    def update(self, state: LiveState) -> Optional[Dict[str, Any]]:
+        """
+        Apply a state snapshot and push what changed to every subscriber.
+        
+        Args:
+            state: Snapshot read from the state bus
+        
+        Returns:
+            Delta sent, or None if nothing changed
+        """
+        rows = {position["symbol"]: position for position in state.positions}
+        status = {"running": state.running, "start_time": _isoformat(state.start_time)}
+        with self._lock:
+            delta = {"updated_at": _isoformat(state.updated_at)}
+            upserts = [row for symbol, row in rows.items() if self._rows.get(symbol) != row]
+            removed = [symbol for symbol in self._rows if symbol not in rows]
+            if upserts:
+                delta["upserts"] = upserts
+            if removed:
+                delta["removed"] = removed
+            if status != self._status:
+                delta["status"] = status
+            if state.updated_at is not None and (not self._pnl or self._pnl[-1][1] != state.pnl):
+                point = (state.updated_at.timestamp(), state.pnl)
+                self._pnl.append(point)
+                delta["pnl"] = point
+            
+            self._rows, self._status = rows, status
+            self._updated_at, self._sequence = state.updated_at, state.sequence
+            if len(delta) == 1:
+                return None
+            self._broadcast(("delta", state.sequence, delta))
+        return delta
+    
+    def _snapshot(self) -> Dict[str, Any]:
+        return {"updated_at": _isoformat(self._updated_at), "status": self._status,
+                "positions": list(self._rows.values()), "pnl": list(self._pnl)}
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the full current state, as sent to a new client.
+        
+        Returns:
+            Dictionary with updated_at, status, positions and pnl points
+        """
+        with self._lock:
+            return self._snapshot()
+    
+    def _broadcast(self, event: Optional[Event]) -> None:
+        for subscriber in self._subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                with subscriber.mutex:
+                    subscriber.queue.clear()
+                subscriber.put_nowait(event if event is None else ("snapshot", self._sequence, self._snapshot()))
+    
+    def subscribe(self) -> queue.Queue:
+        """
+        Register a client.
+        
+        Returns:
+            Queue of events, starting with a snapshot; None marks the end of the feed
+        """
+        subscriber = queue.Queue(self.queue_size)
+        with self._lock:
+            subscriber.put_nowait(("snapshot", self._sequence, self._snapshot()))
+            self._subscribers.append(subscriber)
+        return subscriber
+    
+    def unsubscribe(self, subscriber: queue.Queue) -> None:
+        """
+        Remove a client.
+        
+        Args:
+            subscriber: Queue returned by subscribe()
+        """
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+    
+    def close(self) -> None:
+        """
+        End the feed of every client.
+        """
+        with self._lock:
+            self._broadcast(None)
+            self._subscribers = []
+    
+    @property
+    def subscribers(self) -> int:
+        """Number of connected clients."""
+        with self._lock:
+            return len(self._subscribers)
+
+
+class LiveFeedRequestHandler(BaseHTTPRequestHandler):
+    """Serves the client page, the event stream and the current state."""
+    
+    def do_GET(self):
+        """Handle GET requests."""
+        path = urlsplit(self.path).path
+        if path == "/events":
+            self._stream()
+        elif path == "/state":
+            self._send(200, "application/json", json.dumps(self.server.live_feed.feed.snapshot()).encode())
+        elif path == "/":
+            self._send(200, "text/html; charset=utf-8", client_html("/events").encode())
+        else:
+            self._send(404, "text/plain", b"Not found")
+    
+    def _send(self, status: int, content_type: str, data: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def _stream(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")  # The dashboards embed the client from another origin
+        self.end_headers()
+        
+        server = self.server.live_feed
+        subscriber = server.feed.subscribe()
+        try:
+            while True:
+                try:
+                    event = subscriber.get(timeout=server.heartbeat)
+                except queue.Empty:
+                    self.wfile.write(b": keepalive\n\n")  # Comment line, keeps proxies from closing the stream
+                    self.wfile.flush()
+                    continue
+                if event is None:
+                    break
+                name, sequence, data = event
+                self.wfile.write(f"id: {sequence}\nevent: {name}\ndata: {json.dumps(data)}\n\n".encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            server.feed.unsubscribe(subscriber)
+    
+    def log_message(self, format, *args):
+        """Route request logging to the module logger."""
+        logger.debug(format % args)
+
+
+class LiveFeedServer:
+    """
+    Threaded HTTP server pushing the state bus to dashboard clients.
+    
+    A background thread checks the state bus sequence every poll interval and
+    reads a snapshot only when it changed, so every tick published in between
+    is coalesced into one delta. Each client holds a server-sent events
+    stream; browsers reconnect by themselves and get a fresh snapshot.
+    """
+    
+    def __init__(self, reader: StateReader = None, feed: LiveFeed = None, host: str = None, port: int = None,
+                 poll_interval: float = None, heartbeat: float = None):
+        """
+        Initialize the server.
+        
+        Args:
+            reader: State bus reader, defaults to the configured segment
+            feed: Feed tracking the clients, defaults to a new one
+            host: Interface to bind, defaults to LIVE_FEED_CONFIG
+            port: Port to bind, 0 for a free port, defaults to LIVE_FEED_CONFIG
+            poll_interval: Seconds between checks of the state bus, defaults to LIVE_FEED_CONFIG
+            heartbeat: Seconds of silence after which a keep-alive is sent, defaults to LIVE_FEED_CONFIG
+        """
+        self.reader = reader or StateReader()
+        self.feed = feed or LiveFeed()
+        self.poll_interval = LIVE_FEED_CONFIG["poll_interval"] if poll_interval is None else poll_interval
+        self.heartbeat = LIVE_FEED_CONFIG["heartbeat"] if heartbeat is None else heartbeat
+        self.server = ThreadingHTTPServer((host or LIVE_FEED_CONFIG["host"],
+                                           LIVE_FEED_CONFIG["port"] if port is None else port),
+                                          LiveFeedRequestHandler)
+        self.server.daemon_threads = True
+        self.server.live_feed = self
+        self.thread = None
+        self._pump_thread = None
+        self._stopped = threading.Event()
+    
+    @property
+    def url(self) -> str:
+        """URL of the client page."""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+    
+    @property
+    def events_url(self) -> str:
+        """URL of the event stream."""
+        return f"{self.url}events"
+    
+    def start(self) -> None:
+        """Start serving clients and watching the state bus in background threads."""
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self._pump_thread = threading.Thread(target=self._pump, daemon=True)
+        self._pump_thread.start()
+        logger.info(f"Live feed listening on {self.url}")
+    
+    def stop(self) -> None:
+        """Stop watching, end every client's stream and close the socket."""
+        self._stopped.set()
+        if self._pump_thread is not None:
+            self._pump_thread.join()
+        self.feed.close()
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def _pump(self) -> None:
+        last_sequence = None
+        while not self._stopped.wait(self.poll_interval):
+            try:
+                sequence = self.reader.sequence()
+                if sequence is None or sequence == last_sequence:
+                    continue
+                state = self.reader.snapshot()
+                if state is not None:
+                    self.feed.update(state)
+                    last_sequence = state.sequence
+            except Exception as e:
+                logger.error(f"Error reading the state bus: {str(e)}")
+
+
+def client_html(events_url: str, max_points: int = None) -> str:
+    """
+    Get the live client page, for the dashboards to embed.
+    
+    The page keeps one table row per symbol and rewrites only the cells whose
+    value changed, and appends P&L points to the chart with
+    Plotly.extendTraces instead of redrawing it.
+    
+    Args:
+        events_url: URL of the event stream
+        max_points: P&L points kept on the chart, defaults to LIVE_FEED_CONFIG["history"]
+    
+    Returns:
+        HTML document
+    """
+    return (CLIENT_HTML.replace("__EVENTS_URL__", json.dumps(events_url))
+            .replace("__MAX_POINTS__", str(max_points or LIVE_FEED_CONFIG["history"])))
+
+
+CLIENT_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<script src="https://cdn.plot.ly/plotly-2.27.0.min.js"></script>
+<style>
+    body { font-family: sans-serif; margin: 0; }
+    table { border-collapse: collapse; width: 100%; }
+    th, td { padding: 4px 8px; border-bottom: 1px solid #ddd; text-align: right; }
+    th:first-child, td:first-child { text-align: left; }
+    .profit { color: #4CAF50; }
+    .loss { color: #F44336; }
+    #live-status { margin-bottom: 8px; color: #555; }
+</style>
+</head>
+<body>
+<div id="live-status">Connecting...</div>
+<table id="live-positions">
+    <thead><tr><th>Symbol</th><th>Quantity</th><th>Average Price</th><th>Last Price</th><th>P&amp;L</th></tr></thead>
+    <tbody></tbody>
+</table>
+<div id="live-pnl" style="height: 300px;"></div>
+<script>
+(function () {
+    var columns = ["symbol", "quantity", "average_price", "last_price", "pnl"];
+    var body = document.querySelector("#live-positions tbody");
+    var statusLine = document.getElementById("live-status");
+    var rows = {};
+    var status = {};
+    
+    function format(column, value) {
+        return column === "symbol" || column === "quantity" ? String(value) : Number(value).toFixed(2);
+    }
+    
+    function upsert(position) {
+        var row = rows[position.symbol];
+        if (!row) {
+            row = body.insertRow();
+            columns.forEach(function () { row.insertCell(); });
+            rows[position.symbol] = row;
+        }
+        columns.forEach(function (column, i) {
+            var text = format(column, position[column]);
+            if (row.cells[i].textContent !== text) {
+                row.cells[i].textContent = text;
+            }
+        });
+        row.cells[4].className = position.pnl < 0 ? "loss" : "profit";
+    }
+    
+    function remove(symbol) {
+        if (rows[symbol]) {
+            rows[symbol].remove();
+            delete rows[symbol];
+        }
+    }
+    
+    function showStatus(updatedAt) {
+        statusLine.textContent = (status.running ? "ACTIVE" : "INACTIVE") +
+            (status.start_time ? " since " + status.start_time : "") +
+            (updatedAt ? " | updated " + updatedAt : "");
+    }
+    
+    function point(pnl) {
+        return new Date(pnl[0] * 1000);
+    }
+    
+    var source = new EventSource(__EVENTS_URL__);
+    
+    source.addEventListener("snapshot", function (event) {
+        var state = JSON.parse(event.data);
+        Object.keys(rows).forEach(remove);
+        state.positions.forEach(upsert);
+        status = state.status;
+        showStatus(state.updated_at);
+        Plotly.react("live-pnl", [{x: state.pnl.map(point), y: state.pnl.map(function (p) { return p[1]; }),
+                                   mode: "lines", name: "P&L"}],
+                     {title: "Live P&L", margin: {t: 40, r: 20, b: 40, l: 60}});
+    });
+    
+    source.addEventListener("delta", function (event) {
+        var delta = JSON.parse(event.data);
+        (delta.upserts || []).forEach(upsert);
+        (delta.removed || []).forEach(remove);
+        if (delta.status) {
+            status = delta.status;
+        }
+        showStatus(delta.updated_at);
+        if (delta.pnl) {
+            Plotly.extendTraces("live-pnl", {x: [[point(delta.pnl)]], y: [[delta.pnl[1]]]}, [0], __MAX_POINTS__);
+        }
+    });
+    
+    source.onerror = function () {
+        statusLine.textContent = "Reconnecting...";
+    };
+})();
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,175 @@
+"""
+Incremental tail reader for log files.
+Returns the last lines of a log by seeking backwards from the end, and on
+later calls reads only the bytes appended since, following rotation by
+RotatingFileHandler.
+"""
+
+import collections
+import logging
+import os
+import threading
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 64 * 1024  # Bytes read per backwards seek
+MAX_CATCH_UP = 1024 * 1024  # Appended bytes above which the tail is re-read from the end instead
+
+
+def read_last_lines(f, end: int, max_lines: int, block_size: int = BLOCK_SIZE):
+    """
+    Read the last complete lines before an offset of a binary file.
+    
+    Args:
+        f: File opened in binary mode
+        end: Offset to read backwards from
+        max_lines: Number of lines to return
+        block_size: Bytes read per seek
+    
+    Returns:
+        Tuple of (lines as bytes, offset after the last complete line, partial last line,
+        whether the lines start at the beginning of the file)
+    """
+    position = end
+    data = b""
+    # One newline more than max_lines guarantees the first kept line is whole
+    while position > 0 and data.count(b"\n") <= max_lines:
+        read_size = min(block_size, position)
+        position -= read_size
+        f.seek(position)
+        data = f.read(read_size) + data
+    
+    complete = data.rfind(b"\n") + 1
+    lines = data[:complete].splitlines(keepends=True)
+    from_start = position == 0 and len(lines) <= max_lines
+    return lines[-max_lines:] if max_lines > 0 else [], position + complete, data[complete:], from_start
+
+
+class _TailState:
+    """Read position and cached last lines of one file."""
+    
+    def __init__(self, max_lines: int):
+        self.identity = None
+        self.offset = 0
+        self.partial = b""
+        self.from_start = False
+        self.lines = collections.deque(maxlen=max_lines)
+
+
+class LogTailReader:
+    """
+    Thread-safe reader for the last lines of log files.
+    
+    The first read of a file seeks backwards from EOF in blocks until it has
+    enough lines. The reader then keeps the file's offset and its last lines,
+    so a refresh reads only what was appended. A rollover is detected by a
+    changed inode or a file shorter than the offset. The rest of the rotated
+    file is read from its backup (path.1) before the new file.
+    """
+    
+    def __init__(self, block_size: int = BLOCK_SIZE, max_catch_up: int = MAX_CATCH_UP):
+        """
+        Initialize the reader.
+        
+        Args:
+            block_size: Bytes read per backwards seek
+            max_catch_up: Appended bytes above which the tail is re-read from the end
+        """
+        self.block_size = block_size
+        self.max_catch_up = max_catch_up
+        self._files: Dict[str, _TailState] = {}
+        self._lock = threading.Lock()
+    
+    def tail(self, path: str, max_lines: int = 100) -> List[str]:
+        """
+        Get the last lines of a file.
+        
+        Args:
+            path: File path
+            max_lines: Maximum number of lines to return
+        
+        Returns:
+            Lines with their line endings, like readlines(), empty if the file does not exist
+        """
+        with self._lock:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                self._files.pop(path, None)
+                return []
+            
+            state = self._files.get(path)
+            if state is not None:
+                self._check_rotation(path, state, stat)
+                if state.lines.maxlen < max_lines:
+                    if state.from_start and len(state.lines) < state.lines.maxlen:
+                        # Every line of the file is cached, so a longer cache needs no re-read
+                        state.lines = collections.deque(state.lines, maxlen=max_lines)
+                    else:
+                        state = None
+                elif stat.st_size - state.offset > self.max_catch_up:
+                    state = None
+            
+            if state is None:
+                state = self._seed(path, stat, max_lines)
+                self._files[path] = state
+            elif stat.st_size != state.offset + len(state.partial):
+                with open(path, "rb") as f:
+                    self._append(state, f, stat.st_size)
+            
+            lines = list(state.lines) + ([state.partial] if state.partial else [])
+            lines = lines[-max_lines:] if max_lines > 0 else []
+            return [line.decode("utf-8", errors="replace") for line in lines]
+    
+    def offsets(self) -> Dict[str, int]:
+        """
+        Get the read offset of every file.
+        
+        Returns:
+            File path -> bytes read up to the last complete line
+        """
+        with self._lock:
+            return {path: state.offset for path, state in self._files.items()}
+    
+    def _seed(self, path: str, stat: os.stat_result, max_lines: int) -> _TailState:
+        state = _TailState(max_lines)
+        state.identity = (stat.st_dev, stat.st_ino)
+        with open(path, "rb") as f:
+            lines, state.offset, state.partial, state.from_start = read_last_lines(
+                f, stat.st_size, max_lines, self.block_size)
+        state.lines.extend(lines)
+        return state
+    
+    def _check_rotation(self, path: str, state: _TailState, stat: os.stat_result) -> None:
+        identity = (stat.st_dev, stat.st_ino)
+        if identity == state.identity and stat.st_size >= state.offset:
+            return
+        logger.debug(f"{path} was rotated, reading from the start of the new file")
+        self._finish_rotated(path, state)
+        state.identity = identity
+        state.offset = 0
+        state.partial = b""
+        state.from_start = False
+    
+    def _append(self, state: _TailState, f, end: int) -> None:
+        f.seek(state.offset)
+        data = f.read(end - state.offset)
+        complete = data.rfind(b"\n") + 1
+        state.lines.extend(data[:complete].splitlines(keepends=True))
+        state.offset += complete
+        state.partial = data[complete:]
+    
+    def _finish_rotated(self, path: str, state: _TailState) -> None:
+        # RotatingFileHandler renames the log to path.1, keeping its inode
+        backup = f"{path}.1"
+        try:
+            stat = os.stat(backup)
+            if (stat.st_dev, stat.st_ino) != state.identity or stat.st_size - state.offset > self.max_catch_up:
+                return
+            with open(backup, "rb") as f:
+                self._append(state, f, stat.st_size)
+            if state.partial:
+                state.lines.append(state.partial)
+        except OSError:
+            pass
@@ -0,0 +1,400 @@
+"""
+Streaming market data client for the mStock tick websocket.
+Keeps a subscription set of instrument tokens, reconnects and resubscribes on
+disconnect, and delivers ticks into an in-process last-price cache.
+"""
+
+import asyncio
+import json
+import logging
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, Iterable, List, Optional
+from urllib.parse import urlencode
+
+import aiohttp
+
+from src.api.mstock_api import MStockAPI
+from config.config import API_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Tick:
+    """
+    Last traded price update for one instrument.
+    """
+    instrument_token: str
+    last_price: float
+    received_at: float  # time.monotonic() when the tick was received
+
+
+class LastPriceCache:
+    """
+    Thread-safe cache of the latest tick per instrument.
+    Listeners are called on the thread that delivers each tick.
+    """
+    
+    def __init__(self):
+        """
+        Initialize the cache.
+        """
+        self._ticks = {}  # Instrument token -> Tick
+        self._listeners = []
+        self._lock = threading.Lock()
+    
+    def update(self, tick: Tick) -> None:
+        """
+        Store a tick and notify listeners.
+        
+        Args:
+            tick: Tick to store
+        """
+        with self._lock:
+            self._ticks[tick.instrument_token] = tick
+            listeners = list(self._listeners)
+        
+        for listener in listeners:
+            try:
+                listener(tick)
+            except Exception as e:
+                logger.error(f"Tick listener failed for {tick.instrument_token}: {str(e)}")
+    
+    def get(self, instrument_token: str) -> Optional[Tick]:
+        """
+        Get the latest tick for an instrument.
+        
+        Args:
+            instrument_token: Instrument token
+        
+        Returns:
+            Tick or None if no tick has been received
+        """
+        with self._lock:
+            return self._ticks.get(instrument_token)
+    
+    def get_price(self, instrument_token: str, max_age: float = None) -> Optional[float]:
+        """
+        Get the last traded price for an instrument.
+        
+        Args:
+            instrument_token: Instrument token
+            max_age: Ignore ticks older than this many seconds
+        
+        Returns:
+            Last traded price or None if unknown or stale
+        """
+        tick = self.get(instrument_token)
+        if tick is None:
+            return None
+        if max_age is not None and time.monotonic() - tick.received_at > max_age:
+            return None
+        return tick.last_price
+    
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Get the last traded price of every cached instrument.
+        
+        Returns:
+            Dictionary of instrument token -> last traded price
+        """
+        with self._lock:
+            return {token: tick.last_price for token, tick in self._ticks.items()}
+    
+    def add_listener(self, listener: Callable[[Tick], None]) -> None:
+        """
+        Register a callback for every tick.
+        
+        Args:
+            listener: Callable taking a Tick
+        """
+        with self._lock:
+            self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[Tick], None]) -> None:
+        """
+        Unregister a tick callback.
+        
+        Args:
+            listener: Callback previously passed to add_listener
+        """
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+
+def parse_binary_ticks(data: bytes, received_at: float = None) -> List[Tick]:
+    """
+    Parse a binary tick frame.
+    
+    A frame starts with a 2-byte packet count, followed by packets each prefixed
+    with a 2-byte length. Every packet starts with the instrument token and the
+    last traded price in paise as big-endian 32-bit integers; longer quote and
+    full packets carry more fields after these, which are ignored here.
+    
+    Args:
+        data: Binary websocket message
+        received_at: Receive time, defaults to now
+    
+    Returns:
+        List of ticks (empty for heartbeats)
+    """
+    if received_at is None:
+        received_at = time.monotonic()
+    
+    ticks = []
+    if len(data) < 2:
+        return ticks  # Heartbeat
+    
+    count = struct.unpack_from(">H", data, 0)[0]
+    offset = 2
+    for _ in range(count):
+        if offset + 2 > len(data):
+            break
+        length = struct.unpack_from(">H", data, offset)[0]
+        offset += 2
+        if length >= 8 and offset + length <= len(data):
+            token, last_price = struct.unpack_from(">iI", data, offset)
+            ticks.append(Tick(instrument_token=str(token), last_price=last_price / 100.0, received_at=received_at))
+        offset += length
+    
+    return ticks
+
+
+class MarketDataStream:
+    """
+    Websocket tick client running on a background thread.
+    
+    The subscription set can be changed from any thread; changes are sent to
+    the server immediately when connected and the full set is resent after
+    every reconnect.
+    """
+    
+    def __init__(self, api: MStockAPI, cache: LastPriceCache = None, url: str = None, mode: str = None):
+        """
+        Initialize the stream.
+        
+        Args:
+            api: Logged-in MStockAPI client, used for the API key and access token
+            cache: Cache to deliver ticks into, a new one is created if not provided
+            url: Websocket URL, defaults to the client's ws_url
+            mode: Stream mode (ltp, quote or full), defaults to API_CONFIG
+        """
+        self.api = api
+        self.cache = cache if cache is not None else LastPriceCache()
+        self.url = url or api.ws_url
+        self.mode = mode or API_CONFIG["stream_mode"]
+        self.reconnect_count = 0
+        
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._loop = None
+        self._ws = None
+        self._stop = None
+        self._connected = threading.Event()
+    
+    @property
+    def subscriptions(self) -> frozenset:
+        with self._lock:
+            return frozenset(self._subscriptions)
+    
+    @property
+    def is_connected(self) -> bool:
+        return self._connected.is_set()
+    
+    def _build_url(self) -> str:
+        url = self.url
+        if url.startswith("https://"):
+            url = "wss://" + url[len("https://"):]
+        elif url.startswith("http://"):
+            url = "ws://" + url[len("http://"):]
+        
+        query = urlencode({"API_KEY": self.api.api_key, "ACCESS_TOKEN": self.api.access_token or ""})
+        return f"{url}{'&' if '?' in url else '?'}{query}"
+    
+    @staticmethod
+    def _wire_tokens(tokens: Iterable[str]) -> List[Any]:
+        return [int(token) if str(token).isdigit() else token for token in sorted(tokens)]
+    
+    def subscribe(self, tokens: Iterable[str]) -> None:
+        """
+        Add instruments to the subscription set.
+        
+        Args:
+            tokens: Instrument tokens
+        """
+        with self._lock:
+            added = set(map(str, tokens)) - self._subscriptions
+            self._subscriptions |= added
+        if added:
+            self._send_threadsafe(self._send_subscribe(added))
+    
+    def unsubscribe(self, tokens: Iterable[str]) -> None:
+        """
+        Remove instruments from the subscription set.
+        
+        Args:
+            tokens: Instrument tokens
+        """
+        with self._lock:
+            removed = set(map(str, tokens)) & self._subscriptions
+            self._subscriptions -= removed
+        if removed:
+            self._send_threadsafe(self._send_message({"a": "unsubscribe", "v": self._wire_tokens(removed)}))
+    
+    def set_subscriptions(self, tokens: Iterable[str]) -> None:
+        """
+        Replace the subscription set, sending only the difference.
+        
+        Args:
+            tokens: Instrument tokens that should be subscribed
+        """
+        wanted = {str(token) for token in tokens if token}
+        current = self.subscriptions
+        self.unsubscribe(current - wanted)
+        self.subscribe(wanted - current)
+    
+    def start(self) -> None:
+        """
+        Start streaming on a background thread.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="market-data-stream", daemon=True)
+        self._thread.start()
+        ready.wait()
+    
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop streaming and wait for the background thread to exit.
+        
+        Args:
+            timeout: Seconds to wait for the thread
+        """
+        if self._thread is None:
+            return
+        
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def wait_until_connected(self, timeout: float = None) -> bool:
+        """
+        Block until the stream is connected.
+        
+        Args:
+            timeout: Seconds to wait
+        
+        Returns:
+            True if connected, False on timeout
+        """
+        return self._connected.wait(timeout)
+    
+    def _send_threadsafe(self, coroutine) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed() or not self.is_connected:
+            coroutine.close()  # Sent with the full set on (re)connect
+            return
+        asyncio.run_coroutine_threadsafe(coroutine, loop)
+    
+    async def _send_message(self, message: Dict[str, Any]) -> None:
+        ws = self._ws
+        if ws is None or ws.closed:
+            return
+        try:
+            await ws.send_str(json.dumps(message))
+        except (aiohttp.ClientError, ConnectionError) as e:
+            logger.warning(f"Failed to send stream message: {str(e)}")
+    
+    async def _send_subscribe(self, tokens: Iterable[str]) -> None:
+        tokens = self._wire_tokens(tokens)
+        if not tokens:
+            return
+        await self._send_message({"a": "subscribe", "v": tokens})
+        await self._send_message({"a": "mode", "v": [self.mode, tokens]})
+    
+    def _run(self, ready: threading.Event) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._stop = asyncio.Event()
+        ready.set()
+        try:
+            self._loop.run_until_complete(self._stream())
+        finally:
+            self._loop.close()
+    
+    async def _stream(self) -> None:
+        delay = API_CONFIG["stream_reconnect_delay"]
+        
+        timeout = aiohttp.ClientTimeout(sock_connect=API_CONFIG["connect_timeout"])
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            while not self._stop.is_set():
+                try:
+                    async with session.ws_connect(self._build_url(), heartbeat=API_CONFIG["stream_heartbeat"]) as ws:
+                        self._ws = ws
+                        self._connected.set()
+                        delay = API_CONFIG["stream_reconnect_delay"]
+                        logger.info(f"Market data stream connected, subscribing {len(self.subscriptions)} instruments")
+                        await self._send_subscribe(self.subscriptions)
+                        await self._receive(ws)
+                except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                    logger.warning(f"Market data stream error: {str(e)}")
+                finally:
+                    self._ws = None
+                    self._connected.clear()
+                
+                if self._stop.is_set():
+                    break
+                
+                self.reconnect_count += 1
+                logger.info(f"Reconnecting market data stream in {delay:.1f}s")
+                try:
+                    await asyncio.wait_for(self._stop.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                delay = min(delay * 2, API_CONFIG["stream_max_reconnect_delay"])
+    
+    async def _receive(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        stop_task = asyncio.ensure_future(self._stop.wait())
+        try:
+            while True:
+                receive_task = asyncio.ensure_future(ws.receive())
+                done, _ = await asyncio.wait({receive_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+                if stop_task in done:
+                    receive_task.cancel()
+                    await ws.close()
+                    return
+                
+                message = receive_task.result()
+                if message.type == aiohttp.WSMsgType.BINARY:
+                    for tick in parse_binary_ticks(message.data):
+                        self.cache.update(tick)
+                elif message.type == aiohttp.WSMsgType.TEXT:
+                    self._handle_text(message.data)
+                elif message.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSING,
+                                      aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    logger.warning("Market data stream closed by server")
+                    return
+        finally:
+            stop_task.cancel()
+    
+    def _handle_text(self, data: str) -> None:
+        try:
+            message = json.loads(data)
+        except ValueError:
+            logger.warning(f"Unexpected stream message: {data[:200]}")
+            return
+        
+        if not isinstance(message, dict):
+            logger.warning(f"Unexpected stream message: {data[:200]}")
+            return
+        
+        if message.get("type") == "error":
+            logger.error(f"Market data stream error: {message.get('data')}")
@@ -9,6 +9,11 @@ import time
 import logging
 from typing import Dict, Any, Optional, List, Tuple
 
+from src.api.http_session import get_default_timeout, get_session_stats
+from src.api.rate_limiter import RateLimiter, RateLimitTimeout, endpoint_class, get_rate_limiter
+from src.utils.resilience import BreakerRegistry, TransientError, call_with_retry, endpoint_name
+from src.api.transport import create_configured_session
+from src.api.session_manager import OTPProvider, SessionManager, create_otp_provider, get_session_manager
 from config.config import API_CONFIG
 
 logger = logging.getLogger(__name__)
@@ -19,7 +24,10 @@ class MStockAPI:
     Handles authentication, session management, and API requests.
     """
     
-    def __init__(self, api_key: str, username: str, password: str):
+    def __init__(self, api_key: str, username: str, password: str,
+                 session: Optional[requests.Session] = None, rate_limiter: Optional[RateLimiter] = None,
+                 breakers: Optional[BreakerRegistry] = None, otp_provider: Optional[OTPProvider] = None,
+                 session_manager: Optional[SessionManager] = None):
         """
         Initialize the MStockAPI client.
         
@@ -27,6 +35,13 @@ class MStockAPI:
             api_key: API key for authentication
             username: mStock account username
             password: mStock account password
+            session: HTTP session to use, defaults to a pooled keep-alive session,
+                recording or replaying as set by API_CONFIG["transport_mode"]
+            rate_limiter: Rate limiter to queue requests on, defaults to the process-wide limiter
+            breakers: Circuit breakers per endpoint, defaults to a new registry for this client
+            otp_provider: Source of the login OTP, defaults to SESSION_CONFIG["otp_provider"]
+            session_manager: Store for the access token across restarts, defaults to
+                SESSION_CONFIG, None there disables persistence
         """
         self.api_key = api_key
         self.username = username
@@ -38,14 +53,139 @@ class MStockAPI:
         }
         self.base_url = API_CONFIG["api_url"]
         self.ws_url = API_CONFIG["ws_url"]
+        self.session = session if session is not None else create_configured_session()
+        self.timeout = get_default_timeout()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter()
+        self.breakers = breakers if breakers is not None else BreakerRegistry()
+        self.otp_provider = otp_provider if otp_provider is not None else create_otp_provider()
+        self.session_manager = session_manager if session_manager is not None else get_session_manager()
+    
+    def _throttle(self, url: str) -> None:
+        """
+        Wait until the rate limiter lets a request to url through.
         
-    def login(self) -> bool:
+        Args:
+            url: Request URL
+        
+        Raises:
+            RateLimitTimeout: If the request waited longer than allowed
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(endpoint_class(url))
+    
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the rate limiter and the endpoint's circuit breaker.
+        
+        GET requests are retried with jittered backoff on connection errors,
+        timeouts and 429 or 5xx responses, within RESILIENCE_CONFIG["call_budget"].
+        Orders and other POST requests are sent once, since a retry could
+        duplicate them.
+        
+        Args:
+            method: GET or POST
+            url: Request URL
+            **kwargs: Session request arguments (headers, data)
+        
+        Returns:
+            Response of the last attempt
+        
+        Raises:
+            CircuitOpenError: If the endpoint's breaker is open
+            RateLimitTimeout: If the request waited longer than allowed for the rate limiter
+        """
+        send = self.session.get if method == "GET" else self.session.post
+        
+        def attempt(remaining: float) -> requests.Response:
+            self._throttle(url)
+            # Never wait on the socket past the call's budget
+            timeout = tuple(min(limit, max(remaining, 0.001)) for limit in self.timeout)
+            response = send(url, timeout=timeout, **kwargs)
+            self._on_response(response)
+            if response.status_code == 429 or response.status_code >= 500:
+                raise TransientError(f"HTTP {response.status_code} from {endpoint_name(url)}", response)
+            return response
+        
+        breaker = self.breakers.get(endpoint_name(url)) if self.breakers is not None else None
+        return call_with_retry(attempt, breaker, retry=method == "GET", passthrough=(RateLimitTimeout,))
+    
+    def _on_response(self, response: requests.Response) -> None:
+        # Broker throttling pauses the whole endpoint class, not just this request
+        if response.status_code == 429 and self.rate_limiter is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            try:
+                pause = float(retry_after)
+            except ValueError:
+                pause = None
+            self.rate_limiter.throttle(endpoint_class(response.url), pause)
+        
+    def _set_access_token(self, access_token: Optional[str]) -> None:
+        """
+        Use an access token for subsequent requests.
+        
+        Args:
+            access_token: Access token, None to drop the current one
+        """
+        self.access_token = access_token
+        if access_token is None:
+            self.headers.pop("Authorization", None)
+        else:
+            self.headers["Authorization"] = f"token {self.api_key}:{access_token}"
+    
+    def restore_session(self) -> bool:
+        """
+        Reuse the access token saved by an earlier login, if it is still valid.
+        
+        The token is checked with a fund summary request, so a token the broker
+        has revoked is not used.
+        
+        Returns:
+            bool: True if a saved token was restored, False otherwise
+        """
+        if self.session_manager is None:
+            return False
+        access_token = self.session_manager.load(self.base_url, self.api_key, self.username)
+        if access_token is None:
+            return False
+        
+        self._set_access_token(access_token)
+        try:
+            url = f"{self.base_url}/openapi/typea/fund/summary"
+            response = self._send("GET", url, headers=self.headers)
+            if response.status_code == 200 and response.json()["status"] == "success":
+                logger.info("Restored saved session")
+                return True
+            logger.info(f"Saved session rejected: {response.text}")
+        except Exception as e:
+            logger.warning(f"Could not validate saved session: {str(e)}")
+        self._set_access_token(None)
+        return False
+    
+    def clear_session(self) -> None:
+        """
+        Drop the access token and remove it from the session file.
+        """
+        self._set_access_token(None)
+        if self.session_manager is not None:
+            self.session_manager.clear(self.base_url, self.username)
+    
+    def login(self, force: bool = False) -> bool:
         """
         Login to mStock API and generate access token.
         
+        A saved, still valid access token is reused without a new OTP unless
+        force is set. Otherwise the OTP comes from the client's OTP provider and
+        the new token is saved for the next start.
+        
+        Args:
+            force: Log in again even if a saved token is valid
+        
         Returns:
             bool: True if login successful, False otherwise
         """
+        if not force and self.restore_session():
+            return True
+        
         try:
             # Step 1: Login with username and password to get OTP
             login_url = f"{self.base_url}/openapi/typea/connect/login"
@@ -54,7 +194,7 @@ class MStockAPI:
                 "password": self.password
             }
             
-            response = requests.post(login_url, headers=self.headers, data=login_data)
+            response = self._send("POST", login_url, headers=self.headers, data=login_data)
             if response.status_code != 200:
                 logger.error(f"Login failed: {response.text}")
                 return False
@@ -64,8 +204,11 @@ class MStockAPI:
                 logger.error(f"Login failed: {login_response['message']}")
                 return False
             
-            # Step 2: Get OTP from user (in production, this would be automated)
-            otp = input("Enter the OTP sent to your registered mobile number: ")
+            # Step 2: Get OTP from the configured provider
+            otp = self.otp_provider.get_otp(self.username)
+            if not otp:
+                logger.error("Login failed: no OTP available")
+                return False
             
             # Step 3: Generate session token
             session_url = f"{self.base_url}/openapi/typea/session/token"
@@ -75,7 +218,7 @@ class MStockAPI:
                 "checksum": "L"  # This might need to be calculated based on API documentation
             }
             
-            response = requests.post(session_url, headers=self.headers, data=session_data)
+            response = self._send("POST", session_url, headers=self.headers, data=session_data)
             if response.status_code != 200:
                 logger.error(f"Session token generation failed: {response.text}")
                 return False
@@ -85,11 +228,10 @@ class MStockAPI:
                 logger.error(f"Session token generation failed: {session_response['message']}")
                 return False
             
-            # Save access token
-            self.access_token = session_response["data"]["access_token"]
-            
-            # Update headers with authorization
-            self.headers["Authorization"] = f"token {self.api_key}:{self.access_token}"
+            # Use the access token and keep it for the next start
+            self._set_access_token(session_response["data"]["access_token"])
+            if self.session_manager is not None:
+                self.session_manager.save(self.base_url, self.api_key, self.username, self.access_token)
             
             logger.info("Login successful")
             return True
@@ -107,7 +249,7 @@ class MStockAPI:
         """
         try:
             url = f"{self.base_url}/openapi/typea/portfolio/positions"
-            response = requests.get(url, headers=self.headers)
+            response = self._send("GET", url, headers=self.headers)
             
             if response.status_code != 200:
                 logger.error(f"Failed to get positions: {response.text}")
@@ -133,7 +275,7 @@ class MStockAPI:
         """
         try:
             url = f"{self.base_url}/openapi/typea/getoptionchainmaster/2"  # 2 is for NSE
-            response = requests.get(url, headers=self.headers)
+            response = self._send("GET", url, headers=self.headers)
             
             if response.status_code != 200:
                 logger.error(f"Failed to get option chain master: {response.text}")
@@ -163,7 +305,7 @@ class MStockAPI:
         """
         try:
             url = f"{self.base_url}/openapi/typea/GetOptionChain/2/{expiry_timestamp}/{token}"
-            response = requests.get(url, headers=self.headers)
+            response = self._send("GET", url, headers=self.headers)
             
             if response.status_code != 200:
                 logger.error(f"Failed to get option chain: {response.text}")
@@ -192,7 +334,7 @@ class MStockAPI:
         """
         try:
             url = f"{self.base_url}/openapi/typea/order/place"
-            response = requests.post(url, headers=self.headers, data=order_params)
+            response = self._send("POST", url, headers=self.headers, data=order_params)
             
             if response.status_code != 200:
                 logger.error(f"Failed to place order: {response.text}")
@@ -224,7 +366,7 @@ class MStockAPI:
             url = f"{self.base_url}/openapi/typea/order/modify"
             order_params["order_id"] = order_id
             
-            response = requests.post(url, headers=self.headers, data=order_params)
+            response = self._send("POST", url, headers=self.headers, data=order_params)
             
             if response.status_code != 200:
                 logger.error(f"Failed to modify order: {response.text}")
@@ -255,7 +397,7 @@ class MStockAPI:
             url = f"{self.base_url}/openapi/typea/order/cancel"
             data = {"order_id": order_id}
             
-            response = requests.post(url, headers=self.headers, data=data)
+            response = self._send("POST", url, headers=self.headers, data=data)
             
             if response.status_code != 200:
                 logger.error(f"Failed to cancel order: {response.text}")
@@ -281,7 +423,7 @@ class MStockAPI:
         """
         try:
             url = f"{self.base_url}/openapi/typea/order/history"
-            response = requests.get(url, headers=self.headers)
+            response = self._send("GET", url, headers=self.headers)
             
             if response.status_code != 200:
                 logger.error(f"Failed to get order history: {response.text}")
@@ -307,7 +449,7 @@ class MStockAPI:
         """
         try:
             url = f"{self.base_url}/openapi/typea/fund/summary"
-            response = requests.get(url, headers=self.headers)
+            response = self._send("GET", url, headers=self.headers)
             
             if response.status_code != 200:
                 logger.error(f"Failed to get fund summary: {response.text}")
@@ -323,3 +465,55 @@ class MStockAPI:
         except Exception as e:
             logger.error(f"Get fund summary error: {str(e)}")
             return None
+    
+    def endpoint_available(self, endpoint: str) -> bool:
+        """
+        Check whether an endpoint's circuit breaker lets calls through.
+        
+        Args:
+            endpoint: Endpoint name, e.g. GetOptionChain or portfolio/positions
+        
+        Returns:
+            False while the endpoint is failing and calls fail fast, True otherwise
+        """
+        if self.breakers is None:
+            return True
+        return self.breakers.is_available(endpoint)
+    
+    def get_breaker_states(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Get circuit breaker states.
+        
+        Returns:
+            Endpoint name -> state and failure counters, or None if breakers are disabled
+        """
+        if self.breakers is None:
+            return None
+        return self.breakers.states()
+    
+    def get_pool_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get connection pool statistics for the HTTP session.
+        
+        Returns:
+            Dictionary with request count, new connections, reuse ratio and pool waits,
+            or None if the session is not pooled
+        """
+        return get_session_stats(self.session)
+    
+    def get_rate_limit_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get rate limiter statistics.
+        
+        Returns:
+            Bucket name -> queue depth, wait times and counters, or None if rate limiting is disabled
+        """
+        if self.rate_limiter is None:
+            return None
+        return self.rate_limiter.stats()
+    
+    def close(self) -> None:
+        """
+        Close the HTTP session and release pooled connections.
+        """
+        self.session.close()
@@ -2,8 +2,9 @@
 Option chain model for representing option chain data.
 """
 
-from dataclasses import dataclass
-from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+import bisect
 import datetime
 
 
@@ -26,6 +27,149 @@ class OptionContract:
     ask_price: float
     ask_quantity: int
     underlying_price: float
+    
+    @classmethod
+    def from_api_response(cls, response: Dict[str, Any], option_type: str,
+                          expiry_date: datetime.datetime, underlying_price: float) -> 'OptionContract':
+        """
+        Create an OptionContract object from one option chain entry.
+        
+        Args:
+            response: Contract entry from the option chain response
+            option_type: Option type (CE or PE)
+            expiry_date: Expiry date for the contract
+            underlying_price: Spot price of the underlying
+        
+        Returns:
+            OptionContract object
+        """
+        return cls(
+            symbol=response.get("sym", ""),
+            strike_price=float(response.get("strikePrice", 0)),
+            expiry_date=expiry_date,
+            option_type=option_type,
+            instrument_token=response.get("token", ""),
+            last_price=float(response.get("lastPrice", 0)),
+            change=float(response.get("change", 0)),
+            open_interest=int(response.get("openInterest", 0)),
+            volume=int(response.get("volume", 0)),
+            bid_price=float(response.get("bidPrice", 0)),
+            bid_quantity=int(response.get("bidQty", 0)),
+            ask_price=float(response.get("askPrice", 0)),
+            ask_quantity=int(response.get("askQty", 0)),
+            underlying_price=underlying_price
+        )
+
+
+class StrikeIndex:
+    """
+    Sorted strike index over one side of an option chain.
+    Supports exact, nearest and directional strike lookups in logarithmic time.
+    """
+    
+    def __init__(self, contracts: List[OptionContract]):
+        """
+        Build the index.
+        
+        Args:
+            contracts: Option contracts of a single type
+        """
+        self.contracts = sorted(contracts, key=lambda contract: contract.strike_price)
+        self.strikes = [contract.strike_price for contract in self.contracts]
+    
+    def __len__(self) -> int:
+        return len(self.strikes)
+    
+    def find(self, strike_price: float, tolerance: float = 0.01) -> Optional[OptionContract]:
+        """
+        Find the contract at a strike price.
+        
+        Args:
+            strike_price: Strike price to find
+            tolerance: Allowed difference for floating point strikes
+        
+        Returns:
+            OptionContract if found, None otherwise
+        """
+        index = bisect.bisect_left(self.strikes, strike_price - tolerance)
+        if index < len(self.strikes) and abs(self.strikes[index] - strike_price) < tolerance:
+            return self.contracts[index]
+        return None
+    
+    def nearest(self, strike_price: float) -> Optional[OptionContract]:
+        """
+        Find the contract with the strike closest to a price (lower strike on ties).
+        
+        Args:
+            strike_price: Target strike price
+        
+        Returns:
+            OptionContract or None if the index is empty
+        """
+        if not self.strikes:
+            return None
+        
+        index = bisect.bisect_left(self.strikes, strike_price)
+        if index == 0:
+            return self.contracts[0]
+        if index == len(self.strikes):
+            return self.contracts[-1]
+        
+        before = self.strikes[index - 1]
+        after = self.strikes[index]
+        return self.contracts[index] if after - strike_price < strike_price - before else self.contracts[index - 1]
+    
+    def ceil(self, strike_price: float) -> Optional[OptionContract]:
+        """
+        Find the first contract with strike greater than or equal to a price.
+        
+        Args:
+            strike_price: Lower bound
+        
+        Returns:
+            OptionContract or None if no strike qualifies
+        """
+        index = bisect.bisect_left(self.strikes, strike_price)
+        return self.contracts[index] if index < len(self.strikes) else None
+    
+    def floor(self, strike_price: float) -> Optional[OptionContract]:
+        """
+        Find the last contract with strike less than or equal to a price.
+        
+        Args:
+            strike_price: Upper bound
+        
+        Returns:
+            OptionContract or None if no strike qualifies
+        """
+        index = bisect.bisect_right(self.strikes, strike_price)
+        return self.contracts[index - 1] if index > 0 else None
+    
+    def above(self, strike_price: float) -> Optional[OptionContract]:
+        """
+        Find the first contract with strike strictly greater than a price.
+        
+        Args:
+            strike_price: Exclusive lower bound
+        
+        Returns:
+            OptionContract or None if no strike qualifies
+        """
+        index = bisect.bisect_right(self.strikes, strike_price)
+        return self.contracts[index] if index < len(self.strikes) else None
+    
+    def below(self, strike_price: float) -> Optional[OptionContract]:
+        """
+        Find the last contract with strike strictly less than a price.
+        
+        Args:
+            strike_price: Exclusive upper bound
+        
+        Returns:
+            OptionContract or None if no strike qualifies
+        """
+        index = bisect.bisect_left(self.strikes, strike_price)
+        return self.contracts[index - 1] if index > 0 else None
 
 
 @dataclass
@@ -38,6 +182,29 @@ class OptionChain:
     expiry_date: datetime.datetime
     calls: List[OptionContract]
     puts: List[OptionContract]
+    _strike_indexes: Dict[str, Tuple[List[OptionContract], int, StrikeIndex]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    
+    def strike_index(self, option_type: str) -> StrikeIndex:
+        """
+        Get the sorted strike index for calls or puts, building it on first use.
+        
+        The index is rebuilt if the contract list is replaced or changes length.
+        
+        Args:
+            option_type: Option type (CE or PE)
+        
+        Returns:
+            StrikeIndex for the requested side
+        """
+        contracts = self.calls if option_type == "CE" else self.puts
+        cached = self._strike_indexes.get(option_type)
+        # Hold the list itself, an id() could be reused by a new list after the old one is freed
+        if cached is None or cached[0] is not contracts or cached[1] != len(contracts):
+            cached = (contracts, len(contracts), StrikeIndex(contracts))
+            self._strike_indexes[option_type] = cached
+        return cached[2]
     
     @classmethod
     def from_api_response(cls, response: Dict[str, Any], expiry_date: datetime.datetime) -> 'OptionChain':
@@ -47,7 +214,7 @@ class OptionChain:
         Args:
             response: API response dictionary
             expiry_date: Expiry date for the option chain
-            
+        
         Returns:
             OptionChain object
         """
@@ -64,44 +231,12 @@ class OptionChain:
             spot_price = float(contract_model.get("spotPrice", 0))
             
             # Process call options
-            if "ce" in contract_model:
-                for ce_data in contract_model["ce"]:
-                    calls.append(OptionContract(
-                        symbol=ce_data.get("sym", ""),
-                        strike_price=float(ce_data.get("strikePrice", 0)),
-                        expiry_date=expiry_date,
-                        option_type="CE",
-                        instrument_token=ce_data.get("token", ""),
-                        last_price=float(ce_data.get("lastPrice", 0)),
-                        change=float(ce_data.get("change", 0)),
-                        open_interest=int(ce_data.get("openInterest", 0)),
-                        volume=int(ce_data.get("volume", 0)),
-                        bid_price=float(ce_data.get("bidPrice", 0)),
-                        bid_quantity=int(ce_data.get("bidQty", 0)),
-                        ask_price=float(ce_data.get("askPrice", 0)),
-                        ask_quantity=int(ce_data.get("askQty", 0)),
-                        underlying_price=spot_price
-                    ))
+            for ce_data in contract_model.get("ce", []):
+                calls.append(OptionContract.from_api_response(ce_data, "CE", expiry_date, spot_price))
             
             # Process put options
-            if "pe" in contract_model:
-                for pe_data in contract_model["pe"]:
-                    puts.append(OptionContract(
-                        symbol=pe_data.get("sym", ""),
-                        strike_price=float(pe_data.get("strikePrice", 0)),
-                        expiry_date=expiry_date,
-                        option_type="PE",
-                        instrument_token=pe_data.get("token", ""),
-                        last_price=float(pe_data.get("lastPrice", 0)),
-                        change=float(pe_data.get("change", 0)),
-                        open_interest=int(pe_data.get("openInterest", 0)),
-                        volume=int(pe_data.get("volume", 0)),
-                        bid_price=float(pe_data.get("bidPrice", 0)),
-                        bid_quantity=int(pe_data.get("bidQty", 0)),
-                        ask_price=float(pe_data.get("askPrice", 0)),
-                        ask_quantity=int(pe_data.get("askQty", 0)),
-                        underlying_price=spot_price
-                    ))
+            for pe_data in contract_model.get("pe", []):
+                puts.append(OptionContract.from_api_response(pe_data, "PE", expiry_date, spot_price))
         
         return cls(
             underlying=underlying,
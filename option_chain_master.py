@@ -0,0 +1,128 @@
+"""
+Option chain master model and cache.
+Indexes the master payload once so token and expiry lookups are constant time.
+"""
+
+import datetime
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional
+
+from src.api.mstock_api import MStockAPI
+from config.config import API_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OptionChainMaster:
+    """
+    Parsed option chain master with prebuilt lookup indexes.
+    """
+    tokens: Dict[str, Dict[str, str]] = field(default_factory=dict)  # Segment -> symbol -> token
+    expiry_timestamps: Dict[datetime.date, int] = field(default_factory=dict)  # Expiry date -> timestamp
+    
+    @classmethod
+    def from_api_response(cls, response: Dict[str, Any]) -> 'OptionChainMaster':
+        """
+        Create an OptionChainMaster object from API response.
+        
+        Args:
+            response: Option chain master data
+        
+        Returns:
+            OptionChainMaster object
+        """
+        tokens = {}
+        for segment, items in response.items():
+            if not isinstance(items, list):
+                continue
+            
+            segment_tokens = tokens.setdefault(segment, {})
+            for item in items:
+                parts = str(item).split(",")
+                if len(parts) >= 2:
+                    # Keep the first entry for a symbol, matching the original linear scan
+                    segment_tokens.setdefault(parts[0], parts[1])
+        
+        expiry_timestamps = {}
+        for timestamp in response.get("dctExp", {}).values():
+            expiry_date = datetime.datetime.fromtimestamp(timestamp).date()
+            expiry_timestamps.setdefault(expiry_date, timestamp)
+        
+        return cls(tokens=tokens, expiry_timestamps=expiry_timestamps)
+    
+    def get_token(self, symbol: str, segment: str = "OPTIDX") -> Optional[str]:
+        """
+        Get the instrument token for a symbol.
+        
+        Args:
+            symbol: Underlying symbol (e.g. NIFTY)
+            segment: Master segment to search
+        
+        Returns:
+            Instrument token or None if not found
+        """
+        return self.tokens.get(segment, {}).get(symbol)
+    
+    def get_expiry_timestamp(self, expiry_date: datetime.date) -> Optional[int]:
+        """
+        Get the expiry timestamp for an expiry date.
+        
+        Args:
+            expiry_date: Expiry date
+        
+        Returns:
+            Expiry timestamp or None if not found
+        """
+        return self.expiry_timestamps.get(expiry_date)
+
+
+class OptionChainMasterCache:
+    """
+    Time-based cache for the option chain master.
+    """
+    
+    def __init__(self, api: MStockAPI, ttl: float = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            api: MStockAPI client
+            ttl: Time to live in seconds
+        """
+        self.api = api
+        self.ttl = API_CONFIG["option_chain_master_ttl"] if ttl is None else ttl
+        self._master = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+    
+    def get(self) -> Optional[OptionChainMaster]:
+        """
+        Get the option chain master, fetching it if the cache is empty or expired.
+        
+        Returns:
+            OptionChainMaster object or None if request fails
+        """
+        with self._lock:
+            if self._master is not None and time.monotonic() - self._fetched_at < self.ttl:
+                return self._master
+            
+            master_data = self.api.get_option_chain_master()
+            if master_data is None:
+                logger.error("Failed to fetch option chain master")
+                return None
+            
+            self._master = OptionChainMaster.from_api_response(master_data)
+            self._fetched_at = time.monotonic()
+            return self._master
+    
+    def invalidate(self) -> None:
+        """
+        Drop the cached master so the next lookup fetches it again.
+        """
+        with self._lock:
+            self._master = None
+            self._fetched_at = 0.0
@@ -6,7 +6,11 @@ from typing import Dict, Any, List, Tuple, Optional
 import math
 import datetime
 
+import numpy as np
+
 from src.models.option_chain import OptionContract, OptionChain
+from src.models.columnar_chain import ColumnarOptionChain
+from src.utils.greeks import compute_chain_greeks
 from config.config import STRATEGY_CONFIG
 
 
@@ -42,19 +46,55 @@ def find_strike_prices_for_strangle(option_chain: OptionChain, distance: int = N
     if distance is None:
         distance = STRATEGY_CONFIG["strangle_distance"]
     
+    if isinstance(option_chain, ColumnarOptionChain):
+        return option_chain.find_strike_prices_for_strangle(distance)
+    
     spot_price = option_chain.spot_price
+    call_index = option_chain.strike_index("CE")
+    put_index = option_chain.strike_index("PE")
     
-    # Find call strike at least 'distance' points above spot price
-    call_strikes = sorted([contract.strike_price for contract in option_chain.calls])
-    put_strikes = sorted([contract.strike_price for contract in option_chain.puts], reverse=True)
+    # Find call strike at least 'distance' points above spot price, else the highest strike
+    call_contract = call_index.ceil(spot_price + distance) or call_index.contracts[-1]
+    # Find put strike at least 'distance' points below spot price, else the lowest strike
+    put_contract = put_index.floor(spot_price - distance) or put_index.contracts[0]
     
-    call_strike = next((strike for strike in call_strikes if strike >= spot_price + distance), call_strikes[-1])
-    put_strike = next((strike for strike in put_strikes if strike <= spot_price - distance), put_strikes[-1])
+    return call_contract.strike_price, put_contract.strike_price
+
+
+def find_strike_prices_by_delta(option_chain: OptionChain, target_delta: float = None,
+                                as_of: datetime.datetime = None) -> Tuple[float, float]:
+    """
+    Find short strangle strike prices whose delta is closest to a target.
+    
+    Falls back to distance-based selection if no implied volatility can be solved
+    for one of the sides.
+    
+    Args:
+        option_chain: Option chain data
+        target_delta: Absolute target delta for both legs
+        as_of: Valuation time, defaults to now
+        
+    Returns:
+        Tuple of (call_strike, put_strike)
+    """
+    if target_delta is None:
+        target_delta = STRATEGY_CONFIG["target_delta"]
+    
+    greeks = compute_chain_greeks(option_chain, as_of)
+    call_distance = np.abs(greeks.calls.delta - target_delta)
+    put_distance = np.abs(greeks.puts.delta + target_delta)
+    
+    if np.all(np.isnan(call_distance)) or np.all(np.isnan(put_distance)):
+        return find_strike_prices_for_strangle(option_chain)
+    
+    call_strike = float(greeks.calls.strike[np.nanargmin(call_distance)])
+    put_strike = float(greeks.puts.strike[np.nanargmin(put_distance)])
     
     return call_strike, put_strike
 
 
-def find_option_contract(option_chain: OptionChain, strike_price: float, option_type: str) -> Optional[OptionContract]:
+def find_option_contract(option_chain: OptionChain, strike_price: float, option_type: str,
+                         nearest: bool = False) -> Optional[OptionContract]:
     """
     Find an option contract with the specified strike price and type.
     
@@ -62,17 +102,16 @@ def find_option_contract(option_chain: OptionChain, strike_price: float, option_
         option_chain: Option chain data
         strike_price: Strike price to find
         option_type: Option type (CE or PE)
+        nearest: Return the contract with the closest listed strike instead of an exact match
         
     Returns:
         OptionContract if found, None otherwise
     """
-    contracts = option_chain.calls if option_type == "CE" else option_chain.puts
-    
-    for contract in contracts:
-        if abs(contract.strike_price - strike_price) < 0.01:  # Allow for small floating point differences
-            return contract
+    if isinstance(option_chain, ColumnarOptionChain):
+        return option_chain.find_option_contract(strike_price, option_type, nearest)
     
-    return None
+    index = option_chain.strike_index(option_type)
+    return index.nearest(strike_price) if nearest else index.find(strike_price)
 
 
 def calculate_hedge_strike(sell_strike: float, premium: float, option_type: str) -> float:
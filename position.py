@@ -4,10 +4,51 @@ Position model for representing and managing trading positions.
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import datetime
+import re
 
 from src.models.order import OptionType
+from src.utils.date_utils import get_monthly_expiry_date
+
+
+# Monthly (NIFTY25MAY18000CE) and weekly (NIFTY2552918000CE) NFO option symbols
+OPTION_SYMBOL_PATTERN = re.compile(
+    r"^(?P<underlying>[A-Z]+)(?P<year>\d{2})"
+    r"(?:(?P<month_name>[A-Z]{3})|(?P<month_code>[1-9OND])(?P<day>\d{2}))"
+    r"(?P<strike>\d+(?:\.\d+)?)(?P<option_type>CE|PE)$"
+)
+
+MONTH_CODES = {"O": 10, "N": 11, "D": 12}
+
+
+def parse_option_symbol(symbol: str) -> Tuple[Optional[float], Optional[datetime.datetime]]:
+    """
+    Parse the strike price and expiry from an NFO option trading symbol.
+    
+    Args:
+        symbol: Trading symbol
+    
+    Returns:
+        Tuple of (strike price, expiry datetime at market close), None where the symbol does not match
+    """
+    match = OPTION_SYMBOL_PATTERN.match(symbol)
+    if match is None:
+        return None, None
+    
+    year = 2000 + int(match.group("year"))
+    try:
+        if match.group("month_name"):
+            month = datetime.datetime.strptime(match.group("month_name").title(), "%b").month
+            expiry = get_monthly_expiry_date(year, month)
+        else:
+            code = match.group("month_code")
+            month = MONTH_CODES.get(code) or int(code)
+            expiry = datetime.date(year, month, int(match.group("day")))
+    except ValueError:
+        return float(match.group("strike")), None
+    
+    return float(match.group("strike")), datetime.datetime.combine(expiry, datetime.time(15, 30))
 
 
 @dataclass
@@ -48,23 +89,20 @@ class Position:
         
         Args:
             response: API response dictionary
-            
+        
         Returns:
             Position object
         """
         # Extract option details from symbol if available
         option_type = None
-        strike_price = None
-        expiry_date = None
         
         symbol = response.get("tradingsymbol", "")
         if "CE" in symbol:
             option_type = OptionType.CE
         elif "PE" in symbol:
             option_type = OptionType.PE
-            
-        # In a real implementation, we would parse the strike price and expiry date from the symbol
-        # This is a simplified example
+        
+        strike_price, expiry_date = parse_option_symbol(symbol)
         
         return cls(
             symbol=symbol,
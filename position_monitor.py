@@ -0,0 +1,325 @@
+"""
+Event-driven position monitor.
+Evaluates stop-loss and martingale rules whenever the price of a held
+instrument changes, instead of polling every check interval.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from src.api.market_stream import LastPriceCache, Tick
+from src.models.position import Position
+from src.utils.option_utils import should_trigger_stop_loss, should_trigger_martingale
+from config.config import STRATEGY_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TriggerRule:
+    """
+    A condition on a position's price and the action to take when it holds.
+    """
+    name: str
+    condition: Callable[[Position, float], bool]  # (position, last price) -> should act
+    action: Callable[[Position], bool]  # Returns True if the action succeeded
+
+
+def default_rules(strategy) -> List[TriggerRule]:
+    """
+    Stop-loss and martingale rules backed by a ShortStrangleStrategy.
+    The rules apply to sell legs only, as in ShortStrangleStrategy.check_positions.
+    
+    Args:
+        strategy: Strategy whose handlers perform the actions
+    
+    Returns:
+        List of trigger rules
+    """
+    return [
+        TriggerRule("stop_loss",
+                    lambda position, price: position.quantity < 0
+                    and should_trigger_stop_loss(position.average_price, price),
+                    strategy.handle_stop_loss),
+        TriggerRule("martingale",
+                    lambda position, price: position.quantity < 0
+                    and should_trigger_martingale(position.average_price, price),
+                    strategy.handle_martingale),
+    ]
+
+
+class MonitorStats:
+    """
+    Thread-safe counters and tick-to-decision latency samples.
+    """
+    
+    def __init__(self, max_samples: int = 4096):
+        """
+        Initialize empty monitor statistics.
+        
+        Args:
+            max_samples: Number of most recent latency samples to keep
+        """
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=max_samples)
+        self.ticks = 0
+        self.evaluations = 0
+        self.triggers = 0
+        self.debounced = 0
+        self.cooled_down = 0
+        self.action_failures = 0
+    
+    def record_evaluation(self, latency: float) -> None:
+        """
+        Record the evaluation of one tick.
+        
+        Args:
+            latency: Time from tick receipt to decision in seconds
+        """
+        with self._lock:
+            self.evaluations += 1
+            self._latencies.append(latency)
+    
+    def increment(self, counter: str) -> None:
+        """
+        Increment a named counter.
+        
+        Args:
+            counter: Counter attribute name
+        """
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """
+        Get a tick-to-decision latency percentile.
+        
+        Args:
+            percentile: Percentile between 0 and 100
+        
+        Returns:
+            Latency in seconds or None if nothing has been evaluated
+        """
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return None
+        index = min(int(round(percentile / 100 * (len(samples) - 1))), len(samples) - 1)
+        return samples[index]
+    
+    def reset(self) -> None:
+        """Reset all counters and latency samples."""
+        with self._lock:
+            self._latencies.clear()
+            self.ticks = 0
+            self.evaluations = 0
+            self.triggers = 0
+            self.debounced = 0
+            self.cooled_down = 0
+            self.action_failures = 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get a snapshot of the statistics.
+        
+        Returns:
+            Dictionary with monitor statistics
+        """
+        return {
+            "ticks": self.ticks,
+            "evaluations": self.evaluations,
+            "triggers": self.triggers,
+            "debounced": self.debounced,
+            "cooled_down": self.cooled_down,
+            "action_failures": self.action_failures,
+            "latency_p50": self.latency_percentile(50),
+            "latency_p99": self.latency_percentile(99),
+            "latency_max": self.latency_percentile(100),
+        }
+
+
+class PositionMonitor:
+    """
+    Evaluates trigger rules on every tick for a held instrument.
+    
+    A rule fires only after its condition has held for the debounce period,
+    and not again for the same position until the cooldown has passed. While
+    started, a held condition is re-checked when the debounce period ends, so
+    it fires even if no further tick arrives. Actions run on a single worker
+    thread so the tick feed is never blocked by order placement and actions
+    never run concurrently. After a successful action positions are re-synced
+    from the broker.
+    """
+    
+    def __init__(self, strategy, cache: LastPriceCache, rules: List[TriggerRule] = None,
+                 debounce: float = None, cooldown: float = None):
+        """
+        Initialize the monitor.
+        
+        Args:
+            strategy: ShortStrangleStrategy holding the active positions
+            cache: Last-price cache delivering ticks
+            rules: Trigger rules, defaults to stop-loss and martingale
+            debounce: Seconds a condition must hold before acting, defaults to STRATEGY_CONFIG
+            cooldown: Seconds between actions of one rule on one position, defaults to STRATEGY_CONFIG
+        """
+        self.strategy = strategy
+        self.cache = cache
+        self.rules = rules if rules is not None else default_rules(strategy)
+        self.debounce = STRATEGY_CONFIG["trigger_debounce_seconds"] if debounce is None else debounce
+        self.cooldown = STRATEGY_CONFIG["trigger_cooldown_seconds"] if cooldown is None else cooldown
+        self.stats = MonitorStats()
+        
+        self._positions = {}  # Instrument token -> Position
+        self._pending_since = {}  # (token, rule name) -> time the condition started holding
+        self._last_fired = {}  # (token, rule name) -> time the rule last fired
+        self._in_flight = set()  # (token, rule name) actions still running
+        self._timers = {}  # (token, rule name) -> Timer re-checking a debounced condition
+        self._lock = threading.Lock()
+        self._executor = None
+    
+    def refresh(self) -> None:
+        """
+        Re-index the strategy's active positions by instrument token.
+        Call after positions change.
+        """
+        positions = {position.instrument_token: position
+                     for position in self.strategy.active_positions.values()
+                     if position.instrument_token}
+        with self._lock:
+            self._positions = positions
+            # Drop debounce state for instruments no longer held
+            self._pending_since = {key: since for key, since in self._pending_since.items() if key[0] in positions}
+    
+    def start(self) -> None:
+        """
+        Start reacting to ticks.
+        """
+        if self._executor is not None:
+            return
+        self.refresh()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="position-monitor")
+        self.cache.add_listener(self.on_tick)
+        logger.info(f"Position monitor started for {len(self._positions)} positions")
+    
+    def stop(self, wait: bool = True) -> None:
+        """
+        Stop reacting to ticks.
+        
+        Args:
+            wait: Wait for running actions to finish
+        """
+        if self._executor is None:
+            return
+        self.cache.remove_listener(self.on_tick)
+        with self._lock:
+            timers, self._timers = list(self._timers.values()), {}
+        for timer in timers:
+            timer.cancel()
+        self._executor.shutdown(wait=wait)
+        self._executor = None
+    
+    def on_tick(self, tick: Tick) -> None:
+        """
+        Evaluate the rules for the position holding the ticked instrument.
+        
+        Args:
+            tick: Price update
+        """
+        with self._lock:
+            position = self._positions.get(tick.instrument_token)
+        if position is None:
+            return
+        
+        self.stats.increment("ticks")
+        position.last_price = tick.last_price
+        
+        triggered = [rule for rule in self.rules if self._evaluate(tick, position, rule)]
+        self.stats.record_evaluation(time.monotonic() - tick.received_at)
+        
+        for rule in triggered:
+            self._submit(tick.instrument_token, position, rule)
+    
+    def _evaluate(self, tick: Tick, position: Position, rule: TriggerRule) -> bool:
+        key = (tick.instrument_token, rule.name)
+        now = time.monotonic()
+        
+        if not rule.condition(position, tick.last_price):
+            with self._lock:
+                self._pending_since.pop(key, None)
+            return False
+        
+        with self._lock:
+            if key not in self._pending_since and self._executor is not None and self.debounce > 0:
+                self._schedule_recheck(key)
+            since = self._pending_since.setdefault(key, tick.received_at)
+            if now - since < self.debounce:
+                self.stats.increment("debounced")
+                return False
+            
+            last_fired = self._last_fired.get(key)
+            if key in self._in_flight or (last_fired is not None and now - last_fired < self.cooldown):
+                self.stats.increment("cooled_down")
+                return False
+            
+            self._last_fired[key] = now
+            self._in_flight.add(key)
+            self._pending_since.pop(key, None)
+        
+        self.stats.increment("triggers")
+        logger.info(f"{rule.name} triggered for {position.symbol} at {tick.last_price}")
+        return True
+    
+    def _schedule_recheck(self, key: Tuple[str, str]) -> None:
+        timer = threading.Timer(self.debounce, self._recheck, args=(key,))
+        timer.daemon = True
+        self._timers[key] = timer
+        timer.start()
+    
+    def _recheck(self, key: Tuple[str, str]) -> None:
+        # The condition started holding one debounce period ago: evaluate it again at the latest price
+        token, rule_name = key
+        with self._lock:
+            self._timers.pop(key, None)
+            position = self._positions.get(token)
+            pending = key in self._pending_since
+        latest = self.cache.get(token)
+        rule = next((rule for rule in self.rules if rule.name == rule_name), None)
+        if not pending or position is None or latest is None or rule is None or self._executor is None:
+            return
+        
+        if self._evaluate(Tick(token, latest.last_price, time.monotonic()), position, rule):
+            self._submit(token, position, rule)
+    
+    def _resync(self) -> None:
+        # Re-read positions after an action so a closed or resized position is not acted on again
+        if not self.strategy.update_positions():
+            logger.warning("Failed to re-sync positions after a triggered action")
+        self.refresh()
+    
+    def _submit(self, token: str, position: Position, rule: TriggerRule) -> None:
+        executor = self._executor
+        if executor is None:
+            # Not started: act inline
+            self._run_action(token, position, rule)
+            return
+        executor.submit(self._run_action, token, position, rule)
+    
+    def _run_action(self, token: str, position: Position, rule: TriggerRule) -> None:
+        try:
+            if not rule.action(position):
+                self.stats.increment("action_failures")
+                logger.error(f"{rule.name} action failed for {position.symbol}")
+            else:
+                self._resync()
+        except Exception as e:
+            self.stats.increment("action_failures")
+            logger.error(f"{rule.name} action raised for {position.symbol}: {str(e)}")
+        finally:
+            with self._lock:
+                self._in_flight.discard((token, rule.name))
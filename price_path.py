@@ -0,0 +1,134 @@
+"""
+Synthetic price paths and option chains.
+Generates seeded random walks of the underlying and prices weekly option
+chains along them with Black-Scholes, for simulations, load tests and tests.
+"""
+
+import datetime
+from typing import List
+
+import numpy as np
+
+from src.models.chain_series import ChainSeries, SeriesSide
+from src.utils.greeks import black_scholes_price
+
+# Minutes in a trading session, 09:15 to 15:30
+SESSION_MINUTES = 375
+
+
+def weekly_option_symbol(underlying: str, expiry: datetime.date, strike: float, option_type: str) -> str:
+    """
+    Get the NFO symbol of a weekly option contract.
+    
+    Args:
+        underlying: Underlying symbol
+        expiry: Expiry date
+        strike: Strike price
+        option_type: CE or PE
+    
+    Returns:
+        Trading symbol, e.g. NIFTY2552918000CE
+    """
+    month = {10: "O", 11: "N", 12: "D"}.get(expiry.month, str(expiry.month))
+    return f"{underlying}{expiry:%y}{month}{expiry:%d}{int(strike)}{option_type}"
+
+
+def trading_times(start: datetime.date, days: int, interval_minutes: int = 1) -> np.ndarray:
+    """
+    Get snapshot times on weekdays from 09:15 to 15:30.
+    
+    Args:
+        start: First calendar date
+        days: Number of calendar days
+        interval_minutes: Minutes between snapshots
+    
+    Returns:
+        Unix times as int64
+    """
+    dates = [start + datetime.timedelta(days=offset) for offset in range(days)]
+    minutes = np.arange(0, SESSION_MINUTES + 1, interval_minutes)
+    return np.array([int(datetime.datetime.combine(date, datetime.time(9, 15)).timestamp()) + minute * 60
+                     for date in dates if date.weekday() < 5 for minute in minutes], dtype=np.int64)
+
+
+def random_walk(spot: float, volatility: float, steps: int, interval_minutes: int = 1,
+                seed: int = 0) -> np.ndarray:
+    """
+    Generate a driftless geometric random walk of the underlying.
+    
+    Args:
+        spot: Starting price
+        volatility: Annualized volatility
+        steps: Number of prices
+        interval_minutes: Trading minutes between prices
+        seed: Random seed
+    
+    Returns:
+        Prices, one per step
+    """
+    rng = np.random.default_rng(seed)
+    step_volatility = volatility * np.sqrt(interval_minutes / (252 * SESSION_MINUTES))
+    return spot * np.exp(np.cumsum(rng.normal(0.0, step_volatility, steps)))
+
+
+def generate_chain_series(start: datetime.date, days: int, interval_minutes: int = 1, spot: float = 18000.0,
+                          volatility: float = 0.15, strike_range: int = 3000, strike_step: int = 100,
+                          weeks_ahead: int = 5, seed: int = 0, underlying: str = "NIFTY") -> List[ChainSeries]:
+    """
+    Generate Black-Scholes priced chain series for weekly Thursday expiries.
+    
+    Snapshots are taken every interval on weekdays from 09:15 to 15:30 over a
+    seeded random walk of the spot price. Each expiry is listed weeks_ahead
+    weeks before it expires.
+    
+    Args:
+        start: First calendar date
+        days: Number of calendar days
+        interval_minutes: Minutes between snapshots
+        spot: Starting price of the underlying
+        volatility: Annualized volatility of the walk and of option pricing
+        strike_range: Points listed either side of the starting price
+        strike_step: Points between strikes
+        weeks_ahead: Weeks each expiry is listed before it expires
+        seed: Random seed
+        underlying: Underlying symbol
+    
+    Returns:
+        Chain series, one per expiry
+    """
+    times = trading_times(start, days, interval_minutes)
+    spots = random_walk(spot, volatility, len(times), interval_minutes, seed)
+    strikes = np.arange(round(spot / strike_step) * strike_step - strike_range,
+                        round(spot / strike_step) * strike_step + strike_range + 1, strike_step, dtype=np.float64)
+    
+    first_expiry = start + datetime.timedelta(days=(3 - start.weekday()) % 7)
+    last_date = datetime.date.fromtimestamp(int(times[-1])) + datetime.timedelta(weeks=weeks_ahead)
+    series = []
+    expiry = first_expiry
+    token = 40000
+    while expiry <= last_date:
+        expiry_datetime = datetime.datetime.combine(expiry, datetime.time(15, 30))
+        listed_from = datetime.datetime.combine(expiry - datetime.timedelta(weeks=weeks_ahead), datetime.time(0, 0))
+        mask = (times >= int(listed_from.timestamp())) & (times <= int(expiry_datetime.timestamp()))
+        if mask.any():
+            expiry_times = times[mask]
+            time_to_expiry = (int(expiry_datetime.timestamp()) - expiry_times) / (365.0 * 24 * 3600)
+            sides = {}
+            for option_type in ("CE", "PE"):
+                price = black_scholes_price(spots[mask][:, None], strikes[None, :], time_to_expiry[:, None],
+                                            volatility, option_type == "CE", rate=0.0)
+                last_price = np.maximum(np.round(price * 20) / 20, 0.05)
+                half_spread = np.maximum(np.round(last_price * 0.005 * 20) / 20, 0.05)
+                sides[option_type] = SeriesSide(
+                    option_type, strikes,
+                    symbols=[weekly_option_symbol(underlying, expiry, strike, option_type) for strike in strikes],
+                    tokens=[str(token + index) for index in range(len(strikes))],
+                    last_price=last_price,
+                    bid_price=np.maximum(last_price - half_spread, 0.05),
+                    ask_price=last_price + half_spread,
+                    open_interest=np.full(price.shape, 10000.0)
+                )
+                token += len(strikes)
+            series.append(ChainSeries(underlying, expiry_datetime, expiry_times, spots[mask], sides["CE"], sides["PE"]))
+        expiry += datetime.timedelta(weeks=1)
+    return series
@@ -0,0 +1,337 @@
+"""
+Client-side rate limiting for the mStock API.
+Token buckets per endpoint class, shared by every client in the process, with
+priority lanes so urgent orders are sent ahead of routine refreshes.
+"""
+
+import asyncio
+import contextlib
+import functools
+import heapq
+import itertools
+import logging
+import threading
+import time
+from enum import IntEnum
+from typing import Dict, Any, Optional
+
+from config.config import RATE_LIMIT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Request lanes, lower values are served first."""
+    CRITICAL = 0  # Stop losses and rollbacks of failed baskets
+    HIGH = 1  # Other orders
+    NORMAL = 2  # Portfolio and account queries
+    LOW = 3  # Market data refreshes
+
+
+# Lane of each endpoint class unless request_priority() says otherwise
+DEFAULT_PRIORITIES = {
+    "orders": Priority.HIGH,
+    "portfolio": Priority.NORMAL,
+    "market_data": Priority.LOW,
+}
+
+_local = threading.local()
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a request waited longer than allowed for a rate limit token."""
+    pass
+
+
+@contextlib.contextmanager
+def request_priority(priority: Priority):
+    """
+    Send the requests made by the current thread in a given lane.
+    
+    Args:
+        priority: Lane to use while the context is active
+    """
+    previous = getattr(_local, "priority", None)
+    _local.priority = priority
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+def current_priority(endpoint_class: str) -> Priority:
+    """
+    Get the lane of a request from the current thread.
+    
+    Args:
+        endpoint_class: Endpoint class of the request
+    
+    Returns:
+        Lane set by request_priority(), or the endpoint class default
+    """
+    priority = getattr(_local, "priority", None)
+    return priority if priority is not None else DEFAULT_PRIORITIES.get(endpoint_class, Priority.NORMAL)
+
+
+def endpoint_class(url: str) -> str:
+    """
+    Get the rate limit class of an API URL.
+    
+    Args:
+        url: Request URL
+    
+    Returns:
+        orders, market_data or portfolio
+    """
+    if "/order/" in url:
+        return "orders"
+    if "GetOptionChain" in url or "getoptionchainmaster" in url:
+        return "market_data"
+    return "portfolio"
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with priority-ordered waiters.
+    
+    Tokens refill continuously at rate per second up to burst. Waiters queue
+    by (priority, arrival), and only the head of the queue may take a token,
+    so a CRITICAL request that arrives behind queued LOW requests is served
+    first. A throttle response from the broker empties the bucket and pauses
+    refilling for the requested time.
+    """
+    
+    def __init__(self, name: str, rate: float, burst: float):
+        """
+        Initialize the bucket.
+        
+        Args:
+            name: Bucket name used in logs and statistics
+            rate: Tokens added per second, 0 for a fixed allowance of burst tokens
+            burst: Maximum tokens held
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+        self._waiters = []  # Heap of (priority, sequence)
+        self._sequence = itertools.count()
+        
+        self.acquired = 0
+        self.waited = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.timeouts = 0
+        self.throttles = 0
+        self.max_queue_depth = 0
+    
+    def _refill(self, now: float) -> None:
+        if now > self._paused_until:
+            start = max(self._updated, self._paused_until)
+            self._tokens = min(self.burst, self._tokens + (now - start) * self.rate)
+        self._updated = now
+    
+    def _remove_waiter(self, ticket) -> None:
+        self._waiters.remove(ticket)
+        heapq.heapify(self._waiters)
+    
+    def acquire(self, priority: Priority = Priority.NORMAL, timeout: float = None) -> bool:
+        """
+        Take one token, waiting behind higher priority and earlier requests.
+        
+        Args:
+            priority: Lane of the request
+            timeout: Maximum seconds to wait, None to wait indefinitely
+        
+        Returns:
+            True if a token was taken, False if the timeout expired
+        """
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        with self._condition:
+            ticket = (int(priority), next(self._sequence))
+            heapq.heappush(self._waiters, ticket)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    is_head = self._waiters[0] == ticket
+                    if is_head and self._tokens >= 1:
+                        self._tokens -= 1
+                        heapq.heappop(self._waiters)
+                        self._record_acquire(now - started)
+                        return True
+                    
+                    if deadline is not None and now >= deadline:
+                        self._remove_waiter(ticket)
+                        self.timeouts += 1
+                        return False
+                    
+                    # The head sleeps until its token is due; the rest wait to become head
+                    wait = None
+                    if is_head and self.rate > 0:
+                        wait = max(self._paused_until - now, 0.0) + (1 - self._tokens) / self.rate
+                    if deadline is not None:
+                        wait = deadline - now if wait is None else min(wait, deadline - now)
+                    self._condition.wait(wait)
+            finally:
+                self._condition.notify_all()
+    
+    def _record_acquire(self, wait_time: float) -> None:
+        self.acquired += 1
+        if wait_time > 0.001:
+            self.waited += 1
+            self.wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+    
+    def throttle(self, pause: float) -> None:
+        """
+        Back off after the broker rejected a request for exceeding its limit.
+        
+        Args:
+            pause: Seconds during which no tokens are added
+        """
+        with self._condition:
+            self._refill(time.monotonic())
+            self._tokens = 0.0
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            self.throttles += 1
+            self._condition.notify_all()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get a snapshot of the bucket statistics.
+        
+        Returns:
+            Dictionary with queue depth, wait times and counters
+        """
+        with self._condition:
+            self._refill(time.monotonic())
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "tokens": self._tokens,
+                "queue_depth": len(self._waiters),
+                "max_queue_depth": self.max_queue_depth,
+                "acquired": self.acquired,
+                "waited": self.waited,
+                "wait_time": self.wait_time,
+                "average_wait_time": self.wait_time / self.waited if self.waited else 0.0,
+                "max_wait_time": self.max_wait_time,
+                "timeouts": self.timeouts,
+                "throttles": self.throttles,
+            }
+
+
+class RateLimiter:
+    """
+    Rate limits for every endpoint class plus one account-wide bucket.
+    
+    A request takes a token from its endpoint class bucket and then from the
+    global bucket, in the same priority lane in both.
+    """
+    
+    def __init__(self, buckets: Dict[str, Dict[str, float]] = None, global_limit: Dict[str, float] = None,
+                 max_wait: float = None, throttle_pause: float = None):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            buckets: Endpoint class -> {"rate", "burst"}, defaults to RATE_LIMIT_CONFIG
+            global_limit: {"rate", "burst"} across all classes, defaults to RATE_LIMIT_CONFIG
+            max_wait: Maximum seconds a request waits for its tokens, defaults to RATE_LIMIT_CONFIG
+            throttle_pause: Default pause after a throttle response, defaults to RATE_LIMIT_CONFIG
+        """
+        buckets = buckets or RATE_LIMIT_CONFIG["buckets"]
+        global_limit = global_limit or RATE_LIMIT_CONFIG["global"]
+        self.buckets = {name: TokenBucket(name, limit["rate"], limit["burst"]) for name, limit in buckets.items()}
+        self.global_bucket = TokenBucket("global", global_limit["rate"], global_limit["burst"])
+        self.max_wait = RATE_LIMIT_CONFIG["max_wait"] if max_wait is None else max_wait
+        self.throttle_pause = RATE_LIMIT_CONFIG["throttle_pause"] if throttle_pause is None else throttle_pause
+    
+    def acquire(self, endpoint_class: str, priority: Priority = None) -> None:
+        """
+        Wait until a request of an endpoint class may be sent.
+        
+        Args:
+            endpoint_class: Endpoint class of the request
+            priority: Lane of the request, defaults to current_priority()
+        
+        Raises:
+            RateLimitTimeout: If the tokens were not available within max_wait
+        """
+        priority = current_priority(endpoint_class) if priority is None else priority
+        deadline = time.monotonic() + self.max_wait
+        bucket = self.buckets.get(endpoint_class)
+        for item in (bucket, self.global_bucket):
+            if item is not None and not item.acquire(priority, max(deadline - time.monotonic(), 0.0)):
+                raise RateLimitTimeout(f"No {item.name} rate limit token within {self.max_wait}s "
+                                       f"for {endpoint_class} request")
+    
+    async def acquire_async(self, endpoint_class: str, priority: Priority = None) -> None:
+        """
+        Wait without blocking the event loop until a request of an endpoint class may be sent.
+        
+        The wait runs on an executor thread against the same buckets as
+        acquire(), so asyncio and threaded clients share one set of limits.
+        
+        Args:
+            endpoint_class: Endpoint class of the request
+            priority: Lane of the request, defaults to current_priority()
+        
+        Raises:
+            RateLimitTimeout: If the tokens were not available within max_wait
+        """
+        # The lane is thread-local, so resolve it before leaving the event loop thread
+        priority = current_priority(endpoint_class) if priority is None else priority
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self.acquire, endpoint_class, priority))
+    
+    def throttle(self, endpoint_class: str, retry_after: float = None) -> None:
+        """
+        Pause an endpoint class after a throttle response.
+        
+        Args:
+            endpoint_class: Endpoint class that was throttled
+            retry_after: Seconds requested by the broker, defaults to throttle_pause
+        """
+        pause = self.throttle_pause if retry_after is None else retry_after
+        logger.warning(f"Broker throttled {endpoint_class} requests, pausing for {pause}s")
+        bucket = self.buckets.get(endpoint_class)
+        if bucket is not None:
+            bucket.throttle(pause)
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get statistics of every bucket.
+        
+        Returns:
+            Bucket name -> bucket statistics
+        """
+        stats = {name: bucket.to_dict() for name, bucket in self.buckets.items()}
+        stats["global"] = self.global_bucket.to_dict()
+        return stats
+
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Get the rate limiter shared by all clients in the process.
+    
+    Returns:
+        Shared RateLimiter, or None if rate limiting is disabled
+    """
+    global _shared_limiter
+    if not RATE_LIMIT_CONFIG["enabled"]:
+        return None
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
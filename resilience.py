@@ -0,0 +1,394 @@
+"""
+Resilience utilities for calls to the broker.
+Jittered exponential backoff, per-endpoint circuit breakers and retries that
+stay within a per-call time budget, in sync and asyncio variants.
+"""
+
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from enum import Enum
+from typing import Callable, Any, Dict
+
+from config.config import RESILIENCE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    """States of a circuit breaker."""
+    CLOSED = "CLOSED"  # Calls go through
+    OPEN = "OPEN"  # Calls fail fast until the recovery timeout has passed
+    HALF_OPEN = "HALF_OPEN"  # A limited number of trial calls go through
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because its circuit breaker is open."""
+    pass
+
+
+class TransientError(Exception):
+    """Raised by a call attempt to request a retry, e.g. for an HTTP 5xx response."""
+    
+    def __init__(self, message: str, result: Any = None):
+        """
+        Initialize the error.
+        
+        Args:
+            message: Error message
+            result: Result of the failed attempt, returned if no retry succeeds
+        """
+        super().__init__(message)
+        self.result = result
+
+
+def endpoint_name(url: str) -> str:
+    """
+    Get the endpoint of an API URL, without path parameters.
+    
+    Args:
+        url: Request URL or path
+    
+    Returns:
+        Endpoint name, e.g. GetOptionChain or order/place
+    """
+    path = re.sub(r"^\w+://[^/]+", "", url).split("?")[0]
+    path = path.split("/openapi/typea/", 1)[-1].strip("/")
+    segments = []
+    for segment in path.split("/"):
+        if segment.isdigit():
+            break
+        segments.append(segment)
+    return "/".join(segments)
+
+
+class Backoff:
+    """
+    Exponential backoff with full jitter.
+    
+    The delay before retry n is drawn uniformly from [0, min(cap, base * multiplier ** n)],
+    which spreads out clients that failed together.
+    """
+    
+    def __init__(self, base: float = None, cap: float = None, multiplier: float = 2.0, rng: random.Random = None):
+        """
+        Initialize the backoff.
+        
+        Args:
+            base: Delay ceiling of the first retry in seconds, defaults to RESILIENCE_CONFIG
+            cap: Maximum delay ceiling in seconds, defaults to RESILIENCE_CONFIG
+            multiplier: Growth of the ceiling per retry
+            rng: Random number generator, defaults to a new one
+        """
+        self.base = RESILIENCE_CONFIG["backoff_base"] if base is None else base
+        self.cap = RESILIENCE_CONFIG["backoff_cap"] if cap is None else cap
+        self.multiplier = multiplier
+        self.rng = rng or random.Random()
+    
+    def delay(self, retry: int) -> float:
+        """
+        Get the delay before a retry.
+        
+        Args:
+            retry: Zero-based retry number
+        
+        Returns:
+            Delay in seconds
+        """
+        return self.rng.uniform(0.0, min(self.cap, self.base * self.multiplier ** retry))
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for one endpoint.
+    
+    Consecutive failed calls up to failure_threshold open the breaker, and
+    calls then fail fast. A call retried by call_with_retry() counts once,
+    after its last attempt. After recovery_timeout the breaker is half-open
+    and lets half_open_max_calls trial calls through: a success closes it, a
+    failure opens it again.
+    """
+    
+    def __init__(self, name: str, failure_threshold: int = None, recovery_timeout: float = None,
+                 half_open_max_calls: int = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the circuit breaker.
+        
+        Args:
+            name: Endpoint name
+            failure_threshold: Consecutive failed calls that open the breaker, defaults to RESILIENCE_CONFIG
+            recovery_timeout: Seconds to stay open before trial calls, defaults to RESILIENCE_CONFIG
+            half_open_max_calls: Concurrent trial calls when half-open, defaults to RESILIENCE_CONFIG
+            clock: Monotonic time source
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold or RESILIENCE_CONFIG["failure_threshold"]
+        self.recovery_timeout = RESILIENCE_CONFIG["recovery_timeout"] if recovery_timeout is None else recovery_timeout
+        self.half_open_max_calls = half_open_max_calls or RESILIENCE_CONFIG["half_open_max_calls"]
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self.rejected_calls = 0
+        self.times_opened = 0
+    
+    def _update(self) -> None:
+        if self._state == CircuitState.OPEN and self.clock() - self._opened_at >= self.recovery_timeout:
+            self._state = CircuitState.HALF_OPEN
+            self._trial_calls = 0
+    
+    @property
+    def state(self) -> CircuitState:
+        """Current state of the breaker."""
+        with self._lock:
+            self._update()
+            return self._state
+    
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may go through, reserving a trial slot when half-open.
+        
+        Returns:
+            True if the call may be made, False if it must fail fast
+        """
+        with self._lock:
+            self._update()
+            if self._state == CircuitState.CLOSED:
+                return True
+            if self._state == CircuitState.HALF_OPEN and self._trial_calls < self.half_open_max_calls:
+                self._trial_calls += 1
+                return True
+            self.rejected_calls += 1
+            return False
+    
+    def record_success(self) -> None:
+        """Record a successful call."""
+        with self._lock:
+            if self._state != CircuitState.CLOSED:
+                logger.info(f"Circuit breaker {self.name} closed")
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+    
+    def release(self) -> None:
+        """Give back the trial slot of a call that ended without a success or failure."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN and self._trial_calls > 0:
+                self._trial_calls -= 1
+    
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        with self._lock:
+            self._failures += 1
+            if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != CircuitState.OPEN:
+                    self.times_opened += 1
+                    logger.warning(f"Circuit breaker {self.name} opened after {self._failures} failures")
+                self._state = CircuitState.OPEN
+                self._opened_at = self.clock()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get a snapshot of the breaker.
+        
+        Returns:
+            Dictionary with state and counters
+        """
+        with self._lock:
+            self._update()
+            return {
+                "state": self._state.value,
+                "consecutive_failures": self._failures,
+                "times_opened": self.times_opened,
+                "rejected_calls": self.rejected_calls,
+            }
+
+
+class BreakerRegistry:
+    """
+    Circuit breakers of a client, created on first use per endpoint.
+    """
+    
+    def __init__(self, **breaker_options):
+        """
+        Initialize the registry.
+        
+        Args:
+            **breaker_options: CircuitBreaker arguments for every breaker
+        """
+        self.breaker_options = breaker_options
+        self._breakers = {}
+        self._lock = threading.Lock()
+    
+    def get(self, name: str) -> CircuitBreaker:
+        """
+        Get the breaker of an endpoint.
+        
+        Args:
+            name: Endpoint name
+        
+        Returns:
+            CircuitBreaker instance
+        """
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, **self.breaker_options)
+                self._breakers[name] = breaker
+            return breaker
+    
+    def is_available(self, name: str) -> bool:
+        """
+        Check whether calls to an endpoint are currently let through.
+        
+        Args:
+            name: Endpoint name
+        
+        Returns:
+            False if the endpoint's breaker is open, True otherwise
+        """
+        with self._lock:
+            breaker = self._breakers.get(name)
+        return breaker is None or breaker.state != CircuitState.OPEN
+    
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the state of every breaker.
+        
+        Returns:
+            Endpoint name -> breaker snapshot
+        """
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.to_dict() for breaker in breakers}
+
+
+def call_with_retry(attempt: Callable[[float], Any], breaker: CircuitBreaker = None, max_attempts: int = None,
+                    backoff: Backoff = None, budget: float = None, retry: bool = True, passthrough: tuple = (),
+                    sleep: Callable[[float], None] = time.sleep) -> Any:
+    """
+    Call a function with retries, a circuit breaker and a time budget.
+    
+    The attempt function gets the seconds left in the budget and signals a
+    retryable failure by raising TransientError or any other exception. A
+    retry is only made if its backoff delay still leaves time in the budget.
+    The breaker is asked once per call and sees one success or failure, not
+    one per attempt.
+    
+    Args:
+        attempt: Function of the remaining budget making one attempt
+        breaker: Circuit breaker of the endpoint
+        max_attempts: Maximum attempts, defaults to RESILIENCE_CONFIG
+        backoff: Backoff between attempts, defaults to Backoff()
+        budget: Seconds for all attempts and delays together, defaults to RESILIENCE_CONFIG
+        retry: Whether to retry at all, False for non-idempotent calls
+        passthrough: Exceptions raised straight away without counting as a failure
+        sleep: Sleep function
+    
+    Returns:
+        Result of the first successful attempt, or the result carried by the last TransientError
+    
+    Raises:
+        CircuitOpenError: If the breaker refuses the call
+        Exception: The last error of an attempt without a result
+    """
+    max_attempts = (max_attempts or RESILIENCE_CONFIG["max_attempts"]) if retry else 1
+    backoff = backoff or Backoff()
+    deadline = time.monotonic() + (RESILIENCE_CONFIG["call_budget"] if budget is None else budget)
+    
+    if breaker is not None and not breaker.allow_request():
+        raise CircuitOpenError(f"Circuit breaker {breaker.name} is open")
+    
+    settled = breaker is None
+    try:
+        for number in range(max_attempts):
+            try:
+                result = attempt(max(deadline - time.monotonic(), 0.0))
+            except passthrough:
+                raise
+            except Exception as e:
+                delay = backoff.delay(number)
+                if number + 1 >= max_attempts or time.monotonic() + delay >= deadline:
+                    if breaker is not None:
+                        breaker.record_failure()
+                        settled = True
+                    if isinstance(e, TransientError):
+                        return e.result
+                    raise
+                logger.warning(f"Attempt {number + 1}/{max_attempts} failed: {str(e)}. Retrying in {delay:.2f}s")
+                sleep(delay)
+                continue
+            if breaker is not None:
+                breaker.record_success()
+                settled = True
+            return result
+    finally:
+        if not settled:
+            # Passthrough errors, cancellation and interrupts neither close nor open the breaker
+            breaker.release()
+
+
+async def async_call_with_retry(attempt: Callable[[float], Any], breaker: CircuitBreaker = None,
+                                max_attempts: int = None, backoff: Backoff = None, budget: float = None,
+                                retry: bool = True, passthrough: tuple = ()) -> Any:
+    """
+    Await a coroutine function with retries, a circuit breaker and a time budget.
+    
+    Same policy as call_with_retry(); every attempt is also cancelled when
+    the budget runs out.
+    
+    Args:
+        attempt: Coroutine function of the remaining budget making one attempt
+        breaker: Circuit breaker of the endpoint
+        max_attempts: Maximum attempts, defaults to RESILIENCE_CONFIG
+        backoff: Backoff between attempts, defaults to Backoff()
+        budget: Seconds for all attempts and delays together, defaults to RESILIENCE_CONFIG
+        retry: Whether to retry at all, False for non-idempotent calls
+        passthrough: Exceptions raised straight away without counting as a failure
+    
+    Returns:
+        Result of the first successful attempt, or the result carried by the last TransientError
+    
+    Raises:
+        CircuitOpenError: If the breaker refuses the call
+        Exception: The last error of an attempt without a result
+    """
+    max_attempts = (max_attempts or RESILIENCE_CONFIG["max_attempts"]) if retry else 1
+    backoff = backoff or Backoff()
+    deadline = time.monotonic() + (RESILIENCE_CONFIG["call_budget"] if budget is None else budget)
+    
+    if breaker is not None and not breaker.allow_request():
+        raise CircuitOpenError(f"Circuit breaker {breaker.name} is open")
+    
+    settled = breaker is None
+    try:
+        for number in range(max_attempts):
+            remaining = max(deadline - time.monotonic(), 0.0)
+            try:
+                result = await asyncio.wait_for(attempt(remaining), remaining)
+            except passthrough:
+                raise
+            except Exception as e:
+                delay = backoff.delay(number)
+                if number + 1 >= max_attempts or time.monotonic() + delay >= deadline:
+                    if breaker is not None:
+                        breaker.record_failure()
+                        settled = True
+                    if isinstance(e, TransientError):
+                        return e.result
+                    raise
+                logger.warning(f"Attempt {number + 1}/{max_attempts} failed: {str(e)}. Retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            if breaker is not None:
+                breaker.record_success()
+                settled = True
+            return result
+    finally:
+        if not settled:
+            # Passthrough errors, cancellation and interrupts neither close nor open the breaker
+            breaker.release()
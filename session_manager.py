@@ -0,0 +1,501 @@
+"""
+Session management for the mStock API clients.
+Persists access tokens on disk, encrypted, with their expiry so a restarted
+process can reuse them, and supplies OTPs for re-login from pluggable providers.
+"""
+
+import abc
+import base64
+import datetime
+import hashlib
+import hmac
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from typing import Callable, Dict, Any, Optional
+
+from config.config import SESSION_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class OTPProvider(abc.ABC):
+    """
+    Source of the one-time password needed to generate a session token.
+    """
+    
+    @abc.abstractmethod
+    def get_otp(self, username: str) -> Optional[str]:
+        """
+        Get the OTP for a login.
+        
+        Args:
+            username: mStock account username
+        
+        Returns:
+            OTP, or None if none is available
+        """
+
+
+class ConsoleOTPProvider(OTPProvider):
+    """
+    Prompts for the OTP on the console.
+    """
+    
+    def __init__(self, prompt: str = "Enter the OTP sent to your registered mobile number: "):
+        """
+        Initialize the provider.
+        
+        Args:
+            prompt: Prompt shown to the user
+        """
+        self.prompt = prompt
+    
+    def get_otp(self, username: str) -> Optional[str]:
+        """Read the OTP from standard input."""
+        return input(self.prompt).strip() or None
+
+
+class EnvironmentOTPProvider(OTPProvider):
+    """
+    Reads the OTP from an environment variable.
+    """
+    
+    def __init__(self, variable: str = None):
+        """
+        Initialize the provider.
+        
+        Args:
+            variable: Environment variable name, defaults to SESSION_CONFIG
+        """
+        self.variable = variable or SESSION_CONFIG["otp_env_var"]
+    
+    def get_otp(self, username: str) -> Optional[str]:
+        """Read the OTP from the environment variable."""
+        return os.environ.get(self.variable) or None
+
+
+class FileOTPProvider(OTPProvider):
+    """
+    Waits for the OTP to be written to a file, e.g. by an SMS forwarder or the
+    dashboard, and deletes the file after reading it.
+    """
+    
+    def __init__(self, path: str = None, timeout: float = None, poll_interval: float = 0.5):
+        """
+        Initialize the provider.
+        
+        Args:
+            path: OTP file, defaults to SESSION_CONFIG
+            timeout: Seconds to wait for the file, defaults to SESSION_CONFIG
+            poll_interval: Seconds between checks for the file
+        """
+        self.path = path or SESSION_CONFIG["otp_file"]
+        self.timeout = SESSION_CONFIG["otp_timeout"] if timeout is None else timeout
+        self.poll_interval = poll_interval
+    
+    def get_otp(self, username: str) -> Optional[str]:
+        """Wait for the OTP file and read it."""
+        deadline = time.monotonic() + self.timeout
+        logger.info(f"Waiting up to {self.timeout}s for the OTP in {self.path}")
+        while True:
+            try:
+                with open(self.path, "r") as f:
+                    otp = f.read().strip()
+                os.remove(self.path)
+                return otp or None
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"Error reading OTP file {self.path}: {str(e)}")
+                return None
+            if time.monotonic() >= deadline:
+                logger.error(f"No OTP in {self.path} within {self.timeout}s")
+                return None
+            time.sleep(self.poll_interval)
+
+
+class TOTPProvider(OTPProvider):
+    """
+    Generates time-based OTPs (RFC 6238) from the account's TOTP secret.
+    """
+    
+    def __init__(self, secret: str = None, digits: int = 6, period: int = 30,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize the provider.
+        
+        Args:
+            secret: Base32 TOTP secret, defaults to the variable named in SESSION_CONFIG
+            digits: OTP length
+            period: Seconds each OTP is valid
+            clock: Source of the Unix time
+        """
+        self.secret = secret or os.environ.get(SESSION_CONFIG["totp_secret_env_var"], "")
+        self.digits = digits
+        self.period = period
+        self.clock = clock
+    
+    def get_otp(self, username: str) -> Optional[str]:
+        """Generate the OTP for the current period."""
+        if not self.secret:
+            logger.error("No TOTP secret configured")
+            return None
+        try:
+            secret = self.secret.replace(" ", "").upper()
+            key = base64.b32decode(secret + "=" * (-len(secret) % 8))
+        except ValueError as e:
+            logger.error(f"Invalid TOTP secret: {str(e)}")
+            return None
+        counter = struct.pack(">Q", int(self.clock()) // self.period)
+        digest = hmac.new(key, counter, hashlib.sha1).digest()
+        offset = digest[-1] & 0x0F
+        code = struct.unpack(">I", digest[offset:offset + 4])[0] & 0x7FFFFFFF
+        return str(code % 10 ** self.digits).zfill(self.digits)
+
+
+class CallbackOTPProvider(OTPProvider):
+    """
+    Gets the OTP from a function, e.g. one that reads it from a UI form.
+    """
+    
+    def __init__(self, callback: Callable[[str], Optional[str]]):
+        """
+        Initialize the provider.
+        
+        Args:
+            callback: Function of the username returning the OTP
+        """
+        self.callback = callback
+    
+    def get_otp(self, username: str) -> Optional[str]:
+        """Call the callback."""
+        return self.callback(username)
+
+
+OTP_PROVIDERS = {
+    "console": ConsoleOTPProvider,
+    "env": EnvironmentOTPProvider,
+    "file": FileOTPProvider,
+    "totp": TOTPProvider,
+}
+
+
+def create_otp_provider(name: str = None) -> OTPProvider:
+    """
+    Create an OTP provider by name.
+    
+    Args:
+        name: console, env, file or totp, defaults to SESSION_CONFIG["otp_provider"]
+    
+    Returns:
+        OTPProvider instance, a console provider for unknown names
+    """
+    name = name or SESSION_CONFIG["otp_provider"]
+    provider = OTP_PROVIDERS.get(name)
+    if provider is None:
+        logger.warning(f"Unknown OTP provider {name}, using console")
+        provider = ConsoleOTPProvider
+    return provider()
+
+
+class TokenCipher:
+    """
+    Encrypts access tokens at rest with a secret key.
+    
+    The keystream is HMAC-SHA256 of a random nonce and a block counter, and
+    the nonce and ciphertext are authenticated with a separate HMAC key, so a
+    token read back with the wrong key or from a modified file is rejected.
+    """
+    
+    NONCE_SIZE = 16
+    TAG_SIZE = 32
+    
+    def __init__(self, key: bytes):
+        """
+        Initialize the cipher.
+        
+        Args:
+            key: Secret key, at least 16 random bytes
+        """
+        self._encryption_key = hmac.new(key, b"encrypt", hashlib.sha256).digest()
+        self._authentication_key = hmac.new(key, b"authenticate", hashlib.sha256).digest()
+    
+    @classmethod
+    def from_secret(cls, secret: str) -> 'TokenCipher':
+        """
+        Create a cipher keyed by a passphrase.
+        
+        Args:
+            secret: Passphrase, stretched with PBKDF2
+        
+        Returns:
+            TokenCipher object
+        """
+        return cls(hashlib.pbkdf2_hmac("sha256", secret.encode(), b"mstock-session", 200000))
+    
+    @classmethod
+    def from_config(cls, key_env_var: str = None, key_file: str = None) -> Optional['TokenCipher']:
+        """
+        Create the cipher configured in SESSION_CONFIG.
+        
+        Uses the secret in the key environment variable if it is set, otherwise
+        a random key read from the key file, which is created on first use.
+        
+        Args:
+            key_env_var: Environment variable with the secret, defaults to SESSION_CONFIG
+            key_file: Random key file, defaults to SESSION_CONFIG
+        
+        Returns:
+            TokenCipher, or None if the key file cannot be read or created
+        """
+        secret = os.environ.get(key_env_var or SESSION_CONFIG["key_env_var"])
+        if secret:
+            return cls.from_secret(secret)
+        
+        path = os.path.expanduser(key_file or SESSION_CONFIG["key_file"])
+        try:
+            with open(path, "rb") as f:
+                key = f.read()
+            if len(key) >= 16:
+                return cls(key)
+            logger.error(f"Session key file {path} is too short")
+            return None
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Error reading session key file {path}: {str(e)}")
+            return None
+        
+        key = os.urandom(32)
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(key)
+            return cls(key)
+        except FileExistsError:
+            return cls.from_config(key_env_var, key_file)  # Created by another process meanwhile
+        except OSError as e:
+            logger.error(f"Error creating session key file {path}: {str(e)}")
+            return None
+    
+    def _keystream(self, nonce: bytes, length: int) -> bytes:
+        blocks = []
+        for counter in range((length + 31) // 32):
+            blocks.append(hmac.new(self._encryption_key, nonce + struct.pack(">Q", counter), hashlib.sha256).digest())
+        return b"".join(blocks)[:length]
+    
+    def encrypt(self, plaintext: str) -> str:
+        """
+        Encrypt a token.
+        
+        Args:
+            plaintext: Token
+        
+        Returns:
+            Base64 nonce, ciphertext and authentication tag
+        """
+        data = plaintext.encode()
+        nonce = os.urandom(self.NONCE_SIZE)
+        ciphertext = bytes(a ^ b for a, b in zip(data, self._keystream(nonce, len(data))))
+        tag = hmac.new(self._authentication_key, nonce + ciphertext, hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(nonce + ciphertext + tag).decode()
+    
+    def decrypt(self, token: str) -> Optional[str]:
+        """
+        Decrypt a token.
+        
+        Args:
+            token: Output of encrypt()
+        
+        Returns:
+            Token, or None if it was encrypted with another key or modified
+        """
+        try:
+            blob = base64.urlsafe_b64decode(token.encode())
+        except (AttributeError, ValueError):
+            return None
+        if len(blob) < self.NONCE_SIZE + self.TAG_SIZE:
+            return None
+        nonce, ciphertext, tag = blob[:self.NONCE_SIZE], blob[self.NONCE_SIZE:-self.TAG_SIZE], blob[-self.TAG_SIZE:]
+        expected = hmac.new(self._authentication_key, nonce + ciphertext, hashlib.sha256).digest()
+        if not hmac.compare_digest(tag, expected):
+            return None
+        try:
+            return bytes(a ^ b for a, b in zip(ciphertext, self._keystream(nonce, len(ciphertext)))).decode()
+        except UnicodeDecodeError:
+            return None
+
+
+class SessionManager:
+    """
+    Stores access tokens encrypted in an owner-only file, one per account and API URL.
+    
+    Each token is saved with its expiry, the next SESSION_CONFIG["expiry_time"]
+    after login, and load() only returns tokens that have not expired. The
+    file is replaced atomically so a crash never leaves it half written.
+    """
+    
+    def __init__(self, path: str = None, expiry_time: str = None,
+                 clock: Callable[[], datetime.datetime] = datetime.datetime.now,
+                 cipher: TokenCipher = None):
+        """
+        Initialize the session manager.
+        
+        Args:
+            path: Token file, defaults to SESSION_CONFIG
+            expiry_time: HH:MM at which tokens expire, defaults to SESSION_CONFIG
+            clock: Source of the current local time
+            cipher: Token encryption, defaults to TokenCipher.from_config() on first use
+        """
+        self.path = path or SESSION_CONFIG["token_file"]
+        hour, minute = (expiry_time or SESSION_CONFIG["expiry_time"]).split(":")
+        self.expiry_time = datetime.time(int(hour), int(minute))
+        self.clock = clock
+        self._cipher = cipher
+        self._lock = threading.Lock()
+    
+    def _get_cipher(self) -> Optional[TokenCipher]:
+        if self._cipher is None:
+            self._cipher = TokenCipher.from_config()
+        return self._cipher
+    
+    @staticmethod
+    def _key(base_url: str, username: str) -> str:
+        return f"{username}@{base_url}"
+    
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading session file {self.path}: {str(e)}")
+            return {}
+    
+    def _write(self, sessions: Dict[str, Dict[str, Any]]) -> bool:
+        temp_path = f"{self.path}.tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Create with owner-only permissions so the token is never readable by others
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(sessions, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(temp_path, 0o600)
+            os.replace(temp_path, self.path)
+            return True
+        except OSError as e:
+            logger.error(f"Error writing session file {self.path}: {str(e)}")
+            return False
+    
+    def expiry_after(self, login_time: datetime.datetime) -> datetime.datetime:
+        """
+        Get the expiry of a token issued at a given time.
+        
+        Args:
+            login_time: Time the token was issued
+        
+        Returns:
+            Next occurrence of the expiry time after login_time
+        """
+        expiry = datetime.datetime.combine(login_time.date(), self.expiry_time)
+        if expiry <= login_time:
+            expiry += datetime.timedelta(days=1)
+        return expiry
+    
+    def load(self, base_url: str, api_key: str, username: str) -> Optional[str]:
+        """
+        Get the saved access token of an account.
+        
+        Args:
+            base_url: API URL the token was issued by
+            api_key: API key the token was issued for
+            username: mStock account username
+        
+        Returns:
+            Access token, or None if there is none or it has expired
+        """
+        with self._lock:
+            session = self._read().get(self._key(base_url, username))
+            cipher = self._get_cipher()
+        if session is None or session.get("api_key") != api_key or cipher is None:
+            return None
+        try:
+            expires_at = datetime.datetime.fromisoformat(session["expires_at"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if self.clock() >= expires_at:
+            logger.info(f"Saved session of {username} expired at {expires_at}")
+            return None
+        access_token = cipher.decrypt(session.get("encrypted_token", ""))
+        if access_token is None:
+            logger.warning(f"Saved session of {username} could not be decrypted")
+        return access_token
+    
+    def save(self, base_url: str, api_key: str, username: str, access_token: str) -> bool:
+        """
+        Save the access token of an account.
+        
+        Args:
+            base_url: API URL that issued the token
+            api_key: API key the token was issued for
+            username: mStock account username
+            access_token: Access token
+        
+        Returns:
+            True if the token was written
+        """
+        now = self.clock()
+        with self._lock:
+            cipher = self._get_cipher()
+            if cipher is None:
+                logger.error("No session key, access token not saved")
+                return False
+            sessions = self._read()
+            sessions[self._key(base_url, username)] = {
+                "api_key": api_key,
+                "encrypted_token": cipher.encrypt(access_token),
+                "created_at": now.isoformat(),
+                "expires_at": self.expiry_after(now).isoformat(),
+            }
+            return self._write(sessions)
+    
+    def clear(self, base_url: str, username: str) -> bool:
+        """
+        Remove the saved access token of an account.
+        
+        Args:
+            base_url: API URL that issued the token
+            username: mStock account username
+        
+        Returns:
+            True if the file no longer holds the token
+        """
+        with self._lock:
+            sessions = self._read()
+            if sessions.pop(self._key(base_url, username), None) is None:
+                return True
+            return self._write(sessions)
+
+
+def get_session_manager() -> Optional[SessionManager]:
+    """
+    Get the session manager configured in SESSION_CONFIG.
+    
+    Returns:
+        SessionManager, or None if tokens are not persisted
+    """
+    if not SESSION_CONFIG["persist"]:
+        return None
+    return SessionManager()
@@ -4,20 +4,28 @@ Short Strangle strategy implementation for Nifty 50.
 
 import logging
 import datetime
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Callable, List, Optional, Tuple
 import time
 
 from src.api.mstock_api import MStockAPI
+from src.api.market_stream import MarketDataStream, Tick
+from src.api.rate_limiter import Priority, request_priority
 from src.models.order import Order, OrderType, OrderSide, OrderStatus, ProductType, OptionType
 from src.models.position import Position
 from src.models.option_chain import OptionChain, OptionContract
+from src.models.option_chain_master import OptionChainMasterCache
+from src.models.chain_store import OptionChainStore
+from src.models.snapshot_store import SnapshotStore, SnapshotWriter
+from src.strategies.basket_order import BasketOrderExecutor, LegStatus
+from src.strategies.position_monitor import PositionMonitor
 from src.utils.date_utils import get_expiry_date_n_weeks_ahead, is_trading_day, get_next_trading_day
 from src.utils.option_utils import (
-    calculate_lot_size, find_strike_prices_for_strangle, find_option_contract,
+    calculate_lot_size, find_strike_prices_for_strangle, find_strike_prices_by_delta, find_option_contract,
     calculate_hedge_strike, is_premium_target_met, should_trigger_stop_loss,
     should_trigger_martingale, calculate_position_value, calculate_position_pnl
 )
-from config.config import STRATEGY_CONFIG, INVESTMENT_CONFIG, TRADING_HOURS
+from src.utils.state_bus import StatePublisher
+from config.config import STRATEGY_CONFIG, INVESTMENT_CONFIG, TRADING_HOURS, SNAPSHOT_CONFIG, STATE_BUS_CONFIG
 
 
 logger = logging.getLogger(__name__)
@@ -28,18 +36,30 @@ class ShortStrangleStrategy:
     Implementation of the Short Strangle strategy for Nifty 50.
     """
     
-    def __init__(self, api: MStockAPI):
+    def __init__(self, api: MStockAPI, clock: Callable[[], datetime.datetime] = None):
         """
         Initialize the strategy.
         
         Args:
             api: MStockAPI client
+            clock: Returns the current time, defaults to the wall clock; backtests pass event time
         """
         self.api = api
+        self.clock = clock or datetime.datetime.now
         self.active_orders = {}  # Order ID -> Order
         self.active_positions = {}  # Symbol -> Position
         self.placed_orders_cache = set()  # Set of (symbol, strike, option_type, is_hedge, is_martingale) tuples
-        
+        self.master_cache = OptionChainMasterCache(api)
+        self.chain_stores = {}  # Expiry date -> OptionChainStore
+        self.candidate_tokens = set()  # Instrument tokens of hedge and martingale candidates
+        self.market_stream = None
+        self.price_cache = None
+        self.position_monitor = None
+        self.running = False
+        self.snapshot_writer = (SnapshotWriter(SnapshotStore(SNAPSHOT_CONFIG["directory"], SNAPSHOT_CONFIG["fsync"]))
+                                if SNAPSHOT_CONFIG["enabled"] else None)
+        self.state_publisher = StatePublisher() if STATE_BUS_CONFIG["enabled"] else None
+    
     def initialize(self) -> bool:
         """
         Initialize the strategy by logging in and fetching initial data.
@@ -64,8 +84,83 @@ class ShortStrangleStrategy:
             self.active_positions[position.symbol] = position
         
         logger.info(f"Initialized strategy with {len(self.active_positions)} active positions")
+        if self.state_publisher is not None:
+            self.state_publisher.set_status(True, self.clock())
+        self.update_subscriptions()
         return True
     
+    def attach_market_stream(self, stream: MarketDataStream) -> None:
+        """
+        Use a streaming tick client for position prices.
+        
+        Args:
+            stream: Market data stream to subscribe through
+        """
+        self.market_stream = stream
+        self.price_cache = stream.cache
+        if self.state_publisher is not None:
+            self.price_cache.add_listener(self._publish_tick)
+        self.update_subscriptions()
+    
+    def _publish_tick(self, tick: Tick) -> None:
+        self.state_publisher.update_price(tick.instrument_token, tick.last_price)
+    
+    def update_subscriptions(self) -> None:
+        """
+        Subscribe the market stream to active positions and candidate instruments,
+        dropping instruments that are no longer needed. Also publishes the
+        positions to the state bus, as this is called whenever they change.
+        """
+        if self.state_publisher is not None:
+            self.state_publisher.set_positions(self.active_positions.values())
+        
+        if self.market_stream is None:
+            return
+        
+        tokens = {position.instrument_token for position in self.active_positions.values()}
+        tokens.update(self.candidate_tokens)
+        self.market_stream.set_subscriptions(tokens)
+        
+        if self.position_monitor is not None:
+            self.position_monitor.refresh()
+    
+    def start_position_monitor(self) -> Optional[PositionMonitor]:
+        """
+        React to streamed prices by evaluating stop-loss and martingale rules on
+        every tick, instead of on the check interval.
+        
+        Returns:
+            Running PositionMonitor or None if no market stream is attached
+        """
+        if self.price_cache is None:
+            logger.error("Cannot start position monitor without a market stream")
+            return None
+        
+        if self.position_monitor is None:
+            self.position_monitor = PositionMonitor(self, self.price_cache)
+        self.position_monitor.start()
+        return self.position_monitor
+    
+    def refresh_position_prices(self) -> int:
+        """
+        Update position last prices from the streamed price cache.
+        
+        Returns:
+            Number of positions updated
+        """
+        if self.price_cache is None:
+            return 0
+        
+        updated = 0
+        for position in self.active_positions.values():
+            last_price = self.price_cache.get_price(position.instrument_token)
+            if last_price is not None and last_price != position.last_price:
+                position.last_price = last_price
+                updated += 1
+                if self.state_publisher is not None:
+                    self.state_publisher.update_price(position.instrument_token, last_price)
+        return updated
+    
     def calculate_investment_amount(self) -> float:
         """
         Calculate the total investment amount based on fund summary.
@@ -93,56 +188,56 @@ class ShortStrangleStrategy:
         
         Args:
             expiry_date: Expiry date
-            
+        
         Returns:
             OptionChain object or None if request fails
         """
         # First get option chain master to find expiry timestamp and token
-        master_data = self.api.get_option_chain_master()
-        if master_data is None:
+        master = self.master_cache.get()
+        if master is None:
             logger.error("Failed to fetch option chain master")
             return None
         
-        # Find NIFTY in the option chain master
-        nifty_data = None
-        for item in master_data.get("OPTIDX", []):
-            if item.startswith("NIFTY,"):
-                nifty_data = item
-                break
-        
-        if nifty_data is None:
+        # Find NIFTY token in the option chain master
+        token = master.get_token("NIFTY")
+        if token is None:
             logger.error("Failed to find NIFTY in option chain master")
             return None
         
-        # Parse NIFTY data to get token
-        nifty_parts = nifty_data.split(",")
-        if len(nifty_parts) < 2:
-            logger.error("Invalid NIFTY data format in option chain master")
-            return None
-        
-        token = nifty_parts[1]
-        
         # Find expiry timestamp that matches our expiry date
-        expiry_timestamp = None
-        for exp_id, timestamp in master_data.get("dctExp", {}).items():
-            exp_date = datetime.datetime.fromtimestamp(timestamp).date()
-            if exp_date == expiry_date:
-                expiry_timestamp = timestamp
-                break
-        
+        expiry_timestamp = master.get_expiry_timestamp(expiry_date)
         if expiry_timestamp is None:
             logger.error(f"Failed to find expiry timestamp for date {expiry_date}")
             return None
         
         # Get option chain data
         chain_data = self.api.get_option_chain(str(expiry_timestamp), token)
+        store = self.chain_stores.get(expiry_date)
         if chain_data is None:
+            # While the endpoint's circuit breaker is open, fall back to the last chain received
+            if store is not None and store.chain is not None and not self.api.endpoint_available("GetOptionChain"):
+                logger.warning(f"Option chain endpoint unavailable, using cached chain for {expiry_date}")
+                return store.chain
             logger.error("Failed to fetch option chain data")
             return None
         
-        # Convert to OptionChain object
+        # Apply the snapshot to the stored chain, re-parsing only changed contracts
         expiry_datetime = datetime.datetime.combine(expiry_date, datetime.time(15, 30))
-        return OptionChain.from_api_response(chain_data, expiry_datetime)
+        if store is None:
+            store = OptionChainStore(expiry_datetime)
+            self.chain_stores[expiry_date] = store
+        
+        changes = store.apply(chain_data)
+        if changes is None:
+            return None
+        
+        if self.snapshot_writer is not None:
+            self.snapshot_writer.append(chain_data, expiry_datetime, self.clock())
+        
+        if changes:
+            logger.debug(f"Option chain {expiry_date}: {len(changes.changed)} changed, "
+                         f"{len(changes.added)} added, {len(changes.removed)} removed")
+        return store.chain
     
     def place_short_strangle(self, investment_amount: float) -> bool:
         """
@@ -150,7 +245,7 @@ class ShortStrangleStrategy:
         
         Args:
             investment_amount: Investment amount
-            
+        
         Returns:
             True if successful, False otherwise
         """
@@ -159,8 +254,9 @@ class ShortStrangleStrategy:
         quantity = lot_size * INVESTMENT_CONFIG["lot_size"]
         
         # Get expiry dates
-        sell_expiry_date = get_expiry_date_n_weeks_ahead(STRATEGY_CONFIG["sell_expiry_weeks"])
-        hedge_expiry_date = get_expiry_date_n_weeks_ahead(STRATEGY_CONFIG["hedge_expiry_weeks"])
+        now = self.clock()
+        sell_expiry_date = get_expiry_date_n_weeks_ahead(STRATEGY_CONFIG["sell_expiry_weeks"], as_of=now)
+        hedge_expiry_date = get_expiry_date_n_weeks_ahead(STRATEGY_CONFIG["hedge_expiry_weeks"], as_of=now)
         
         if sell_expiry_date is None or hedge_expiry_date is None:
             logger.error("Failed to calculate expiry dates")
@@ -174,8 +270,15 @@ class ShortStrangleStrategy:
             logger.error("Failed to fetch option chains")
             return False
         
+        if not sell_chain.calls or not sell_chain.puts:
+            logger.error("Option chain has no contracts to sell")
+            return False
+        
         # Find strike prices for short strangle
-        call_strike, put_strike = find_strike_prices_for_strangle(sell_chain)
+        if STRATEGY_CONFIG["strike_selection"] == "delta":
+            call_strike, put_strike = find_strike_prices_by_delta(sell_chain, as_of=now)
+        else:
+            call_strike, put_strike = find_strike_prices_for_strangle(sell_chain)
         
         # Find option contracts
         sell_call = find_option_contract(sell_chain, call_strike, "CE")
@@ -198,14 +301,24 @@ class ShortStrangleStrategy:
         hedge_call_strike = calculate_hedge_strike(call_strike, call_premium, "CE")
         hedge_put_strike = calculate_hedge_strike(put_strike, put_premium, "PE")
         
-        # Find hedge option contracts
-        hedge_call = find_option_contract(hedge_chain, hedge_call_strike, "CE")
-        hedge_put = find_option_contract(hedge_chain, hedge_put_strike, "PE")
+        # Find hedge option contracts at the closest listed strikes
+        hedge_call = find_option_contract(hedge_chain, hedge_call_strike, "CE", nearest=True)
+        hedge_put = find_option_contract(hedge_chain, hedge_put_strike, "PE", nearest=True)
         
         if hedge_call is None or hedge_put is None:
             logger.error("Failed to find hedge option contracts")
             return False
         
+        hedge_call_strike = hedge_call.strike_price
+        hedge_put_strike = hedge_put.strike_price
+        
+        # Stream the legs and their next strikes out, which are the martingale candidates
+        candidates = [sell_call, sell_put, hedge_call, hedge_put,
+                      sell_chain.strike_index("CE").above(call_strike),
+                      sell_chain.strike_index("PE").below(put_strike)]
+        self.candidate_tokens.update(contract.instrument_token for contract in candidates if contract is not None)
+        self.update_subscriptions()
+        
         # Check if orders already placed
         call_key = (sell_call.symbol, call_strike, "CE", False, False)
         put_key = (sell_put.symbol, put_strike, "PE", False, False)
@@ -268,29 +381,26 @@ class ShortStrangleStrategy:
             is_hedge=True
         )
         
-        # Execute orders
+        # Execute orders as a basket so the short legs are never left unhedged
         orders = [sell_call_order, sell_put_order, hedge_call_order, hedge_put_order]
-        success = True
+        result = BasketOrderExecutor(self.api).execute(orders)
         
-        for order in orders:
-            order_params = order.to_api_params()
-            response = self.api.place_order(order_params)
-            
-            if response is None:
-                logger.error(f"Failed to place order: {order.symbol}")
-                success = False
+        for leg in result.legs:
+            if leg.status != LegStatus.PLACED:
+                logger.error(f"Failed to place order: {leg.order.symbol} ({leg.status.value})")
                 continue
             
-            order.order_id = response.get("order_id")
+            order = leg.order
             self.active_orders[order.order_id] = order
             
             # Add to placed orders cache
             key = (order.symbol, order.strike_price, order.option_type.value, order.is_hedge, order.is_martingale)
             self.placed_orders_cache.add(key)
             
-            logger.info(f"Placed order: {order.side.value} {order.symbol} at {order.strike_price}")
+            logger.info(f"Placed order: {order.side.value} {order.symbol} at {order.strike_price} "
+                        f"({leg.latency * 1000:.1f} ms)")
         
-        return success
+        return result.success
     
     def handle_stop_loss(self, position: Position) -> bool:
         """
@@ -298,7 +408,7 @@ class ShortStrangleStrategy:
         
         Args:
             position: Position to handle
-            
+        
         Returns:
             True if successful, False otherwise
         """
@@ -318,7 +428,8 @@ class ShortStrangleStrategy:
         )
         
         order_params = stop_loss_order.to_api_params()
-        response = self.api.place_order(order_params)
+        with request_priority(Priority.CRITICAL):
+            response = self.api.place_order(order_params)
         
         if response is None:
             logger.error(f"Failed to place stop loss order for {position.symbol}")
@@ -362,7 +473,7 @@ class ShortStrangleStrategy:
         
         Args:
             position: Position to handle
-            
+        
         Returns:
             True if successful, False otherwise
         """
@@ -370,10 +481,8 @@ class ShortStrangleStrategy:
         if not should_trigger_martingale(position.average_price, position.last_price):
             return True  # No action needed
         
-        # Get option chain to find next strike
-        # For simplicity, we'll assume we know the expiry date
-        # In a real implementation, we would extract this from the position symbol
-        expiry_date = position.expiry_date.date() if position.expiry_date else datetime.date.today()
+        # Get option chain to find next strike, in the expiry parsed from the position symbol
+        expiry_date = position.expiry_date.date() if position.expiry_date else self.clock().date()
         option_chain = self.get_option_chain_for_expiry(expiry_date)
         
         if option_chain is None:
@@ -385,12 +494,13 @@ class ShortStrangleStrategy:
         current_strike = position.strike_price or 0
         
         # Find next strike in the appropriate direction
+        strike_index = option_chain.strike_index(option_type)
         if option_type == "CE":
-            next_strikes = sorted([c.strike_price for c in option_chain.calls if c.strike_price > current_strike])
-            next_strike = next_strikes[0] if next_strikes else current_strike + 100  # Default increment
+            next_listed = strike_index.above(current_strike)
+            next_strike = next_listed.strike_price if next_listed else current_strike + 100  # Default increment
         else:  # PE
-            next_strikes = sorted([c.strike_price for c in option_chain.puts if c.strike_price < current_strike], reverse=True)
-            next_strike = next_strikes[0] if next_strikes else current_strike - 100  # Default decrement
+            next_listed = strike_index.below(current_strike)
+            next_strike = next_listed.strike_price if next_listed else current_strike - 100  # Default decrement
         
         # Find option contract for next strike
         next_contract = find_option_contract(option_chain, next_strike, option_type)
@@ -404,5 +514,237 @@ class ShortStrangleStrategy:
             symbol=next_contract.symbol,
             exchange="NFO",
             order_type=OrderType.MARKET,
-      
-(Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
+            side=OrderSide.BUY,
+            quantity=abs(position.quantity),
+            product=ProductType.NRML,
+            option_type=OptionType(option_type),
+            strike_price=next_strike,
+            expiry_date=position.expiry_date,
+            is_hedge=True,
+            is_martingale=True
+        )
+        
+        # Sell a larger quantity at the strike whose premium is closest to the reduced target
+        target_premium = position.last_price / STRATEGY_CONFIG["martingale_premium_divisor"]
+        contracts = option_chain.calls if option_type == "CE" else option_chain.puts
+        priced = [contract for contract in contracts if contract.last_price > 0]
+        sell_contract = min(priced, key=lambda contract: abs(contract.last_price - target_premium), default=None)
+        
+        if sell_contract is None:
+            logger.error(f"Failed to find option contract for martingale premium {target_premium}")
+            return False
+        
+        sell_key = (sell_contract.symbol, sell_contract.strike_price, option_type, False, True)
+        if sell_key in self.placed_orders_cache:
+            logger.info(f"Martingale orders already placed for {position.symbol}")
+            return True
+        
+        sell_order = Order(
+            symbol=sell_contract.symbol,
+            exchange="NFO",
+            order_type=OrderType.MARKET,
+            side=OrderSide.SELL,
+            quantity=int(abs(position.quantity) * STRATEGY_CONFIG["martingale_quantity_multiplier"]),
+            product=ProductType.NRML,
+            option_type=OptionType(option_type),
+            strike_price=sell_contract.strike_price,
+            expiry_date=position.expiry_date,
+            is_martingale=True
+        )
+        
+        # Execute as a basket so the larger sell is never placed without its buy
+        result = BasketOrderExecutor(self.api).execute([buy_order, sell_order])
+        
+        for leg in result.placed_legs:
+            order = leg.order
+            self.active_orders[order.order_id] = order
+            key = (order.symbol, order.strike_price, order.option_type.value, order.is_hedge, order.is_martingale)
+            self.placed_orders_cache.add(key)
+            logger.info(f"Placed martingale order: {order.side.value} {order.quantity} {order.symbol}")
+        
+        if not result.success:
+            logger.error(f"Failed to place martingale orders for {position.symbol}")
+        
+        return result.success
+    
+    def rollover_hedge(self) -> bool:
+        """
+        Roll hedge positions expiring today over to next week's expiry.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        now = self.clock()
+        this_week_expiry = get_expiry_date_n_weeks_ahead(1, as_of=now)
+        if this_week_expiry is None or now.date() != this_week_expiry:
+            return True  # Not expiry day
+        
+        hedges = [position for position in self.active_positions.values()
+                  if position.quantity > 0 and position.expiry_date is not None
+                  and position.expiry_date.date() == this_week_expiry]
+        if not hedges:
+            return True  # No action needed
+        
+        next_week_expiry = get_expiry_date_n_weeks_ahead(2, as_of=now)
+        option_chain = self.get_option_chain_for_expiry(next_week_expiry) if next_week_expiry else None
+        
+        if option_chain is None:
+            logger.error("Failed to fetch option chain for hedge rollover")
+            return False
+        
+        success = True
+        for position in hedges:
+            option_type = position.option_type.value if position.option_type else "CE"
+            new_contract = find_option_contract(option_chain, position.strike_price or 0, option_type, nearest=True)
+            
+            if new_contract is None:
+                logger.error(f"Failed to find next week's hedge contract for {position.symbol}")
+                success = False
+                continue
+            
+            # Buy next week's hedge before selling the expiring one, so the sell legs stay covered
+            buy_order = Order(
+                symbol=new_contract.symbol,
+                exchange="NFO",
+                order_type=OrderType.MARKET,
+                side=OrderSide.BUY,
+                quantity=position.quantity,
+                product=ProductType.NRML,
+                option_type=OptionType(option_type),
+                strike_price=new_contract.strike_price,
+                expiry_date=datetime.datetime.combine(next_week_expiry, datetime.time(15, 30)),
+                is_hedge=True
+            )
+            
+            close_order = Order(
+                symbol=position.symbol,
+                exchange=position.exchange,
+                order_type=OrderType.MARKET,
+                side=OrderSide.SELL,
+                quantity=position.quantity,
+                product=ProductType(position.product),
+                option_type=position.option_type,
+                strike_price=position.strike_price,
+                expiry_date=position.expiry_date,
+                is_hedge=True
+            )
+            
+            executor = BasketOrderExecutor(self.api, ordering=lambda order: 0 if order.side == OrderSide.BUY else 1)
+            result = executor.execute([buy_order, close_order])
+            
+            for leg in result.placed_legs:
+                self.active_orders[leg.order.order_id] = leg.order
+            
+            if not result.success:
+                logger.error(f"Failed to roll over hedge {position.symbol}")
+                success = False
+                continue
+            
+            logger.info(f"Rolled over hedge {position.symbol} to {new_contract.symbol}")
+        
+        return success
+    
+    def update_positions(self) -> bool:
+        """
+        Re-sync active positions from the broker.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        positions = self.api.get_positions()
+        if positions is None:
+            logger.error("Failed to fetch positions")
+            return False
+        
+        active_positions = {}
+        for position_data in positions:
+            position = Position.from_api_response(position_data)
+            active_positions[position.symbol] = position
+        
+        self.active_positions = active_positions
+        self.update_subscriptions()
+        return True
+    
+    def is_trading_time(self) -> bool:
+        """
+        Check whether the market is open.
+        
+        Returns:
+            True on a trading day within trading hours, False otherwise
+        """
+        now = self.clock()
+        if not is_trading_day(now.date()):
+            return False
+        
+        start_time = datetime.datetime.strptime(TRADING_HOURS["start_time"], "%H:%M:%S").time()
+        end_time = datetime.datetime.strptime(TRADING_HOURS["end_time"], "%H:%M:%S").time()
+        return start_time <= now.time() <= end_time
+    
+    def check_positions(self) -> bool:
+        """
+        Apply the stop loss and martingale rules to the sell legs and roll over expiring hedges.
+        
+        Returns:
+            True if every action succeeded, False otherwise
+        """
+        success = True
+        for position in list(self.active_positions.values()):
+            if position.quantity >= 0:
+                continue  # Rules apply to sell legs only
+            
+            if should_trigger_stop_loss(position.average_price, position.last_price):
+                success = self.handle_stop_loss(position) and success
+            elif should_trigger_martingale(position.average_price, position.last_price):
+                success = self.handle_martingale(position) and success
+        
+        return self.rollover_hedge() and success
+    
+    def run_once(self) -> bool:
+        """
+        Run one check: re-sync positions, enter a short strangle when flat,
+        otherwise manage the open positions.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.update_positions():
+            return False
+        self.refresh_position_prices()
+        
+        if not any(position.quantity != 0 for position in self.active_positions.values()):
+            return self.place_short_strangle(self.calculate_investment_amount())
+        
+        return self.check_positions()
+    
+    def run(self) -> None:
+        """
+        Run the strategy every check interval during trading hours until stopped.
+        """
+        if not self.initialize():
+            return
+        
+        self.running = True
+        logger.info("Strategy started")
+        try:
+            while self.running:
+                now = self.clock()
+                if self.is_trading_time():
+                    self.run_once()
+                elif not is_trading_day(now.date()):
+                    logger.info(f"Market closed, next trading day is {get_next_trading_day(now.date())}")
+                time.sleep(TRADING_HOURS["check_interval"])
+        finally:
+            self.stop()
+    
+    def stop(self) -> None:
+        """
+        Stop the strategy loop and the position monitor.
+        """
+        self.running = False
+        if self.position_monitor is not None:
+            self.position_monitor.stop()
+        if self.snapshot_writer is not None:
+            self.snapshot_writer.close()
+        if self.state_publisher is not None:
+            self.state_publisher.set_status(False)
+        logger.info("Strategy stopped")
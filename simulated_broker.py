@@ -0,0 +1,551 @@
+"""
+Simulated broker for backtesting.
+Implements the MStockAPI surface over historical option chain snapshots, with
+fill, slippage and margin models, so strategies run unchanged against it.
+"""
+
+import datetime
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import requests
+
+from src.api.mstock_api import MStockAPI
+from src.models.chain_series import ChainSeries, SeriesSide
+from config.config import BACKTEST_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class FillModel:
+    """
+    Prices market and limit orders against a snapshot's quotes.
+    
+    Buys fill at the ask and sells at the bid, falling back to the last price
+    when that side of the book is empty, and every fill is moved against the
+    order by the configured slippage.
+    """
+    
+    def __init__(self, slippage_ticks: float = None, tick_size: float = None):
+        """
+        Initialize the fill model.
+        
+        Args:
+            slippage_ticks: Ticks of adverse slippage per fill, defaults to BACKTEST_CONFIG
+            tick_size: Price increment, defaults to BACKTEST_CONFIG
+        """
+        self.slippage_ticks = BACKTEST_CONFIG["slippage_ticks"] if slippage_ticks is None else slippage_ticks
+        self.tick_size = BACKTEST_CONFIG["tick_size"] if tick_size is None else tick_size
+    
+    def _touch(self, side: str, last: float, bid: float, ask: float) -> Optional[float]:
+        price = ask if side == "BUY" else bid
+        if not price > 0:
+            price = last
+        return price if price > 0 else None
+    
+    def market_price(self, side: str, last: float, bid: float, ask: float) -> Optional[float]:
+        """
+        Get the fill price of a market order.
+        
+        Args:
+            side: BUY or SELL
+            last: Last traded price
+            bid: Best bid
+            ask: Best ask
+        
+        Returns:
+            Fill price or None if the contract has no usable quote
+        """
+        price = self._touch(side, last, bid, ask)
+        if price is None:
+            return None
+        slippage = self.slippage_ticks * self.tick_size
+        return price + slippage if side == "BUY" else max(price - slippage, self.tick_size)
+    
+    def limit_price(self, side: str, limit: float, last: float, bid: float, ask: float) -> Optional[float]:
+        """
+        Get the fill price of a limit order if it is marketable.
+        
+        Args:
+            side: BUY or SELL
+            limit: Limit price
+            last: Last traded price
+            bid: Best bid
+            ask: Best ask
+        
+        Returns:
+            Fill price or None if the order does not fill at this snapshot
+        """
+        price = self.market_price(side, last, bid, ask)
+        if price is None:
+            return None
+        if side == "BUY":
+            return min(price, limit) if price <= limit else None
+        return max(price, limit) if price >= limit else None
+
+
+class MarginModel:
+    """
+    Margin for short options as a fraction of spot notional.
+    Short quantity covered by long options of the same type blocks less margin.
+    """
+    
+    def __init__(self, short_margin_rate: float = None, hedge_margin_benefit: float = None):
+        """
+        Initialize the margin model.
+        
+        Args:
+            short_margin_rate: Margin per short option as a fraction of spot notional, defaults to BACKTEST_CONFIG
+            hedge_margin_benefit: Fractional reduction for hedged quantity, defaults to BACKTEST_CONFIG
+        """
+        self.short_margin_rate = BACKTEST_CONFIG["short_margin_rate"] if short_margin_rate is None else short_margin_rate
+        self.hedge_margin_benefit = (BACKTEST_CONFIG["hedge_margin_benefit"]
+                                     if hedge_margin_benefit is None else hedge_margin_benefit)
+    
+    def required(self, exposures: List[Tuple[str, int, float]]) -> float:
+        """
+        Get the margin blocked by a set of positions.
+        
+        Args:
+            exposures: (option type, signed quantity, spot price) for each position
+        
+        Returns:
+            Required margin
+        """
+        margin = 0.0
+        for option_type in ("CE", "PE"):
+            shorts = [(-quantity, spot) for kind, quantity, spot in exposures if kind == option_type and quantity < 0]
+            if not shorts:
+                continue
+            short_quantity = sum(quantity for quantity, _ in shorts)
+            long_quantity = sum(quantity for kind, quantity, _ in exposures if kind == option_type and quantity > 0)
+            hedged = min(long_quantity, short_quantity) / short_quantity
+            notional = sum(quantity * spot for quantity, spot in shorts)
+            margin += self.short_margin_rate * notional * (1 - self.hedge_margin_benefit * hedged)
+        return margin
+
+
+@dataclass
+class _Book:
+    """Net position in one contract."""
+    symbol: str
+    token: str
+    series_index: int
+    series: ChainSeries
+    side: SeriesSide
+    column: int
+    quantity: int = 0
+    average_price: float = 0.0
+    last_price: float = 0.0
+    realized_pnl: float = 0.0
+    buy_quantity: int = 0
+    buy_value: float = 0.0
+    sell_quantity: int = 0
+    sell_value: float = 0.0
+
+
+class SimulatedBroker(MStockAPI):
+    """
+    MStockAPI replacement that trades against historical chain snapshots.
+    
+    Call advance() with each event time; option chains, positions and fills
+    then reflect the latest snapshot at or before that time. Positions still
+    open at expiry are settled at intrinsic value.
+    """
+    
+    def __init__(self, series: List[ChainSeries], capital: float = None, fill_model: FillModel = None,
+                 margin_model: MarginModel = None, brokerage: float = None, underlying_token: str = "26000"):
+        """
+        Initialize the simulated broker.
+        
+        Args:
+            series: Chain series, one per expiry
+            capital: Starting cash, defaults to BACKTEST_CONFIG
+            fill_model: Fill model, defaults to FillModel()
+            margin_model: Margin model, defaults to MarginModel()
+            brokerage: Charge per executed order, defaults to BACKTEST_CONFIG
+            underlying_token: Token reported for the underlying in the option chain master
+        """
+        super().__init__("backtest", "backtest", "", session=requests.Session())
+        # Everything is answered from the snapshots: no rate limits, breakers or saved tokens
+        self.access_token = "backtest"
+        self.headers = {}
+        self.base_url = ""
+        self.ws_url = ""
+        self.rate_limiter = None
+        self.breakers = None
+        self.session_manager = None
+        
+        self.series = sorted(series, key=lambda item: item.expiry_timestamp)
+        self.cash = BACKTEST_CONFIG["initial_capital"] if capital is None else capital
+        self.fill_model = fill_model or FillModel()
+        self.margin_model = margin_model or MarginModel()
+        self.brokerage = BACKTEST_CONFIG["brokerage_per_order"] if brokerage is None else brokerage
+        self.underlying_token = underlying_token
+        
+        self.timestamp = None
+        self.rows = np.full(len(self.series), -1, dtype=np.int64)
+        self.trades = []  # Executed fills and settlements
+        self.rejected_orders = 0
+        self.position_version = 0  # Incremented whenever a fill or settlement changes positions
+        self._orders = {}  # Order ID -> order record
+        self._books = {}  # Symbol -> _Book
+        self._next_order_id = 1
+        self._series_by_expiry = {item.expiry_timestamp: index for index, item in enumerate(self.series)}
+        self._settled = set()  # Indexes of settled series
+    
+    @property
+    def now(self) -> Optional[datetime.datetime]:
+        """Current event time."""
+        return datetime.datetime.fromtimestamp(self.timestamp) if self.timestamp is not None else None
+    
+    @property
+    def order_count(self) -> int:
+        """Number of orders placed in the simulation, whatever their status."""
+        return len(self._orders)
+    
+    def advance(self, timestamp: int, rows: np.ndarray = None) -> None:
+        """
+        Move the simulation to an event time.
+        
+        Settles expired contracts, marks positions to the latest snapshot and
+        fills resting limit orders that have become marketable.
+        
+        Args:
+            timestamp: Unix seconds
+            rows: Precomputed snapshot index of every series at this time
+        """
+        self.timestamp = int(timestamp)
+        self.rows = rows if rows is not None else np.array([item.row_at(timestamp) for item in self.series],
+                                                           dtype=np.int64)
+        
+        for index, item in enumerate(self.series):
+            if index not in self._settled and item.expiry_timestamp <= self.timestamp:
+                self._settle(index)
+        
+        for book in self._books.values():
+            if book.quantity != 0:
+                last, _, _ = self._quote(book)
+                if last == last:  # Not NaN
+                    book.last_price = last
+        
+        for record in list(self._orders.values()):
+            if record["status"] == "OPEN":
+                self._try_fill(record)
+    
+    def _quote(self, book: _Book) -> Tuple[float, float, float]:
+        row = int(self.rows[book.series_index])
+        if row < 0:
+            return np.nan, np.nan, np.nan
+        side, column = book.side, book.column
+        return side.last_price[row, column], side.bid_price[row, column], side.ask_price[row, column]
+    
+    def _spot(self, book: _Book) -> float:
+        row = int(self.rows[book.series_index])
+        return float(book.series.spot_price[row]) if row >= 0 else 0.0
+    
+    def _book(self, symbol: str) -> Optional[_Book]:
+        book = self._books.get(symbol)
+        if book is not None:
+            return book
+        for index, item in enumerate(self.series):
+            location = item.locate(symbol)
+            if location is not None:
+                side, column = location
+                book = _Book(symbol, side.tokens[column], index, item, side, column)
+                self._books[symbol] = book
+                return book
+        return None
+    
+    def last_price(self, symbol: str) -> float:
+        """
+        Get the mark of a contract.
+        
+        Args:
+            symbol: Trading symbol
+        
+        Returns:
+            Last price of the contract, 0 if it was never traded
+        """
+        book = self._books.get(symbol)
+        return book.last_price if book is not None else 0.0
+    
+    def equity(self) -> float:
+        """
+        Get cash plus the marked value of open positions.
+        
+        Returns:
+            Account equity
+        """
+        return self.cash + sum(book.quantity * book.last_price for book in self._books.values() if book.quantity)
+    
+    def margin_used(self, extra: Tuple[_Book, int] = None) -> float:
+        """
+        Get the margin blocked by open positions.
+        
+        Args:
+            extra: (book, signed quantity) of a prospective fill to include
+        
+        Returns:
+            Required margin
+        """
+        quantities = {symbol: book.quantity for symbol, book in self._books.items() if book.quantity}
+        if extra is not None:
+            quantities[extra[0].symbol] = quantities.get(extra[0].symbol, 0) + extra[1]
+        exposures = [(self._books[symbol].side.option_type, quantity, self._spot(self._books[symbol]))
+                     for symbol, quantity in quantities.items() if quantity]
+        return self.margin_model.required(exposures)
+    
+    def _try_fill(self, record: Dict[str, Any]) -> bool:
+        book = record["book"]
+        last, bid, ask = self._quote(book)
+        if record["order_type"] == "LIMIT":
+            price = self.fill_model.limit_price(record["transaction_type"], record["price"], last, bid, ask)
+        else:
+            price = self.fill_model.market_price(record["transaction_type"], last, bid, ask)
+        if price is None:
+            return False
+        
+        signed = record["quantity"] if record["transaction_type"] == "BUY" else -record["quantity"]
+        margin_after = self.margin_used((book, signed))
+        if margin_after > self.margin_used() and margin_after > self.equity() - self.brokerage:
+            record["status"] = "REJECTED"
+            record["status_message"] = "Insufficient margin"
+            self.rejected_orders += 1
+            logger.warning(f"Order {record['order_id']} for {book.symbol} rejected: insufficient margin")
+            return False
+        
+        self._fill(book, signed, price)
+        record.update(status="COMPLETE", average_price=price, filled_quantity=record["quantity"],
+                      exchange_timestamp=self.now.isoformat())
+        self.trades.append({"timestamp": self.timestamp, "order_id": record["order_id"], "symbol": book.symbol,
+                            "quantity": signed, "price": price, "kind": "fill"})
+        return True
+    
+    def _fill(self, book: _Book, signed: int, price: float, charge: bool = True) -> None:
+        self.cash -= signed * price + (self.brokerage if charge else 0.0)
+        if signed > 0:
+            book.buy_quantity += signed
+            book.buy_value += signed * price
+        else:
+            book.sell_quantity -= signed
+            book.sell_value -= signed * price
+        
+        quantity = book.quantity
+        if quantity == 0 or (quantity > 0) == (signed > 0):
+            book.average_price = (book.average_price * abs(quantity) + price * abs(signed)) / (abs(quantity) + abs(signed))
+        else:
+            closing = min(abs(signed), abs(quantity))
+            book.realized_pnl += closing * (price - book.average_price) * (1 if quantity > 0 else -1)
+            if abs(signed) > abs(quantity):
+                book.average_price = price
+            elif abs(signed) == abs(quantity):
+                book.average_price = 0.0
+        book.quantity = quantity + signed
+        book.last_price = price
+        self.position_version += 1
+    
+    def _settle(self, index: int) -> None:
+        item = self.series[index]
+        row = item.row_at(item.expiry_timestamp)
+        spot = float(item.spot_price[row]) if row >= 0 else 0.0
+        for book in self._books.values():
+            if book.series_index != index or book.quantity == 0:
+                continue
+            strike = float(book.side.strike[book.column])
+            intrinsic = max(spot - strike, 0.0) if book.side.option_type == "CE" else max(strike - spot, 0.0)
+            self.trades.append({"timestamp": item.expiry_timestamp, "order_id": None, "symbol": book.symbol,
+                                "quantity": -book.quantity, "price": intrinsic, "kind": "settlement"})
+            self._fill(book, -book.quantity, intrinsic, charge=False)
+        self._settled.add(index)
+    
+    def login(self) -> bool:
+        """
+        Log in to the simulated account.
+        
+        Returns:
+            Always True
+        """
+        return True
+    
+    def get_positions(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get open positions.
+        
+        Returns:
+            List of positions in API response format
+        """
+        positions = []
+        for book in self._books.values():
+            if book.quantity == 0:
+                continue
+            positions.append({
+                "tradingsymbol": book.symbol,
+                "exchange": "NFO",
+                "instrument_token": book.token,
+                "product": "NRML",
+                "quantity": book.quantity,
+                "average_price": book.average_price,
+                "last_price": book.last_price,
+                "pnl": book.realized_pnl + book.quantity * (book.last_price - book.average_price),
+                "buy_quantity": book.buy_quantity,
+                "buy_price": book.buy_value / book.buy_quantity if book.buy_quantity else 0.0,
+                "buy_value": book.buy_value,
+                "sell_quantity": book.sell_quantity,
+                "sell_price": book.sell_value / book.sell_quantity if book.sell_quantity else 0.0,
+                "sell_value": book.sell_value,
+            })
+        return positions
+    
+    def get_option_chain_master(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the option chain master listing every expiry in the data set.
+        
+        Returns:
+            Option chain master data
+        """
+        underlying = self.series[0].underlying if self.series else "NIFTY"
+        return {
+            "dctExp": {str(index + 1): item.expiry_timestamp for index, item in enumerate(self.series)},
+            "OPTIDX": [f"{underlying},{self.underlying_token}"]
+        }
+    
+    def get_option_chain(self, expiry_timestamp: str, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the option chain snapshot at the current event time.
+        
+        Args:
+            expiry_timestamp: Expiry timestamp
+            token: Underlying token
+        
+        Returns:
+            Option chain data or None if there is no snapshot yet
+        """
+        index = self._series_by_expiry.get(int(expiry_timestamp))
+        if index is None or index in self._settled:
+            logger.error(f"No option chain data for expiry {expiry_timestamp}")
+            return None
+        
+        row = int(self.rows[index])
+        if row < 0:
+            logger.error(f"No option chain snapshot for expiry {expiry_timestamp} at {self.now}")
+            return None
+        return self.series[index].to_api_response(row)
+    
+    def place_order(self, order_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Place an order, filling it immediately if it is marketable.
+        
+        Args:
+            order_params: Order parameters
+        
+        Returns:
+            Order response or None if the order is rejected
+        """
+        symbol = order_params.get("tradingsymbol", "")
+        book = self._book(symbol)
+        if book is None:
+            logger.error(f"Failed to place order: unknown instrument {symbol}")
+            self.rejected_orders += 1
+            return None
+        
+        order_id = f"BT{self._next_order_id:08d}"
+        self._next_order_id += 1
+        record = {
+            "order_id": order_id,
+            "book": book,
+            "tradingsymbol": symbol,
+            "exchange": order_params.get("exchange", "NFO"),
+            "transaction_type": order_params.get("transaction_type", "BUY"),
+            "order_type": order_params.get("order_type", "MARKET"),
+            "product": order_params.get("product", "NRML"),
+            "quantity": int(order_params.get("quantity", 0)),
+            "price": float(order_params.get("price", 0)),
+            "average_price": 0.0,
+            "filled_quantity": 0,
+            "status": "OPEN",
+            "order_timestamp": self.now.isoformat(),
+        }
+        self._orders[order_id] = record
+        
+        filled = self._try_fill(record)
+        if not filled and record["order_type"] != "LIMIT" and record["status"] != "REJECTED":
+            record.update(status="REJECTED", status_message="No quote")
+            self.rejected_orders += 1
+        if record["status"] == "REJECTED":
+            logger.error(f"Failed to place order: {record['status_message']} for {symbol}")
+            return None
+        
+        return {"order_id": order_id, "status": record["status"]}
+    
+    def modify_order(self, order_id: str, order_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Modify the price or quantity of an open order.
+        
+        Args:
+            order_id: Order ID to modify
+            order_params: New order parameters
+        
+        Returns:
+            Order response or None if the order is not open
+        """
+        record = self._orders.get(order_id)
+        if record is None or record["status"] != "OPEN":
+            logger.error(f"Failed to modify order: {order_id} is not open")
+            return None
+        
+        if "price" in order_params:
+            record["price"] = float(order_params["price"])
+        if "quantity" in order_params:
+            record["quantity"] = int(order_params["quantity"])
+        if "order_type" in order_params:
+            record["order_type"] = order_params["order_type"]
+        self._try_fill(record)
+        return {"order_id": order_id, "status": record["status"]}
+    
+    def cancel_order(self, order_id: str) -> bool:
+        """
+        Cancel an open order.
+        
+        Args:
+            order_id: Order ID to cancel
+        
+        Returns:
+            True if cancellation successful, False otherwise
+        """
+        record = self._orders.get(order_id)
+        if record is None or record["status"] != "OPEN":
+            logger.error(f"Failed to cancel order: {order_id} is not open")
+            return False
+        record["status"] = "CANCELLED"
+        return True
+    
+    def get_order_history(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get all orders placed in the simulation.
+        
+        Returns:
+            List of orders in API response format
+        """
+        return [{key: value for key, value in record.items() if key != "book"} for record in self._orders.values()]
+    
+    def get_fund_summary(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the simulated fund summary.
+        
+        Returns:
+            Fund summary with blocked margin and available funds
+        """
+        margin = self.margin_used()
+        return {"invested_amount": margin, "available_funds": self.equity() - margin}
+    
+    def get_pool_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get connection pool statistics.
+        
+        Returns:
+            None, the simulated broker sends no HTTP requests
+        """
+        return None
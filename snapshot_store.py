@@ -0,0 +1,495 @@
+"""
+Columnar on-disk store of option chain snapshots.
+Each underlying/expiry/day is a directory of fixed-width column files that are
+appended per snapshot and read back memory-mapped, without JSON parsing. This
+is the on-disk format of both live captures and backtest market data.
+"""
+
+import datetime
+import json
+import logging
+import os
+import queue
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from src.models.chain_series import ChainSeries, SeriesSide
+from config.config import SNAPSHOT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# API field name, column file, dtype
+COLUMNS = (
+    ("strikePrice", "strike", np.dtype("<f8")),
+    ("bidPrice", "bid_price", np.dtype("<f8")),
+    ("askPrice", "ask_price", np.dtype("<f8")),
+    ("lastPrice", "last_price", np.dtype("<f8")),
+    ("openInterest", "open_interest", np.dtype("<i8")),
+)
+
+# One record per snapshot: rows [offset, offset + count) of the column files belong to it
+INDEX_DTYPE = np.dtype([("timestamp", "<i8"), ("offset", "<i8"), ("count", "<i8"), ("spot_price", "<f8")])
+
+OPTION_TYPES = ("CE", "PE")  # Stored in the option_type column as 0 and 1
+
+
+class SnapshotDay:
+    """
+    Memory-mapped snapshots of one underlying and expiry on one day.
+    
+    Column arrays hold one row per contract per snapshot, calls then puts,
+    and are only as long as the index says, so a snapshot that was being
+    written when the process died is ignored.
+    """
+    
+    def __init__(self, directory: str):
+        """
+        Map the files of a day directory.
+        
+        Args:
+            directory: Day directory written by SnapshotStore
+        """
+        self.directory = directory
+        self.index = _map(os.path.join(directory, "index.bin"), INDEX_DTYPE)
+        rows = int(self.index["offset"][-1] + self.index["count"][-1]) if len(self.index) else 0
+        
+        self.option_type = _map(os.path.join(directory, "option_type.bin"), np.dtype("i1"))[:rows]
+        for _, name, dtype in COLUMNS:
+            setattr(self, name, _map(os.path.join(directory, f"{name}.bin"), dtype)[:rows])
+        
+        with open(os.path.join(directory, "contracts.json")) as f:
+            metadata = json.load(f)
+        self.underlying = metadata["underlying"]
+        self.expiry_date = datetime.datetime.fromisoformat(metadata["expiry_date"])
+        self.contracts = {(option_type, float(strike)): tuple(contract)
+                          for option_type, side in metadata["contracts"].items()
+                          for strike, contract in side.items()}  # (type, strike) -> (symbol, token)
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Snapshot times as Unix seconds."""
+        return self.index["timestamp"]
+    
+    @property
+    def spot_price(self) -> np.ndarray:
+        """Spot price of every snapshot."""
+        return self.index["spot_price"]
+    
+    def rows(self, snapshot: int) -> slice:
+        """
+        Get the column rows of one snapshot.
+        
+        Args:
+            snapshot: Snapshot index
+        
+        Returns:
+            Slice into the column arrays
+        """
+        offset = int(self.index["offset"][snapshot])
+        return slice(offset, offset + int(self.index["count"][snapshot]))
+    
+    def to_api_response(self, snapshot: int) -> Dict[str, Any]:
+        """
+        Rebuild the option chain response of one snapshot.
+        
+        Args:
+            snapshot: Snapshot index
+        
+        Returns:
+            Option chain data in API response format
+        """
+        rows = self.rows(snapshot)
+        columns = {name: getattr(self, name)[rows].tolist() for _, name, _ in COLUMNS}
+        sides = {"ce": [], "pe": []}
+        for i, option_type in enumerate(self.option_type[rows].tolist()):
+            kind = OPTION_TYPES[option_type]
+            symbol, token = self.contracts.get((kind, columns["strike"][i]), ("", ""))
+            sides[kind.lower()].append({
+                "sym": symbol,
+                "strikePrice": columns["strike"][i],
+                "token": token,
+                "lastPrice": columns["last_price"][i],
+                "openInterest": columns["open_interest"][i],
+                "bidPrice": columns["bid_price"][i],
+                "askPrice": columns["ask_price"][i],
+            })
+        return {"contractModel": {"sym": self.underlying, "spotPrice": float(self.spot_price[snapshot]), **sides}}
+
+
+def _map(path: str, dtype: np.dtype) -> np.ndarray:
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    if size < dtype.itemsize:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(size // dtype.itemsize,))
+
+
+class SnapshotStore:
+    """
+    Appends option chain snapshots to per underlying/expiry/day column files.
+    
+    Layout: root/UNDERLYING/EXPIRY(YYYYMMDD)/DAY(YYYYMMDD)/ holding one .bin
+    file per column, index.bin and contracts.json with the symbol and token
+    of every strike. Column files are written before the index record, so a
+    reader never sees a partial snapshot.
+    """
+    
+    def __init__(self, root: str, fsync: bool = False):
+        """
+        Initialize the store.
+        
+        Args:
+            root: Root directory, created on first append
+            fsync: Flush every append to disk before returning
+        """
+        self.root = root
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._contracts = {}  # Day directory -> metadata written to contracts.json
+    
+    def day_directory(self, underlying: str, expiry_date: datetime.date, day: datetime.date) -> str:
+        """
+        Get the directory of one underlying, expiry and day.
+        
+        Args:
+            underlying: Underlying symbol
+            expiry_date: Expiry date
+            day: Snapshot date
+        
+        Returns:
+            Directory path
+        """
+        return os.path.join(self.root, underlying, expiry_date.strftime("%Y%m%d"), day.strftime("%Y%m%d"))
+    
+    def append(self, response: Dict[str, Any], expiry_date: datetime.datetime,
+               timestamp: datetime.datetime = None) -> bool:
+        """
+        Append an option chain snapshot.
+        
+        Args:
+            response: Option chain response
+            expiry_date: Expiry date and time of the chain
+            timestamp: Capture time, defaults to now
+        
+        Returns:
+            True if the snapshot was written, False otherwise
+        """
+        contract_model = response.get("contractModel")
+        if not contract_model:
+            return False
+        timestamp = timestamp or datetime.datetime.now()
+        underlying = contract_model.get("sym", "") or "UNKNOWN"
+        records = [(0, record) for record in contract_model.get("ce", [])] + \
+                  [(1, record) for record in contract_model.get("pe", [])]
+        
+        columns = {
+            name: np.fromiter((float(record.get(key, 0) or 0) for _, record in records), dtype=dtype, count=len(records))
+            for key, name, dtype in COLUMNS
+        }
+        option_type = np.fromiter((kind for kind, _ in records), dtype=np.dtype("i1"), count=len(records))
+        
+        directory = self.day_directory(underlying, expiry_date.date(), timestamp.date())
+        try:
+            with self._lock:
+                os.makedirs(directory, exist_ok=True)
+                self._update_contracts(directory, underlying, expiry_date, records)
+                
+                index_path = os.path.join(directory, "index.bin")
+                snapshots = os.path.getsize(index_path) // INDEX_DTYPE.itemsize if os.path.exists(index_path) else 0
+                offset = self._next_offset(index_path, snapshots)
+                
+                self._write(os.path.join(directory, "option_type.bin"), option_type, offset)
+                for _, name, _ in COLUMNS:
+                    self._write(os.path.join(directory, f"{name}.bin"), columns[name], offset)
+                
+                # The index record commits the snapshot
+                record = np.array([(int(timestamp.timestamp()), offset, len(records),
+                                    float(contract_model.get("spotPrice", 0)))], dtype=INDEX_DTYPE)
+                self._write(index_path, record, snapshots)
+            return True
+        
+        except OSError as e:
+            logger.error(f"Failed to store option chain snapshot in {directory}: {str(e)}")
+            return False
+    
+    def _next_offset(self, index_path: str, snapshots: int) -> int:
+        # Rows after the last indexed snapshot belong to an interrupted append and are overwritten
+        if snapshots == 0:
+            return 0
+        with open(index_path, "rb") as f:
+            f.seek((snapshots - 1) * INDEX_DTYPE.itemsize)
+            last = np.frombuffer(f.read(INDEX_DTYPE.itemsize), dtype=INDEX_DTYPE)[0]
+        return int(last["offset"] + last["count"])
+    
+    def _write(self, path: str, values: np.ndarray, offset: int) -> None:
+        mode = "r+b" if os.path.exists(path) else "wb"
+        with open(path, mode) as f:
+            f.truncate(offset * values.dtype.itemsize)
+            f.seek(offset * values.dtype.itemsize)
+            f.write(values.tobytes())
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+    
+    def _update_contracts(self, directory: str, underlying: str, expiry_date: datetime.datetime,
+                          records: List[Tuple[int, Dict[str, Any]]]) -> None:
+        metadata = self._contracts.get(directory)
+        if metadata is None:
+            path = os.path.join(directory, "contracts.json")
+            if os.path.exists(path):
+                with open(path) as f:
+                    metadata = json.load(f)
+            else:
+                metadata = {"underlying": underlying, "expiry_date": expiry_date.isoformat(),
+                            "contracts": {"CE": {}, "PE": {}}}
+            self._contracts[directory] = metadata
+        
+        changed = False
+        for kind, record in records:
+            side = metadata["contracts"][OPTION_TYPES[kind]]
+            key = repr(float(record.get("strikePrice", 0) or 0))
+            if key not in side:
+                side[key] = [record.get("sym", ""), record.get("token", "")]
+                changed = True
+        
+        if changed or not os.path.exists(os.path.join(directory, "contracts.json")):
+            temporary = os.path.join(directory, "contracts.json.tmp")
+            with open(temporary, "w") as f:
+                json.dump(metadata, f)
+            os.replace(temporary, os.path.join(directory, "contracts.json"))
+    
+    def save_series(self, series: ChainSeries) -> bool:
+        """
+        Append every snapshot of a chain series, e.g. generated or imported history.
+        
+        Args:
+            series: Chain series to store
+        
+        Returns:
+            True if every snapshot was written, False otherwise
+        """
+        written = [self.append(series.to_api_response(row), series.expiry_date,
+                               datetime.datetime.fromtimestamp(int(timestamp)))
+                   for row, timestamp in enumerate(series.timestamps.tolist())]
+        return all(written)
+    
+    def underlyings(self) -> List[str]:
+        """
+        List the stored underlyings.
+        
+        Returns:
+            Sorted underlying symbols
+        """
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+    
+    def expiries(self, underlying: str) -> List[datetime.date]:
+        """
+        List the stored expiries of an underlying.
+        
+        Args:
+            underlying: Underlying symbol
+        
+        Returns:
+            Sorted expiry dates
+        """
+        return _list_dates(os.path.join(self.root, underlying))
+    
+    def days(self, underlying: str, expiry_date: datetime.date) -> List[datetime.date]:
+        """
+        List the stored days of an expiry.
+        
+        Args:
+            underlying: Underlying symbol
+            expiry_date: Expiry date
+        
+        Returns:
+            Sorted snapshot dates
+        """
+        return _list_dates(os.path.join(self.root, underlying, expiry_date.strftime("%Y%m%d")))
+    
+    def open_day(self, underlying: str, expiry_date: datetime.date, day: datetime.date) -> Optional[SnapshotDay]:
+        """
+        Memory-map the snapshots of one day.
+        
+        Args:
+            underlying: Underlying symbol
+            expiry_date: Expiry date
+            day: Snapshot date
+        
+        Returns:
+            SnapshotDay or None if nothing was stored
+        """
+        directory = self.day_directory(underlying, expiry_date, day)
+        if not os.path.exists(os.path.join(directory, "contracts.json")):
+            return None
+        return SnapshotDay(directory)
+    
+    def load_series(self, underlying: str, expiry_date: datetime.date, start: datetime.date = None,
+                    end: datetime.date = None) -> Optional[ChainSeries]:
+        """
+        Load the stored snapshots of an expiry as a ChainSeries for replay.
+        
+        Args:
+            underlying: Underlying symbol
+            expiry_date: Expiry date
+            start: First day to include
+            end: Last day to include
+        
+        Returns:
+            ChainSeries or None if nothing was stored in the range
+        """
+        days = [self.open_day(underlying, expiry_date, day) for day in self.days(underlying, expiry_date)
+                if (start is None or day >= start) and (end is None or day <= end)]
+        days = [day for day in days if day is not None and len(day)]
+        if not days:
+            return None
+        
+        timestamps = np.concatenate([day.timestamps for day in days])
+        spot_price = np.concatenate([day.spot_price for day in days])
+        # Snapshot number of every stored row across all days
+        snapshot_of_row = np.concatenate([
+            np.repeat(np.arange(len(day)) + first, day.index["count"])
+            for day, first in zip(days, np.cumsum([0] + [len(day) for day in days[:-1]]))
+        ])
+        option_type = np.concatenate([day.option_type for day in days])
+        values = {name: np.concatenate([getattr(day, name) for day in days]) for _, name, _ in COLUMNS}
+        contracts = {}
+        for day in days:
+            contracts.update(day.contracts)
+        
+        sides = {}
+        for kind, name in enumerate(OPTION_TYPES):
+            mask = option_type == kind
+            strike = np.unique(values["strike"][mask])
+            rows = snapshot_of_row[mask]
+            columns = np.searchsorted(strike, values["strike"][mask])
+            matrices = {}
+            for _, field in SeriesSide.FIELDS:
+                matrix = np.full((len(timestamps), len(strike)), np.nan)
+                matrix[rows, columns] = values[field][mask]
+                matrices[field] = matrix
+            sides[name] = SeriesSide(
+                name, strike,
+                symbols=[contracts.get((name, value), ("", ""))[0] for value in strike.tolist()],
+                tokens=[contracts.get((name, value), ("", ""))[1] for value in strike.tolist()],
+                **matrices
+            )
+        
+        return ChainSeries(days[0].underlying, days[0].expiry_date, timestamps, spot_price, sides["CE"], sides["PE"])
+    
+    def load_all(self, underlying: str = None, start: datetime.date = None,
+                 end: datetime.date = None) -> List[ChainSeries]:
+        """
+        Load every stored expiry as chain series for a backtest.
+        
+        Args:
+            underlying: Underlying symbol, defaults to every stored underlying
+            start: First day to include
+            end: Last day to include
+        
+        Returns:
+            Chain series sorted by expiry
+        """
+        underlyings = [underlying] if underlying is not None else self.underlyings()
+        series = [self.load_series(name, expiry_date, start, end)
+                  for name in underlyings for expiry_date in self.expiries(name)]
+        return sorted((item for item in series if item is not None), key=lambda item: item.expiry_date)
+
+
+class SnapshotWriter:
+    """
+    Appends snapshots to a SnapshotStore on a background thread.
+    
+    append() only queues the snapshot, so fetching an option chain never
+    waits for disk writes or fsync. When the queue is full the snapshot is
+    dropped with a warning instead of blocking the caller.
+    """
+    
+    def __init__(self, store: SnapshotStore, queue_size: int = None):
+        """
+        Initialize the writer.
+        
+        Args:
+            store: Store to append to
+            queue_size: Snapshots waiting to be written before new ones are dropped,
+                defaults to SNAPSHOT_CONFIG
+        """
+        self.store = store
+        self.dropped = 0
+        self.failed = 0
+        self._queue = queue.Queue(maxsize=queue_size or SNAPSHOT_CONFIG["queue_size"])
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def append(self, response: Dict[str, Any], expiry_date: datetime.datetime,
+               timestamp: datetime.datetime = None) -> bool:
+        """
+        Queue an option chain snapshot for writing.
+        
+        Args:
+            response: Option chain response, not modified afterwards
+            expiry_date: Expiry date and time of the chain
+            timestamp: Capture time, defaults to now
+        
+        Returns:
+            True if the snapshot was queued, False if it was dropped
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait((response, expiry_date, timestamp or datetime.datetime.now()))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Snapshot queue full, dropped option chain snapshot ({self.dropped} dropped)")
+            return False
+    
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                if not self.store.append(*item):
+                    self.failed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Error writing option chain snapshot: {str(e)}")
+            finally:
+                self._queue.task_done()
+    
+    def flush(self) -> None:
+        """
+        Wait until every queued snapshot has been written.
+        """
+        self._queue.join()
+    
+    def close(self) -> None:
+        """
+        Write the queued snapshots and stop the background thread.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+
+def _list_dates(directory: str) -> List[datetime.date]:
+    if not os.path.isdir(directory):
+        return []
+    dates = []
+    for name in os.listdir(directory):
+        try:
+            dates.append(datetime.datetime.strptime(name, "%Y%m%d").date())
+        except ValueError:
+            continue
+    return sorted(dates)
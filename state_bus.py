@@ -0,0 +1,299 @@
+"""
+Shared-memory state bus between the trading engine and the dashboard.
+The engine publishes positions, last prices, P&L and strategy status into a
+fixed-layout segment guarded by a seqlock, and any number of processes read
+consistent snapshots without locks, files or polling the API.
+"""
+
+import contextlib
+import datetime
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from src.models.position import Position
+from config.config import STATE_BUS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+MAGIC = 0x4E535442  # "NSTB"
+LAYOUT_VERSION = 1
+
+# Written once when the segment is created, except the sequence
+HEADER_DTYPE = np.dtype([("magic", "<u4"), ("layout", "<u4"), ("sequence", "<u8"), ("capacity", "<u4")], align=True)
+STATUS_DTYPE = np.dtype([("updated_at", "<f8"), ("start_time", "<f8"), ("pnl", "<f8"), ("count", "<u4"),
+                         ("running", "u1")], align=True)
+POSITION_DTYPE = np.dtype([("symbol", "S40"), ("instrument_token", "S24"), ("quantity", "<i8"),
+                           ("average_price", "<f8"), ("last_price", "<f8"), ("pnl", "<f8")], align=True)
+
+STATUS_OFFSET = 64  # Payload starts on its own cache line
+POSITIONS_OFFSET = STATUS_OFFSET + 64
+
+_published = set()  # Segments owned by a publisher in this process
+
+
+def _segment_size(capacity: int) -> int:
+    return POSITIONS_OFFSET + capacity * POSITION_DTYPE.itemsize
+
+
+def _to_timestamp(value: Optional[datetime.datetime]) -> float:
+    return value.timestamp() if value is not None else math.nan
+
+
+def _from_timestamp(value: float) -> Optional[datetime.datetime]:
+    return None if math.isnan(value) else datetime.datetime.fromtimestamp(value)
+
+
+@dataclass
+class LiveState:
+    """
+    Consistent snapshot of the engine's state.
+    """
+    sequence: int  # Even write sequence of the snapshot, changes with every publish
+    running: bool
+    start_time: Optional[datetime.datetime]
+    updated_at: Optional[datetime.datetime]
+    pnl: float  # Sum of the position P&L
+    positions: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class StatePublisher:
+    """
+    Single writer of the state segment, used by the trading engine.
+    
+    Every write makes the sequence odd, changes the payload in place and
+    makes it even again. Readers copy the payload and retry if the sequence
+    was odd or changed meanwhile, so they never see a torn write and never
+    block the engine. Writes from the engine's threads are serialized by a
+    lock; only one process may publish to a segment.
+    """
+    
+    def __init__(self, name: str = None, capacity: int = None):
+        """
+        Create the segment, or take over one left by a previous engine.
+        
+        Args:
+            name: Shared memory segment name, defaults to STATE_BUS_CONFIG
+            capacity: Maximum number of positions, defaults to STATE_BUS_CONFIG
+        """
+        self.name = name or STATE_BUS_CONFIG["name"]
+        self.capacity = capacity or STATE_BUS_CONFIG["capacity"]
+        self._shm = self._open_segment()
+        _published.add(self.name)
+        self._header = np.ndarray((), HEADER_DTYPE, buffer=self._shm.buf)
+        self._status = np.ndarray((), STATUS_DTYPE, buffer=self._shm.buf, offset=STATUS_OFFSET)
+        self._positions = np.ndarray((self.capacity,), POSITION_DTYPE, buffer=self._shm.buf, offset=POSITIONS_OFFSET)
+        self._rows = {}  # Instrument token -> row of the positions table
+        self._lock = threading.Lock()
+        
+        # A writer that died mid-write left the sequence odd; continue from the next even value
+        sequence = int(self._header["sequence"])
+        self._header["sequence"] = sequence + sequence % 2
+        with self._write():
+            self._header["magic"] = MAGIC
+            self._header["layout"] = LAYOUT_VERSION
+            self._header["capacity"] = self.capacity
+            self._status["start_time"] = math.nan
+            self._status["pnl"] = 0.0
+            self._status["count"] = 0
+            self._status["running"] = 0
+    
+    def _open_segment(self) -> shared_memory.SharedMemory:
+        size = _segment_size(self.capacity)
+        try:
+            return shared_memory.SharedMemory(self.name, create=True, size=size)
+        except FileExistsError:
+            pass
+        existing = shared_memory.SharedMemory(self.name)
+        if existing.size >= size:
+            return existing
+        logger.info(f"Recreating state segment {self.name} for {self.capacity} positions")
+        existing.close()
+        existing.unlink()
+        return shared_memory.SharedMemory(self.name, create=True, size=size)
+    
+    @contextlib.contextmanager
+    def _write(self) -> Iterator[None]:
+        with self._lock:
+            self._header["sequence"] = int(self._header["sequence"]) + 1
+            try:
+                yield
+                self._status["updated_at"] = time.time()
+            finally:
+                self._header["sequence"] = int(self._header["sequence"]) + 1
+    
+    def set_positions(self, positions: Iterable[Position]) -> None:
+        """
+        Replace the published positions.
+        
+        Args:
+            positions: Current positions, only the first capacity of them are published
+        """
+        positions = list(positions)
+        if len(positions) > self.capacity:
+            logger.warning(f"Publishing {self.capacity} of {len(positions)} positions")
+            positions = positions[:self.capacity]
+        rows = np.array([(position.symbol.encode(), str(position.instrument_token or "").encode(), position.quantity,
+                          position.average_price, position.last_price, position.pnl)
+                         for position in positions], dtype=POSITION_DTYPE)
+        
+        with self._write():
+            self._positions[:len(rows)] = rows
+            self._status["count"] = len(rows)
+            self._status["pnl"] = rows["pnl"].sum()
+            self._rows = {position.instrument_token: i for i, position in enumerate(positions)
+                          if position.instrument_token}
+    
+    def update_price(self, instrument_token: str, last_price: float) -> bool:
+        """
+        Publish a new last price of a position, with its P&L.
+        
+        Args:
+            instrument_token: Instrument token of the position
+            last_price: Last traded price
+        
+        Returns:
+            True if a published position holds the instrument
+        """
+        row = self._rows.get(instrument_token)
+        if row is None:
+            return False
+        with self._write():
+            position = self._positions[row]
+            position["last_price"] = last_price
+            position["pnl"] = (last_price - position["average_price"]) * position["quantity"]
+            self._status["pnl"] = self._positions["pnl"][:self._status["count"]].sum()
+        return True
+    
+    def set_status(self, running: bool, start_time: datetime.datetime = None) -> None:
+        """
+        Publish whether the strategy is running.
+        
+        Args:
+            running: Strategy state
+            start_time: Time the strategy started, None when stopped
+        """
+        with self._write():
+            self._status["running"] = running
+            self._status["start_time"] = _to_timestamp(start_time)
+    
+    def close(self, unlink: bool = False) -> None:
+        """
+        Detach from the segment.
+        
+        Args:
+            unlink: Also remove the segment, so readers see no state
+        """
+        self._header = self._status = self._positions = None
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+        _published.discard(self.name)
+
+
+class StateReader:
+    """
+    Lock-free reader of the state segment, safe to use from any number of
+    processes. Attaches lazily, so it can be created before the engine runs.
+    """
+    
+    def __init__(self, name: str = None, timeout: float = None):
+        """
+        Initialize the reader.
+        
+        Args:
+            name: Shared memory segment name, defaults to STATE_BUS_CONFIG
+            timeout: Seconds to retry while a write is in progress, defaults to STATE_BUS_CONFIG
+        """
+        self.name = name or STATE_BUS_CONFIG["name"]
+        self.timeout = STATE_BUS_CONFIG["read_timeout"] if timeout is None else timeout
+        self._shm = None
+        self._header = None
+    
+    def _attach(self) -> bool:
+        if self._shm is not None:
+            return True
+        try:
+            shm = shared_memory.SharedMemory(self.name)
+        except FileNotFoundError:
+            return False
+        if os.name == "posix" and self.name not in _published:
+            # Attaching registers the segment with this process's resource tracker,
+            # which would remove it when the reader exits; only the engine owns it
+            resource_tracker.unregister(shm._name, "shared_memory")
+        header = np.ndarray((), HEADER_DTYPE, buffer=shm.buf)
+        if header["magic"] != MAGIC or header["layout"] != LAYOUT_VERSION:
+            # Also the case for a moment while the engine creates the segment
+            logger.debug(f"Shared memory segment {self.name} holds no state of layout {LAYOUT_VERSION}")
+            header = None
+            shm.close()
+            return False
+        self._shm, self._header = shm, header
+        return True
+    
+    def sequence(self) -> Optional[int]:
+        """
+        Get the current write sequence, e.g. as a cache key.
+        
+        Returns:
+            Sequence, or None if no engine has published
+        """
+        if not self._attach():
+            return None
+        return int(self._header["sequence"])
+    
+    def snapshot(self) -> Optional[LiveState]:
+        """
+        Get a consistent copy of the published state.
+        
+        Returns:
+            LiveState, or None if no engine has published or a write did not finish within the timeout
+        """
+        if not self._attach():
+            return None
+        end = _segment_size(int(self._header["capacity"]))
+        deadline = time.monotonic() + self.timeout
+        while True:
+            before = int(self._header["sequence"])
+            if before % 2 == 0:
+                payload = bytes(self._shm.buf[STATUS_OFFSET:end])
+                if int(self._header["sequence"]) == before:
+                    return self._decode(before, payload)
+            if time.monotonic() >= deadline:
+                logger.warning(f"State segment {self.name} was being written for over {self.timeout}s")
+                return None
+            time.sleep(0)
+    
+    @staticmethod
+    def _decode(sequence: int, payload: bytes) -> LiveState:
+        status = np.frombuffer(payload, STATUS_DTYPE, count=1)[0]
+        rows = np.frombuffer(payload, POSITION_DTYPE, count=int(status["count"]),
+                             offset=POSITIONS_OFFSET - STATUS_OFFSET)
+        positions = [{
+            "symbol": row["symbol"].decode(),
+            "instrument_token": row["instrument_token"].decode(),
+            "quantity": int(row["quantity"]),
+            "average_price": float(row["average_price"]),
+            "last_price": float(row["last_price"]),
+            "pnl": float(row["pnl"]),
+        } for row in rows]
+        return LiveState(sequence=sequence, running=bool(status["running"]),
+                         start_time=_from_timestamp(float(status["start_time"])),
+                         updated_at=_from_timestamp(float(status["updated_at"])),
+                         pnl=float(status["pnl"]), positions=positions)
+    
+    def close(self) -> None:
+        """
+        Detach from the segment.
+        """
+        if self._shm is not None:
+            self._header = None
+            self._shm.close()
+            self._shm = None
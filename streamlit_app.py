@@ -1,8 +1,10 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import matplotlib.pyplot as plt
 import plotly.graph_objects as go
 import plotly.express as px
+import html
 import json
 import os
 import time
@@ -10,6 +12,15 @@ import datetime
 import sys
 from pathlib import Path
 
+# Days of P&L history loaded for the charts, so rendering cost does not grow with the history
+PNL_HISTORY_DAYS = 365
+
+# Minimum seconds between data updates, so widget interactions rerun on cached data
+DATA_REFRESH_SECONDS = 5
+
+# Height in pixels of the embedded live positions and P&L client
+LIVE_FEED_HEIGHT = 520
+
 # Set up paths
 dashboard_dir = os.path.dirname(os.path.abspath(__file__))
 app_dir = os.path.join(os.path.dirname(dashboard_dir), 'nifty_trading_app')
@@ -35,7 +46,18 @@ except ImportError:
                 'timestamp': [datetime.datetime.now(), datetime.datetime.now()]
             })
         
-        def get_pnl_history(self):
+        def get_orders(self, start=None, end=None):
+            return pd.DataFrame({
+                'order_id': ['order1', 'order2'],
+                'symbol': ['NIFTY25MAY18000CE', 'NIFTY25MAY17000PE'],
+                'side': ['SELL', 'SELL'],
+                'quantity': [75, 75],
+                'price': [150.25, 145.75],
+                'status': ['COMPLETE', 'COMPLETE'],
+                'timestamp': [datetime.datetime.now(), datetime.datetime.now()]
+            })
+        
+        def get_pnl_history(self, start=None, end=None):
             dates = pd.date_range(end=datetime.datetime.now(), periods=30)
             return pd.DataFrame({
                 'date': dates,
@@ -67,10 +89,27 @@ except ImportError:
         
         def update_data(self):
             return True
+        
+        def data_versions(self):
+            return {}
+        
+        def get_live_positions(self):
+            return None
+        
+        def get_live_feed_html(self):
+            return None
     
     data_bridge = DummyDataBridge()
 
 # Helper functions
+def file_version(path):
+    """Get the modification time and size of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
 def load_config():
     """Load configuration from the config file or return default config"""
     config_path = os.path.join(app_dir, 'config', 'config.py') if os.path.exists(app_dir) else None
@@ -184,6 +223,88 @@ def load_config():
     
     return config
 
+@st.cache_data(max_entries=4)
+def load_cached_config(version):
+    """Load the configuration once per version of the config file"""
+    return load_config()
+
+def config_version():
+    """Get the version of the config file"""
+    return file_version(os.path.join(app_dir, 'config', 'config.py'))
+
+@st.cache_data(ttl=DATA_REFRESH_SECONDS)
+def refresh_data():
+    """Update the trading data at most once per DATA_REFRESH_SECONDS, across reruns and sessions"""
+    return data_bridge.update_data()
+
+@st.cache_data(max_entries=4)
+def load_positions(version):
+    """Load positions once per version of the positions data"""
+    return data_bridge.get_positions()
+
+@st.cache_data(max_entries=4)
+def load_orders(version):
+    """Load orders once per version of the orders data"""
+    return data_bridge.get_orders()
+
+@st.cache_data(max_entries=4)
+def load_pnl_performance(version, start, investment):
+    """
+    Load the P&L history from start and derive its charts and metrics,
+    once per version of the P&L data rather than on every rerun
+    """
+    pnl_history = data_bridge.get_pnl_history(start=start)
+    if pnl_history.empty:
+        return pnl_history, None
+    
+    # Convert date column to datetime
+    pnl_history['date'] = pd.to_datetime(pnl_history['date'])
+    
+    # Daily P&L chart
+    daily_fig = px.bar(
+        pnl_history, 
+        x='date', 
+        y='daily_pnl',
+        title='Daily P&L',
+        labels={'date': 'Date', 'daily_pnl': 'Daily P&L'},
+        color='daily_pnl',
+        color_continuous_scale=['red', 'green'],
+        color_continuous_midpoint=0
+    )
+    daily_fig.update_layout(height=400)
+    
+    # Cumulative P&L chart
+    cumulative_fig = px.line(
+        pnl_history, 
+        x='date', 
+        y='cumulative_pnl',
+        title='Cumulative P&L',
+        labels={'date': 'Date', 'cumulative_pnl': 'Cumulative P&L'}
+    )
+    cumulative_fig.update_layout(height=400)
+    
+    performance = {
+        'daily_fig': daily_fig,
+        'cumulative_fig': cumulative_fig,
+        'daily_pnl': pnl_history['daily_pnl'].iloc[-1],
+        'total_pnl': pnl_history['cumulative_pnl'].iloc[-1],
+        'monthly_return': pnl_history['cumulative_pnl'].iloc[-1] / investment * 100,
+    }
+    return pnl_history, performance
+
+def format_logs(lines):
+    """Render log lines as HTML, colored by level"""
+    rendered = []
+    for line in lines:
+        if ' - ERROR - ' in line or ' - CRITICAL - ' in line:
+            level = 'error-log'
+        elif ' - WARNING - ' in line:
+            level = 'warning-log'
+        else:
+            level = 'info-log'
+        rendered.append(f"<span class='{level}'>{html.escape(line.rstrip())}</span>")
+    return "<div class='log-container'>" + "<br>".join(rendered) + "</div>"
+
 def save_config(config):
     """Save configuration to the config file"""
     config_dir = os.path.join(app_dir, 'config')
@@ -342,7 +463,8 @@ if 'strategy_running' not in st.session_state:
     st.session_state.strategy_running = status['running']
 
 # Update data
-data_bridge.update_data()
+refresh_data()
+data_versions = data_bridge.data_versions()
 
 # Main dashboard layout
 st.markdown("<h1 class='main-header'>Nifty 50 Trading Dashboard</h1>", unsafe_allow_html=True)
@@ -373,13 +495,13 @@ with col2:
             if data_bridge.stop_strategy():
                 st.session_state.strategy_running = False
                 st.success("Strategy stopped successfully!")
-                st.experimental_rerun()
+                st.rerun()
     else:
         if st.button("Start Strategy", key="start_button"):
             if data_bridge.start_strategy():
                 st.session_state.strategy_running = True
                 st.success("Strategy started successfully!")
-                st.experimental_rerun()
+                st.rerun()
     st.markdown("</div>", unsafe_allow_html=True)
 
 with col3:
@@ -388,7 +510,7 @@ with col3:
     if st.button("Close All Positions", key="close_positions_button"):
         if data_bridge.close_all_positions():
             st.success("All positions closed successfully!")
-            st.experimental_rerun()
+            st.rerun()
     st.markdown("</div>", unsafe_allow_html=True)
 
 # Tabs for different sections
@@ -398,73 +520,194 @@ tab1, tab2, tab3, tab4 = st.tabs(["Positions & P&L", "Strategy Configuration", "
 with tab1:
     st.markdown("<h2 class='sub-header'>Current Positions</h2>", unsafe_allow_html=True)
     
-    # Load positions
-    positions = data_bridge.get_positions()
-    
-    # Display positions
-    if not positions.empty:
-        st.dataframe(positions, use_container_width=True)
+    live_feed_html = data_bridge.get_live_feed_html()
+    if live_feed_html is not None:
+        # The engine pushes changed rows and P&L points, patched in place without rerunning the script
+        components.html(live_feed_html, height=LIVE_FEED_HEIGHT)
     else:
-        st.info("No positions found.")
+        # Load positions, live from shared memory when the trading engine publishes them
+        positions = data_bridge.get_live_positions()
+        if positions is None:
+            positions = load_positions(data_versions.get('positions'))
+        
+        # Display positions
+        if not positions.empty:
+            st.dataframe(positions, use_container_width=True)
+        else:
+            st.info("No positions found.")
     
     st.markdown("<h2 class='sub-header'>P&L Performance</h2>", unsafe_allow_html=True)
     
-    # Load P&L history
-    pnl_history = data_bridge.get_pnl_history()
+    # Load P&L history and its derived charts and metrics
+    config = load_cached_config(config_version())
+    investment = config["INVESTMENT_CONFIG"]["base_investment"]
+    pnl_history, performance = load_pnl_performance(
+        data_versions.get('pnl_history'),
+        datetime.date.today() - datetime.timedelta(days=PNL_HISTORY_DAYS),
+        investment)
     
     # Display P&L charts
     if not pnl_history.empty:
-        # Convert date column to datetime
-        pnl_history['date'] = pd.to_datetime(pnl_history['date'])
-        
         # Create two columns for charts
         col1, col2 = st.columns(2)
         
         with col1:
-            # Daily P&L chart
-            fig = px.bar(
-                pnl_history, 
-                x='date', 
-                y='daily_pnl',
-                title='Daily P&L',
-                labels={'date': 'Date', 'daily_pnl': 'Daily P&L'},
-                color='daily_pnl',
-                color_continuous_scale=['red', 'green'],
-                color_continuous_midpoint=0
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(performance['daily_fig'], use_container_width=True)
         
         with col2:
-            # Cumulative P&L chart
-            fig = px.line(
-                pnl_history, 
-                x='date', 
-                y='cumulative_pnl',
-                title='Cumulative P&L',
-                labels={'date': 'Date', 'cumulative_pnl': 'Cumulative P&L'}
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(performance['cumulative_fig'], use_container_width=True)
         
         # P&L metrics
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
-            st.metric("Today's P&L", f"₹{pnl_history['daily_pnl'].iloc[-1]:,.2f}")
+            st.metric("Today's P&L", f"₹{performance['daily_pnl']:,.2f}")
             st.markdown("</div>", unsafe_allow_html=True)
         
         with col2:
             st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
-            st.metric("Total P&L", f"₹{pnl_history['cumulative_pnl'].iloc[-1]:,.2f}")
+            st.metric("Total P&L", f"₹{performance['total_pnl']:,.2f}")
             st.markdown("</div>", unsafe_allow_html=True)
         
         with col3:
             st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
-            config = load_config()
-            investment = config["INVESTMENT_CONFIG"]["base_investment"]
-            monthly_return = pnl_history['cumulative_pnl'].iloc[-1] / investment * 100
+            monthly_return = performance['monthly_return']
             st.metric("Monthly Return", f"{monthly_return:.2f}%")
-            st.markdown("</div>", unsafe_allo
-(Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
+            st.markdown("</div>", unsafe_allow_html=True)
+        
+        with col4:
+            st.markdown("<div class='metric-card'>", unsafe_allow_html=True)
+            target_return = config["STRATEGY_CONFIG"]["target_monthly_return"] * 100
+            st.metric("Target Return", f"{target_return:.2f}%", f"{monthly_return - target_return:+.2f}%")
+            st.markdown("</div>", unsafe_allow_html=True)
+    else:
+        st.info("No P&L history found.")
+
+# Tab 2: Strategy Configuration
+with tab2:
+    st.markdown("<h2 class='sub-header'>Strategy Configuration</h2>", unsafe_allow_html=True)
+    
+    config = load_cached_config(config_version())
+    investment_config = config["INVESTMENT_CONFIG"]
+    strategy_config = config["STRATEGY_CONFIG"]
+    trading_hours = config["TRADING_HOURS"]
+    
+    with st.form("config_form"):
+        st.subheader("Investment")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            base_investment = st.number_input("Base Investment (₹)", min_value=0,
+                                              value=int(investment_config["base_investment"]), step=10000)
+            lot_size = st.number_input("Lot Size", min_value=1, value=int(investment_config["lot_size"]))
+        
+        with col2:
+            lots_per_investment = st.number_input("Lots per Investment", min_value=1,
+                                                  value=int(investment_config["lots_per_investment"]))
+            investment_per_lot = st.number_input("Investment per Lot (₹)", min_value=0,
+                                                 value=int(investment_config["investment_per_lot"]), step=10000)
+        
+        st.subheader("Strategy")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            target_monthly_return = st.number_input("Target Monthly Return (%)", min_value=0.0,
+                                                    value=strategy_config["target_monthly_return"] * 100, step=0.5)
+            leg_premium_target = st.number_input("Leg Premium Target (% of investment)", min_value=0.0,
+                                                 value=strategy_config["leg_premium_target"] * 100, step=0.5)
+            strangle_distance = st.number_input("Strangle Distance (points)", min_value=0,
+                                                value=int(strategy_config["strangle_distance"]), step=50)
+            sell_expiry_weeks = st.number_input("Sell Expiry (weeks)", min_value=1,
+                                                value=int(strategy_config["sell_expiry_weeks"]))
+            hedge_expiry_weeks = st.number_input("Hedge Expiry (weeks)", min_value=1,
+                                                 value=int(strategy_config["hedge_expiry_weeks"]))
+        
+        with col2:
+            stop_loss_trigger = st.number_input("Stop Loss Trigger (% drop)", min_value=0.0,
+                                                value=strategy_config["stop_loss_trigger"] * 100, step=5.0)
+            stop_loss_percentage = st.number_input("Stop Loss (%)", min_value=0.0,
+                                                   value=strategy_config["stop_loss_percentage"] * 100, step=5.0)
+            martingale_trigger = st.number_input("Martingale Trigger (price multiple)", min_value=1.0,
+                                                 value=float(strategy_config["martingale_trigger"]), step=0.25)
+            martingale_quantity_multiplier = st.number_input(
+                "Martingale Quantity Multiplier", min_value=1.0,
+                value=float(strategy_config["martingale_quantity_multiplier"]), step=0.5)
+            martingale_premium_divisor = st.number_input(
+                "Martingale Premium Divisor", min_value=1.0,
+                value=float(strategy_config["martingale_premium_divisor"]), step=0.5)
+        
+        st.subheader("Trading Hours")
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            start_time = st.text_input("Start Time", value=trading_hours["start_time"])
+        
+        with col2:
+            end_time = st.text_input("End Time", value=trading_hours["end_time"])
+        
+        with col3:
+            check_interval = st.number_input("Check Interval (seconds)", min_value=10,
+                                             value=int(trading_hours["check_interval"]), step=10)
+        
+        holidays = st.text_area("Holidays (one YYYY-MM-DD date per line)", value="\n".join(config["HOLIDAYS"]))
+        
+        if st.form_submit_button("Save Configuration"):
+            investment_config.update(base_investment=base_investment, lot_size=lot_size,
+                                     lots_per_investment=lots_per_investment,
+                                     investment_per_lot=investment_per_lot)
+            strategy_config.update(target_monthly_return=target_monthly_return / 100,
+                                   leg_premium_target=leg_premium_target / 100,
+                                   strangle_distance=strangle_distance,
+                                   sell_expiry_weeks=sell_expiry_weeks,
+                                   hedge_expiry_weeks=hedge_expiry_weeks,
+                                   stop_loss_trigger=stop_loss_trigger / 100,
+                                   stop_loss_percentage=stop_loss_percentage / 100,
+                                   martingale_trigger=martingale_trigger,
+                                   martingale_quantity_multiplier=martingale_quantity_multiplier,
+                                   martingale_premium_divisor=martingale_premium_divisor)
+            trading_hours.update(start_time=start_time, end_time=end_time, check_interval=check_interval)
+            config["HOLIDAYS"] = [line.strip() for line in holidays.splitlines() if line.strip()]
+            
+            save_config(config)
+            st.success("Configuration saved. Restart the strategy to apply it.")
+
+# Tab 3: Logs & Monitoring
+with tab3:
+    st.markdown("<h2 class='sub-header'>Logs & Monitoring</h2>", unsafe_allow_html=True)
+    
+    max_lines = st.slider("Log lines", min_value=10, max_value=500, value=100, step=10)
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Trading Log")
+        st.markdown(format_logs(data_bridge.get_logs(max_lines)), unsafe_allow_html=True)
+    
+    with col2:
+        st.subheader("Error Log")
+        st.markdown(format_logs(data_bridge.get_error_logs(max_lines)), unsafe_allow_html=True)
+    
+    st.markdown("<h2 class='sub-header'>Recent Orders</h2>", unsafe_allow_html=True)
+    orders = load_orders(data_versions.get('orders'))
+    if not orders.empty:
+        st.dataframe(orders, use_container_width=True)
+    else:
+        st.info("No orders found.")
+
+# Tab 4: About
+with tab4:
+    st.markdown("<h2 class='sub-header'>About</h2>", unsafe_allow_html=True)
+    st.markdown("""
+This dashboard monitors the short strangle options strategy for Nifty 50.
+
+**Strategy logic**
+
+1. The total investment is the invested amount plus the available funds
+2. Short strangle legs are placed at least the strangle distance away from the spot price
+3. Each leg premium targets around 2% of the investment
+4. Hedge buy orders are placed for the current week's expiry and rolled over weekly on expiry day
+5. When a sell leg drops by the stop loss trigger, a stop loss is placed and a new sell order is added
+6. When a sell leg doubles in price, the martingale rule sells a larger quantity further out
+
+Configuration changes take effect when the strategy is restarted.
+""")
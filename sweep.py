@@ -0,0 +1,206 @@
+"""
+Parallel parameter sweeps of the backtest over STRATEGY_CONFIG grids.
+Workers load the market data from a snapshot store once and stream one summary
+row per configuration into a shared CSV table, which is also the resume checkpoint.
+"""
+
+import csv
+import hashlib
+import itertools
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Set
+
+import pandas as pd
+
+from src.models.snapshot_store import SnapshotStore
+from src.strategies.backtest import BacktestEngine
+
+logger = logging.getLogger(__name__)
+
+# Summary columns written after the swept parameters
+RESULT_FIELDS = (
+    "events", "final_equity", "total_pnl", "return", "max_drawdown", "fills", "settlements",
+    "entries", "stop_losses", "martingales", "rejected_orders", "elapsed", "error",
+)
+
+# Market data of the worker process, loaded once by the pool initializer
+_worker_series = None
+
+
+def parameter_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand a grid of parameter values into configurations.
+    
+    Args:
+        grid: Parameter name -> values to try
+    
+    Returns:
+        One dictionary per combination, in grid order
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def config_id(params: Dict[str, Any]) -> str:
+    """
+    Stable identifier of a configuration.
+    
+    Args:
+        params: Strategy parameters
+    
+    Returns:
+        Short hash of the parameters, independent of key order
+    """
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _init_worker(data_dir: str, log_level: int) -> None:
+    global _worker_series
+    logging.getLogger().setLevel(log_level)
+    _worker_series = SnapshotStore(data_dir).load_all()
+
+
+def _run_configuration(params: Dict[str, Any], engine_options: Dict[str, Any]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        start = engine_options.pop("start", None)
+        end = engine_options.pop("end", None)
+        summary = BacktestEngine(_worker_series, strategy_overrides=params, **engine_options).run(start, end).summary()
+        summary["error"] = ""
+    except Exception as e:
+        summary = {"error": f"{type(e).__name__}: {str(e)}"}
+    summary["elapsed"] = time.perf_counter() - started
+    return summary
+
+
+class SweepRunner:
+    """
+    Runs one backtest per configuration across a process pool.
+    
+    Market data is read from a SnapshotStore; every worker loads it from the
+    memory-mapped column files when it starts, so nothing but the parameters
+    and the summary row crosses the process boundary. Each finished configuration is appended
+    and flushed to the results table immediately, and configurations already
+    in the table are skipped, so an interrupted sweep resumes where it stopped.
+    Configurations that raise are recorded with their error and not retried.
+    """
+    
+    def __init__(self, data_dir: str, results_path: str, max_workers: int = None,
+                 log_level: int = logging.ERROR, **engine_options):
+        """
+        Initialize the sweep runner.
+        
+        Args:
+            data_dir: Root directory of the SnapshotStore holding the market data
+            results_path: CSV file collecting one row per configuration
+            max_workers: Worker processes, defaults to the CPU count
+            log_level: Root log level inside workers, keeps per-order logging quiet
+            **engine_options: BacktestEngine arguments (capital, entry_time, broker options) plus start and end
+        """
+        self.data_dir = data_dir
+        self.results_path = results_path
+        self.max_workers = max_workers or os.cpu_count()
+        self.log_level = log_level
+        self.engine_options = engine_options
+    
+    def completed(self) -> Set[str]:
+        """
+        Get the configurations already in the results table.
+        
+        Returns:
+            Set of configuration identifiers
+        """
+        if not os.path.exists(self.results_path):
+            return set()
+        with open(self.results_path, newline="") as f:
+            return {row["config_id"] for row in csv.DictReader(f) if row.get("config_id")}
+    
+    def _drop_partial_row(self) -> None:
+        # A crash while writing leaves a row without its line terminator
+        if not os.path.exists(self.results_path):
+            return
+        with open(self.results_path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                logger.warning(f"Dropping partially written row from {self.results_path}")
+                f.truncate(data.rfind(b"\n") + 1)
+    
+    def _open_results(self, fieldnames: List[str]):
+        exists = os.path.exists(self.results_path) and os.path.getsize(self.results_path) > 0
+        if exists:
+            with open(self.results_path, newline="") as f:
+                header = next(csv.reader(f), None)
+            if header != fieldnames:
+                raise ValueError(f"Results table {self.results_path} has different columns: {header}")
+        
+        f = open(self.results_path, "a", newline="")
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        if not exists:
+            writer.writeheader()
+            f.flush()
+        return f, writer
+    
+    def run(self, configurations: List[Dict[str, Any]]) -> int:
+        """
+        Run every configuration not yet in the results table.
+        
+        Args:
+            configurations: Strategy parameter overrides, all with the same keys
+        
+        Returns:
+            Number of configurations completed by this call
+        """
+        if not configurations:
+            return 0
+        
+        parameters = list(configurations[0])
+        fieldnames = ["config_id"] + parameters + list(RESULT_FIELDS)
+        self._drop_partial_row()
+        done = self.completed()
+        pending = {config_id(params): params for params in configurations}
+        pending = {key: params for key, params in pending.items() if key not in done}
+        logger.info(f"Sweep: {len(pending)} configurations to run, {len(done)} already done")
+        if not pending:
+            return 0
+        
+        f, writer = self._open_results(fieldnames)
+        finished = 0
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(self.data_dir, self.log_level)) as executor:
+                futures = {executor.submit(_run_configuration, params, dict(self.engine_options)): key
+                           for key, params in pending.items()}
+                for future in as_completed(futures):
+                    key = futures[future]
+                    summary = future.result()
+                    row = {"config_id": key, **pending[key]}
+                    row.update({field: summary.get(field, "") for field in RESULT_FIELDS})
+                    writer.writerow(row)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    finished += 1
+                    if summary["error"]:
+                        logger.error(f"Sweep configuration {pending[key]} failed: {summary['error']}")
+        except BrokenProcessPool as e:
+            logger.error(f"Sweep worker died after {finished} configurations, rerun to resume: {str(e)}")
+        finally:
+            f.close()
+        
+        logger.info(f"Sweep finished {finished} configurations")
+        return finished
+    
+    def results(self) -> Optional[pd.DataFrame]:
+        """
+        Load the results table.
+        
+        Returns:
+            DataFrame with one row per configuration, or None if nothing has run
+        """
+        if not os.path.exists(self.results_path):
+            return None
+        return pd.read_csv(self.results_path, keep_default_na=False, na_values=[""]).fillna({"error": ""})
@@ -6,9 +6,12 @@ import unittest
 from unittest.mock import patch, MagicMock
 import json
 import datetime
+import os
+import tempfile
 
 from src.api.mstock_api import MStockAPI
-from tests.test_utils import mock_api_response, mock_api_error_response, MockResponse
+from src.api.session_manager import SessionManager, TokenCipher
+from tests.test_utils import mock_api_response, mock_api_error_response, MockResponse, MockAPIServer
 
 
 class TestMStockAPI(unittest.TestCase):
@@ -16,13 +19,17 @@ class TestMStockAPI(unittest.TestCase):
     
     def setUp(self):
         """Set up test environment."""
-        self.api = MStockAPI("test_api_key", "test_username", "test_password")
+        session_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(session_dir.cleanup)
+        self.api = MStockAPI("test_api_key", "test_username", "test_password",
+                             session_manager=SessionManager(os.path.join(session_dir.name, "session"),
+                                                            cipher=TokenCipher(os.urandom(32))))
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_login_success(self, mock_post):
         """Test successful login."""
         # Mock the login response
-        mock_post.side_effect = lambda url, headers, data: mock_api_response(url, headers, data)
+        mock_post.side_effect = lambda url, headers, data, **kwargs: mock_api_response(url, headers, data)
         
         # Mock input function to return OTP
         with patch('builtins.input', return_value="123456"):
@@ -33,18 +40,18 @@ class TestMStockAPI(unittest.TestCase):
         self.assertIn("Authorization", self.api.headers)
         self.assertEqual(self.api.headers["Authorization"], "token test_api_key:test_access_token")
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_login_failure(self, mock_post):
         """Test login failure."""
         # Mock the login error response
-        mock_post.side_effect = lambda url, headers, data: mock_api_error_response(url, headers, data)
+        mock_post.side_effect = lambda url, headers, data, **kwargs: mock_api_error_response(url, headers, data)
         
         result = self.api.login()
         
         self.assertFalse(result)
         self.assertIsNone(self.api.access_token)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_positions_success(self, mock_get):
         """Test successful get positions."""
         # Set up API with access token
@@ -52,7 +59,7 @@ class TestMStockAPI(unittest.TestCase):
         self.api.headers["Authorization"] = f"token {self.api.api_key}:{self.api.access_token}"
         
         # Mock the positions response
-        mock_get.side_effect = lambda url, headers: mock_api_response(url, headers)
+        mock_get.side_effect = lambda url, headers, **kwargs: mock_api_response(url, headers)
         
         positions = self.api.get_positions()
         
@@ -61,7 +68,7 @@ class TestMStockAPI(unittest.TestCase):
         self.assertEqual(positions[0]["tradingsymbol"], "NIFTY25MAY18000CE")
         self.assertEqual(positions[1]["tradingsymbol"], "NIFTY25MAY17000PE")
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_positions_failure(self, mock_get):
         """Test get positions failure."""
         # Set up API with access token
@@ -69,13 +76,13 @@ class TestMStockAPI(unittest.TestCase):
         self.api.headers["Authorization"] = f"token {self.api.api_key}:{self.api.access_token}"
         
         # Mock the positions error response
-        mock_get.side_effect = lambda url, headers: mock_api_error_response(url, headers)
+        mock_get.side_effect = lambda url, headers, **kwargs: mock_api_error_response(url, headers)
         
         positions = self.api.get_positions()
         
         self.assertIsNone(positions)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_option_chain_master_success(self, mock_get):
         """Test successful get option chain master."""
         # Set up API with access token
@@ -83,7 +90,7 @@ class TestMStockAPI(unittest.TestCase):
         self.api.headers["Authorization"] = f"token {self.api.api_key}:{self.api.access_token}"
         
         # Mock the option chain master response
-        mock_get.side_effect = lambda url, headers: mock_api_response(url, headers)
+        mock_get.side_effect = lambda url, headers, **kwargs: mock_api_response(url, headers)
         
         option_chain_master = self.api.get_option_chain_master()
         
@@ -92,7 +99,7 @@ class TestMStockAPI(unittest.TestCase):
         self.assertIn("OPTIDX", option_chain_master)
         self.assertEqual(option_chain_master["OPTIDX"][0], "NIFTY,26000,2,3,4")
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_option_chain_success(self, mock_get):
         """Test successful get option chain."""
         # Set up API with access token
@@ -100,7 +107,7 @@ class TestMStockAPI(unittest.TestCase):
         self.api.headers["Authorization"] = f"token {self.api.api_key}:{self.api.access_token}"
         
         # Mock the option chain response
-        mock_get.side_effect = lambda url, headers: mock_api_response(url, headers)
+        mock_get.side_effect = lambda url, headers, **kwargs: mock_api_response(url, headers)
         
         option_chain = self.api.get_option_chain("1716470400", "26000")
         
@@ -110,7 +117,7 @@ class TestMStockAPI(unittest.TestCase):
         self.assertEqual(len(option_chain["contractModel"]["ce"]), 4)
         self.assertEqual(len(option_chain["contractModel"]["pe"]), 4)
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_place_order_success(self, mock_post):
         """Test successful place order."""
         # Set up API with access token
@@ -118,7 +125,7 @@ class TestMStockAPI(unittest.TestCase):
         self.api.headers["Authorization"] = f"token {self.api.api_key}:{self.api.access_token}"
         
         # Mock the place order response
-        mock_post.side_effect = lambda url, headers, data: mock_api_response(url, headers, data)
+        mock_post.side_effect = lambda url, headers, data, **kwargs: mock_api_response(url, headers, data)
         
         order_params = {
             "tradingsymbol": "NIFTY25MAY18000CE",
@@ -136,7 +143,7 @@ class TestMStockAPI(unittest.TestCase):
         self.assertEqual(response["order_id"], "test_order_123")
         self.assertEqual(response["status"], "OPEN")
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_place_order_failure(self, mock_post):
         """Test place order failure."""
         # Set up API with access token
@@ -144,7 +151,7 @@ class TestMStockAPI(unittest.TestCase):
         self.api.headers["Authorization"] = f"token {self.api.api_key}:{self.api.access_token}"
         
         # Mock the place order error response
-        mock_post.side_effect = lambda url, headers, data: mock_api_error_response(url, headers, data)
+        mock_post.side_effect = lambda url, headers, data, **kwargs: mock_api_error_response(url, headers, data)
         
         order_params = {
             "tradingsymbol": "NIFTY25MAY18000CE",
@@ -160,7 +167,7 @@ class TestMStockAPI(unittest.TestCase):
         
         self.assertIsNone(response)
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_fund_summary_success(self, mock_get):
         """Test successful get fund summary."""
         # Set up API with access token
@@ -168,7 +175,7 @@ class TestMStockAPI(unittest.TestCase):
         self.api.headers["Authorization"] = f"token {self.api.api_key}:{self.api.access_token}"
         
         # Mock the fund summary response
-        mock_get.side_effect = lambda url, headers: mock_api_response(url, headers)
+        mock_get.side_effect = lambda url, headers, **kwargs: mock_api_response(url, headers)
         
         fund_summary = self.api.get_fund_summary()
         
@@ -176,7 +183,7 @@ class TestMStockAPI(unittest.TestCase):
         self.assertEqual(fund_summary["invested_amount"], 150000)
         self.assertEqual(fund_summary["available_funds"], 50000)
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_cancel_order_success(self, mock_post):
         """Test successful cancel order."""
         # Set up API with access token
@@ -184,13 +191,13 @@ class TestMStockAPI(unittest.TestCase):
         self.api.headers["Authorization"] = f"token {self.api.api_key}:{self.api.access_token}"
         
         # Mock the cancel order response
-        mock_post.side_effect = lambda url, headers, data: mock_api_response(url, headers, data)
+        mock_post.side_effect = lambda url, headers, data, **kwargs: mock_api_response(url, headers, data)
         
         result = self.api.cancel_order("test_order_123")
         
         self.assertTrue(result)
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_cancel_order_failure(self, mock_post):
         """Test cancel order failure."""
         # Set up API with access token
@@ -198,12 +205,49 @@ class TestMStockAPI(unittest.TestCase):
         self.api.headers["Authorization"] = f"token {self.api.api_key}:{self.api.access_token}"
         
         # Mock the cancel order error response
-        mock_post.side_effect = lambda url, headers, data: mock_api_error_response(url, headers, data)
+        mock_post.side_effect = lambda url, headers, data, **kwargs: mock_api_error_response(url, headers, data)
         
         result = self.api.cancel_order("test_order_123")
         
         self.assertFalse(result)
 
 
+class TestPooledSession(unittest.TestCase):
+    """Test cases for the pooled HTTP session."""
+    
+    def setUp(self):
+        """Start a local keep-alive HTTP server."""
+        self.server = MockAPIServer()
+        self.server.start()
+    
+    def tearDown(self):
+        """Stop the local HTTP server."""
+        self.server.stop()
+    
+    def test_connection_reused(self):
+        """Test that sequential requests reuse a single connection."""
+        api = MStockAPI("test_api_key", "test_username", "test_password")
+        api.base_url = self.server.base_url
+        
+        for _ in range(5):
+            self.assertIsNotNone(api.get_fund_summary())
+        
+        stats = api.get_pool_stats()
+        api.close()
+        
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["new_connections"], 1)
+        self.assertAlmostEqual(stats["reuse_ratio"], 0.8)
+        self.assertEqual(stats["pool_waits"], 0)
+    
+    def test_unpooled_session_has_no_stats(self):
+        """Test that a plain session reports no pool statistics."""
+        import requests
+        
+        api = MStockAPI("test_api_key", "test_username", "test_password", session=requests.Session())
+        
+        self.assertIsNone(api.get_pool_stats())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,97 @@
+"""
+Test cases for the AsyncMStockAPI client.
+"""
+
+import unittest
+import os
+import tempfile
+from unittest.mock import patch
+
+from src.api.async_mstock_api import AsyncMStockAPI
+from src.api.rate_limiter import RateLimiter, get_rate_limiter
+from src.api.session_manager import SessionManager, TokenCipher
+from tests.test_utils import MockAPIServer
+
+
+class TestAsyncMStockAPI(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the AsyncMStockAPI client."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.server = MockAPIServer()
+        self.server.start()
+        session_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(session_dir.cleanup)
+        self.api = AsyncMStockAPI("test_api_key", "test_username", "test_password",
+                                  session_manager=SessionManager(os.path.join(session_dir.name, "session"),
+                                                                 cipher=TokenCipher(os.urandom(32))))
+        self.api.base_url = self.server.base_url
+    
+    async def asyncTearDown(self):
+        """Close the client session."""
+        await self.api.close()
+    
+    def tearDown(self):
+        """Stop the local HTTP server."""
+        self.server.stop()
+    
+    async def test_login_success(self):
+        """Test successful login."""
+        with patch('builtins.input', return_value="123456"):
+            result = await self.api.login()
+        
+        self.assertTrue(result)
+        self.assertEqual(self.api.access_token, "test_access_token")
+        self.assertEqual(self.api.headers["Authorization"], "token test_api_key:test_access_token")
+    
+    async def test_get_positions_success(self):
+        """Test successful get positions."""
+        positions = await self.api.get_positions()
+        
+        self.assertEqual(len(positions), 2)
+        self.assertEqual(positions[0]["tradingsymbol"], "NIFTY25MAY18000CE")
+    
+    async def test_get_option_chains_concurrently(self):
+        """Test fetching several option chains concurrently."""
+        chains = await self.api.get_option_chains([("1716470400", "26000"), ("1717075200", "26000")])
+        
+        self.assertEqual(len(chains), 2)
+        for chain in chains:
+            self.assertEqual(chain["contractModel"]["sym"], "NIFTY")
+    
+    async def test_place_orders_concurrently(self):
+        """Test placing several orders concurrently."""
+        responses = await self.api.place_orders([
+            {"tradingsymbol": "NIFTY25MAY18000CE", "transaction_type": "SELL", "quantity": "75"},
+            {"tradingsymbol": "NIFTY25MAY17000PE", "transaction_type": "SELL", "quantity": "75"}
+        ])
+        
+        self.assertEqual([r["order_id"] for r in responses], ["test_order_123", "test_order_123"])
+    
+    async def test_cancel_order_success(self):
+        """Test successful cancel order."""
+        self.assertTrue(await self.api.cancel_order("test_order_123"))
+    
+    async def test_shared_rate_limiter(self):
+        """Test that requests take tokens from the process-wide limiter and fail when none arrive."""
+        self.assertIs(self.api.rate_limiter, get_rate_limiter())
+        self.api.rate_limiter = RateLimiter(buckets={"portfolio": {"rate": 0, "burst": 1}},
+                                            global_limit={"rate": 100, "burst": 10}, max_wait=0.05)
+        
+        self.assertIsNotNone(await self.api.get_positions())
+        self.assertIsNone(await self.api.get_positions())
+        
+        stats = self.api.rate_limiter.stats()["portfolio"]
+        self.assertEqual(stats["acquired"], 1)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(self.api.get_breaker_states()["portfolio/positions"]["consecutive_failures"], 0)
+    
+    async def test_request_failure_returns_none(self):
+        """Test that an unreachable server returns None."""
+        self.api.base_url = "http://127.0.0.1:1"
+        
+        self.assertIsNone(await self.api.get_fund_summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+"""
+Test cases for the chain series, simulated broker and backtest engine.
+"""
+
+import unittest
+from unittest.mock import patch
+import datetime
+
+import numpy as np
+
+from src.api.simulated_broker import SimulatedBroker, FillModel, MarginModel
+from src.models.chain_series import ChainSeries
+from src.strategies.backtest import BacktestEngine, config_overrides
+from src.strategies.short_strangle import ShortStrangleStrategy
+from config.config import STRATEGY_CONFIG
+from src.utils.price_path import generate_chain_series
+from tests.test_utils import mock_api_response
+
+
+EXPIRY = datetime.datetime(2025, 5, 29, 15, 30)
+T0 = int(datetime.datetime(2025, 5, 26, 9, 15).timestamp())
+
+
+def snapshot(price_shift: float = 0.0, spot: float = 18500.25) -> dict:
+    """Mock option chain response with all prices shifted."""
+    response = mock_api_response("GetOptionChain").json()["data"]
+    response["contractModel"]["spotPrice"] = spot
+    for side in ("ce", "pe"):
+        for record in response["contractModel"][side]:
+            for key in ("lastPrice", "bidPrice", "askPrice"):
+                record[key] += price_shift
+    return response
+
+
+class TestChainSeries(unittest.TestCase):
+    """Test cases for the columnar chain series."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.responses = [snapshot(), snapshot(5.0)]
+        del self.responses[1]["contractModel"]["ce"][0]  # Contract missing from the second snapshot
+        self.series = ChainSeries.from_snapshots([(T0 + 60, self.responses[1]), (T0, self.responses[0])], EXPIRY)
+    
+    def test_round_trip(self):
+        """Test that snapshots are rebuilt as the original responses."""
+        rebuilt = self.series.to_api_response(0)["contractModel"]
+        original = self.responses[0]["contractModel"]
+        
+        self.assertEqual(rebuilt["spotPrice"], original["spotPrice"])
+        self.assertEqual([r["sym"] for r in rebuilt["ce"]], [r["sym"] for r in sorted(original["ce"], key=lambda r: r["strikePrice"])])
+        self.assertEqual(rebuilt["ce"][0]["askPrice"], original["ce"][0]["askPrice"])
+    
+    def test_unlisted_contracts_omitted(self):
+        """Test that contracts missing from a snapshot are not replayed."""
+        symbols = [record["sym"] for record in self.series.to_api_response(1)["contractModel"]["ce"]]
+        
+        self.assertNotIn(self.responses[0]["contractModel"]["ce"][0]["sym"], symbols)
+        self.assertTrue(np.isnan(self.series.calls.last_price[1, 0]))
+    
+    def test_row_lookup(self):
+        """Test event-time lookup of the latest snapshot."""
+        self.assertEqual(self.series.row_at(T0 - 1), -1)
+        self.assertEqual(self.series.row_at(T0 + 59), 0)
+        np.testing.assert_array_equal(self.series.rows_at([T0, T0 + 60, T0 + 600]), [0, 1, 1])
+
+
+class TestSimulatedBroker(unittest.TestCase):
+    """Test cases for the simulated broker."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        series = ChainSeries.from_snapshots([(T0, snapshot()), (T0 + 60, snapshot(-20.0)),
+                                             (T0 + 120, snapshot(40.0, spot=18700.0))], EXPIRY)
+        self.broker = SimulatedBroker([series], capital=200000, fill_model=FillModel(slippage_ticks=1, tick_size=0.05),
+                                      margin_model=MarginModel(0.12, 0.7), brokerage=20.0)
+        self.broker.advance(T0)
+    
+    def order(self, side: str, quantity: int = 75, symbol: str = "NIFTY25MAY18000CE", **params) -> dict:
+        """Place an order and return the response."""
+        return self.broker.place_order({"tradingsymbol": symbol, "exchange": "NFO", "transaction_type": side,
+                                        "order_type": params.pop("order_type", "MARKET"), "quantity": str(quantity),
+                                        "product": "NRML", **params})
+    
+    def test_market_fill_with_slippage(self):
+        """Test that sells fill at the bid less slippage and cash includes brokerage."""
+        response = self.order("SELL")
+        
+        self.assertEqual(response["status"], "COMPLETE")
+        position = self.broker.get_positions()[0]
+        self.assertEqual(position["quantity"], -75)
+        self.assertAlmostEqual(position["average_price"], 154.75 - 0.05)
+        self.assertAlmostEqual(self.broker.cash, 200000 + 75 * 154.70 - 20.0)
+    
+    def test_limit_order_rests_until_marketable(self):
+        """Test that a limit buy fills once the ask falls to the limit."""
+        response = self.order("BUY", order_type="LIMIT", price="140")
+        self.assertEqual(response["status"], "OPEN")
+        
+        self.broker.advance(T0 + 60)
+        
+        history = {order["order_id"]: order for order in self.broker.get_order_history()}
+        self.assertEqual(history[response["order_id"]]["status"], "COMPLETE")
+        self.assertAlmostEqual(history[response["order_id"]]["average_price"], 136.30)
+        self.assertTrue(self.broker.cancel_order(self.order("BUY", order_type="LIMIT", price="1")["order_id"]))
+        self.assertEqual(self.broker.order_count, 2)
+    
+    def test_netting_and_realized_pnl(self):
+        """Test that closing a short realizes P&L and flattens the position."""
+        self.order("SELL")
+        self.broker.advance(T0 + 60)
+        self.order("BUY")
+        
+        self.assertEqual(self.broker.get_positions(), [])
+        book = self.broker._books["NIFTY25MAY18000CE"]
+        self.assertAlmostEqual(book.realized_pnl, 75 * (154.70 - (156.25 - 20.0 + 0.05)))
+    
+    def test_margin_rejection(self):
+        """Test that shorts beyond available equity are rejected and closing trades are not."""
+        self.assertIsNone(self.order("SELL", quantity=750))
+        self.assertEqual(self.broker.rejected_orders, 1)
+        
+        self.assertIsNotNone(self.order("SELL"))
+        self.assertAlmostEqual(self.broker.margin_used(), 0.12 * 18500.25 * 75)
+        self.assertIsNotNone(self.order("BUY", symbol="NIFTY25MAY19000CE"))
+        self.assertAlmostEqual(self.broker.margin_used(), 0.12 * 18500.25 * 75 * 0.3)
+    
+    def test_settlement_at_intrinsic_value(self):
+        """Test that open positions settle at intrinsic value at expiry."""
+        self.order("SELL")
+        
+        self.broker.advance(int(EXPIRY.timestamp()))
+        
+        self.assertEqual(self.broker.get_positions(), [])
+        settlement = self.broker.trades[-1]
+        self.assertEqual(settlement["kind"], "settlement")
+        self.assertAlmostEqual(settlement["price"], 18700.0 - 18000)
+        self.assertIsNone(self.broker.get_option_chain(str(int(EXPIRY.timestamp())), "26000"))
+    
+    def test_client_attributes(self):
+        """Test that the broker has the client attributes and sends nothing over HTTP."""
+        self.assertIsNotNone(self.broker.session)
+        self.assertIsNotNone(self.broker.timeout)
+        self.assertIsNone(self.broker.session_manager)
+        self.assertIsNone(self.broker.rate_limiter)
+        self.assertIsNone(self.broker.get_pool_stats())
+        self.broker.close()
+    
+    def test_option_chain_master_and_chain(self):
+        """Test that the chain served matches the current snapshot."""
+        self.broker.advance(T0 + 60)
+        master = self.broker.get_option_chain_master()
+        expiry_timestamp = master["dctExp"]["1"]
+        
+        chain = self.broker.get_option_chain(str(expiry_timestamp), "26000")
+        
+        self.assertEqual(expiry_timestamp, int(EXPIRY.timestamp()))
+        self.assertAlmostEqual(chain["contractModel"]["ce"][0]["lastPrice"], 155.50 - 20.0)
+
+
+class TestBacktestEngine(unittest.TestCase):
+    """Test cases for the backtest engine."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Generate two weeks of 5-minute snapshots."""
+        cls.series = generate_chain_series(datetime.date(2025, 6, 2), 14, interval_minutes=5)
+    
+    def test_run(self):
+        """Test that a run trades through the strategy and records equity per event."""
+        result = BacktestEngine(self.series).run()
+        summary = result.summary()
+        
+        self.assertEqual(len(result.equity), len(BacktestEngine(self.series).event_times()))
+        self.assertGreaterEqual(summary["entries"], 1)
+        self.assertGreaterEqual(summary["fills"], 4)
+        self.assertAlmostEqual(summary["final_equity"], result.equity[-1])
+        self.assertGreaterEqual(summary["max_drawdown"], 0.0)
+    
+    def test_deterministic(self):
+        """Test that replaying the same data gives the same result."""
+        first = BacktestEngine(self.series).run()
+        second = BacktestEngine(self.series).run()
+        
+        np.testing.assert_array_equal(first.equity, second.equity)
+    
+    def test_positions_managed_by_strategy(self):
+        """Test that open positions go through the strategy's check_positions, including hedge rollover."""
+        with patch.object(ShortStrangleStrategy, "rollover_hedge", return_value=True) as rollover:
+            BacktestEngine(self.series).run()
+        
+        self.assertTrue(rollover.called)
+    
+    def test_failed_entries_not_counted(self):
+        """Test that only strangles that were placed count as entries."""
+        with patch.object(ShortStrangleStrategy, "place_short_strangle", return_value=False):
+            result = BacktestEngine(self.series).run()
+        
+        self.assertEqual(result.entries, 0)
+    
+    def test_strategy_overrides(self):
+        """Test that overrides change the strikes traded and are restored afterwards."""
+        distance = STRATEGY_CONFIG["strangle_distance"]
+        
+        near = BacktestEngine(self.series, strategy_overrides={"strangle_distance": 300}).run()
+        far = BacktestEngine(self.series, strategy_overrides={"strangle_distance": 1500}).run()
+        
+        self.assertNotEqual(near.trades[0]["symbol"], far.trades[0]["symbol"])
+        self.assertEqual(STRATEGY_CONFIG["strangle_distance"], distance)
+        with self.assertRaises(KeyError):
+            with config_overrides({"no_such_parameter": 1}):
+                pass
+
+
+if __name__ == '__main__':
+    unittest.main()
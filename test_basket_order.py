@@ -0,0 +1,149 @@
+"""
+Test cases for basket order execution.
+"""
+
+import threading
+import unittest
+from typing import Dict, Any, Optional
+
+from src.models.order import Order, OrderType, OrderSide, ProductType, OptionType
+from src.strategies.basket_order import (
+    BasketOrderExecutor, LegStatus, hedges_first, simultaneous
+)
+from tests.test_utils import MockMStockAPI
+
+
+class RecordingMockAPI(MockMStockAPI):
+    """Mock API that records submissions and can reject chosen symbols."""
+    
+    def __init__(self, reject_symbols=(), cancel_succeeds=False, reject_buy_symbols=()):
+        """Initialize the recording mock API."""
+        super().__init__()
+        self.reject_symbols = set(reject_symbols)
+        self.reject_buy_symbols = set(reject_buy_symbols)
+        self.cancel_succeeds = cancel_succeeds
+        self.placed = []
+        self.cancelled = []
+        self._lock = threading.Lock()
+    
+    def place_order(self, order_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Record the order and reject it if its symbol is blocked."""
+        with self._lock:
+            self.placed.append(order_params)
+            if order_params["tradingsymbol"] in self.reject_symbols:
+                return None
+            if order_params["transaction_type"] == "BUY" and order_params["tradingsymbol"] in self.reject_buy_symbols:
+                return None
+            return {"order_id": f"order_{len(self.placed)}", "status": "OPEN"}
+    
+    def cancel_order(self, order_id: str) -> bool:
+        """Record the cancellation."""
+        with self._lock:
+            self.cancelled.append(order_id)
+        return self.cancel_succeeds
+
+
+def make_order(symbol: str, side: OrderSide, is_hedge: bool = False) -> Order:
+    """Create a market order for testing."""
+    return Order(
+        symbol=symbol,
+        exchange="NFO",
+        order_type=OrderType.MARKET,
+        side=side,
+        quantity=75,
+        product=ProductType.NRML,
+        option_type=OptionType.CE if symbol.endswith("CE") else OptionType.PE,
+        is_hedge=is_hedge
+    )
+
+
+class TestBasketOrderExecutor(unittest.TestCase):
+    """Test cases for BasketOrderExecutor."""
+    
+    def setUp(self):
+        """Set up a four-leg strangle basket."""
+        self.orders = [
+            make_order("NIFTY25MAY19500CE", OrderSide.SELL),
+            make_order("NIFTY25MAY16500PE", OrderSide.SELL),
+            make_order("NIFTY25MAY20000CE", OrderSide.BUY, is_hedge=True),
+            make_order("NIFTY25MAY16000PE", OrderSide.BUY, is_hedge=True)
+        ]
+    
+    def test_all_legs_placed(self):
+        """Test that every leg is placed with latency recorded."""
+        api = RecordingMockAPI()
+        result = BasketOrderExecutor(api, ordering=hedges_first).execute(self.orders)
+        
+        self.assertTrue(result.success)
+        self.assertEqual(len(result.placed_legs), 4)
+        self.assertEqual(len(result.latencies), 4)
+        self.assertTrue(all(order.order_id for order in self.orders))
+    
+    def test_hedges_submitted_first(self):
+        """Test that hedge legs are submitted before sell legs."""
+        api = RecordingMockAPI()
+        BasketOrderExecutor(api, ordering=hedges_first).execute(self.orders)
+        
+        sides = [params["transaction_type"] for params in api.placed]
+        self.assertEqual(sides, ["BUY", "BUY", "SELL", "SELL"])
+    
+    def test_failed_hedge_skips_sells_and_rolls_back(self):
+        """Test that a failed hedge skips the sells and offsets the placed hedge."""
+        api = RecordingMockAPI(reject_symbols={"NIFTY25MAY16000PE"})
+        result = BasketOrderExecutor(api, ordering=hedges_first).execute(self.orders)
+        
+        statuses = {leg.order.symbol: leg.status for leg in result.legs}
+        self.assertFalse(result.success)
+        self.assertEqual(statuses["NIFTY25MAY16000PE"], LegStatus.FAILED)
+        self.assertEqual(statuses["NIFTY25MAY20000CE"], LegStatus.COMPENSATED)
+        self.assertEqual(statuses["NIFTY25MAY19500CE"], LegStatus.SKIPPED)
+        self.assertEqual(statuses["NIFTY25MAY16500PE"], LegStatus.SKIPPED)
+        
+        # Cancel failed, so the hedge is offset with an opposite order
+        offset = api.placed[-1]
+        self.assertEqual(offset["tradingsymbol"], "NIFTY25MAY20000CE")
+        self.assertEqual(offset["transaction_type"], "SELL")
+    
+    def test_rollback_unwinds_sells_before_hedges(self):
+        """Test that a failed sell leg rolls back the placed sell before the hedges."""
+        api = RecordingMockAPI(reject_symbols={"NIFTY25MAY16500PE"})
+        result = BasketOrderExecutor(api, ordering=hedges_first).execute(self.orders)
+        
+        self.assertFalse(result.success)
+        offsets = [(params["tradingsymbol"], params["transaction_type"]) for params in api.placed[4:]]
+        self.assertEqual(offsets[0], ("NIFTY25MAY19500CE", "BUY"))
+        self.assertEqual(sorted(offsets[1:]), [("NIFTY25MAY16000PE", "SELL"), ("NIFTY25MAY20000CE", "SELL")])
+    
+    def test_rollback_keeps_hedges_of_open_sells(self):
+        """Test that hedges are kept when a sell leg cannot be unwound."""
+        api = RecordingMockAPI(reject_symbols={"NIFTY25MAY16500PE"}, reject_buy_symbols={"NIFTY25MAY19500CE"})
+        result = BasketOrderExecutor(api, ordering=simultaneous).execute(self.orders)
+        
+        statuses = {leg.order.symbol: leg.status for leg in result.legs}
+        self.assertEqual(statuses["NIFTY25MAY19500CE"], LegStatus.COMPENSATION_FAILED)
+        self.assertEqual(statuses["NIFTY25MAY20000CE"], LegStatus.PLACED)
+        self.assertEqual(statuses["NIFTY25MAY16000PE"], LegStatus.PLACED)
+    
+    def test_rollback_prefers_cancel(self):
+        """Test that a cancellable leg is cancelled rather than offset."""
+        api = RecordingMockAPI(reject_symbols={"NIFTY25MAY16500PE"}, cancel_succeeds=True)
+        result = BasketOrderExecutor(api, ordering=simultaneous).execute(self.orders)
+        
+        self.assertEqual(len(api.cancelled), 3)
+        self.assertEqual(len(api.placed), 4)
+        self.assertEqual(
+            sorted(leg.status.value for leg in result.legs),
+            ["COMPENSATED", "COMPENSATED", "COMPENSATED", "FAILED"]
+        )
+    
+    def test_no_rollback(self):
+        """Test that placed legs are kept when rollback is disabled."""
+        api = RecordingMockAPI(reject_symbols={"NIFTY25MAY16500PE"})
+        result = BasketOrderExecutor(api, ordering=simultaneous, rollback=False).execute(self.orders)
+        
+        self.assertEqual(len(result.placed_legs), 3)
+        self.assertEqual(api.cancelled, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
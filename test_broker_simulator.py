@@ -0,0 +1,131 @@
+"""
+Test cases for the local broker simulator server.
+"""
+
+import unittest
+import datetime
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+from src.api.broker_simulator import BrokerSimulatorServer, FaultProfile
+from src.api.mstock_api import MStockAPI
+from src.api.session_manager import SessionManager, TokenCipher
+from src.strategies.short_strangle import ShortStrangleStrategy
+from config.config import RESILIENCE_CONFIG
+
+
+START = datetime.date(2025, 6, 2)
+
+
+class TestBrokerSimulator(unittest.TestCase):
+    """Test cases for serving the mStock API from a simulated broker."""
+    
+    def start_server(self, **kwargs) -> MStockAPI:
+        """Start a simulator on a free port and return a client pointed at it."""
+        self.server = BrokerSimulatorServer.from_price_path(START, 3, 5, port=0, speed=0, **kwargs)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        session_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(session_dir.cleanup)
+        api = MStockAPI("test_api_key", "test_username", "test_password",
+                        session_manager=SessionManager(os.path.join(session_dir.name, "session"),
+                                                       cipher=TokenCipher(os.urandom(32))))
+        api.base_url = self.server.base_url
+        self.addCleanup(api.close)
+        return api
+    
+    def order(self, api: MStockAPI, side: str, symbol: str, **params) -> dict:
+        """Place an order through the client."""
+        return api.place_order({"tradingsymbol": symbol, "exchange": "NFO", "transaction_type": side,
+                                "order_type": params.pop("order_type", "MARKET"), "quantity": "75",
+                                "product": "NRML", **params})
+    
+    def first_chain(self, api: MStockAPI) -> dict:
+        """Get the chain of the nearest expiry."""
+        master = api.get_option_chain_master()
+        return api.get_option_chain(str(master["dctExp"]["1"]), master["OPTIDX"][0].split(",")[1])
+    
+    def test_order_round_trip(self):
+        """Test that market orders fill and show up in positions, history and funds."""
+        api = self.start_server()
+        chain = self.first_chain(api)
+        contract = chain["contractModel"]["ce"][35]
+        
+        response = self.order(api, "SELL", contract["sym"])
+        
+        self.assertEqual(response["status"], "COMPLETE")
+        positions = api.get_positions()
+        self.assertEqual([(p["tradingsymbol"], p["quantity"]) for p in positions], [(contract["sym"], -75)])
+        self.assertEqual(api.get_order_history()[0]["order_id"], response["order_id"])
+        self.assertGreater(api.get_fund_summary()["invested_amount"], 0)
+        self.assertIsNone(self.order(api, "SELL", "NIFTY25JUN99999CE"))
+        self.assertEqual(self.server.stats()["orders"], 1)
+    
+    def test_resting_limit_order(self):
+        """Test that limit orders rest in the book unless marketable and can be modified and cancelled."""
+        api = self.start_server()
+        contract = self.first_chain(api)["contractModel"]["ce"][35]
+        bid = contract["bidPrice"]
+        
+        response = self.order(api, "SELL", contract["sym"], order_type="LIMIT", price=str(bid + 100))
+        self.assertEqual(response["status"], "OPEN")
+        self.assertEqual(api.modify_order(response["order_id"], {"price": str(bid + 50)})["status"], "OPEN")
+        self.assertTrue(api.cancel_order(response["order_id"]))
+        self.assertFalse(api.cancel_order(response["order_id"]))
+        
+        resting = self.order(api, "BUY", contract["sym"], order_type="LIMIT", price="1000")
+        self.assertEqual(resting["status"], "COMPLETE")
+    
+    def test_simulated_clock(self):
+        """Test that the market moves with simulated time."""
+        api = self.start_server()
+        first = self.first_chain(api)["contractModel"]["spotPrice"]
+        
+        self.server.advance(self.server.simulated_time() + 3600)
+        
+        self.assertNotEqual(self.first_chain(api)["contractModel"]["spotPrice"], first)
+    
+    def test_fault_injection(self):
+        """Test injected errors, dropped connections and latency."""
+        api = self.start_server(faults={"positions": FaultProfile(error_rate=1.0),
+                                        "order_history": FaultProfile(drop_rate=1.0),
+                                        "fund_summary": FaultProfile(latency=0.1)})
+        
+        self.assertIsNone(api.get_positions())
+        self.assertIsNone(api.get_order_history())
+        started = time.perf_counter()
+        self.assertIsNotNone(api.get_fund_summary())
+        self.assertGreaterEqual(time.perf_counter() - started, 0.1)
+        
+        stats = self.server.stats()  # Failed reads are retried
+        self.assertEqual(stats["errors_injected"], RESILIENCE_CONFIG["max_attempts"])
+        self.assertEqual(stats["drops_injected"], RESILIENCE_CONFIG["max_attempts"])
+    
+    def test_authentication(self):
+        """Test that calls need the token issued by the login flow."""
+        api = self.start_server(require_auth=True)
+        
+        self.assertIsNone(api.get_positions())
+        with patch("builtins.input", return_value="123456"):
+            self.assertTrue(api.login())
+        self.assertEqual(api.get_positions(), [])
+    
+    def test_strategy_over_http(self):
+        """Test that the strategy opens a strangle against the simulator."""
+        api = self.start_server()
+        strategy = ShortStrangleStrategy(api, clock=lambda: datetime.datetime.fromtimestamp(
+            self.server.simulated_time()))
+        strategy.snapshot_writer = None
+        self.server.advance(self.server.simulated_time() + 300)
+        
+        with patch("builtins.input", return_value="123456"):
+            self.assertTrue(strategy.initialize())
+        strategy.place_short_strangle(strategy.calculate_investment_amount())
+        
+        self.assertGreaterEqual(len(api.get_positions()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Test cases for the incremental option chain store.
+"""
+
+import unittest
+import copy
+import datetime
+
+from src.models.option_chain import OptionChain
+from src.models.chain_store import OptionChainStore
+from tests.test_utils import mock_api_response
+
+
+class TestOptionChainStore(unittest.TestCase):
+    """Test cases for OptionChainStore."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.snapshot = mock_api_response("GetOptionChain").json()["data"]
+        self.expiry = datetime.datetime(2025, 5, 29, 15, 30)
+        self.store = OptionChainStore(self.expiry)
+        self.store.apply(self.snapshot)
+    
+    def next_snapshot(self):
+        """Copy the current snapshot, as a fresh API response would be."""
+        return copy.deepcopy(self.snapshot)
+    
+    def test_initial_load_matches_full_parse(self):
+        """Test that the first snapshot builds the same chain as a full parse."""
+        expected = OptionChain.from_api_response(self.snapshot, self.expiry)
+        
+        self.assertEqual(self.store.chain, expected)
+    
+    def test_unchanged_snapshot(self):
+        """Test that an identical snapshot parses nothing and reports nothing."""
+        changes = self.store.apply(self.next_snapshot())
+        
+        self.assertFalse(changes)
+        self.assertEqual(changes.parsed, 0)
+    
+    def test_changed_contract_updated_in_place(self):
+        """Test that a changed contract is re-parsed and updated in place."""
+        contract = self.store.get_contract("12349", "CE")
+        snapshot = self.next_snapshot()
+        snapshot["contractModel"]["ce"][2]["lastPrice"] = 60.25
+        snapshot["contractModel"]["ce"][2]["volume"] = 12500
+        
+        changes = self.store.apply(snapshot)
+        
+        self.assertEqual(changes.parsed, 1)
+        self.assertEqual(len(changes.changed), 1)
+        self.assertIs(changes.changed[0].contract, contract)
+        self.assertEqual(changes.changed[0].changes, {"last_price": (55.75, 60.25)})
+        self.assertEqual(contract.last_price, 60.25)
+        self.assertEqual(contract.volume, 12500)
+        self.assertEqual(changes.strikes("CE"), [19000])
+        self.assertEqual(self.store.chain, OptionChain.from_api_response(snapshot, self.expiry))
+    
+    def test_threshold_measured_from_last_report(self):
+        """Test that small moves are applied silently but accumulate until reported."""
+        store = OptionChainStore(self.expiry, thresholds={"last_price": 1.0})
+        store.apply(self.snapshot)
+        
+        snapshot = self.next_snapshot()
+        snapshot["contractModel"]["pe"][0]["lastPrice"] = 75.75
+        changes = store.apply(snapshot)
+        self.assertEqual(changes.changed, [])
+        self.assertEqual(store.get_contract("12346", "PE").last_price, 75.75)
+        
+        snapshot = copy.deepcopy(snapshot)
+        snapshot["contractModel"]["pe"][0]["lastPrice"] = 76.50
+        changes = store.apply(snapshot)
+        self.assertEqual(changes.changed[0].changes, {"last_price": (75.25, 76.50)})
+    
+    def test_added_and_removed_strikes(self):
+        """Test that listing and delisting strikes rebuilds the strike index."""
+        snapshot = self.next_snapshot()
+        removed = snapshot["contractModel"]["pe"].pop(0)
+        added = dict(removed, sym="NIFTY25MAY16000PE", strikePrice=16000, token="12399")
+        snapshot["contractModel"]["pe"].append(added)
+        
+        changes = self.store.apply(snapshot)
+        
+        self.assertEqual([contract.symbol for contract in changes.removed], [removed["sym"]])
+        self.assertEqual([contract.symbol for contract in changes.added], ["NIFTY25MAY16000PE"])
+        self.assertIsNone(self.store.get_contract(removed["token"], "PE"))
+        self.assertEqual(self.store.chain.strike_index("PE").strikes[0], 16000)
+        self.assertNotIn(removed["strikePrice"], self.store.chain.strike_index("PE").strikes)
+    
+    def test_spot_price_change(self):
+        """Test that a spot move updates the chain and every contract."""
+        snapshot = self.next_snapshot()
+        snapshot["contractModel"]["spotPrice"] = 18600.0
+        
+        changes = self.store.apply(snapshot)
+        
+        self.assertTrue(changes.spot_price_changed)
+        self.assertEqual(changes.parsed, 0)
+        self.assertEqual(self.store.chain.spot_price, 18600.0)
+        self.assertTrue(all(contract.underlying_price == 18600.0 for contract in self.store.chain.calls))
+    
+    def test_malformed_snapshot(self):
+        """Test that a snapshot without a contract model is rejected."""
+        self.assertIsNone(self.store.apply({}))
+        self.assertEqual(len(self.store.chain.calls), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,202 @@
+"""
+Test cases for the trading calendar and date utilities.
+"""
+
+import unittest
+import datetime
+import types
+from unittest.mock import patch
+
+import numpy as np
+
+from src.utils import date_utils
+from src.utils.date_utils import TradingCalendar, ExpiryService
+
+
+HOLIDAYS = ["2025-01-26", "2025-03-14", "2025-05-01", "2025-05-29", "2025-08-15", "2025-12-25"]
+
+
+def reference_is_trading_day(date: datetime.date) -> bool:
+    """Day-by-day reference implementation."""
+    return date.weekday() < 5 and date.strftime("%Y-%m-%d") not in HOLIDAYS
+
+
+def reference_next_trading_day(date: datetime.date) -> datetime.date:
+    """Day-by-day reference implementation."""
+    date += datetime.timedelta(days=1)
+    while not reference_is_trading_day(date):
+        date += datetime.timedelta(days=1)
+    return date
+
+
+def reference_previous_trading_day(date: datetime.date) -> datetime.date:
+    """Day-by-day reference implementation."""
+    date -= datetime.timedelta(days=1)
+    while not reference_is_trading_day(date):
+        date -= datetime.timedelta(days=1)
+    return date
+
+
+class TestTradingCalendar(unittest.TestCase):
+    """Test cases for TradingCalendar."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.calendar = TradingCalendar(datetime.date(2024, 1, 1), datetime.date(2026, 12, 31), HOLIDAYS)
+        start = datetime.date(2024, 2, 1)
+        self.dates = [start + datetime.timedelta(days=i) for i in range(0, 900, 3)]
+    
+    def test_matches_day_by_day_reference(self):
+        """Test trading day lookups against the day-by-day implementation."""
+        for date in self.dates:
+            self.assertEqual(self.calendar.is_trading_day(date), reference_is_trading_day(date))
+            self.assertEqual(self.calendar.next_trading_day(date), reference_next_trading_day(date))
+            self.assertEqual(self.calendar.previous_trading_day(date), reference_previous_trading_day(date))
+    
+    def test_holiday_lookups(self):
+        """Test holidays around a long weekend."""
+        self.assertFalse(self.calendar.is_trading_day(datetime.date(2025, 8, 15)))
+        self.assertTrue(self.calendar.is_holiday(datetime.datetime(2025, 8, 15, 10, 0)))
+        self.assertEqual(self.calendar.next_trading_day(datetime.date(2025, 8, 14)), datetime.date(2025, 8, 18))
+        self.assertEqual(self.calendar.previous_trading_day(datetime.date(2025, 8, 18)), datetime.date(2025, 8, 14))
+    
+    def test_add_and_count_trading_days(self):
+        """Test trading day offsets and counts."""
+        thursday = datetime.date(2025, 8, 14)
+        
+        self.assertEqual(self.calendar.add_trading_days(thursday, 1), datetime.date(2025, 8, 18))
+        self.assertEqual(self.calendar.add_trading_days(thursday, 3), datetime.date(2025, 8, 20))
+        self.assertEqual(self.calendar.add_trading_days(datetime.date(2025, 8, 16), -1), thursday)
+        self.assertEqual(self.calendar.add_trading_days(thursday, 0), thursday)
+        self.assertEqual(self.calendar.count_trading_days(thursday, datetime.date(2025, 8, 20)), 4)
+        self.assertEqual(len(self.calendar.trading_days(thursday, datetime.date(2025, 8, 20))), 4)
+    
+    def test_weekly_expiries(self):
+        """Test weekly expiries move back from holidays."""
+        expiries = self.calendar.weekly_expiries(datetime.date(2025, 5, 20), 3)
+        
+        self.assertEqual(expiries, [datetime.date(2025, 5, 22), datetime.date(2025, 5, 28), datetime.date(2025, 6, 5)])
+        self.assertEqual(self.calendar.next_weekly_expiry(datetime.date(2025, 5, 22)), datetime.date(2025, 5, 22))
+        self.assertEqual(self.calendar.next_weekly_expiry(datetime.date(2025, 5, 20), 2), datetime.date(2025, 5, 28))
+    
+    def test_monthly_expiries(self):
+        """Test monthly expiries on the last Thursday."""
+        self.assertEqual(self.calendar.monthly_expiry(2025, 5), datetime.date(2025, 5, 28))
+        self.assertEqual(self.calendar.monthly_expiry(2025, 7), datetime.date(2025, 7, 31))
+        self.assertEqual(self.calendar.next_monthly_expiry(datetime.date(2025, 5, 29)), datetime.date(2025, 6, 26))
+    
+    def test_array_variants_match_scalar(self):
+        """Test that vectorized lookups match the scalar ones."""
+        dates = np.array(self.dates, dtype="datetime64[D]")
+        
+        np.testing.assert_array_equal(self.calendar.is_trading_day_array(dates),
+                                      [self.calendar.is_trading_day(d) for d in self.dates])
+        np.testing.assert_array_equal(self.calendar.next_trading_day_array(dates),
+                                      np.array([self.calendar.next_trading_day(d) for d in self.dates], dtype="datetime64[D]"))
+        np.testing.assert_array_equal(self.calendar.previous_trading_day_array(self.dates),
+                                      np.array([self.calendar.previous_trading_day(d) for d in self.dates], dtype="datetime64[D]"))
+        np.testing.assert_array_equal(self.calendar.next_weekly_expiry_array(dates, 2),
+                                      np.array([self.calendar.next_weekly_expiry(d, 2) for d in self.dates], dtype="datetime64[D]"))
+        np.testing.assert_array_equal(self.calendar.next_monthly_expiry_array(dates),
+                                      np.array([self.calendar.next_monthly_expiry(d) for d in self.dates], dtype="datetime64[D]"))
+        np.testing.assert_array_equal(self.calendar.count_trading_days_array(dates, dates + 10),
+                                      [self.calendar.count_trading_days(d, d + datetime.timedelta(days=10)) for d in self.dates])
+    
+    def test_out_of_range(self):
+        """Test that queries outside the calendar raise ValueError."""
+        with self.assertRaises(ValueError):
+            self.calendar.is_trading_day(datetime.date(2030, 1, 1))
+        with self.assertRaises(ValueError):
+            self.calendar.next_trading_day_array(np.array(["2030-01-01"], dtype="datetime64[D]"))
+
+
+class TestExpiryService(unittest.TestCase):
+    """Test cases for the clock-injectable expiry service."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        calendar = TradingCalendar(datetime.date(2024, 1, 1), datetime.date(2026, 12, 31), HOLIDAYS)
+        self.service = ExpiryService(calendar)
+    
+    def test_cutoff_on_expiry_day(self):
+        """Test that the day's expiry is used until the market closes."""
+        self.assertEqual(self.service.next_expiry(datetime.datetime(2025, 5, 22, 15, 0)), datetime.date(2025, 5, 22))
+        self.assertEqual(self.service.next_expiry(datetime.datetime(2025, 5, 22, 15, 31)), datetime.date(2025, 5, 28))
+        self.assertEqual(self.service.next_expiry(datetime.date(2025, 5, 22)), datetime.date(2025, 5, 22))
+    
+    def test_memoized_by_date_and_weeks(self):
+        """Test that timestamps on the same effective date share a cache entry."""
+        first = self.service.next_expiry(datetime.datetime(2025, 6, 2, 9, 15), 4)
+        second = self.service.next_expiry(datetime.datetime(2025, 6, 2, 14, 0), 4)
+        
+        self.assertEqual(first, datetime.date(2025, 6, 26))
+        self.assertEqual(first, second)
+        self.assertEqual(self.service.cache_info(), {"hits": 1, "misses": 1, "size": 1})
+    
+    def test_weekday_rule_change(self):
+        """Test schedules when the exchange moves the expiry weekday."""
+        service = ExpiryService.with_rules(
+            [{"effective_from": "2000-01-01", "weekday": 3}, {"effective_from": "2025-09-01", "weekday": 1}],
+            datetime.date(2025, 1, 1), datetime.date(2025, 12, 31), HOLIDAYS
+        )
+        
+        weekly = service.schedule(datetime.date(2025, 8, 18), datetime.date(2025, 9, 12))
+        monthly = service.schedule(datetime.date(2025, 8, 1), datetime.date(2025, 10, 31), monthly=True)
+        
+        self.assertEqual(weekly, [datetime.date(2025, 8, 21), datetime.date(2025, 8, 28),
+                                  datetime.date(2025, 9, 2), datetime.date(2025, 9, 9)])
+        self.assertEqual(monthly, [datetime.date(2025, 8, 28), datetime.date(2025, 9, 30), datetime.date(2025, 10, 28)])
+        self.assertEqual(service.next_expiry(datetime.datetime(2025, 8, 29, 10, 0)), datetime.date(2025, 9, 2))
+        self.assertEqual(service.next_monthly_expiry(datetime.date(2025, 9, 1)), datetime.date(2025, 9, 30))
+
+
+class TestDateUtils(unittest.TestCase):
+    """Test cases for the module-level date functions."""
+    
+    def setUp(self):
+        """Use a calendar with known holidays."""
+        date_utils._trading_calendar = TradingCalendar(datetime.date(2024, 1, 1), datetime.date(2026, 12, 31), HOLIDAYS)
+    
+    def tearDown(self):
+        """Drop the test calendar."""
+        date_utils.reset_trading_calendar()
+    
+    def test_module_functions_use_calendar(self):
+        """Test that module functions answer from the shared calendar."""
+        self.assertTrue(date_utils.is_market_holiday(datetime.date(2025, 5, 1)))
+        self.assertEqual(date_utils.get_next_trading_day(datetime.date(2025, 4, 30)), datetime.date(2025, 5, 2))
+        self.assertEqual(date_utils.get_monthly_expiry_date(2025, 5), datetime.date(2025, 5, 28))
+    
+    def test_expiry_dates(self):
+        """Test consecutive expiries around an expiry-day holiday."""
+        as_of = datetime.datetime(2025, 5, 20, 10, 0)
+        
+        expiries = date_utils.get_expiry_dates(3, as_of=as_of)
+        
+        self.assertEqual(expiries, [datetime.date(2025, 5, 22), datetime.date(2025, 5, 28), datetime.date(2025, 6, 5)])
+        self.assertEqual(date_utils.get_expiry_date_n_weeks_ahead(2, datetime.date(2025, 5, 20)), datetime.date(2025, 5, 28))
+        self.assertEqual(date_utils.get_next_expiry_date(datetime.date(2025, 5, 22)), datetime.date(2025, 5, 22))
+    
+    def test_today_rolls_after_close(self):
+        """Test that a from_date of today skips today's expiry once the market has closed."""
+        class AfterClose(datetime.datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return cls(2025, 5, 22, 16, 0)
+        
+        clock = types.SimpleNamespace(date=datetime.date, datetime=AfterClose, time=datetime.time,
+                                      timedelta=datetime.timedelta)
+        with patch('src.utils.date_utils.datetime', clock):
+            self.assertEqual(date_utils.get_next_expiry_date(datetime.date(2025, 5, 22)), datetime.date(2025, 5, 28))
+            self.assertEqual(date_utils.get_expiry_dates(2, datetime.date(2025, 5, 22)),
+                             [datetime.date(2025, 5, 28), datetime.date(2025, 6, 5)])
+            self.assertEqual(date_utils.get_next_expiry_date(datetime.date(2025, 5, 21)), datetime.date(2025, 5, 22))
+    
+    def test_calendar_extends_for_distant_dates(self):
+        """Test that the shared calendar grows to cover distant dates."""
+        self.assertTrue(date_utils.is_trading_day(datetime.date(2031, 6, 2)))
+        self.assertTrue(date_utils.get_trading_calendar().covers(datetime.date(2031, 6, 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
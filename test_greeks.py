@@ -0,0 +1,119 @@
+"""
+Test cases for the Black-Scholes greeks and implied volatility engine.
+"""
+
+import unittest
+import datetime
+import math
+
+import numpy as np
+
+from src.models.option_chain import OptionChain
+from src.utils import greeks
+from src.utils.greeks import (
+    black_scholes_price, black_scholes_greeks, implied_volatility, compute_chain_greeks, norm_cdf
+)
+from src.utils.option_utils import find_strike_prices_by_delta
+from tests.test_utils import mock_api_response
+
+
+class TestBlackScholes(unittest.TestCase):
+    """Test cases for Black-Scholes pricing and greeks."""
+    
+    def test_norm_cdf_fallback(self):
+        """Test the built-in normal CDF approximation against math.erfc."""
+        x = np.linspace(-6, 6, 49)
+        expected = np.array([0.5 * math.erfc(-v / math.sqrt(2)) for v in x])
+        
+        original = greeks._ndtr
+        greeks._ndtr = None
+        try:
+            np.testing.assert_allclose(norm_cdf(x), expected, atol=1e-7)
+        finally:
+            greeks._ndtr = original
+    
+    def test_put_call_parity(self):
+        """Test that call and put prices satisfy put-call parity."""
+        strike = np.array([19000.0, 20000.0, 21000.0])
+        call = black_scholes_price(20000, strike, 0.1, 0.15, True, rate=0.065, dividend_yield=0.01)
+        put = black_scholes_price(20000, strike, 0.1, 0.15, False, rate=0.065, dividend_yield=0.01)
+        
+        parity = 20000 * math.exp(-0.01 * 0.1) - strike * math.exp(-0.065 * 0.1)
+        np.testing.assert_allclose(call - put, parity, atol=1e-8)
+    
+    def test_greeks_match_finite_differences(self):
+        """Test delta and vega against bumped prices."""
+        args = (20500, 30 / 365, 0.15, True)
+        result = black_scholes_greeks(20000, *args)
+        
+        bump = 0.01
+        delta = (black_scholes_price(20000 + bump, *args) - black_scholes_price(20000 - bump, *args)) / (2 * bump)
+        vega = (black_scholes_price(20000, 20500, 30 / 365, 0.1501, True)
+                - black_scholes_price(20000, 20500, 30 / 365, 0.1499, True)) / 0.0002 / 100
+        
+        self.assertAlmostEqual(float(result["delta"]), float(delta), places=5)
+        self.assertAlmostEqual(float(result["vega"]), float(vega), places=4)
+        self.assertLess(float(result["theta"]), 0)
+        self.assertGreater(float(result["gamma"]), 0)
+    
+    def test_implied_volatility_round_trip(self):
+        """Test that implied volatility recovers the pricing volatility for a batch."""
+        rng = np.random.default_rng(7)
+        strike = rng.uniform(18000, 22000, 2000)
+        expiry = rng.uniform(7 / 365, 0.25, 2000)
+        volatility = rng.uniform(0.1, 0.4, 2000)
+        is_call = rng.random(2000) < 0.5
+        price = black_scholes_price(20000, strike, expiry, volatility, is_call)
+        
+        solved = implied_volatility(price, 20000, strike, expiry, is_call)
+        
+        np.testing.assert_allclose(solved, volatility, atol=1e-4)
+    
+    def test_implied_volatility_invalid_inputs(self):
+        """Test that arbitrage-violating prices and expired options give NaN."""
+        solved = implied_volatility(
+            price=[0.0, 25000.0, 150.0, 150.0],
+            spot=20000,
+            strike=[20000, 20000, 20000, 20000],
+            time_to_expiry=[0.1, 0.1, 0.0, 0.1],
+            is_call=True
+        )
+        
+        self.assertTrue(np.isnan(solved[:3]).all())
+        self.assertTrue(np.isfinite(solved[3]))
+
+
+class TestChainGreeks(unittest.TestCase):
+    """Test cases for whole-chain greeks."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        response = mock_api_response("GetOptionChain").json()["data"]
+        self.expiry = datetime.datetime(2025, 5, 29, 15, 30)
+        self.as_of = datetime.datetime(2025, 5, 1, 10, 0)
+        self.chain = OptionChain.from_api_response(response, self.expiry)
+    
+    def test_compute_chain_greeks(self):
+        """Test that chain greeks are aligned with sorted strikes and have the right signs."""
+        result = compute_chain_greeks(self.chain, as_of=self.as_of)
+        
+        np.testing.assert_array_equal(result.calls.strike, [18000, 18500, 19000, 19500])
+        np.testing.assert_array_equal(result.puts.strike, [16500, 17000, 17500, 18000])
+        self.assertTrue(np.isfinite(result.puts.iv).all())
+        self.assertTrue((result.puts.delta < 0).all())
+        self.assertTrue(np.all(np.diff(result.puts.delta) < 0))
+    
+    def test_find_strike_prices_by_delta(self):
+        """Test delta-based strike selection picks the put closest to the target."""
+        result = compute_chain_greeks(self.chain, as_of=self.as_of)
+        target = 0.05
+        expected_put = result.puts.strike[np.nanargmin(np.abs(result.puts.delta + target))]
+        
+        call_strike, put_strike = find_strike_prices_by_delta(self.chain, target, as_of=self.as_of)
+        
+        self.assertEqual(put_strike, expected_put)
+        self.assertIn(call_strike, [18000, 18500, 19000, 19500])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Test cases for the live dashboard feed.
+"""
+
+import unittest
+import datetime
+import json
+import os
+import time
+import uuid
+
+import requests
+
+from src.api.live_feed import LiveFeed, LiveFeedServer, client_html
+from src.utils.state_bus import LiveState, StatePublisher, StateReader
+from tests.test_state_bus import make_position
+
+
+def make_state(sequence: int, prices: dict, running: bool = True) -> LiveState:
+    """Build a state with one short position per symbol at the given prices."""
+    positions = [{"symbol": symbol, "instrument_token": symbol, "quantity": -75, "average_price": 100.0,
+                  "last_price": price, "pnl": (price - 100.0) * -75} for symbol, price in prices.items()]
+    return LiveState(sequence=sequence, running=running, start_time=datetime.datetime(2025, 5, 19, 9, 15),
+                     updated_at=datetime.datetime(2025, 5, 19, 10, 0) + datetime.timedelta(seconds=sequence),
+                     pnl=sum(position["pnl"] for position in positions), positions=positions)
+
+
+def read_event(lines) -> tuple:
+    """Read the next event from a server-sent events stream, skipping comments."""
+    fields = {}
+    for line in lines:
+        if line == "":
+            if fields:
+                return fields["event"], int(fields["id"]), json.loads(fields["data"])
+            continue
+        if not line.startswith(":"):
+            name, _, value = line.partition(": ")
+            fields[name] = value
+    raise AssertionError("Stream ended")
+
+
+class TestLiveFeed(unittest.TestCase):
+    """Test cases for turning state snapshots into events."""
+    
+    def test_deltas(self):
+        """Test that deltas hold only the rows, status and P&L that changed."""
+        feed = LiveFeed(history=10)
+        feed.update(make_state(2, {"A": 100.0, "B": 100.0}))
+        
+        delta = feed.update(make_state(4, {"A": 90.0, "B": 100.0}))
+        self.assertEqual([row["symbol"] for row in delta["upserts"]], ["A"])
+        self.assertEqual(delta["pnl"][1], 750.0)
+        self.assertNotIn("status", delta)
+        
+        delta = feed.update(make_state(6, {"A": 90.0}, running=False))
+        self.assertEqual(delta["removed"], ["B"])
+        self.assertEqual(delta["status"]["running"], False)
+        self.assertNotIn("upserts", delta)
+        
+        self.assertIsNone(feed.update(make_state(8, {"A": 90.0}, running=False)))
+        self.assertEqual(len(feed.snapshot()["pnl"]), 2)
+    
+    def test_subscribers(self):
+        """Test that clients start with a snapshot and slow clients are resynchronized."""
+        feed = LiveFeed(queue_size=2)
+        feed.update(make_state(2, {"A": 100.0}))
+        subscriber = feed.subscribe()
+        
+        name, sequence, snapshot = subscriber.get_nowait()
+        self.assertEqual((name, sequence), ("snapshot", 2))
+        self.assertEqual(snapshot["positions"][0]["symbol"], "A")
+        
+        for i, price in enumerate((101.0, 102.0, 103.0)):
+            feed.update(make_state(4 + 2 * i, {"A": price}))
+        name, sequence, snapshot = subscriber.get_nowait()
+        self.assertEqual((name, sequence), ("snapshot", 8))
+        self.assertEqual(snapshot["positions"][0]["last_price"], 103.0)
+        self.assertTrue(subscriber.empty())
+        
+        feed.close()
+        self.assertIsNone(subscriber.get_nowait())
+        self.assertEqual(feed.subscribers, 0)
+    
+    def test_client_html(self):
+        """Test that the client page subscribes to the given stream and patches in place."""
+        html = client_html("http://127.0.0.1:8766/events", max_points=500)
+        
+        self.assertIn('new EventSource("http://127.0.0.1:8766/events")', html)
+        self.assertIn("Plotly.extendTraces", html)
+        self.assertIn("[0], 500)", html)
+
+
+class TestLiveFeedServer(unittest.TestCase):
+    """Test cases for pushing the state bus to clients over HTTP."""
+    
+    def setUp(self):
+        """Set up a state bus segment and a feed server on a free port."""
+        name = f"test_feed_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self.publisher = StatePublisher(name, capacity=4)
+        self.addCleanup(self.publisher.close, True)
+        self.publisher.set_positions([make_position("NIFTY25MAY18000CE", "1001", -75, 150.0, 150.0),
+                                      make_position("NIFTY25MAY17000PE", "1002", -75, 140.0, 140.0)])
+        self.server = LiveFeedServer(StateReader(name), port=0, poll_interval=0.01, heartbeat=0.05)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        
+        deadline = time.monotonic() + 5
+        while not self.server.feed.snapshot()["positions"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+    
+    def test_stream(self):
+        """Test that a client gets the snapshot, then only the row whose price ticked."""
+        response = requests.get(self.server.events_url, stream=True, timeout=5)
+        self.addCleanup(response.close)
+        self.assertEqual(response.headers["Content-Type"], "text/event-stream")
+        lines = response.iter_lines(decode_unicode=True)
+        
+        name, _, snapshot = read_event(lines)
+        self.assertEqual(name, "snapshot")
+        self.assertEqual(len(snapshot["positions"]), 2)
+        
+        self.publisher.update_price("1002", 130.0)
+        name, sequence, delta = read_event(lines)
+        self.assertEqual(name, "delta")
+        self.assertEqual(sequence, self.publisher._header["sequence"])
+        self.assertEqual([row["symbol"] for row in delta["upserts"]], ["NIFTY25MAY17000PE"])
+        self.assertEqual(delta["pnl"][1], 750.0)
+    
+    def test_page_and_state(self):
+        """Test that the client page and the current state are served."""
+        page = requests.get(self.server.url, timeout=5)
+        self.assertIn('new EventSource("/events")', page.text)
+        
+        self.assertEqual(requests.get(f"{self.server.url}missing", timeout=5).status_code, 404)
+        self.assertIn("positions", requests.get(f"{self.server.url}state", timeout=5).json())
+
+
+if __name__ == '__main__':
+    unittest.main()
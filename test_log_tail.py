@@ -0,0 +1,101 @@
+"""
+Test cases for the incremental log tail reader.
+"""
+
+import unittest
+import logging
+import os
+import random
+import tempfile
+from logging.handlers import RotatingFileHandler
+
+from src.utils.log_tail import LogTailReader, read_last_lines
+
+
+class TestLogTail(unittest.TestCase):
+    """Test cases for reading the last lines of log files."""
+    
+    def setUp(self):
+        """Set up a log file in a temporary directory."""
+        log_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(log_dir.cleanup)
+        self.path = os.path.join(log_dir.name, "trading_app.log")
+        self.reader = LogTailReader(block_size=16)
+    
+    def write(self, text: str, mode: str = "a") -> None:
+        """Write text to the log file."""
+        with open(self.path, mode) as f:
+            f.write(text)
+    
+    def readlines(self, max_lines: int) -> list:
+        """Read the last lines the way the dashboard used to."""
+        with open(self.path, "r") as f:
+            return f.readlines()[-max_lines:]
+    
+    def test_matches_readlines(self):
+        """Test that backwards seeking returns the same lines as readlines()."""
+        rng = random.Random(7)
+        for case in range(30):
+            lines = [f"{case} INFO " + "x" * rng.randint(0, 40) + "\n" for _ in range(rng.randint(0, 60))]
+            self.write("".join(lines) + ("partial" if case % 3 == 0 else ""), "w")
+            for max_lines in (1, 5, 100):
+                self.assertEqual(LogTailReader(block_size=16).tail(self.path, max_lines), self.readlines(max_lines))
+        
+        self.assertEqual(self.reader.tail(os.path.join(os.path.dirname(self.path), "missing.log")), [])
+    
+    def test_backwards_read_stops_early(self):
+        """Test that only the blocks holding the requested lines are read."""
+        self.write("".join(f"line {i}\n" for i in range(10000)), "w")
+        
+        with open(self.path, "rb") as f:
+            lines, offset, partial, from_start = read_last_lines(f, os.path.getsize(self.path), 3, 64)
+            self.assertGreaterEqual(f.tell(), os.path.getsize(self.path) - 64)
+        
+        self.assertEqual(lines, [b"line 9997\n", b"line 9998\n", b"line 9999\n"])
+        self.assertEqual(offset, os.path.getsize(self.path))
+        self.assertFalse(from_start)
+    
+    def test_incremental_reads(self):
+        """Test that refreshes read appended lines, including a line completed later."""
+        self.write("".join(f"line {i}\n" for i in range(50)))
+        self.assertEqual(self.reader.tail(self.path, 3), ["line 47\n", "line 48\n", "line 49\n"])
+        
+        self.write("line 50\nline 5")
+        self.assertEqual(self.reader.tail(self.path, 3), ["line 49\n", "line 50\n", "line 5"])
+        self.write("1\n")
+        self.assertEqual(self.reader.tail(self.path, 3), ["line 49\n", "line 50\n", "line 51\n"])
+        self.assertEqual(self.reader.offsets()[self.path], os.path.getsize(self.path))
+        
+        self.assertEqual(self.reader.tail(self.path, 10), self.readlines(10))
+    
+    def test_rotating_file_handler(self):
+        """Test that lines written around a rollover are all returned in order."""
+        handler = RotatingFileHandler(self.path, maxBytes=400, backupCount=3)
+        self.addCleanup(handler.close)
+        log = logging.getLogger("test_log_tail")
+        log.propagate = False
+        log.addHandler(handler)
+        self.addCleanup(log.removeHandler, handler)
+        
+        written = []
+        for i in range(60):
+            log.warning(f"message {i}")
+            written.append(f"message {i}\n")
+            if i % 7 == 0:
+                self.assertEqual(self.reader.tail(self.path, 20), written[-20:])
+        
+        self.assertTrue(os.path.exists(f"{self.path}.1"))
+        self.assertEqual(self.reader.tail(self.path, 20), written[-20:])
+    
+    def test_truncated_file(self):
+        """Test that a file truncated in place is read from its start."""
+        self.write("".join(f"old {i}\n" for i in range(20)))
+        self.reader.tail(self.path, 5)
+        
+        self.write("new 0\nnew 1\n", "w")
+        
+        self.assertEqual(self.reader.tail(self.path, 5)[-2:], ["new 0\n", "new 1\n"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Test cases for the streaming market data client.
+"""
+
+import unittest
+import threading
+import time
+
+from src.api.mstock_api import MStockAPI
+from src.api.market_stream import MarketDataStream, LastPriceCache, Tick, parse_binary_ticks
+from tests.test_utils import MockTickServer, encode_tick_frame
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    """Poll a condition until it holds or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class TestLastPriceCache(unittest.TestCase):
+    """Test cases for the last-price cache."""
+    
+    def test_update_and_listeners(self):
+        """Test that updates are stored and listeners are notified."""
+        cache = LastPriceCache()
+        received = []
+        cache.add_listener(received.append)
+        cache.add_listener(lambda tick: 1 / 0)  # A failing listener must not break delivery
+        
+        cache.update(Tick("12345", 155.5, time.monotonic()))
+        
+        self.assertEqual(cache.get_price("12345"), 155.5)
+        self.assertEqual(cache.snapshot(), {"12345": 155.5})
+        self.assertEqual([tick.instrument_token for tick in received], ["12345"])
+        self.assertIsNone(cache.get_price("99999"))
+    
+    def test_stale_price(self):
+        """Test that max_age filters out stale ticks."""
+        cache = LastPriceCache()
+        cache.update(Tick("12345", 155.5, time.monotonic() - 10))
+        
+        self.assertIsNone(cache.get_price("12345", max_age=5))
+        self.assertEqual(cache.get_price("12345", max_age=30), 155.5)
+
+
+class TestBinaryTicks(unittest.TestCase):
+    """Test cases for binary tick frame parsing."""
+    
+    def test_parse_frame(self):
+        """Test parsing a frame with several packets."""
+        ticks = parse_binary_ticks(encode_tick_frame([(12345, 155.5), (12346, 75.25)]))
+        
+        self.assertEqual([(t.instrument_token, t.last_price) for t in ticks], [("12345", 155.5), ("12346", 75.25)])
+    
+    def test_heartbeat(self):
+        """Test that one-byte heartbeats produce no ticks."""
+        self.assertEqual(parse_binary_ticks(b"\x00"), [])
+
+
+class TestMarketDataStream(unittest.TestCase):
+    """Test cases for the websocket tick client."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.server = MockTickServer()
+        self.server.start()
+        self.api = MStockAPI("test_api_key", "test_username", "test_password")
+        self.api.access_token = "test_access_token"
+        self.stream = MarketDataStream(self.api, url=self.server.url)
+    
+    def tearDown(self):
+        """Stop the stream and the server."""
+        self.stream.stop()
+        self.api.close()
+        self.server.stop()
+    
+    def test_subscribe_and_receive_ticks(self):
+        """Test that subscriptions are sent and ticks reach the cache."""
+        self.stream.subscribe(["12345"])
+        self.stream.start()
+        self.assertTrue(self.stream.wait_until_connected(5))
+        self.stream.subscribe(["12346"])
+        self.assertTrue(wait_for(lambda: self.server.subscribed_tokens() == {12345, 12346}))
+        
+        delivered = threading.Event()
+        self.stream.cache.add_listener(lambda tick: delivered.set())
+        self.server.push([(12345, 160.0)])
+        
+        self.assertTrue(delivered.wait(5))
+        self.assertEqual(self.stream.cache.get_price("12345"), 160.0)
+        self.assertEqual(self.server.query, {"API_KEY": "test_api_key", "ACCESS_TOKEN": "test_access_token"})
+        self.assertIn({"a": "mode", "v": ["ltp", [12345]]}, self.server.messages)
+    
+    def test_set_subscriptions_sends_difference(self):
+        """Test that replacing the subscription set unsubscribes dropped tokens."""
+        self.stream.subscribe(["12345", "12346"])
+        self.stream.start()
+        self.assertTrue(self.stream.wait_until_connected(5))
+        
+        self.stream.set_subscriptions(["12346", "12347"])
+        
+        self.assertTrue(wait_for(lambda: self.server.subscribed_tokens() == {12346, 12347}))
+        self.assertEqual(self.stream.subscriptions, frozenset({"12346", "12347"}))
+    
+    def test_reconnect_resubscribes(self):
+        """Test that a dropped connection reconnects and resends the subscription set."""
+        self.stream.subscribe(["12345"])
+        self.stream.start()
+        self.assertTrue(self.stream.wait_until_connected(5))
+        self.assertTrue(wait_for(lambda: len(self.server.messages) == 2))
+        
+        self.server.messages.clear()
+        self.server.drop_connections()
+        
+        self.assertTrue(wait_for(lambda: self.server.connections == 2))
+        self.assertTrue(wait_for(lambda: self.server.subscribed_tokens() == {12345}))
+        self.assertEqual(self.stream.reconnect_count, 1)
+    
+    def test_non_object_text_skipped(self):
+        """Test that JSON text messages that are not objects are logged and skipped."""
+        with self.assertLogs("src.api.market_stream", level="WARNING") as logs:
+            for data in ('[1, 2]', '5', '"text"', 'null'):
+                self.stream._handle_text(data)
+        
+        self.assertEqual(len(logs.output), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Test cases for the option chain models and lookups.
+"""
+
+import unittest
+import dataclasses
+import datetime
+
+import numpy as np
+
+from src.models.option_chain import OptionChain, StrikeIndex
+from src.models.columnar_chain import ColumnarOptionChain, ContractView
+from src.utils.option_utils import find_strike_prices_for_strangle, find_option_contract
+from tests.test_utils import mock_api_response
+
+
+class TestStrikeIndex(unittest.TestCase):
+    """Test cases for the sorted strike index."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        response = mock_api_response("GetOptionChain").json()["data"]
+        self.chain = OptionChain.from_api_response(response, datetime.datetime(2025, 5, 29, 15, 30))
+        self.puts = self.chain.strike_index("PE")
+    
+    def test_index_sorted(self):
+        """Test that the index is sorted even when the chain is not."""
+        self.assertEqual(self.puts.strikes, [16500, 17000, 17500, 18000])
+    
+    def test_exact_lookup(self):
+        """Test exact strike lookup."""
+        self.assertEqual(self.puts.find(17000).symbol, "NIFTY25MAY17000PE")
+        self.assertEqual(self.puts.find(17000.004).symbol, "NIFTY25MAY17000PE")
+        self.assertIsNone(self.puts.find(17100))
+    
+    def test_nearest_lookup(self):
+        """Test nearest strike lookup including ties and out-of-range prices."""
+        self.assertEqual(self.puts.nearest(17240).strike_price, 17000)
+        self.assertEqual(self.puts.nearest(17260).strike_price, 17500)
+        self.assertEqual(self.puts.nearest(17250).strike_price, 17000)
+        self.assertEqual(self.puts.nearest(100).strike_price, 16500)
+        self.assertEqual(self.puts.nearest(99999).strike_price, 18000)
+        self.assertIsNone(StrikeIndex([]).nearest(17000))
+    
+    def test_directional_lookups(self):
+        """Test ceil, floor, above and below lookups."""
+        self.assertEqual(self.puts.ceil(17000).strike_price, 17000)
+        self.assertEqual(self.puts.ceil(17001).strike_price, 17500)
+        self.assertIsNone(self.puts.ceil(18001))
+        self.assertEqual(self.puts.floor(17499).strike_price, 17000)
+        self.assertIsNone(self.puts.floor(16499))
+        self.assertEqual(self.puts.above(17000).strike_price, 17500)
+        self.assertEqual(self.puts.below(17000).strike_price, 16500)
+    
+    def test_index_rebuilt_when_contracts_change(self):
+        """Test that replacing the contract list rebuilds the index."""
+        self.chain.puts = self.chain.puts[:2]
+        
+        self.assertEqual(self.chain.strike_index("PE").strikes, [17500, 18000])
+        
+        # A list of the same length replacing a freed one
+        replacement = [dataclasses.replace(contract, strike_price=contract.strike_price + 1000)
+                       for contract in self.chain.puts]
+        self.chain.puts = []
+        self.chain.puts = replacement
+        self.assertEqual(self.chain.strike_index("PE").strikes, [18500, 19000])
+    
+    def test_find_option_contract_nearest(self):
+        """Test that hedge strikes snap to the nearest listed strike."""
+        self.assertIsNone(find_option_contract(self.chain, 18530.5, "CE"))
+        self.assertEqual(find_option_contract(self.chain, 18530.5, "CE", nearest=True).strike_price, 18500)
+
+
+class TestColumnarOptionChain(unittest.TestCase):
+    """Test cases for the columnar option chain."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.response = mock_api_response("GetOptionChain").json()["data"]
+        self.expiry = datetime.datetime(2025, 5, 29, 15, 30)
+        self.chain = OptionChain.from_api_response(self.response, self.expiry)
+        self.columnar = ColumnarOptionChain.from_api_response(self.response, self.expiry)
+    
+    def test_columns_sorted_by_strike(self):
+        """Test that both sides are sorted ascending by strike."""
+        np.testing.assert_array_equal(self.columnar.calls.strike, [18000, 18500, 19000, 19500])
+        np.testing.assert_array_equal(self.columnar.puts.strike, [16500, 17000, 17500, 18000])
+        self.assertEqual(self.columnar.puts.symbols[0], "NIFTY25MAY16500PE")
+        self.assertEqual(self.columnar.puts.last_price[0], 15.25)
+    
+    def test_contract_view_round_trip(self):
+        """Test that contract views materialize to the same contracts as the list model."""
+        rebuilt = self.columnar.to_option_chain()
+        
+        self.assertEqual(sorted(rebuilt.calls, key=lambda c: c.strike_price),
+                         sorted(self.chain.calls, key=lambda c: c.strike_price))
+        self.assertEqual(sorted(rebuilt.puts, key=lambda c: c.strike_price),
+                         sorted(self.chain.puts, key=lambda c: c.strike_price))
+    
+    def test_from_option_chain(self):
+        """Test building columns from an existing OptionChain."""
+        columnar = ColumnarOptionChain.from_option_chain(self.chain)
+        
+        np.testing.assert_array_equal(columnar.calls.open_interest, self.columnar.calls.open_interest)
+        np.testing.assert_array_equal(columnar.puts.ask_price, self.columnar.puts.ask_price)
+    
+    def test_strangle_strikes_match_list_model(self):
+        """Test that vectorized strike selection matches the list implementation."""
+        for distance in (0, 250, 500, 1000, 5000):
+            self.assertEqual(
+                find_strike_prices_for_strangle(self.columnar, distance),
+                find_strike_prices_for_strangle(self.chain, distance)
+            )
+    
+    def test_find_option_contract(self):
+        """Test finding a contract returns a view onto the arrays."""
+        view = find_option_contract(self.columnar, 19000, "CE")
+        
+        self.assertIsInstance(view, ContractView)
+        self.assertEqual(view.symbol, "NIFTY25MAY19000CE")
+        self.assertEqual(view.last_price, 55.75)
+        self.assertEqual(view.option_type, "CE")
+        self.assertIsNone(find_option_contract(self.columnar, 19100, "CE"))
+        self.assertEqual(find_option_contract(self.columnar, 19100, "CE", nearest=True).strike_price, 19000)
+        self.assertEqual(find_option_contract(self.columnar, 19300, "CE", nearest=True).strike_price, 19500)
+    
+    def test_screen(self):
+        """Test vectorized liquidity screening."""
+        mask = self.columnar.puts.screen(min_open_interest=16000, max_spread=0.6)
+        screened = self.columnar.puts.take(mask)
+        
+        self.assertEqual(list(screened.symbols), ["NIFTY25MAY16500PE", "NIFTY25MAY17000PE"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+"""
+Test cases for the event-driven position monitor.
+"""
+
+import unittest
+import threading
+import time
+
+from src.api.market_stream import LastPriceCache, Tick
+from src.strategies.position_monitor import PositionMonitor, TriggerRule
+from src.strategies.short_strangle import ShortStrangleStrategy
+from tests.test_utils import MockMStockAPI
+
+
+def tick(token: str, price: float) -> Tick:
+    """Create a tick received now."""
+    return Tick(token, price, time.monotonic())
+
+
+class TestPositionMonitor(unittest.TestCase):
+    """Test cases for PositionMonitor."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.mock_api = MockMStockAPI()
+        self.mock_api.set_mock_positions([
+            {
+                "tradingsymbol": "NIFTY25MAY18000CE",
+                "exchange": "NFO",
+                "instrument_token": "12345",
+                "product": "NRML",
+                "quantity": -75,
+                "average_price": 100.0,
+                "last_price": 100.0,
+                "pnl": 0.0
+            }
+        ])
+        self.strategy = ShortStrangleStrategy(self.mock_api)
+        self.strategy.initialize()
+        self.cache = LastPriceCache()
+        self.actions = []
+        self.rules = [TriggerRule("stop_loss", lambda position, price: price <= 75.0, self.record_action)]
+    
+    def record_action(self, position) -> bool:
+        """Record an action and report success."""
+        self.actions.append((position.symbol, position.last_price))
+        return True
+    
+    def test_triggers_on_price_change(self):
+        """Test that a rule fires on the tick that crosses its threshold."""
+        monitor = PositionMonitor(self.strategy, self.cache, self.rules, debounce=0, cooldown=60)
+        monitor.refresh()
+        
+        monitor.on_tick(tick("12345", 90.0))
+        self.assertEqual(self.strategy.active_positions["NIFTY25MAY18000CE"].last_price, 90.0)
+        monitor.on_tick(tick("12345", 74.0))
+        
+        self.assertEqual(self.actions, [("NIFTY25MAY18000CE", 74.0)])
+        self.assertEqual(monitor.stats.evaluations, 2)
+        self.assertIsNotNone(monitor.stats.latency_percentile(99))
+    
+    def test_cooldown_prevents_double_fire(self):
+        """Test that repeated ticks within the cooldown do not fire again."""
+        monitor = PositionMonitor(self.strategy, self.cache, self.rules, debounce=0, cooldown=60)
+        monitor.refresh()
+        
+        for price in (74.0, 73.0, 72.0):
+            monitor.on_tick(tick("12345", price))
+        
+        self.assertEqual(len(self.actions), 1)
+        self.assertEqual(monitor.stats.cooled_down, 2)
+    
+    def test_debounce_requires_condition_to_hold(self):
+        """Test that a brief dip is ignored and a sustained one fires."""
+        monitor = PositionMonitor(self.strategy, self.cache, self.rules, debounce=0.05, cooldown=0)
+        monitor.refresh()
+        
+        monitor.on_tick(tick("12345", 74.0))
+        monitor.on_tick(tick("12345", 80.0))
+        time.sleep(0.06)
+        monitor.on_tick(tick("12345", 74.0))
+        self.assertEqual(self.actions, [])
+        
+        time.sleep(0.06)
+        monitor.on_tick(tick("12345", 73.5))
+        self.assertEqual(self.actions, [("NIFTY25MAY18000CE", 73.5)])
+        self.assertEqual(monitor.stats.debounced, 2)
+    
+    def test_debounce_rechecked_without_ticks(self):
+        """Test that a started monitor fires a held condition when the debounce ends, with no further tick."""
+        done = threading.Event()
+        
+        def action(position):
+            self.actions.append(position.last_price)
+            done.set()
+            return True
+        
+        rules = [TriggerRule("stop_loss", lambda position, price: price <= 75.0, action)]
+        monitor = PositionMonitor(self.strategy, self.cache, rules, debounce=0.05, cooldown=60)
+        monitor.start()
+        self.cache.update(tick("12345", 74.0))
+        
+        self.assertTrue(done.wait(5))
+        monitor.stop()
+        self.assertEqual(self.actions, [74.0])
+        self.assertEqual(monitor.stats.ticks, 1)
+    
+    def test_resync_after_action(self):
+        """Test that positions are re-synced after an action, so a closed position is not acted on again."""
+        def close_position(position):
+            self.mock_api.set_mock_positions([])
+            return self.record_action(position)
+        
+        rules = [TriggerRule("stop_loss", lambda position, price: price <= 75.0, close_position)]
+        monitor = PositionMonitor(self.strategy, self.cache, rules, debounce=0, cooldown=0)
+        monitor.refresh()
+        
+        monitor.on_tick(tick("12345", 74.0))
+        monitor.on_tick(tick("12345", 73.0))
+        
+        self.assertEqual(len(self.actions), 1)
+        self.assertEqual(self.strategy.active_positions, {})
+        self.assertEqual(monitor.stats.ticks, 1)
+    
+    def test_ignores_unheld_instruments(self):
+        """Test that ticks for instruments without a position are skipped."""
+        monitor = PositionMonitor(self.strategy, self.cache, self.rules, debounce=0)
+        monitor.refresh()
+        
+        monitor.on_tick(tick("99999", 1.0))
+        
+        self.assertEqual(self.actions, [])
+        self.assertEqual(monitor.stats.ticks, 0)
+    
+    def test_started_monitor_acts_on_worker_thread(self):
+        """Test that a started monitor reacts to cache updates off the tick thread."""
+        threads = []
+        done = threading.Event()
+        
+        def action(position):
+            threads.append(threading.current_thread().name)
+            done.set()
+            return True
+        
+        rules = [TriggerRule("stop_loss", lambda position, price: price <= 75.0, action)]
+        monitor = PositionMonitor(self.strategy, self.cache, rules, debounce=0)
+        monitor.start()
+        self.cache.update(tick("12345", 70.0))
+        
+        self.assertTrue(done.wait(5))
+        monitor.stop()
+        self.assertTrue(threads[0].startswith("position-monitor"))
+    
+    def test_default_rules_place_stop_loss(self):
+        """Test that the default stop-loss rule places orders through the strategy."""
+        monitor = PositionMonitor(self.strategy, self.cache, debounce=0)
+        monitor.refresh()
+        
+        monitor.on_tick(tick("12345", 70.0))
+        
+        self.assertEqual(monitor.stats.triggers, 1)
+        self.assertGreaterEqual(len(self.strategy.active_orders), 1)
+    
+    def test_default_rules_skip_hedges(self):
+        """Test that the default rules do not act on long hedges."""
+        self.mock_api.set_mock_positions([
+            {
+                "tradingsymbol": "NIFTY25MAY19000CE",
+                "exchange": "NFO",
+                "instrument_token": "67890",
+                "product": "NRML",
+                "quantity": 75,
+                "average_price": 10.0,
+                "last_price": 10.0,
+                "pnl": 0.0
+            }
+        ])
+        self.strategy.update_positions()
+        monitor = PositionMonitor(self.strategy, self.cache, debounce=0, cooldown=0)
+        monitor.refresh()
+        
+        monitor.on_tick(tick("67890", 7.0))
+        monitor.on_tick(tick("67890", 25.0))
+        
+        self.assertEqual(monitor.stats.triggers, 0)
+        self.assertEqual(self.strategy.active_orders, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Test cases for the client-side rate limiter.
+"""
+
+import unittest
+import threading
+import time
+from unittest.mock import patch
+
+import requests
+
+from src.api.mstock_api import MStockAPI
+from src.api.rate_limiter import (TokenBucket, RateLimiter, Priority, request_priority, current_priority,
+                                  endpoint_class)
+from tests.test_utils import mock_api_response
+
+
+def wait_for_queue(bucket: TokenBucket, depth: int) -> None:
+    """Wait until a number of requests are queued on a bucket."""
+    deadline = time.monotonic() + 5
+    while bucket.to_dict()["queue_depth"] < depth and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for the priority token bucket."""
+    
+    def test_burst_then_rate(self):
+        """Test that a full bucket serves its burst at once and then refills at the rate."""
+        bucket = TokenBucket("test", rate=20, burst=3)
+        
+        started = time.perf_counter()
+        for _ in range(4):
+            self.assertTrue(bucket.acquire())
+        elapsed = time.perf_counter() - started
+        
+        self.assertGreaterEqual(elapsed, 0.04)
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(bucket.to_dict()["waited"], 1)
+    
+    def test_priority_lanes(self):
+        """Test that a critical request overtakes queued low priority requests."""
+        bucket = TokenBucket("test", rate=5, burst=1)
+        bucket.acquire()
+        served = []
+        
+        def request(priority: Priority) -> None:
+            bucket.acquire(priority)
+            served.append(priority)
+        
+        threads = [threading.Thread(target=request, args=(Priority.LOW,)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        wait_for_queue(bucket, 2)
+        threads.append(threading.Thread(target=request, args=(Priority.CRITICAL,)))
+        threads[-1].start()
+        for thread in threads:
+            thread.join(5)
+        
+        self.assertEqual(served, [Priority.CRITICAL, Priority.LOW, Priority.LOW])
+        self.assertEqual(bucket.to_dict()["max_queue_depth"], 3)
+    
+    def test_timeout(self):
+        """Test that a request gives up when no token arrives in time."""
+        bucket = TokenBucket("test", rate=0.5, burst=1)
+        bucket.acquire()
+        
+        self.assertFalse(bucket.acquire(timeout=0.05))
+        stats = bucket.to_dict()
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["queue_depth"], 0)
+    
+    def test_zero_rate(self):
+        """Test that a bucket without refill serves its burst and then times out."""
+        bucket = TokenBucket("test", rate=0, burst=1)
+        
+        self.assertTrue(bucket.acquire(timeout=0.05))
+        self.assertFalse(bucket.acquire(timeout=0.05))
+    
+    def test_throttle_pauses_refill(self):
+        """Test that a throttle response empties the bucket for the requested time."""
+        bucket = TokenBucket("test", rate=100, burst=5)
+        bucket.throttle(0.2)
+        
+        started = time.perf_counter()
+        bucket.acquire()
+        
+        self.assertGreaterEqual(time.perf_counter() - started, 0.2)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for rate limiting MStockAPI requests."""
+    
+    def setUp(self):
+        """Set up a client with its own tight limits."""
+        self.limiter = RateLimiter(buckets={"orders": {"rate": 1, "burst": 2}, "market_data": {"rate": 100, "burst": 5},
+                                            "portfolio": {"rate": 100, "burst": 5}},
+                                   global_limit={"rate": 100, "burst": 10}, max_wait=0.05)
+        self.api = MStockAPI("test_api_key", "test_username", "test_password", rate_limiter=self.limiter)
+    
+    def test_endpoint_classes(self):
+        """Test the mapping of API URLs to endpoint classes and default lanes."""
+        self.assertEqual(endpoint_class("https://api/openapi/typea/order/place"), "orders")
+        self.assertEqual(endpoint_class("https://api/openapi/typea/GetOptionChain/2/1/26000"), "market_data")
+        self.assertEqual(endpoint_class("https://api/openapi/typea/portfolio/positions"), "portfolio")
+        self.assertEqual(current_priority("market_data"), Priority.LOW)
+        with request_priority(Priority.CRITICAL):
+            self.assertEqual(current_priority("market_data"), Priority.CRITICAL)
+        self.assertEqual(current_priority("orders"), Priority.HIGH)
+    
+    @patch('requests.Session.post')
+    @patch('requests.Session.get')
+    def test_requests_counted_per_class(self, mock_get, mock_post):
+        """Test that each request takes a token from its class and the global bucket."""
+        mock_get.side_effect = lambda url, **kwargs: mock_api_response(url)
+        mock_post.side_effect = lambda url, **kwargs: mock_api_response(url)
+        
+        self.api.get_positions()
+        self.api.get_option_chain("1716470400", "26000")
+        self.api.place_order({"tradingsymbol": "NIFTY25MAY18000CE"})
+        
+        stats = self.api.get_rate_limit_stats()
+        self.assertEqual(stats["portfolio"]["acquired"], 1)
+        self.assertEqual(stats["market_data"]["acquired"], 1)
+        self.assertEqual(stats["orders"]["acquired"], 1)
+        self.assertEqual(stats["global"]["acquired"], 3)
+    
+    @patch('requests.Session.post')
+    def test_wait_limit_fails_request(self, mock_post):
+        """Test that a request that cannot get a token in time fails without being sent."""
+        mock_post.side_effect = lambda url, **kwargs: mock_api_response(url)
+        
+        results = [self.api.place_order({"tradingsymbol": "NIFTY25MAY18000CE"}) for _ in range(3)]
+        
+        self.assertIsNotNone(results[1])
+        self.assertIsNone(results[2])
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(self.api.get_rate_limit_stats()["orders"]["timeouts"], 1)
+    
+    def test_throttle_response(self):
+        """Test that a 429 response pauses the endpoint class for Retry-After seconds."""
+        response = requests.Response()
+        response.status_code = 429
+        response.url = "https://api/openapi/typea/order/place"
+        response.headers["Retry-After"] = "2"
+        
+        self.api._on_response(response)
+        
+        stats = self.limiter.stats()
+        self.assertEqual(stats["orders"]["throttles"], 1)
+        self.assertEqual(stats["portfolio"]["throttles"], 0)
+        self.assertFalse(self.limiter.buckets["orders"].acquire(timeout=0.05))
+
+    
+    def test_shared_session_not_modified(self):
+        """Test that clients sharing a session do not register hooks on it."""
+        session = requests.Session()
+        hooks = list(session.hooks["response"])
+        for _ in range(3):
+            MStockAPI("test_api_key", "test_username", "test_password", session=session, rate_limiter=self.limiter)
+        
+        self.assertEqual(session.hooks["response"], hooks)
+
+
+if __name__ == '__main__':
+    unittest.main()
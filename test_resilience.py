@@ -0,0 +1,293 @@
+"""
+Test cases for backoff, circuit breakers and budgeted retries.
+"""
+
+import unittest
+import asyncio
+import datetime
+import random
+import time
+from unittest.mock import patch
+
+import requests
+
+from src.api.mstock_api import MStockAPI
+from src.strategies.short_strangle import ShortStrangleStrategy
+from src.utils.resilience import (Backoff, CircuitBreaker, CircuitState, CircuitOpenError, BreakerRegistry,
+                                  TransientError, call_with_retry, async_call_with_retry, endpoint_name)
+from tests.test_utils import MockMStockAPI, MockResponse, mock_api_response
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self):
+        """Start at zero."""
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        """Get the current time."""
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for the circuit breaker state machine."""
+    
+    def setUp(self):
+        """Set up a breaker on a fake clock."""
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker("test", failure_threshold=3, recovery_timeout=10, clock=self.clock)
+    
+    def test_opens_after_consecutive_failures(self):
+        """Test that only consecutive failures open the breaker."""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+        
+        self.breaker.record_failure()
+        
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.breaker.to_dict()["rejected_calls"], 1)
+    
+    def test_half_open_trial(self):
+        """Test that one trial call is allowed after the recovery timeout."""
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10
+        
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())
+        
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        
+        self.clock.now = 20
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+        self.assertEqual(self.breaker.to_dict()["times_opened"], 2)
+
+
+class TestRetry(unittest.TestCase):
+    """Test cases for budgeted retries."""
+    
+    def setUp(self):
+        """Set up a deterministic backoff and recorded sleeps."""
+        self.backoff = Backoff(base=0.1, cap=0.4, rng=random.Random(1))
+        self.sleeps = []
+    
+    def flaky(self, failures: int, error: Exception = None):
+        """Build an attempt function that fails a number of times before succeeding."""
+        calls = []
+        
+        def attempt(remaining: float) -> str:
+            calls.append(remaining)
+            if len(calls) <= failures:
+                raise error or ConnectionError("down")
+            return "ok"
+        return attempt, calls
+    
+    def test_backoff_bounds(self):
+        """Test that jittered delays stay below the capped exponential ceiling."""
+        delays = [[self.backoff.delay(retry) for _ in range(200)] for retry in range(4)]
+        
+        for retry, values in enumerate(delays):
+            self.assertTrue(all(0 <= value <= min(0.4, 0.1 * 2 ** retry) for value in values))
+        self.assertGreater(len(set(delays[0])), 100)
+    
+    def test_retries_until_success(self):
+        """Test that failed attempts are retried and the breaker sees the outcome."""
+        attempt, calls = self.flaky(2)
+        breaker = CircuitBreaker("test", failure_threshold=5)
+        
+        result = call_with_retry(attempt, breaker, max_attempts=3, backoff=self.backoff, budget=5,
+                                 sleep=self.sleeps.append)
+        
+        self.assertEqual(result, "ok")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertEqual(breaker.to_dict()["consecutive_failures"], 0)
+    
+    def test_budget_limits_retries(self):
+        """Test that no retry is made when its delay would exceed the budget."""
+        attempt, calls = self.flaky(5)
+        
+        with self.assertRaises(ConnectionError):
+            call_with_retry(attempt, max_attempts=5, backoff=Backoff(base=1.0, cap=1.0, rng=random.Random(3)),
+                            budget=0.05, sleep=self.sleeps.append)
+        
+        self.assertEqual(len(calls), 1)
+        self.assertLessEqual(calls[0], 0.05)
+    
+    def test_transient_result_and_no_retry(self):
+        """Test that the last transient result is returned and non-idempotent calls run once."""
+        attempt, calls = self.flaky(5, TransientError("HTTP 503", "last response"))
+        
+        result = call_with_retry(attempt, retry=False, backoff=self.backoff, sleep=self.sleeps.append)
+        
+        self.assertEqual(result, "last response")
+        self.assertEqual(len(calls), 1)
+    
+    def test_open_breaker_fails_fast(self):
+        """Test that an open breaker refuses calls without attempting them."""
+        attempt, calls = self.flaky(0)
+        breaker = CircuitBreaker("test", failure_threshold=1)
+        breaker.record_failure()
+        
+        with self.assertRaises(CircuitOpenError):
+            call_with_retry(attempt, breaker)
+        self.assertEqual(calls, [])
+    
+    def test_one_failure_per_call(self):
+        """Test that a call counts as one breaker failure however many attempts it made."""
+        breaker = CircuitBreaker("test", failure_threshold=5)
+        
+        for _ in range(2):
+            attempt, calls = self.flaky(5)
+            with self.assertRaises(ConnectionError):
+                call_with_retry(attempt, breaker, max_attempts=3, backoff=self.backoff, budget=5,
+                                sleep=self.sleeps.append)
+            self.assertEqual(len(calls), 3)
+        
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        self.assertEqual(breaker.to_dict()["consecutive_failures"], 2)
+    
+    def test_passthrough_releases_trial_slot(self):
+        """Test that a half-open trial ended by a passthrough error frees its slot."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=10, half_open_max_calls=1, clock=clock)
+        breaker.record_failure()
+        clock.now = 10
+        attempt, calls = self.flaky(1, KeyError("bad payload"))
+        
+        with self.assertRaises(KeyError):
+            call_with_retry(attempt, breaker, passthrough=(KeyError,), sleep=self.sleeps.append)
+        
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        self.assertEqual(call_with_retry(attempt, breaker, sleep=self.sleeps.append), "ok")
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+    
+    def test_async_cancel_releases_trial_slot(self):
+        """Test that a cancelled half-open trial frees its slot."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=10, half_open_max_calls=1, clock=clock)
+        breaker.record_failure()
+        clock.now = 10
+        
+        async def slow(remaining: float) -> str:
+            await asyncio.sleep(1)
+            return "late"
+        
+        async def cancel_trial():
+            task = asyncio.ensure_future(async_call_with_retry(slow, breaker, budget=5))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+        
+        asyncio.run(cancel_trial())
+        
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+    
+    def test_async_retry(self):
+        """Test that the async variant retries and cancels attempts at the budget."""
+        failures = []
+        
+        async def attempt(remaining: float) -> str:
+            if len(failures) < 1:
+                failures.append(remaining)
+                raise ConnectionError("down")
+            return "ok"
+        
+        async def slow(remaining: float) -> str:
+            await asyncio.sleep(1)
+            return "late"
+        
+        self.assertEqual(asyncio.run(async_call_with_retry(attempt, backoff=self.backoff, budget=5)), "ok")
+        started = time.perf_counter()
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(async_call_with_retry(slow, max_attempts=1, budget=0.05))
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+
+class TestClientResilience(unittest.TestCase):
+    """Test cases for retries and breakers in MStockAPI."""
+    
+    def setUp(self):
+        """Set up a client with a low failure threshold."""
+        self.api = MStockAPI("test_api_key", "test_username", "test_password",
+                             breakers=BreakerRegistry(failure_threshold=3, recovery_timeout=60))
+    
+    def test_endpoint_names(self):
+        """Test that path parameters are stripped from endpoint names."""
+        self.assertEqual(endpoint_name("https://api.mstock.trade/openapi/typea/GetOptionChain/2/1716470400/26000"),
+                         "GetOptionChain")
+        self.assertEqual(endpoint_name("/openapi/typea/order/place"), "order/place")
+        self.assertEqual(endpoint_name("http://127.0.0.1:8765/openapi/typea/getoptionchainmaster/2"),
+                         "getoptionchainmaster")
+    
+    @patch('src.utils.resilience.time.sleep')
+    @patch('requests.Session.get')
+    def test_server_errors_retried(self, mock_get, mock_sleep):
+        """Test that a read recovers from a 503 and a connection error."""
+        responses = [MockResponse({"status": "error"}, 503), requests.exceptions.ConnectionError("reset"),
+                     mock_api_response("portfolio/positions")]
+        mock_get.side_effect = responses
+        
+        positions = self.api.get_positions()
+        
+        self.assertEqual(len(positions), 2)
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(self.api.get_breaker_states()["portfolio/positions"]["state"], "CLOSED")
+    
+    @patch('requests.Session.post')
+    def test_orders_not_retried(self, mock_post):
+        """Test that a failed order is not sent again."""
+        mock_post.return_value = MockResponse({"status": "error", "message": "down"}, 503)
+        
+        self.assertIsNone(self.api.place_order({"tradingsymbol": "NIFTY25MAY18000CE"}))
+        self.assertEqual(mock_post.call_count, 1)
+    
+    @patch('src.utils.resilience.time.sleep')
+    @patch('requests.Session.get')
+    def test_breaker_opens_and_fails_fast(self, mock_get, mock_sleep):
+        """Test that a failing endpoint stops being called while other endpoints still work."""
+        mock_get.side_effect = lambda url, **kwargs: (MockResponse({"status": "error"}, 502) if "GetOptionChain" in url
+                                                      else mock_api_response(url))
+        
+        for _ in range(3):
+            self.assertIsNone(self.api.get_option_chain("1716470400", "26000"))
+        calls = mock_get.call_count
+        self.assertIsNone(self.api.get_option_chain("1716470400", "26000"))
+        
+        self.assertEqual(mock_get.call_count, calls)
+        self.assertFalse(self.api.endpoint_available("GetOptionChain"))
+        self.assertTrue(self.api.endpoint_available("portfolio/positions"))
+        self.assertIsNotNone(self.api.get_positions())
+    
+    def test_strategy_uses_cached_chain(self):
+        """Test that the strategy falls back to its last chain while the chain endpoint is failing."""
+        api = MockMStockAPI()
+        api.breakers = BreakerRegistry(failure_threshold=1)
+        api.set_mock_option_chain_master(mock_api_response("getoptionchainmaster").json()["data"])
+        api.set_mock_option_chain(mock_api_response("GetOptionChain").json()["data"])
+        strategy = ShortStrangleStrategy(api)
+        strategy.snapshot_writer = None
+        expiry_date = datetime.datetime.fromtimestamp(1716470400).date()
+        chain = strategy.get_option_chain_for_expiry(expiry_date)
+        
+        api.set_mock_option_chain(None)
+        self.assertIsNone(strategy.get_option_chain_for_expiry(expiry_date))
+        api.breakers.get("GetOptionChain").record_failure()
+        
+        self.assertIs(strategy.get_option_chain_for_expiry(expiry_date), chain)
+
+
+if __name__ == '__main__':
+    unittest.main()
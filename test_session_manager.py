@@ -0,0 +1,213 @@
+"""
+Test cases for persisted sessions and OTP providers.
+"""
+
+import unittest
+import datetime
+import os
+import stat
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+from src.api.broker_simulator import BrokerSimulatorServer
+from src.api.mstock_api import MStockAPI
+from src.api.session_manager import (SessionManager, TokenCipher, OTPProvider, CallbackOTPProvider,
+                                     EnvironmentOTPProvider, FileOTPProvider, TOTPProvider, create_otp_provider,
+                                     get_session_manager)
+
+
+class TestSessionManager(unittest.TestCase):
+    """Test cases for storing access tokens."""
+    
+    def setUp(self):
+        """Set up a session file in a temporary directory."""
+        session_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(session_dir.cleanup)
+        self.directory = session_dir.name
+        self.path = os.path.join(session_dir.name, "data", "session")
+        self.now = datetime.datetime(2025, 6, 2, 9, 0)
+        self.cipher = TokenCipher(b"k" * 32)
+        self.manager = SessionManager(self.path, "06:00", clock=lambda: self.now, cipher=self.cipher)
+    
+    def test_save_and_load(self):
+        """Test that a saved token is restored for the same account and API URL only."""
+        self.assertTrue(self.manager.save("https://api", "key", "user", "token"))
+        
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+        restored = SessionManager(self.path, "06:00", clock=lambda: self.now, cipher=self.cipher)
+        self.assertEqual(restored.load("https://api", "key", "user"), "token")
+        self.assertIsNone(restored.load("http://127.0.0.1:8765", "key", "user"))
+        self.assertIsNone(restored.load("https://api", "other_key", "user"))
+        self.assertIsNone(restored.load("https://api", "key", "other_user"))
+    
+    def test_expiry(self):
+        """Test that tokens expire at the next expiry time after login."""
+        self.assertEqual(self.manager.expiry_after(self.now), datetime.datetime(2025, 6, 3, 6, 0))
+        self.assertEqual(self.manager.expiry_after(datetime.datetime(2025, 6, 2, 1, 30)),
+                         datetime.datetime(2025, 6, 2, 6, 0))
+        
+        self.manager.save("https://api", "key", "user", "token")
+        self.now = datetime.datetime(2025, 6, 3, 5, 59)
+        self.assertEqual(self.manager.load("https://api", "key", "user"), "token")
+        self.now = datetime.datetime(2025, 6, 3, 6, 0)
+        self.assertIsNone(self.manager.load("https://api", "key", "user"))
+    
+    def test_clear_and_corrupt_file(self):
+        """Test clearing a token and reading a damaged file."""
+        self.manager.save("https://api", "key", "user", "token")
+        self.manager.save("https://api", "key", "other_user", "other_token")
+        
+        self.assertTrue(self.manager.clear("https://api", "user"))
+        self.assertIsNone(self.manager.load("https://api", "key", "user"))
+        self.assertEqual(self.manager.load("https://api", "key", "other_user"), "other_token")
+        
+        with open(self.path, "w") as f:
+            f.write('{"user@https://api": {"access')
+        self.assertIsNone(self.manager.load("https://api", "key", "user"))
+    
+    def test_token_encrypted(self):
+        """Test that the token is not stored in plain text and needs the same key to be read."""
+        self.manager.save("https://api", "key", "user", "secret-access-token")
+        
+        with open(self.path, "r") as f:
+            self.assertNotIn("secret-access-token", f.read())
+        other_key = SessionManager(self.path, "06:00", clock=lambda: self.now, cipher=TokenCipher(b"x" * 32))
+        self.assertIsNone(other_key.load("https://api", "key", "user"))
+        
+        encrypted = self.cipher.encrypt("secret-access-token")
+        tampered = encrypted[:30] + ("A" if encrypted[30] != "A" else "B") + encrypted[31:]
+        self.assertEqual(self.cipher.decrypt(encrypted), "secret-access-token")
+        self.assertIsNone(self.cipher.decrypt(tampered))
+    
+    def test_key_from_config(self):
+        """Test that the key comes from the environment secret, or else a random key file created once."""
+        key_file = os.path.join(self.directory, "keys", "session.key")
+        
+        first = TokenCipher.from_config("TEST_SESSION_KEY_UNSET", key_file)
+        second = TokenCipher.from_config("TEST_SESSION_KEY_UNSET", key_file)
+        self.assertEqual(second.decrypt(first.encrypt("token")), "token")
+        self.assertEqual(stat.S_IMODE(os.stat(key_file).st_mode), 0o600)
+        
+        with patch.dict(os.environ, {"TEST_SESSION_KEY": "passphrase"}):
+            from_secret = TokenCipher.from_config("TEST_SESSION_KEY", key_file)
+        self.assertEqual(TokenCipher.from_secret("passphrase").decrypt(from_secret.encrypt("token")), "token")
+        self.assertIsNone(first.decrypt(from_secret.encrypt("token")))
+
+
+class TestOTPProviders(unittest.TestCase):
+    """Test cases for OTP providers."""
+    
+    def test_totp(self):
+        """Test the RFC 6238 SHA-1 test vector."""
+        provider = TOTPProvider("GEZDGNBVGY3TQOJQGEZDGNBVGY3TQOJQ", digits=8, clock=lambda: 59)
+        
+        self.assertEqual(provider.get_otp("user"), "94287082")
+        self.assertIsNone(TOTPProvider("not base32!", clock=lambda: 59).get_otp("user"))
+    
+    def test_environment(self):
+        """Test reading the OTP from the environment."""
+        with patch.dict(os.environ, {"TEST_OTP": "654321"}):
+            self.assertEqual(EnvironmentOTPProvider("TEST_OTP").get_otp("user"), "654321")
+        self.assertIsNone(EnvironmentOTPProvider("TEST_OTP_UNSET").get_otp("user"))
+    
+    def test_file(self):
+        """Test waiting for the OTP file and consuming it."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "otp.txt")
+            
+            def deliver():
+                time.sleep(0.05)
+                with open(path, "w") as f:
+                    f.write("123456\n")
+            writer = threading.Thread(target=deliver)
+            writer.start()
+            otp = FileOTPProvider(path, timeout=5, poll_interval=0.01).get_otp("user")
+            writer.join()
+            
+            self.assertEqual(otp, "123456")
+            self.assertFalse(os.path.exists(path))
+            self.assertIsNone(FileOTPProvider(path, timeout=0.05, poll_interval=0.01).get_otp("user"))
+    
+    def test_create_by_name(self):
+        """Test creating providers from their configured names."""
+        self.assertIsInstance(create_otp_provider("env"), EnvironmentOTPProvider)
+        self.assertIsInstance(create_otp_provider("file"), FileOTPProvider)
+        self.assertIsInstance(create_otp_provider("totp"), TOTPProvider)
+    
+    def test_provider_must_implement_get_otp(self):
+        """Test that a provider without get_otp cannot be created."""
+        with self.assertRaises(TypeError):
+            OTPProvider()
+    
+    def test_persisted_by_default(self):
+        """Test that tokens are persisted unless disabled."""
+        self.assertIsInstance(get_session_manager(), SessionManager)
+        with patch.dict('src.api.session_manager.SESSION_CONFIG', {"persist": False}):
+            self.assertIsNone(get_session_manager())
+
+
+class TestSessionRestore(unittest.TestCase):
+    """Test cases for restoring sessions in MStockAPI."""
+    
+    def setUp(self):
+        """Start a simulator that checks tokens and set up a session file."""
+        self.server = BrokerSimulatorServer.from_price_path(datetime.date(2025, 6, 2), 1, 15, port=0, speed=0,
+                                                            require_auth=True)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        session_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(session_dir.cleanup)
+        self.manager = SessionManager(os.path.join(session_dir.name, "session"), cipher=TokenCipher(os.urandom(32)))
+        self.otp_requests = []
+    
+    def client(self) -> MStockAPI:
+        """Create a client, as after a process restart."""
+        api = MStockAPI("test_api_key", "test_username", "test_password", session_manager=self.manager,
+                        otp_provider=CallbackOTPProvider(lambda username: self.otp_requests.append(username) or "1234"))
+        api.base_url = self.server.base_url
+        self.addCleanup(api.close)
+        return api
+    
+    def test_restart_reuses_token(self):
+        """Test that a new client restores the saved token without an OTP."""
+        first = self.client()
+        self.assertTrue(first.login())
+        self.assertEqual(self.otp_requests, ["test_username"])
+        
+        second = self.client()
+        self.assertTrue(second.login())
+        
+        self.assertEqual(self.otp_requests, ["test_username"])
+        self.assertEqual(second.access_token, first.access_token)
+        self.assertEqual(second.get_positions(), [])
+    
+    def test_rejected_token_logs_in_again(self):
+        """Test that a token the broker does not accept is replaced by a fresh login."""
+        self.manager.save(self.server.base_url, "test_api_key", "test_username", "revoked")
+        api = self.client()
+        
+        self.assertTrue(api.login())
+        
+        self.assertEqual(len(self.otp_requests), 1)
+        self.assertNotEqual(api.access_token, "revoked")
+        self.assertEqual(self.manager.load(self.server.base_url, "test_api_key", "test_username"), api.access_token)
+    
+    def test_missing_otp_fails(self):
+        """Test that login fails without an OTP and the session can be cleared."""
+        api = self.client()
+        api.otp_provider = CallbackOTPProvider(lambda username: None)
+        
+        self.assertFalse(api.login())
+        self.assertIsNone(api.access_token)
+        
+        api.otp_provider = CallbackOTPProvider(lambda username: "1234")
+        self.assertTrue(api.login())
+        api.clear_session()
+        self.assertNotIn("Authorization", api.headers)
+        self.assertIsNone(self.manager.load(self.server.base_url, "test_api_key", "test_username"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Test cases for the columnar option chain snapshot store.
+"""
+
+import unittest
+import datetime
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+
+from src.models.chain_series import ChainSeries
+from src.models.snapshot_store import SnapshotStore, SnapshotWriter
+from src.strategies.short_strangle import ShortStrangleStrategy
+from tests.test_utils import MockMStockAPI, mock_api_response
+
+
+EXPIRY = datetime.datetime(2025, 5, 29, 15, 30)
+DAY = datetime.datetime(2025, 5, 26, 9, 15)
+
+
+def snapshot(price_shift: float = 0.0) -> dict:
+    """Mock option chain response with all prices shifted."""
+    response = mock_api_response("GetOptionChain").json()["data"]
+    for side in ("ce", "pe"):
+        for record in response["contractModel"][side]:
+            for key in ("lastPrice", "bidPrice", "askPrice"):
+                record[key] += price_shift
+    return response
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """Test cases for SnapshotStore."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.root = tempfile.mkdtemp()
+        self.store = SnapshotStore(self.root)
+        self.times = [DAY + datetime.timedelta(minutes=minute) for minute in range(3)]
+        self.responses = [snapshot(shift) for shift in (0.0, 1.0, 2.0)]
+        for time, response in zip(self.times, self.responses):
+            self.assertTrue(self.store.append(response, EXPIRY, time))
+    
+    def tearDown(self):
+        """Remove the store."""
+        shutil.rmtree(self.root)
+    
+    def test_memory_mapped_columns(self):
+        """Test that columns and the timestamp index are read back memory-mapped."""
+        day = self.store.open_day("NIFTY", EXPIRY.date(), DAY.date())
+        contracts = len(self.responses[0]["contractModel"]["ce"]) + len(self.responses[0]["contractModel"]["pe"])
+        
+        self.assertEqual(len(day), 3)
+        self.assertIsInstance(day.last_price, np.memmap)
+        self.assertEqual(len(day.strike), 3 * contracts)
+        self.assertEqual(day.timestamps.tolist(), [int(time.timestamp()) for time in self.times])
+        self.assertAlmostEqual(day.last_price[day.rows(1)][0], self.responses[1]["contractModel"]["ce"][0]["lastPrice"])
+    
+    def test_api_response_round_trip(self):
+        """Test that a stored snapshot rebuilds the fields it keeps."""
+        day = self.store.open_day("NIFTY", EXPIRY.date(), DAY.date())
+        rebuilt = day.to_api_response(2)["contractModel"]
+        original = self.responses[2]["contractModel"]
+        
+        self.assertEqual(rebuilt["spotPrice"], original["spotPrice"])
+        for side in ("ce", "pe"):
+            for stored, record in zip(rebuilt[side], original[side]):
+                for key in ("sym", "token", "strikePrice", "lastPrice", "bidPrice", "askPrice", "openInterest"):
+                    self.assertEqual(stored[key], record[key])
+    
+    def test_load_series_matches_snapshots(self):
+        """Test that stored days load as the series built from the responses."""
+        self.store.append(snapshot(3.0), EXPIRY, DAY + datetime.timedelta(days=1))
+        expected = ChainSeries.from_snapshots(
+            [(int(time.timestamp()), response) for time, response in zip(self.times, self.responses)]
+            + [(int((DAY + datetime.timedelta(days=1)).timestamp()), snapshot(3.0))], EXPIRY)
+        
+        series = self.store.load_series("NIFTY", EXPIRY.date())
+        
+        self.assertEqual(self.store.days("NIFTY", EXPIRY.date()), [DAY.date(), DAY.date() + datetime.timedelta(days=1)])
+        self.assertEqual(self.store.expiries("NIFTY"), [EXPIRY.date()])
+        np.testing.assert_array_equal(series.timestamps, expected.timestamps)
+        np.testing.assert_array_equal(series.puts.bid_price, expected.puts.bid_price)
+        self.assertEqual(series.calls.symbols.tolist(), expected.calls.symbols.tolist())
+        self.assertEqual(len(self.store.load_series("NIFTY", EXPIRY.date(), start=DAY.date() + datetime.timedelta(days=1))), 1)
+    
+    def test_interrupted_append_ignored(self):
+        """Test that column rows written without an index record are invisible and overwritten."""
+        directory = self.store.day_directory("NIFTY", EXPIRY.date(), DAY.date())
+        with open(os.path.join(directory, "last_price.bin"), "ab") as f:
+            f.write(np.zeros(5).tobytes())
+        with open(os.path.join(directory, "index.bin"), "ab") as f:
+            f.write(b"\x01\x02")
+        
+        day = self.store.open_day("NIFTY", EXPIRY.date(), DAY.date())
+        self.assertEqual(len(day), 3)
+        self.assertEqual(len(day.last_price), len(day.strike))
+        
+        self.assertTrue(self.store.append(snapshot(9.0), EXPIRY, DAY + datetime.timedelta(minutes=3)))
+        day = self.store.open_day("NIFTY", EXPIRY.date(), DAY.date())
+        self.assertEqual(len(day), 4)
+        self.assertEqual(day.to_api_response(3)["contractModel"]["ce"][0]["lastPrice"],
+                         snapshot(9.0)["contractModel"]["ce"][0]["lastPrice"])
+    
+    def test_strategy_appends_fetched_chains(self):
+        """Test that chains fetched by the strategy are captured."""
+        api = MockMStockAPI()
+        api.set_mock_option_chain_master(mock_api_response("getoptionchainmaster").json()["data"])
+        api.set_mock_option_chain(snapshot())
+        strategy = ShortStrangleStrategy(api, clock=lambda: DAY)
+        strategy.snapshot_writer = SnapshotWriter(self.store)
+        expiry_date = datetime.datetime.fromtimestamp(1795876200).date()
+        
+        self.assertIsNotNone(strategy.get_option_chain_for_expiry(expiry_date))
+        strategy.stop()
+        
+        self.assertEqual(len(self.store.open_day("NIFTY", expiry_date, DAY.date())), 1)
+    
+    def test_writer_appends_in_background(self):
+        """Test that queued snapshots are written off the caller's thread and dropped when the queue is full."""
+        threads = []
+        release = threading.Event()
+        
+        class BlockingStore:
+            def append(self, response, expiry_date, timestamp):
+                threads.append(threading.current_thread().name)
+                return release.wait(5)
+        
+        writer = SnapshotWriter(BlockingStore(), queue_size=1)
+        results = [writer.append(snapshot(), EXPIRY, DAY) for _ in range(3)]
+        release.set()
+        writer.close()
+        
+        self.assertTrue(results[0])
+        self.assertFalse(results[-1])
+        self.assertGreaterEqual(writer.dropped, 1)
+        self.assertEqual(set(threads), {"snapshot-writer"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Test cases for the shared-memory state bus.
+"""
+
+import unittest
+import datetime
+import multiprocessing
+import os
+import uuid
+
+from src.models.position import Position
+from src.utils.state_bus import StatePublisher, StateReader
+
+
+def make_position(symbol: str, token: str, quantity: int, average_price: float, last_price: float) -> Position:
+    """Build a position with its P&L at the last price."""
+    return Position(symbol=symbol, exchange="NFO", instrument_token=token, quantity=quantity,
+                    average_price=average_price, last_price=last_price,
+                    pnl=(last_price - average_price) * quantity, product="NRML")
+
+
+def publish_loop(name: str, writes: int) -> None:
+    """Publish positions whose quantities all equal the write number."""
+    publisher = StatePublisher(name, capacity=8)
+    for i in range(writes):
+        publisher.set_positions([make_position(f"NIFTY{row}", str(row), i, 100.0, 101.0) for row in range(1 + i % 8)])
+    publisher.close()
+
+
+class TestStateBus(unittest.TestCase):
+    """Test cases for publishing and reading live state."""
+    
+    def setUp(self):
+        """Set up a publisher and reader on a segment unique to the test."""
+        self.name = f"test_state_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        self.reader = StateReader(self.name, timeout=0.05)
+        self.addCleanup(self.reader.close)
+    
+    def publisher(self, capacity: int = 4) -> StatePublisher:
+        """Create a publisher removed after the test."""
+        publisher = StatePublisher(self.name, capacity=capacity)
+        self.addCleanup(publisher.close, True)
+        return publisher
+    
+    def test_publish_and_read(self):
+        """Test that positions, status and P&L are read as published."""
+        self.assertIsNone(self.reader.snapshot())
+        
+        publisher = self.publisher()
+        start_time = datetime.datetime(2025, 5, 19, 9, 15)
+        publisher.set_status(True, start_time)
+        publisher.set_positions([make_position("NIFTY25MAY18000CE", "1001", -75, 150.25, 155.5),
+                                 make_position("NIFTY25MAY17000PE", "1002", -75, 145.75, 140.25)])
+        
+        state = self.reader.snapshot()
+        self.assertTrue(state.running)
+        self.assertEqual(state.start_time, start_time)
+        self.assertEqual([position["symbol"] for position in state.positions],
+                         ["NIFTY25MAY18000CE", "NIFTY25MAY17000PE"])
+        self.assertAlmostEqual(state.pnl, -393.75 + 412.5)
+        self.assertEqual(state.sequence % 2, 0)
+        self.assertEqual(state.sequence, self.reader.sequence())
+        
+        publisher.set_status(False)
+        stopped = self.reader.snapshot()
+        self.assertFalse(stopped.running)
+        self.assertIsNone(stopped.start_time)
+        self.assertEqual(len(stopped.positions), 2)
+        self.assertGreater(stopped.sequence, state.sequence)
+    
+    def test_update_price(self):
+        """Test that a tick updates the position's price and P&L and the total."""
+        publisher = self.publisher()
+        publisher.set_positions([make_position("NIFTY25MAY18000CE", "1001", -75, 150.0, 150.0),
+                                 make_position("NIFTY25MAY17000PE", "1002", -75, 140.0, 140.0)])
+        
+        self.assertTrue(publisher.update_price("1002", 130.0))
+        self.assertFalse(publisher.update_price("9999", 1.0))
+        
+        state = self.reader.snapshot()
+        self.assertEqual(state.positions[1]["last_price"], 130.0)
+        self.assertEqual(state.positions[1]["pnl"], 750.0)
+        self.assertEqual(state.pnl, 750.0)
+    
+    def test_capacity(self):
+        """Test that positions beyond the capacity are not published."""
+        publisher = self.publisher(capacity=2)
+        publisher.set_positions([make_position(f"NIFTY{i}", str(i), -75, 100.0, 100.0) for i in range(3)])
+        
+        self.assertEqual(len(self.reader.snapshot().positions), 2)
+    
+    def test_interrupted_write(self):
+        """Test that a write left unfinished is never read, and a new publisher recovers."""
+        publisher = StatePublisher(self.name, capacity=4)
+        publisher.set_positions([make_position("NIFTY25MAY18000CE", "1001", -75, 150.0, 150.0)])
+        publisher._header["sequence"] = int(publisher._header["sequence"]) + 1
+        publisher.close()
+        
+        self.assertIsNone(self.reader.snapshot())
+        
+        self.publisher()
+        state = self.reader.snapshot()
+        self.assertEqual(state.positions, [])
+        self.assertEqual(state.sequence % 2, 0)
+    
+    def test_consistent_snapshots_across_processes(self):
+        """Test that snapshots taken while another process writes are never torn."""
+        self.publisher(capacity=8)
+        writer = multiprocessing.Process(target=publish_loop, args=(self.name, 20000))
+        writer.start()
+        self.addCleanup(writer.join)
+        
+        snapshots = 0
+        while writer.is_alive() or snapshots == 0:
+            state = self.reader.snapshot()
+            if state is None or not state.positions:
+                continue
+            snapshots += 1
+            quantities = {position["quantity"] for position in state.positions}
+            self.assertEqual(len(quantities), 1)
+            self.assertEqual(len(state.positions), 1 + quantities.pop() % 8)
+        
+        writer.join()
+        self.assertEqual(writer.exitcode, 0)
+        self.assertGreater(snapshots, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
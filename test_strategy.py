@@ -6,7 +6,9 @@ import unittest
 from unittest.mock import patch, MagicMock
 import datetime
 import json
+import time
 
+from src.api.market_stream import MarketDataStream, Tick
 from src.strategies.short_strangle import ShortStrangleStrategy
 from src.models.order import Order, OrderType, OrderSide, OrderStatus, ProductType, OptionType
 from src.models.position import Position
@@ -51,7 +53,10 @@ class TestShortStrangleStrategy(unittest.TestCase):
                 "1": 1795876200,
                 "2": 1716470400,
                 "3": 1717075200,
-                "4": 1717680000
+                "4": 1717680000,
+                "5": int(datetime.datetime(2025, 5, 25, 15, 30).timestamp()),
+                "6": int(datetime.datetime(2025, 6, 1, 15, 30).timestamp()),
+                "7": int(datetime.datetime(2025, 6, 15, 15, 30).timestamp())
             },
             "OPTIDX": [
                 "NIFTY,26000,2,3,4"
@@ -119,7 +124,7 @@ class TestShortStrangleStrategy(unittest.TestCase):
         # Mock expiry dates
         sell_expiry = datetime.date(2025, 6, 15)
         hedge_expiry = datetime.date(2025, 5, 25)
-        mock_get_expiry.side_effect = lambda weeks, from_date=None: sell_expiry if weeks == 4 else hedge_expiry
+        mock_get_expiry.side_effect = lambda weeks, from_date=None, as_of=None: sell_expiry if weeks == 4 else hedge_expiry
         
         # Initialize strategy
         self.strategy.initialize()
@@ -131,6 +136,19 @@ class TestShortStrangleStrategy(unittest.TestCase):
         # Check that orders were placed
         self.assertEqual(len(self.strategy.placed_orders_cache), 4)  # 2 sell orders + 2 hedge orders
     
+    @patch('src.strategies.short_strangle.find_strike_prices_by_delta', return_value=(19500, 16500))
+    @patch('src.strategies.short_strangle.get_expiry_date_n_weeks_ahead')
+    def test_delta_strikes_use_clock(self, mock_get_expiry, mock_by_delta):
+        """Test that delta strike selection values the chain at the strategy's clock."""
+        now = datetime.datetime(2024, 5, 20, 10, 0)
+        strategy = ShortStrangleStrategy(self.mock_api, clock=lambda: now)
+        mock_get_expiry.return_value = datetime.datetime.fromtimestamp(1716470400).date()
+        
+        with patch.dict('src.strategies.short_strangle.STRATEGY_CONFIG', {"strike_selection": "delta"}):
+            strategy.place_short_strangle(200000)
+        
+        self.assertEqual(mock_by_delta.call_args.kwargs["as_of"], now)
+    
     def test_handle_stop_loss(self):
         """Test handling stop loss."""
         # Initialize strategy
@@ -183,22 +201,21 @@ class TestShortStrangleStrategy(unittest.TestCase):
         self.assertGreaterEqual(len(self.strategy.active_orders), 1)
     
     @patch('src.strategies.short_strangle.get_expiry_date_n_weeks_ahead')
-    @patch('src.strategies.short_strangle.datetime')
-    def test_rollover_hedge(self, mock_datetime, mock_get_expiry):
+    def test_rollover_hedge(self, mock_get_expiry):
         """Test rolling over hedge positions."""
-        # Mock today as expiry day
+        # Run on expiry day
         today = datetime.date(2025, 5, 25)
-        mock_datetime.date.today.return_value = today
+        self.strategy = ShortStrangleStrategy(self.mock_api, clock=lambda: datetime.datetime(2025, 5, 25, 10, 0))
         
         # Mock expiry dates
         this_week_expiry = today
         next_week_expiry = datetime.date(2025, 6, 1)
-        mock_get_expiry.side_effect = lambda weeks, from_date=None: this_week_expiry if weeks == 1 else next_week_expiry
+        mock_get_expiry.side_effect = lambda weeks, from_date=None, as_of=None: this_week_expiry if weeks == 1 else next_week_expiry
         
-        # Add hedge positions to mock API
+        # Add hedge positions expiring today to mock API
         self.mock_api.set_mock_positions([
             {
-                "tradingsymbol": "NIFTY25MAY18500CE",
+                "tradingsymbol": "NIFTY2552518500CE",
                 "exchange": "NFO",
                 "instrument_token": "12347",
                 "product": "NRML",
@@ -210,7 +227,7 @@ class TestShortStrangleStrategy(unittest.TestCase):
                 "expiry_date": datetime.datetime(2025, 5, 25, 15, 30)
             },
             {
-                "tradingsymbol": "NIFTY25MAY17500PE",
+                "tradingsymbol": "NIFTY2552517500PE",
                 "exchange": "NFO",
                 "instrument_token": "12348",
                 "product": "NRML",
@@ -226,13 +243,80 @@ class TestShortStrangleStrategy(unittest.TestCase):
         # Initialize strategy
         self.strategy.initialize()
         
-        # Test rolling over hedge positions
-        result = self.strategy.rollover_hedge()
+        # Test rolling over hedge positions, giving each order its own ID
+        responses = [{"order_id": f"test_order_{i}", "status": "OPEN"} for i in range(4)]
+        with patch.object(self.mock_api, 'place_order', side_effect=responses):
+            result = self.strategy.rollover_hedge()
         
         self.assertTrue(result)
         # Check that rollover orders were placed
         self.assertGreaterEqual(len(self.strategy.active_orders), 2)
     
+    def test_option_chain_master_cached(self):
+        """Test that the option chain master is fetched once for repeated lookups."""
+        expiry_date = datetime.datetime.fromtimestamp(1716470400).date()
+        
+        with patch.object(self.mock_api, 'get_option_chain_master',
+                          wraps=self.mock_api.get_option_chain_master) as mock_master:
+            first_chain = self.strategy.get_option_chain_for_expiry(expiry_date)
+            second_chain = self.strategy.get_option_chain_for_expiry(expiry_date)
+        
+        self.assertIsNotNone(first_chain)
+        self.assertIsNotNone(second_chain)
+        self.assertEqual(mock_master.call_count, 1)
+    
+    def test_option_chain_master_invalidate(self):
+        """Test that invalidating the master cache forces a refetch."""
+        expiry_date = datetime.datetime.fromtimestamp(1716470400).date()
+        
+        with patch.object(self.mock_api, 'get_option_chain_master',
+                          wraps=self.mock_api.get_option_chain_master) as mock_master:
+            self.strategy.get_option_chain_for_expiry(expiry_date)
+            self.strategy.master_cache.invalidate()
+            self.strategy.get_option_chain_for_expiry(expiry_date)
+        
+        self.assertEqual(mock_master.call_count, 2)
+    
+    def test_option_chain_master_unknown_expiry(self):
+        """Test that an unlisted expiry date returns no option chain."""
+        self.assertIsNone(self.strategy.get_option_chain_for_expiry(datetime.date(2030, 1, 1)))
+    
+    def test_streamed_prices(self):
+        """Test that positions are subscribed and priced from the tick stream."""
+        stream = MarketDataStream(self.mock_api)
+        self.strategy.initialize()
+        self.strategy.attach_market_stream(stream)
+        
+        self.assertEqual(stream.subscriptions, frozenset({"12345", "12346"}))
+        
+        stream.cache.update(Tick("12345", 170.0, time.monotonic()))
+        
+        self.assertEqual(self.strategy.refresh_position_prices(), 1)
+        self.assertEqual(self.strategy.active_positions["NIFTY25MAY18000CE"].last_price, 170.0)
+        self.assertEqual(self.strategy.active_positions["NIFTY25MAY17000PE"].last_price, 140.25)
+    
+    def test_update_positions(self):
+        """Test that positions are re-synced from the broker."""
+        self.strategy.initialize()
+        self.mock_api.set_mock_positions([{
+            "tradingsymbol": "NIFTY25MAY17000PE",
+            "exchange": "NFO",
+            "instrument_token": "12346",
+            "product": "NRML",
+            "quantity": -150,
+            "average_price": 145.75,
+            "last_price": 140.25,
+            "pnl": 825.0
+        }])
+        
+        self.assertTrue(self.strategy.update_positions())
+        self.assertEqual(list(self.strategy.active_positions), ["NIFTY25MAY17000PE"])
+        self.assertEqual(self.strategy.active_positions["NIFTY25MAY17000PE"].quantity, -150)
+        
+        self.mock_api.set_mock_positions(None)
+        self.assertFalse(self.strategy.update_positions())
+        self.assertEqual(len(self.strategy.active_positions), 1)
+    
     def test_negative_api_failure(self):
         """Test handling API failures."""
         # Set up API to return None for positions
@@ -263,7 +347,7 @@ class TestShortStrangleStrategy(unittest.TestCase):
             # Mock expiry dates
             sell_expiry = datetime.date(2025, 6, 15)
             hedge_expiry = datetime.date(2025, 5, 25)
-            mock_get_expiry.side_effect = lambda weeks, from_date=None: sell_expiry if weeks == 4 else hedge_expiry
+            mock_get_expiry.side_effect = lambda weeks, from_date=None, as_of=None: sell_expiry if weeks == 4 else hedge_expiry
             
             result = self.strategy.place_short_strangle(200000)
             
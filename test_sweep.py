@@ -0,0 +1,111 @@
+"""
+Test cases for the parallel parameter sweep runner.
+"""
+
+import unittest
+import datetime
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from src.models.snapshot_store import SnapshotStore
+from src.strategies.backtest import BacktestEngine
+from src.strategies.sweep import SweepRunner, parameter_grid, config_id
+from src.utils.price_path import generate_chain_series
+
+
+class TestStoredSeries(unittest.TestCase):
+    """Test cases for storing chain series in the snapshot store."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.directory = tempfile.mkdtemp()
+        self.series = generate_chain_series(datetime.date(2025, 6, 2), 3, interval_minutes=15)
+    
+    def tearDown(self):
+        """Remove saved data."""
+        shutil.rmtree(self.directory)
+    
+    def test_round_trip(self):
+        """Test that series loaded from the store equal the stored ones."""
+        store = SnapshotStore(self.directory)
+        for item in self.series:
+            self.assertTrue(store.save_series(item))
+        
+        loaded = store.load_all()
+        
+        self.assertEqual([item.expiry_date for item in loaded], [item.expiry_date for item in self.series])
+        np.testing.assert_array_equal(loaded[0].timestamps, self.series[0].timestamps)
+        np.testing.assert_array_equal(loaded[0].puts.ask_price, self.series[0].puts.ask_price)
+        self.assertEqual(loaded[0].to_api_response(5), self.series[0].to_api_response(5))
+        self.assertEqual(len(BacktestEngine.from_store(self.directory).series), len(self.series))
+
+
+class TestSweepRunner(unittest.TestCase):
+    """Test cases for SweepRunner."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Save a week of 15-minute snapshots."""
+        cls.directory = tempfile.mkdtemp()
+        cls.series = generate_chain_series(datetime.date(2025, 6, 2), 7, interval_minutes=15)
+        store = SnapshotStore(os.path.join(cls.directory, "data"))
+        for item in cls.series:
+            store.save_series(item)
+        cls.grid = parameter_grid({"strangle_distance": [500, 1000], "stop_loss_trigger": [0.25, 0.5]})
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove saved data."""
+        shutil.rmtree(cls.directory)
+    
+    def setUp(self):
+        """Start every test with an empty results table."""
+        self.results_path = os.path.join(self.directory, "results.csv")
+        if os.path.exists(self.results_path):
+            os.remove(self.results_path)
+        self.runner = SweepRunner(os.path.join(self.directory, "data"), self.results_path, max_workers=2)
+    
+    def test_parameter_grid(self):
+        """Test grid expansion and stable configuration identifiers."""
+        self.assertEqual(len(self.grid), 4)
+        self.assertEqual(self.grid[1], {"strangle_distance": 500, "stop_loss_trigger": 0.5})
+        self.assertEqual(config_id({"a": 1, "b": 2}), config_id({"b": 2, "a": 1}))
+    
+    def test_results_match_single_run(self):
+        """Test that every configuration is written once and matches an in-process backtest."""
+        self.assertEqual(self.runner.run(self.grid), 4)
+        
+        results = self.runner.results()
+        expected = BacktestEngine(self.series, strategy_overrides=self.grid[0]).run().summary()
+        row = results[results["config_id"] == config_id(self.grid[0])].iloc[0]
+        
+        self.assertEqual(len(results), 4)
+        self.assertEqual(set(results["error"]), {""})
+        self.assertAlmostEqual(row["final_equity"], expected["final_equity"])
+        self.assertEqual(row["fills"], expected["fills"])
+    
+    def test_resume(self):
+        """Test that a rerun skips finished configurations and drops a half-written row."""
+        self.runner.run(self.grid[:2])
+        with open(self.results_path, "a") as f:
+            f.write(config_id(self.grid[2]) + ",1000,0.2")  # Crash mid-row
+        
+        self.assertEqual(self.runner.run(self.grid), 2)
+        
+        results = self.runner.results()
+        self.assertEqual(sorted(results["config_id"]), sorted(config_id(params) for params in self.grid))
+        self.assertEqual(self.runner.run(self.grid), 0)
+    
+    def test_mismatched_columns(self):
+        """Test that a results table from a different grid is not appended to."""
+        self.runner.run(self.grid[:1])
+        
+        with self.assertRaises(ValueError):
+            self.runner.run([{"martingale_trigger": 3.0}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Test cases for the SQLite trading data store.
+"""
+
+import unittest
+import datetime
+import os
+import sqlite3
+import tempfile
+import threading
+
+import pandas as pd
+
+from src.models.trading_store import TradingStore
+
+
+def make_orders(start: datetime.datetime, count: int) -> pd.DataFrame:
+    """Build one order per hour starting at a time."""
+    return pd.DataFrame({
+        "order_id": [f"order{i}" for i in range(count)],
+        "symbol": ["NIFTY25MAY18000CE"] * count,
+        "side": ["SELL", "BUY"] * (count // 2) + ["SELL"] * (count % 2),
+        "quantity": [75] * count,
+        "price": [150.25 + i for i in range(count)],
+        "status": ["COMPLETE"] * count,
+        "timestamp": [start + datetime.timedelta(hours=i) for i in range(count)],
+    })
+
+
+class TestTradingStore(unittest.TestCase):
+    """Test cases for storing positions, orders and P&L."""
+    
+    def setUp(self):
+        """Set up a store in a temporary directory."""
+        store_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(store_dir.cleanup)
+        self.path = os.path.join(store_dir.name, "data", "trading.db")
+        self.store = TradingStore(self.path)
+        self.addCleanup(self.store.close)
+    
+    def test_wal_and_indexes(self):
+        """Test that the database runs in WAL mode with time indexes."""
+        connection = sqlite3.connect(self.path)
+        self.addCleanup(connection.close)
+        
+        self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        plan = connection.execute("EXPLAIN QUERY PLAN SELECT * FROM orders WHERE timestamp >= '2025'").fetchall()
+        self.assertIn("orders_timestamp", str(plan))
+        plan = connection.execute("EXPLAIN QUERY PLAN SELECT * FROM pnl_history WHERE date >= '2025'").fetchall()
+        self.assertIn("INDEX", str(plan))
+    
+    def test_positions(self):
+        """Test replacing, refreshing and closing positions."""
+        now = datetime.datetime(2025, 5, 19, 10, 0)
+        self.store.replace_positions(pd.DataFrame({
+            "symbol": ["NIFTY25MAY18000CE", "NIFTY25MAY17000PE"], "quantity": [-75, -75],
+            "average_price": [150.25, 145.75], "last_price": [155.5, 140.25], "pnl": [-393.75, 412.5],
+            "timestamp": [now, now]}))
+        self.store.replace_positions(pd.DataFrame({
+            "symbol": ["NIFTY25MAY17000PE"], "quantity": [-150], "average_price": [145.75], "last_price": [140.25],
+            "pnl": [825.0], "timestamp": [now]}))
+        
+        positions = self.store.get_positions()
+        self.assertEqual(dict(zip(positions["symbol"], positions["quantity"])),
+                         {"NIFTY25MAY18000CE": -75, "NIFTY25MAY17000PE": -150})
+        
+        self.store.close_positions(now + datetime.timedelta(hours=1))
+        positions = self.store.get_positions()
+        self.assertTrue((positions["quantity"] == 0).all())
+        self.assertTrue((positions["timestamp"] == now + datetime.timedelta(hours=1)).all())
+    
+    def test_orders_time_range(self):
+        """Test that appended orders are queried by time range and latest rows."""
+        start = datetime.datetime(2025, 5, 19, 9, 0)
+        self.assertEqual(self.store.append_orders(make_orders(start, 10)), 10)
+        self.store.append_orders(make_orders(start + datetime.timedelta(days=1), 2))
+        
+        day = self.store.get_orders(start, start + datetime.timedelta(hours=23))
+        self.assertEqual(len(day), 10)
+        self.assertEqual(day["timestamp"].iloc[0], start)
+        self.assertEqual(list(self.store.get_orders(start="2025-05-20")["order_id"]), ["order0", "order1"])
+        self.assertEqual(list(self.store.get_orders(limit=3)["price"]), [159.25, 150.25, 151.25])
+        self.assertEqual(self.store.count("orders"), 12)
+    
+    def test_pnl_append_only(self):
+        """Test that each day's P&L is recorded once and read by date range."""
+        history = pd.DataFrame({"date": pd.date_range("2025-05-01", periods=10),
+                                "daily_pnl": [100.0] * 10, "cumulative_pnl": [100.0 * (i + 1) for i in range(10)]})
+        self.assertEqual(self.store.append_pnl_history(history), 10)
+        
+        self.assertFalse(self.store.append_pnl(datetime.date(2025, 5, 10), 5.0, 5.0))
+        self.assertTrue(self.store.append_pnl(datetime.date(2025, 5, 11), -50.0, 950.0))
+        
+        self.assertEqual(self.store.last_pnl(), {"date": datetime.date(2025, 5, 11), "daily_pnl": -50.0,
+                                                 "cumulative_pnl": 950.0})
+        week = self.store.get_pnl_history(datetime.date(2025, 5, 5), datetime.date(2025, 5, 11))
+        self.assertEqual(len(week), 7)
+        self.assertEqual(week["date"].iloc[-1], pd.Timestamp("2025-05-11"))
+    
+    def test_versions(self):
+        """Test that a table's version changes only when the table is written."""
+        start = datetime.datetime(2025, 5, 19, 9, 0)
+        before = self.store.versions()
+        self.store.append_orders(make_orders(start, 3))
+        self.store.get_orders()
+        after = self.store.versions()
+        
+        self.assertNotEqual(after["orders"], before["orders"])
+        self.assertEqual(after["pnl_history"], before["pnl_history"])
+        
+        self.store.append_pnl(datetime.date(2025, 5, 19), 100.0, 100.0)
+        version = self.store.versions()["pnl_history"]
+        self.assertFalse(self.store.append_pnl(datetime.date(2025, 5, 19), 5.0, 5.0))
+        self.assertEqual(self.store.versions()["pnl_history"], version)
+        
+        # Writes by another process are seen too
+        connection = sqlite3.connect(self.path)
+        self.addCleanup(connection.close)
+        with connection:
+            connection.execute("DELETE FROM pnl_history")
+        self.assertNotEqual(self.store.versions()["pnl_history"], version)
+    
+    def test_concurrent_writers(self):
+        """Test appends from several threads, each on its own connection."""
+        def append(worker: int) -> None:
+            for batch in range(5):
+                self.store.append_orders(make_orders(datetime.datetime(2025, 5, 19 + worker, batch), 4))
+            self.store.close()
+        
+        threads = [threading.Thread(target=append, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(self.store.count("orders"), 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
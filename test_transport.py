@@ -0,0 +1,144 @@
+"""
+Test cases for the record and replay transport.
+"""
+
+import unittest
+import json
+import os
+import tempfile
+import time
+from urllib.parse import parse_qsl
+
+import requests
+
+from src.api.mstock_api import MStockAPI
+from src.api.transport import (TransportLog, ReplayAdapter, create_recording_session, create_replay_session,
+                               get_replay_stats, REDACTED_VALUE)
+from tests.test_utils import MockAPIServer
+from config.config import RESILIENCE_CONFIG
+
+
+class TestTransport(unittest.TestCase):
+    """Test cases for recording and replaying API traffic."""
+    
+    def setUp(self):
+        """Record a session against a local HTTP server."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.temp_dir.name, "transport.jsonl")
+        
+        server = MockAPIServer()
+        server.start()
+        try:
+            api = MStockAPI("test_api_key", "test_username", "test_password",
+                            session=create_recording_session(self.log_path))
+            api.base_url = server.base_url
+            self.recorded = self.calls(api)
+            api.close()
+        finally:
+            server.stop()
+    
+    def tearDown(self):
+        """Remove the log."""
+        self.temp_dir.cleanup()
+    
+    def calls(self, api: MStockAPI) -> list:
+        """Make a fixed sequence of API calls and return their results."""
+        return [
+            api.get_fund_summary(),
+            api.get_positions(),
+            api.place_order({"tradingsymbol": "NIFTY25MAY18000CE", "transaction_type": "SELL", "quantity": "75"}),
+            api.get_positions(),
+            api.cancel_order("123456789"),
+        ]
+    
+    def replay_api(self, latency_scale: float = 0.0) -> MStockAPI:
+        """Create a client answered from the recorded log."""
+        api = MStockAPI("test_api_key", "test_username", "test_password",
+                        session=create_replay_session(self.log_path, latency_scale))
+        api.base_url = "http://replay.invalid"
+        return api
+    
+    def test_log_records_exchanges(self):
+        """Test that every exchange is logged with its timing."""
+        records = TransportLog(self.log_path).records()
+        
+        self.assertEqual([record["method"] for record in records], ["GET", "GET", "POST", "GET", "POST"])
+        self.assertTrue(all(record["status"] == 200 and record["latency"] > 0 for record in records))
+        self.assertEqual(json.loads(records[0]["response"])["status"], "success")
+    
+    def test_replay_matches_recording(self):
+        """Test that replaying without a server gives the recorded results."""
+        api = self.replay_api()
+        
+        self.assertEqual(self.calls(api), self.recorded)
+        self.assertEqual(get_replay_stats(api.session), {"served": 5, "misses": 0, "remaining": 0})
+    
+    def test_unrecorded_request_fails(self):
+        """Test that a request missing from the log fails like a connection error."""
+        api = self.replay_api()
+        
+        self.assertIsNone(api.get_order_history())
+        self.assertIsNone(api.modify_order("123456789", {"price": "1"}))
+        # The read is retried, the order modification is not
+        self.assertEqual(get_replay_stats(api.session)["misses"], RESILIENCE_CONFIG["max_attempts"] + 1)
+    
+    def test_replay_speed(self):
+        """Test that replay waits for the recorded latency only when asked."""
+        records = TransportLog(self.log_path).records()
+        for record in records:
+            record["latency"] = 0.05
+        
+        fast = ReplayAdapter(records, latency_scale=0.0)
+        realtime = ReplayAdapter(records, latency_scale=1.0)
+        durations = []
+        for adapter in (fast, realtime):
+            session = requests.Session()
+            session.mount("http://", adapter)
+            started = time.perf_counter()
+            session.get("http://replay.invalid/openapi/typea/fund/summary")
+            durations.append(time.perf_counter() - started)
+        
+        self.assertLess(durations[0], 0.05)
+        self.assertGreaterEqual(durations[1], 0.05)
+    
+    def test_replay_paced_by_timestamps(self):
+        """Test that replayed requests keep the recorded spacing, scaled by the speed factor."""
+        records = TransportLog(self.log_path).records()
+        for index, record in enumerate(records):
+            record["ts"] = 1000.0 + index * 0.1
+            record["latency"] = 0.0
+        
+        for scale in (1.0, 0.5):
+            session = requests.Session()
+            session.mount("http://", ReplayAdapter(records, latency_scale=scale))
+            finished = []
+            for path in ("fund/summary", "portfolio/positions"):
+                session.get(f"http://replay.invalid/openapi/typea/{path}")
+                finished.append(time.perf_counter())
+            
+            spacing = finished[1] - finished[0]
+            self.assertGreaterEqual(spacing, 0.09 * scale)
+            self.assertLess(spacing, 0.1 * scale + 0.05)
+    
+    def test_secrets_redacted(self):
+        """Test that credentials and tokens are not written to the log."""
+        session = create_recording_session(self.log_path)
+        request = requests.Request("POST", "http://127.0.0.1:9/openapi/typea/connect/login",
+                                   data={"username": "test_username", "password": "secret"}).prepare()
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            session.send(request, timeout=1)
+        
+        with open(self.log_path) as f:
+            content = f.read()
+        record = TransportLog(self.log_path).records()[-1]
+        self.assertNotIn("secret", content)
+        self.assertEqual(dict(parse_qsl(record["body"]))["password"], REDACTED_VALUE)
+        self.assertEqual(record["error"], "ConnectionError")
+        
+        replayed = create_replay_session(self.log_path)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            replayed.send(request)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,12 +2,19 @@
 Test utilities for mocking API responses and testing the trading application.
 """
 
+import asyncio
 import json
 import os
+import struct
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock, patch
 from typing import Dict, Any, List, Optional, Callable
 
+import aiohttp
+from aiohttp import web
+
 from src.api.mstock_api import MStockAPI
 
 
@@ -44,7 +51,7 @@ def mock_api_response(url: str, headers: Dict[str, str] = None, data: Dict[str,
         url: API URL
         headers: Request headers
         data: Request data
-        
+    
     Returns:
         MockResponse object
     """
@@ -334,7 +341,7 @@ def mock_api_error_response(url: str, headers: Dict[str, str] = None, data: Dict
         url: API URL
         headers: Request headers
         data: Request data
-        
+    
     Returns:
         MockResponse object with error
     """
@@ -365,6 +372,8 @@ class MockMStockAPI(MStockAPI):
         }
         self.base_url = "https://api.mstock.trade"
         self.ws_url = "https://ws.mstock.trade"
+        self.rate_limiter = None
+        self.breakers = None
         
         # Mock responses
         self.mock_positions = []
@@ -372,7 +381,7 @@ class MockMStockAPI(MStockAPI):
         self.mock_option_chain = {}
         self.mock_fund_summary = {}
         self.mock_order_history = []
-        
+    
     def login(self) -> bool:
         """Mock login."""
         return True
@@ -428,3 +437,143 @@ class MockMStockAPI(MStockAPI):
     def set_mock_order_history(self, order_history: List[Dict[str, Any]]) -> None:
         """Set mock order history."""
         self.mock_order_history = order_history
+
+
+class MockAPIRequestHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 keep-alive handler serving mock_api_response payloads."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def _send_mock_response(self) -> None:
+        """Write the mock response for the requested path."""
+        length = int(self.headers.get("Content-Length", 0))
+        if length:
+            self.rfile.read(length)
+        
+        response = mock_api_response(self.path)
+        body = json.dumps(response.json()).encode()
+        self.send_response(response.status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        """Handle GET requests."""
+        self._send_mock_response()
+    
+    def do_POST(self):
+        """Handle POST requests."""
+        self._send_mock_response()
+    
+    def log_message(self, format, *args):
+        """Silence request logging."""
+        pass
+
+
+class MockAPIServer:
+    """Local HTTP server that answers mStock API paths with mock responses."""
+    
+    def __init__(self):
+        """Initialize the server on a free local port."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), MockAPIRequestHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+    
+    def start(self) -> None:
+        """Start serving requests in a background thread."""
+        self.thread.start()
+    
+    def stop(self) -> None:
+        """Stop the server and close its socket."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def encode_tick_frame(ticks: List[tuple]) -> bytes:
+    """Encode (token, last price) pairs as a binary LTP tick frame."""
+    frame = struct.pack(">H", len(ticks))
+    for token, last_price in ticks:
+        frame += struct.pack(">Hii", 8, int(token), int(round(last_price * 100)))
+    return frame
+
+
+class MockTickServer:
+    """Local websocket server that records subscriptions and pushes binary ticks."""
+    
+    def __init__(self):
+        """Initialize the server state."""
+        self.messages = []
+        self.connections = 0
+        self.query = None
+        self.sockets = set()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.runner = None
+        self.url = None
+    
+    async def _handle(self, request):
+        """Accept a websocket and record the messages it sends."""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        self.query = dict(request.query)
+        self.sockets.add(ws)
+        try:
+            async for message in ws:
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    self.messages.append(json.loads(message.data))
+        finally:
+            self.sockets.discard(ws)
+        return ws
+    
+    async def _start(self):
+        """Start the aiohttp site on a free local port."""
+        app = web.Application()
+        app.router.add_get("/", self._handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/"
+    
+    def _call(self, coroutine, timeout: float = 5):
+        """Run a coroutine on the server loop and wait for it."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+    
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        self.thread.start()
+        self._call(self._start())
+    
+    def stop(self) -> None:
+        """Stop the server and its event loop."""
+        self._call(self.runner.cleanup())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+        self.loop.close()
+    
+    def push(self, ticks: List[tuple]) -> None:
+        """Send a tick frame to every connected client."""
+        async def send():
+            for ws in list(self.sockets):
+                await ws.send_bytes(encode_tick_frame(ticks))
+        self._call(send())
+    
+    def drop_connections(self) -> None:
+        """Close every client connection from the server side."""
+        async def close():
+            for ws in list(self.sockets):
+                await ws.close()
+        self._call(close())
+    
+    def subscribed_tokens(self) -> set:
+        """Tokens currently subscribed according to the recorded messages."""
+        tokens = set()
+        for message in self.messages:
+            if message["a"] == "subscribe":
+                tokens.update(message["v"])
+            elif message["a"] == "unsubscribe":
+                tokens.difference_update(message["v"])
+        return tokens
@@ -0,0 +1,301 @@
+"""
+Embedded SQLite store for positions, orders and P&L history.
+Tables are indexed by time and orders and P&L are append-only, so reads of
+a time range and writes of new rows cost the same however long the history.
+"""
+
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+DATE_FORMAT = "%Y-%m-%d"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+    symbol TEXT PRIMARY KEY,
+    quantity INTEGER NOT NULL,
+    average_price REAL,
+    last_price REAL,
+    pnl REAL,
+    timestamp TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    side TEXT,
+    quantity INTEGER,
+    price REAL,
+    status TEXT,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_timestamp ON orders (timestamp);
+CREATE INDEX IF NOT EXISTS orders_order_id ON orders (order_id);
+CREATE TABLE IF NOT EXISTS pnl_history (
+    date TEXT PRIMARY KEY,
+    daily_pnl REAL NOT NULL,
+    cumulative_pnl REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+"""
+
+# Table -> (columns, column holding the row time, its stored format)
+TABLES = {
+    "positions": (("symbol", "quantity", "average_price", "last_price", "pnl", "timestamp"),
+                  "timestamp", TIMESTAMP_FORMAT),
+    "orders": (("order_id", "symbol", "side", "quantity", "price", "status", "timestamp"),
+               "timestamp", TIMESTAMP_FORMAT),
+    "pnl_history": (("date", "daily_pnl", "cumulative_pnl"), "date", DATE_FORMAT),
+}
+
+# Triggers counting the writes to each table, so readers can tell whether it changed
+VERSION_SCHEMA = "".join(
+    f"INSERT OR IGNORE INTO versions (name, version) VALUES ('{table}', 0);\n"
+    + "".join(f"CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_version AFTER {event} ON {table} "
+              f"BEGIN UPDATE versions SET version = version + 1 WHERE name = '{table}'; END;\n"
+              for event in ("INSERT", "UPDATE", "DELETE"))
+    for table in TABLES)
+
+TimeBound = Optional[Union[str, datetime.date, datetime.datetime, pd.Timestamp]]
+
+
+def _format_time(value: TimeBound, time_format: str) -> Optional[str]:
+    """Format a time the way it is stored, so text comparison orders it correctly."""
+    if value is None:
+        return None
+    return pd.Timestamp(value).strftime(time_format)
+
+
+class TradingStore:
+    """
+    SQLite database in WAL mode holding the dashboard's trading data.
+    
+    Positions are the current book, replaced per symbol. Orders and daily
+    P&L are only ever inserted, and both are indexed by time for range
+    queries. WAL lets the dashboard read while the trading app writes. Each
+    thread gets its own connection. Triggers keep a version per table, so a
+    reader can cache query results until the table is written again.
+    """
+    
+    def __init__(self, path: str, timeout: float = 5.0):
+        """
+        Open or create the store.
+        
+        Args:
+            path: Database file
+            timeout: Seconds to wait for a lock held by another writer
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            connection.executescript(SCHEMA + VERSION_SCHEMA)
+    
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints, safe against corruption
+            self._local.connection = connection
+        return connection
+    
+    def close(self) -> None:
+        """
+        Close the calling thread's connection.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+    
+    def _rows(self, table: str, frame: pd.DataFrame) -> List[tuple]:
+        columns, time_column, time_format = TABLES[table]
+        frame = frame.reindex(columns=list(columns)).astype(object)
+        frame[time_column] = pd.to_datetime(frame[time_column]).dt.strftime(time_format)
+        frame = frame.where(pd.notna(frame), None)
+        return list(frame.itertuples(index=False, name=None))
+    
+    def _insert(self, table: str, frame: pd.DataFrame, verb: str = "INSERT") -> int:
+        columns = TABLES[table][0]
+        rows = self._rows(table, frame)
+        sql = f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        with self._connection() as connection:
+            cursor = connection.executemany(sql, rows)
+        return cursor.rowcount
+    
+    def _query(self, table: str, start: TimeBound = None, end: TimeBound = None,
+               limit: int = None) -> pd.DataFrame:
+        columns, time_column, time_format = TABLES[table]
+        conditions, params = [], []
+        if start is not None:
+            conditions.append(f"{time_column} >= ?")
+            params.append(_format_time(start, time_format))
+        if end is not None:
+            conditions.append(f"{time_column} <= ?")
+            params.append(_format_time(end, time_format))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        order = {"orders": "id", "positions": "rowid"}.get(table, time_column)
+        sql = f"SELECT {', '.join(columns)} FROM {table}{where} ORDER BY {order}"
+        if limit is not None:
+            sql += f" DESC LIMIT {int(limit)}"
+        frame = pd.read_sql_query(sql, self._connection(), params=params)
+        if limit is not None:
+            # The latest rows, still returned oldest first
+            frame = frame.iloc[::-1].reset_index(drop=True)
+        frame[time_column] = pd.to_datetime(frame[time_column], format=time_format)
+        return frame
+    
+    def count(self, table: str) -> int:
+        """
+        Get the number of rows of a table.
+        
+        Args:
+            table: positions, orders or pnl_history
+        
+        Returns:
+            Row count
+        """
+        return self._connection().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    
+    def versions(self) -> Dict[str, int]:
+        """
+        Get the version of every table, which changes with each write to it.
+        
+        Returns:
+            Table name -> number of rows written, by any connection
+        """
+        return dict(self._connection().execute("SELECT name, version FROM versions").fetchall())
+    
+    def replace_positions(self, positions: pd.DataFrame) -> None:
+        """
+        Insert or update positions by symbol.
+        
+        Args:
+            positions: Frame with the positions table columns
+        """
+        self._insert("positions", positions, "INSERT OR REPLACE")
+    
+    def touch_positions(self, timestamp: datetime.datetime) -> None:
+        """
+        Set the update time of every position.
+        
+        Args:
+            timestamp: Update time
+        """
+        with self._connection() as connection:
+            connection.execute("UPDATE positions SET timestamp = ?", (_format_time(timestamp, TIMESTAMP_FORMAT),))
+    
+    def close_positions(self, timestamp: datetime.datetime) -> None:
+        """
+        Mark every position closed, with zero quantity and P&L.
+        
+        Args:
+            timestamp: Close time
+        """
+        with self._connection() as connection:
+            connection.execute("UPDATE positions SET quantity = 0, pnl = 0, timestamp = ?",
+                               (_format_time(timestamp, TIMESTAMP_FORMAT),))
+    
+    def get_positions(self) -> pd.DataFrame:
+        """
+        Get the current positions.
+        
+        Returns:
+            Positions frame
+        """
+        return self._query("positions")
+    
+    def append_orders(self, orders: pd.DataFrame) -> int:
+        """
+        Append order events.
+        
+        Args:
+            orders: Frame with the orders table columns
+        
+        Returns:
+            Number of rows inserted
+        """
+        return self._insert("orders", orders)
+    
+    def get_orders(self, start: TimeBound = None, end: TimeBound = None, limit: int = None) -> pd.DataFrame:
+        """
+        Get order events in a time range.
+        
+        Args:
+            start: Earliest timestamp, inclusive
+            end: Latest timestamp, inclusive
+            limit: Maximum rows, the latest ones
+        
+        Returns:
+            Orders frame in insertion order
+        """
+        return self._query("orders", start, end, limit)
+    
+    def append_pnl(self, date: Union[str, datetime.date], daily_pnl: float, cumulative_pnl: float) -> bool:
+        """
+        Append the P&L of a day, unless that day is already recorded.
+        
+        Args:
+            date: Trading day
+            daily_pnl: P&L of the day
+            cumulative_pnl: P&L up to and including the day
+        
+        Returns:
+            True if the row was inserted
+        """
+        frame = pd.DataFrame({"date": [date], "daily_pnl": [daily_pnl], "cumulative_pnl": [cumulative_pnl]})
+        return self._insert("pnl_history", frame, "INSERT OR IGNORE") > 0
+    
+    def append_pnl_history(self, pnl_history: pd.DataFrame) -> int:
+        """
+        Append P&L rows, skipping days already recorded.
+        
+        Args:
+            pnl_history: Frame with date, daily_pnl and cumulative_pnl
+        
+        Returns:
+            Number of rows inserted
+        """
+        return self._insert("pnl_history", pnl_history, "INSERT OR IGNORE")
+    
+    def get_pnl_history(self, start: TimeBound = None, end: TimeBound = None) -> pd.DataFrame:
+        """
+        Get daily P&L in a date range.
+        
+        Args:
+            start: First day, inclusive
+            end: Last day, inclusive
+        
+        Returns:
+            P&L frame in date order
+        """
+        return self._query("pnl_history", start, end)
+    
+    def last_pnl(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest P&L row.
+        
+        Returns:
+            Dictionary with date, daily_pnl and cumulative_pnl, or None if there is none
+        """
+        row = self._connection().execute(
+            "SELECT date, daily_pnl, cumulative_pnl FROM pnl_history ORDER BY date DESC LIMIT 1").fetchone()
+        if row is None:
+            return None
+        return {"date": datetime.datetime.strptime(row[0], DATE_FORMAT).date(), "daily_pnl": row[1],
+                "cumulative_pnl": row[2]}
@@ -0,0 +1,351 @@
+"""
+Record and replay transport for the mStock API client.
+Captures every HTTP exchange of a session to an append-only JSON lines log and
+serves the same exchanges back later without a network connection.
+"""
+
+import collections
+import datetime
+import json
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional, List, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from src.api.http_session import PooledHTTPAdapter, create_session
+from config.config import API_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Request form fields and response JSON keys never written to a log
+REDACTED_FIELDS = ("password", "api_key", "request_token", "checksum", "access_token")
+REDACTED_VALUE = "***"
+
+# Response headers not worth keeping in a log
+_DROPPED_HEADERS = ("set-cookie", "date", "connection", "keep-alive")
+
+
+class ReplayMissError(requests.exceptions.ConnectionError):
+    """Raised when a replayed session sends a request that is not in the log."""
+
+
+def _redact_json(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: REDACTED_VALUE if key in REDACTED_FIELDS else _redact_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_redact_json(item) for item in value]
+    return value
+
+
+def _request_body(request: requests.PreparedRequest) -> str:
+    """
+    Get the request body with secrets redacted.
+    
+    Args:
+        request: Prepared request
+    
+    Returns:
+        Form-encoded body with redacted fields, or the raw body text
+    """
+    body = request.body
+    if not body:
+        return ""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    if "x-www-form-urlencoded" in request.headers.get("Content-Type", ""):
+        fields = [(key, REDACTED_VALUE if key in REDACTED_FIELDS else value)
+                  for key, value in parse_qsl(body, keep_blank_values=True)]
+        return urlencode(fields)
+    return body
+
+
+def _response_body(response: requests.Response) -> str:
+    text = response.content.decode(response.encoding or "utf-8", errors="replace")
+    if "json" not in response.headers.get("Content-Type", ""):
+        return text
+    try:
+        return json.dumps(_redact_json(json.loads(text)), separators=(",", ":"))
+    except ValueError:
+        return text
+
+
+def request_key(method: str, url: str, body: str) -> Tuple[str, str, str]:
+    """
+    Get the key a request is matched on during replay.
+    
+    The host is left out, so a log recorded against one base URL replays
+    against any other.
+    
+    Args:
+        method: HTTP method
+        url: Request URL
+        body: Redacted request body
+    
+    Returns:
+        Tuple of (method, path with query, body)
+    """
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    return method.upper(), path, body
+
+
+class TransportLog:
+    """
+    Append-only JSON lines log of HTTP exchanges.
+    
+    Each line is one exchange: the request method, URL and redacted body, the
+    wall-clock start time, the latency until the full body was read, and the
+    response status, headers and body, or the name of the exception raised.
+    Lines are written whole under a lock, so concurrent requests never
+    interleave and a crash loses at most the exchange in flight.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the log.
+        
+        Args:
+            path: Log file, created on the first append
+        """
+        self.path = path
+        self._lock = threading.Lock()
+    
+    def append(self, record: Dict[str, Any]) -> bool:
+        """
+        Append one exchange to the log.
+        
+        Args:
+            record: Exchange record
+        
+        Returns:
+            bool: True if written, False otherwise
+        """
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        try:
+            with self._lock:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            return True
+        except OSError as e:
+            logger.error(f"Error writing transport log {self.path}: {str(e)}")
+            return False
+    
+    def records(self) -> List[Dict[str, Any]]:
+        """
+        Read every complete exchange in the log.
+        
+        Returns:
+            Exchange records in the order they finished
+        """
+        records = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    logger.warning(f"Ignoring partially written record at the end of {self.path}")
+                    break
+                records.append(json.loads(line))
+        return records
+
+
+class RecordingAdapter(PooledHTTPAdapter):
+    """
+    Pooled HTTP adapter that logs every exchange it sends.
+    
+    Requests go to the network unchanged. Latency is measured from sending the
+    request to reading the last byte of the response body.
+    """
+    
+    def __init__(self, log: TransportLog, **kwargs):
+        """
+        Initialize the adapter.
+        
+        Args:
+            log: Log to append exchanges to
+            **kwargs: PooledHTTPAdapter arguments
+        """
+        super().__init__(**kwargs)
+        self.log = log
+    
+    def send(self, request, **kwargs):
+        record = {"ts": time.time(), "method": request.method, "url": request.url, "body": _request_body(request)}
+        started = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+            if not kwargs.get("stream"):
+                response.content  # Read the body so the latency covers the full transfer
+        except requests.exceptions.RequestException as e:
+            record.update({"latency": time.perf_counter() - started, "error": type(e).__name__, "message": str(e)})
+            self.log.append(record)
+            raise
+        
+        record.update({
+            "latency": time.perf_counter() - started,
+            "status": response.status_code,
+            "headers": {key: value for key, value in response.headers.items()
+                        if key.lower() not in _DROPPED_HEADERS},
+            "response": _response_body(response),
+        })
+        self.log.append(record)
+        return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    HTTP adapter that answers requests from a transport log.
+    
+    Requests are matched on method, path and redacted body. Identical requests
+    are answered in the order they were recorded, so a client that repeats its
+    recorded sequence of calls gets the same responses back, including
+    recorded connection errors and timeouts. A request with no recorded
+    answer left raises ReplayMissError.
+    
+    With a latency scale above zero, replay keeps the recorded pacing: each
+    answer is held until its offset from the first recorded request, plus
+    its latency, has passed since the first replayed request, both scaled,
+    and never comes sooner than its scaled latency.
+    """
+    
+    def __init__(self, records: List[Dict[str, Any]], latency_scale: float = 0.0):
+        """
+        Initialize the adapter.
+        
+        Args:
+            records: Exchange records from TransportLog.records()
+            latency_scale: Multiple of the recorded timing to replay at, 1.0 for original
+                speed, 0.5 for half the delays and 0.0 for as fast as possible
+        """
+        super().__init__()
+        self.latency_scale = latency_scale
+        self._first_ts = min((record["ts"] for record in records), default=0.0)
+        self._started = None  # time.monotonic() of the first replayed request
+        self._lock = threading.Lock()
+        self._queues = collections.defaultdict(collections.deque)
+        for record in records:
+            self._queues[request_key(record["method"], record["url"], record["body"])].append(record)
+        self.served = 0
+        self.misses = 0
+    
+    def remaining(self) -> int:
+        """
+        Get the number of recorded exchanges not yet replayed.
+        
+        Returns:
+            Number of unreplayed exchanges
+        """
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+    
+    def send(self, request, **kwargs):
+        key = request_key(request.method, request.url, _request_body(request))
+        with self._lock:
+            if self._started is None:
+                self._started = time.monotonic()
+            queue = self._queues.get(key)
+            record = queue.popleft() if queue else None
+            if record is None:
+                self.misses += 1
+            else:
+                self.served += 1
+        
+        if record is None:
+            raise ReplayMissError(f"No recorded response for {key[0]} {key[1]}", request=request)
+        
+        if self.latency_scale > 0:
+            time.sleep(self._delay(record))
+        
+        if "error" in record:
+            error = getattr(requests.exceptions, record["error"], requests.exceptions.ConnectionError)
+            raise error(record.get("message", ""), request=request)
+        
+        response = requests.Response()
+        response.status_code = record["status"]
+        response.headers = CaseInsensitiveDict(record["headers"])
+        response._content = record["response"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.elapsed = datetime.timedelta(seconds=record["latency"])
+        response.connection = self
+        return response
+    
+    def _delay(self, record: Dict[str, Any]) -> float:
+        # Hold the answer until it is due on the recorded timeline, and at least its recorded latency
+        latency = record["latency"] * self.latency_scale
+        due = self._started + (record["ts"] - self._first_ts) * self.latency_scale + latency
+        return max(due - time.monotonic(), latency)
+
+
+def create_recording_session(log_path: str, **kwargs) -> requests.Session:
+    """
+    Create a pooled session that records every exchange to a log.
+    
+    Args:
+        log_path: Transport log file to append to
+        **kwargs: PooledHTTPAdapter arguments
+    
+    Returns:
+        Recording requests session
+    """
+    session = requests.Session()
+    adapter = RecordingAdapter(TransportLog(log_path), **kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def create_replay_session(log_path: str, latency_scale: float = 0.0) -> requests.Session:
+    """
+    Create a session that answers every request from a log.
+    
+    Args:
+        log_path: Transport log file to replay
+        latency_scale: Multiple of the recorded request spacing and latency to replay at
+    
+    Returns:
+        Replaying requests session
+    """
+    session = requests.Session()
+    adapter = ReplayAdapter(TransportLog(log_path).records(), latency_scale)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def create_configured_session() -> requests.Session:
+    """
+    Create the session selected by API_CONFIG["transport_mode"].
+    
+    Returns:
+        Live pooled session, or a recording or replaying session on the configured log
+    """
+    mode = API_CONFIG["transport_mode"]
+    if mode == "record":
+        logger.info(f"Recording API traffic to {API_CONFIG['transport_log']}")
+        return create_recording_session(API_CONFIG["transport_log"])
+    if mode == "replay":
+        logger.info(f"Replaying API traffic from {API_CONFIG['transport_log']}")
+        return create_replay_session(API_CONFIG["transport_log"], API_CONFIG["replay_latency_scale"])
+    if mode != "live":
+        logger.warning(f"Unknown transport mode {mode}, using live session")
+    return create_session()
+
+
+def get_replay_stats(session: requests.Session) -> Optional[Dict[str, Any]]:
+    """
+    Get replay progress for a session created by create_replay_session.
+    
+    Args:
+        session: Requests session
+    
+    Returns:
+        Dictionary with served, missed and remaining exchanges, or None if the session does not replay
+    """
+    adapter = session.get_adapter("https://")
+    if not isinstance(adapter, ReplayAdapter):
+        return None
+    return {"served": adapter.served, "misses": adapter.misses, "remaining": adapter.remaining()}